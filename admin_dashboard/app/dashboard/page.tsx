@@ -63,7 +63,7 @@ export default function DashboardPage() {
       }
 
       if (activityResponse?.success && activityResponse.data) {
-        setActivity(activityResponse.data)
+        setActivity(activityResponse.data.results)
       }
     } catch (err) {
       console.error("❌ Dashboard error:", err)
@@ -80,9 +80,9 @@ export default function DashboardPage() {
     switch (type) {
       case "booking":
         return <FileText className="h-4 w-4" />
-      case "visa":
+      case "document":
         return <AlertCircle className="h-4 w-4" />
-      case "trip":
+      case "readiness":
         return <Plane className="h-4 w-4" />
       default:
         return <Clock className="h-4 w-4" />
@@ -93,9 +93,9 @@ export default function DashboardPage() {
     switch (type) {
       case "booking":
         return "bg-blue-100 text-blue-600 dark:bg-blue-900 dark:text-blue-300"
-      case "visa":
+      case "document":
         return "bg-orange-100 text-orange-600 dark:bg-orange-900 dark:text-orange-300"
-      case "trip":
+      case "readiness":
         return "bg-green-100 text-green-600 dark:bg-green-900 dark:text-green-300"
       default:
         return "bg-gray-100 text-gray-600 dark:bg-gray-800 dark:text-gray-300"
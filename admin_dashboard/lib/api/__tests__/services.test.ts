@@ -33,24 +33,50 @@ describe('DashboardService', () => {
   })
 
   it('should fetch dashboard activity', async () => {
-    const mockActivity = [
-      {
-        id: '1',
-        type: 'booking',
-        title: 'New booking',
-        description: 'Booking created',
-        timestamp: '2025-01-01T00:00:00Z',
-      },
-    ]
+    const mockPage = {
+      results: [
+        {
+          id: '1',
+          type: 'booking',
+          eventType: 'BOOKING_CREATED',
+          title: 'New BOOKED booking',
+          description: 'Test Pilgrim - Umrah 2025',
+          timestamp: '2025-01-01T00:00:00Z',
+          relatedId: 'booking-1',
+          status: 'BOOKED',
+        },
+      ],
+      nextCursor: 'next-page',
+    }
 
     ;(apiClient.get as jest.Mock).mockResolvedValueOnce({
       success: true,
-      data: mockActivity,
+      data: mockPage,
     })
 
     const result = await DashboardService.getActivity('test-token')
 
-    expect(result.data).toEqual(mockActivity)
+    expect(apiClient.get).toHaveBeenCalledWith(
+      expect.stringContaining('dashboard/activity'),
+      undefined,
+      'test-token'
+    )
+    expect(result.data).toEqual(mockPage)
+  })
+
+  it('should pass the cursor when fetching the next activity page', async () => {
+    ;(apiClient.get as jest.Mock).mockResolvedValueOnce({
+      success: true,
+      data: { results: [], nextCursor: null },
+    })
+
+    await DashboardService.getActivity('test-token', 'next-page')
+
+    expect(apiClient.get).toHaveBeenCalledWith(
+      expect.stringContaining('dashboard/activity'),
+      { cursor: 'next-page' },
+      'test-token'
+    )
   })
 })
 
@@ -1,7 +1,7 @@
 // lib/api/services/dashboard.ts
 import { apiClient, type ApiResponse } from "../client"
 import { API_ENDPOINTS } from "../config"
-import type { DashboardStats, RecentActivity, TripWithPackages } from "@/types/models"
+import type { ActivityFeedPage, DashboardStats, TripWithPackages } from "@/types/models"
 
 /**
  * Service for dashboard API calls.
@@ -23,14 +23,16 @@ export class DashboardService {
 
   /**
    * GET /dashboard/activity
-   * Get recent activity feed.
+   * Get one page of the recent activity feed, newest first.
+   * Pass the previous page's `nextCursor` to fetch the page after it.
    */
   static async getActivity(
-    authToken?: string
-  ): Promise<ApiResponse<RecentActivity[]>> {
-    return apiClient.get<RecentActivity[]>(
+    authToken?: string,
+    cursor?: string
+  ): Promise<ApiResponse<ActivityFeedPage>> {
+    return apiClient.get<ActivityFeedPage>(
       API_ENDPOINTS.DASHBOARD.ACTIVITY,
-      undefined,
+      cursor ? { cursor } : undefined,
       authToken
     )
   }
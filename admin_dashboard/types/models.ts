@@ -1007,11 +1007,18 @@ export interface Activity {
 
 export interface RecentActivity {
   id: string
-  type: "booking" | "visa" | "payment" | "update"
+  type: "booking" | "payment" | "document" | "readiness" | "lead" | "feedback"
+  eventType: string
   title: string
   description: string
   timestamp: string
   relatedId?: string
+  status: string
+}
+
+export interface ActivityFeedPage {
+  results: RecentActivity[]
+  nextCursor: string | null
 }
 
 // Form data types (for create/update)
@@ -257,7 +257,7 @@ AUTH_USER_MODEL = 'accounts.Account'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.api.auth.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -270,9 +270,13 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'apps.common.exceptions.custom_exception_handler',
+    # Proxies in front of the app, so throttles key on the real client IP from X-Forwarded-For.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=None),
 }
 
 # JWT configuration
+# Lifetime of cached account snapshots used by CachedJWTAuthentication.
+AUTH_USER_CACHE_SECONDS = env.int('AUTH_USER_CACHE_SECONDS', default=60)
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(seconds=env('JWT_ACCESS_TOKEN_LIFETIME')),
     'REFRESH_TOKEN_LIFETIME': timedelta(seconds=env('JWT_REFRESH_TOKEN_LIFETIME')),
@@ -405,6 +409,24 @@ SPECTACULAR_SETTINGS = {
     ],
 }
 
+# Cache shared by every web and worker process: rate-limit buckets, auth
+# snapshots, platform settings, dashboard stats and task locks all rely on it.
+# Tests use a per-process in-memory cache.
+if RUNNING_TESTS:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': env('REDIS_URL'),
+            'KEY_PREFIX': 'alhilal',
+        }
+    }
+
 # Celery configuration
 CELERY_BROKER_URL = env('REDIS_URL')
 CELERY_RESULT_BACKEND = env('REDIS_URL')
@@ -412,6 +434,58 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_ALWAYS_EAGER = env.bool('CELERY_TASK_ALWAYS_EAGER', default=RUNNING_TESTS)
+CELERY_BEAT_SCHEDULE = {
+    # Safety net for the eta wake-ups queued when content is scheduled.
+    'publish-due-content': {
+        'task': 'apps.trips.tasks.publish_due_content_task',
+        'schedule': 60.0,
+    },
+    # Only needed with the database OTP backend; Redis keys expire on their own.
+    'purge-expired-otps': {
+        'task': 'apps.accounts.tasks.purge_expired_otps_task',
+        'schedule': 3600.0,
+    },
+    # Deletes staged pilgrim import rows once their session can no longer be committed.
+    'purge-import-sessions': {
+        'task': 'apps.accounts.tasks.purge_import_sessions_task',
+        'schedule': 3600.0,
+    },
+    # Resumes pilgrim import jobs whose worker died or whose enqueue was lost.
+    'resume-stalled-import-jobs': {
+        'task': 'apps.accounts.tasks.resume_stalled_import_jobs_task',
+        'schedule': 300.0,
+    },
+    # Picks up SMS whose enqueue was lost and retries that are due.
+    'deliver-sms-outbox': {
+        'task': 'apps.common.tasks.deliver_sms_outbox_task',
+        'schedule': 60.0,
+    },
+    # Deletes sent and failed SMS after SMS_OUTBOX_RETENTION_DAYS.
+    'purge-sms-outbox': {
+        'task': 'apps.common.tasks.purge_sms_outbox_task',
+        'schedule': 3600.0,
+    },
+}
+
+# Live trip update streams (server-sent events)
+REALTIME_BROKER = env('REALTIME_BROKER', default='local' if RUNNING_TESTS else 'redis')
+REALTIME_REDIS_URL = env('REDIS_URL')
+TRIP_UPDATE_STREAM_HEARTBEAT_SECONDS = env.int('TRIP_UPDATE_STREAM_HEARTBEAT_SECONDS', default=15)
+TRIP_UPDATE_STREAM_MAX_SECONDS = env.int('TRIP_UPDATE_STREAM_MAX_SECONDS', default=900)
+TRIP_UPDATE_STREAM_RETRY_MS = 5000
+
+# Push notifications. The local provider only records batches, so it is never the
+# production default; with PUSH_PROVIDER unset, due notifications are held, not dropped.
+PUSH_PROVIDER = env('PUSH_PROVIDER', default='apps.common.push.LocalPushProvider' if RUNNING_TESTS else '')
+# Notifications still unsent this long after their scheduled time are skipped, not delivered late.
+NOTIFICATION_MAX_DELAY_SECONDS = env.int('NOTIFICATION_MAX_DELAY_SECONDS', default=86400)
+
+# Offline trip packs
+OFFLINE_PACK_REBUILD_DELAY_SECONDS = env.int('OFFLINE_PACK_REBUILD_DELAY_SECONDS', default=5)
+
+# Staff dashboard stats cache lifetime
+DASHBOARD_STATS_CACHE_SECONDS = env.int('DASHBOARD_STATS_CACHE_SECONDS', default=60)
 
 # Simple History configuration
 SIMPLE_HISTORY_HISTORY_CHANGE_REASON_USE_TEXT = True
@@ -419,6 +493,12 @@ SIMPLE_HISTORY_HISTORY_CHANGE_REASON_USE_TEXT = True
 # OTP configuration
 OTP_EXPIRY_SECONDS = env('OTP_EXPIRY_SECONDS')
 OTP_MAX_ATTEMPTS = env('OTP_MAX_ATTEMPTS')
+OTP_RESEND_SECONDS = env.int('OTP_RESEND_SECONDS', default=60)
+OTP_BACKEND = env('OTP_BACKEND', default='apps.accounts.otp.DatabaseOTPBackend')
+OTP_REDIS_URL = env('OTP_REDIS_URL', default=env('REDIS_URL'))
+
+# Pilgrim import jobs untouched this long are treated as interrupted and re-queued
+IMPORT_JOB_STALL_SECONDS = env.int('IMPORT_JOB_STALL_SECONDS', default=600)
 
 # Field encryption key
 # For Railway deployment: generate a secure key and set it in environment variables
@@ -427,6 +507,12 @@ OTP_MAX_ATTEMPTS = env('OTP_MAX_ATTEMPTS')
 # Valid Fernet key format (32 url-safe base64-encoded bytes = 44 chars)
 TEMPORARY_KEY = 'dGVtcG9yYXJ5X2J1aWxkX2tleV9kb19ub3RfdXNlX2lucHJvZHVjdGlvbg=='
 FIELD_ENCRYPTION_KEY = env('FIELD_ENCRYPTION_KEY') or TEMPORARY_KEY
+# Ordered keys for rotation: the first encrypts, all decrypt. Defaults to the single key above.
+FIELD_ENCRYPTION_KEYS = env.list('FIELD_ENCRYPTION_KEYS', default=[]) or [FIELD_ENCRYPTION_KEY]
+# HMAC key for blind-index lookups on passport/document numbers. Falls back to
+# SECRET_KEY when unset, which ties the stored indexes to it; changing the key in
+# use requires `manage.py rebuild_blind_indexes`.
+BLIND_INDEX_KEY = env('BLIND_INDEX_KEY', default='') or SECRET_KEY
 
 # Warn if using temporary key in production
 if not DEBUG and FIELD_ENCRYPTION_KEY == TEMPORARY_KEY:
@@ -437,15 +523,52 @@ if not DEBUG and FIELD_ENCRYPTION_KEY == TEMPORARY_KEY:
         RuntimeWarning
     )
 
+# Warn if blind indexes are keyed by SECRET_KEY in production
+if not DEBUG and not RUNNING_TESTS and not env('BLIND_INDEX_KEY', default=''):
+    import warnings
+    warnings.warn(
+        "WARNING: BLIND_INDEX_KEY is not set and falls back to SECRET_KEY! "
+        "Set it explicitly (to the current SECRET_KEY to keep existing indexes) "
+        "so rotating SECRET_KEY does not break passport and document lookups.",
+        RuntimeWarning
+    )
+
 # Rate limiting
 RATELIMIT_ENABLE = env('RATELIMIT_ENABLE')
+# Token buckets per view scope, keyed by ip, phone or route: "<capacity>/<period>".
+RATE_LIMITS = {
+    'otp-request': {'ip': '20/hour', 'phone': '5/hour', 'route': '600/min'},
+    'otp-verify': {'ip': '30/hour', 'phone': '10/hour'},
+    'staff-login': {'ip': '30/hour', 'phone': '10/hour'},
+    'lead-capture': {'ip': '10/hour'},
+    'public-catalog': {'ip': '120/min'},
+}
 
 # Africa's Talking SMS Configuration
 AFRICASTALKING_USERNAME = env('AFRICASTALKING_USERNAME')
 AFRICASTALKING_API_KEY = env('AFRICASTALKING_API_KEY')
 AFRICASTALKING_SENDER_ID = env('AFRICASTALKING_SENDER_ID')
 SMS_ENABLED = env('SMS_ENABLED')
+SMS_PROVIDER = env(
+    'SMS_PROVIDER',
+    default='apps.common.sms.LocalSmsProvider' if RUNNING_TESTS else 'apps.common.sms.AfricasTalkingSmsProvider',
+)
+SMS_MAX_ATTEMPTS = env.int('SMS_MAX_ATTEMPTS', default=5)
+SMS_RETRY_BASE_SECONDS = env.int('SMS_RETRY_BASE_SECONDS', default=15)
+SMS_OUTBOX_BATCH_SIZE = env.int('SMS_OUTBOX_BATCH_SIZE', default=500)
+SMS_OUTBOX_RETENTION_DAYS = env.int('SMS_OUTBOX_RETENTION_DAYS', default=30)
 YOUTUBE_DATA_API_KEY = env('YOUTUBE_DATA_API_KEY')
+YOUTUBE_CLIENT = env(
+    'YOUTUBE_CLIENT',
+    default='apps.common.youtube.LocalYouTubeClient' if RUNNING_TESTS else 'apps.common.youtube.YouTubeDataClient',
+)
+
+# Direct-to-storage uploads: the storage backend and how long a signed upload stays valid
+UPLOAD_STORAGE = env(
+    'UPLOAD_STORAGE',
+    default='apps.common.uploads.LocalUploadStorage' if RUNNING_TESTS else 'apps.common.uploads.CloudinaryUploadStorage',
+)
+UPLOAD_TOKEN_MAX_AGE = env.int('UPLOAD_TOKEN_MAX_AGE', default=3600)
 
 # Initialize Africa's Talking if credentials are provided
 if AFRICASTALKING_API_KEY and AFRICASTALKING_API_KEY != '':
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import Account, StaffProfile, PilgrimProfile, OTPCode
+from .models import Account, StaffProfile, PilgrimProfile, OTPCode, PilgrimImportJob
 
 
 @admin.register(Account)
@@ -56,3 +56,21 @@ class OTPCodeAdmin(admin.ModelAdmin):
     search_fields = ['phone']
     readonly_fields = ['created_at']
 
+
+@admin.register(PilgrimImportJob)
+class PilgrimImportJobAdmin(admin.ModelAdmin):
+    """Read-only progress view for PilgrimImportJob."""
+    
+    list_display = [
+        'file_name', 'kind', 'status', 'processed_count', 'total_rows',
+        'created_count', 'updated_count', 'failed_count', 'created_at',
+    ]
+    list_filter = ['kind', 'status']
+    search_fields = ['file_name']
+    exclude = ['rows']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
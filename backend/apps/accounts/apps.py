@@ -6,3 +6,7 @@ class AccountsConfig(AppConfig):
     name = 'apps.accounts'
     verbose_name = 'Accounts'
 
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
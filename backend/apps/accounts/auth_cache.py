@@ -0,0 +1,81 @@
+"""
+Short-lived cache of the account facts needed to authenticate a request.
+
+A snapshot holds the identity and permission columns of the account (never the
+password hash), the staff role and whether a pilgrim profile exists.
+Authentication rebuilds an ``Account`` from it without touching the database,
+and permission checks read the staff role and pilgrim-profile flag from the
+rebuilt user. Columns left out of the snapshot are deferred on that user, so
+reading one loads it and ``save()`` writes back only the snapshot columns. Saving or deleting an account, staff profile or pilgrim
+profile drops the snapshot; ``AUTH_USER_CACHE_SECONDS`` bounds staleness from
+bulk updates that bypass signals.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.db.models import Exists, OuterRef
+
+from .models import Account, PilgrimProfile
+
+USER_CACHE_KEY = 'auth:user:{user_id}'
+
+# Account columns kept in a snapshot, in model field order.
+SNAPSHOT_FIELDS = [
+    field.attname
+    for field in Account._meta.concrete_fields
+    if field.attname in {'id', 'role', 'phone', 'email', 'name', 'is_active', 'is_staff', 'is_superuser'}
+]
+
+
+def build_user_snapshot(user_id):
+    """Load the snapshot for an account in one query, or ``None`` if it does not exist."""
+    user = (
+        Account.objects.select_related('staff_profile')
+        .annotate(has_pilgrim_profile=Exists(PilgrimProfile.objects.filter(user_id=OuterRef('pk'))))
+        .filter(pk=user_id)
+        .first()
+    )
+    if user is None:
+        return None
+
+    staff_profile = getattr(user, 'staff_profile', None)
+    return {
+        'account': {name: getattr(user, name) for name in SNAPSHOT_FIELDS},
+        'staff_role': staff_profile.role if staff_profile else None,
+        'has_pilgrim_profile': user.has_pilgrim_profile,
+    }
+
+
+def get_user_snapshot(user_id):
+    """Return the cached snapshot for an account, loading it on a miss."""
+    key = USER_CACHE_KEY.format(user_id=user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_user_snapshot(user_id)
+        if snapshot is not None:
+            cache.set(key, snapshot, timeout=settings.AUTH_USER_CACHE_SECONDS)
+    return snapshot
+
+
+def user_from_snapshot(snapshot):
+    """Rebuild a saved ``Account`` carrying ``staff_role`` and ``has_pilgrim_profile``."""
+    account = snapshot['account']
+    user = Account.from_db(
+        router.db_for_read(Account),
+        SNAPSHOT_FIELDS,
+        [account[name] for name in SNAPSHOT_FIELDS],
+    )
+    user.staff_role = snapshot['staff_role']
+    user.has_pilgrim_profile = snapshot['has_pilgrim_profile']
+
+    # Known-missing profiles are cached as absent so hasattr() checks skip the query.
+    if user.staff_role is None:
+        Account.staff_profile.related.set_cached_value(user, None)
+    if not user.has_pilgrim_profile:
+        Account.pilgrim_profile.related.set_cached_value(user, None)
+    return user
+
+
+def invalidate_user_snapshot(user_id):
+    """Drop the cached snapshot for an account."""
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
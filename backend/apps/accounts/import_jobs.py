@@ -0,0 +1,192 @@
+"""
+Background pilgrim import jobs.
+
+Imports are parsed and validated in the request, then written by a Celery
+worker in chunks. Each chunk commits together with the job's progress
+counters, so ``next_row`` always points at the first uncommitted row and a job
+that fails, or whose worker dies, resumes exactly there instead of starting
+over or double-importing.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import PilgrimImportJob, PilgrimImportSession
+
+logger = logging.getLogger(__name__)
+
+IMPORT_JOB_CHUNK_SIZE = 500
+
+# Chunk writers by job kind: ``handler(rows, created_by) -> (created, updated, errors)``.
+IMPORT_JOB_HANDLERS = {
+    'EXCEL': 'apps.accounts.importing.import_chunk',
+    'CSV': 'apps.trips.csv_import.import_chunk',
+}
+
+
+class ImportJobSuperseded(Exception):
+    """Raised when a job was re-queued while this worker still held it."""
+
+
+CHUNK_PROGRESS_FIELDS = [
+    'next_row',
+    'processed_count',
+    'created_count',
+    'updated_count',
+    'failed_count',
+    'errors',
+    'updated_at',
+]
+
+
+def start_import_job(kind, rows, created_by=None, file_name='', errors=(), session=None,
+                     chunk_size=IMPORT_JOB_CHUNK_SIZE):
+    """
+    Record a job for ``rows`` and queue it.
+
+    ``errors`` are rows already rejected during validation; they count as
+    failed but are not part of ``total_rows``. The job row is committed
+    before it is queued, so this must not run inside a transaction. With
+    eager Celery the returned job has already finished.
+    """
+    rows = list(rows)
+    errors = list(errors)
+    job = PilgrimImportJob.objects.create(
+        kind=kind,
+        file_name=file_name,
+        rows=rows,
+        total_rows=len(rows),
+        chunk_size=chunk_size,
+        errors=errors,
+        failed_count=len(errors),
+        session=session,
+        created_by=created_by,
+    )
+    enqueue_import_job(job.pk)
+    job.refresh_from_db()
+    return job
+
+
+def enqueue_import_job(job_id):
+    """Hand a pending job to the worker."""
+    from .tasks import run_import_job_task
+
+    try:
+        run_import_job_task.delay(str(job_id))
+    except Exception:
+        # The stalled-job sweep picks up jobs whose enqueue was lost.
+        logger.exception("Failed to queue pilgrim import job %s", job_id)
+
+
+def run_import_job(job_id):
+    """
+    Claim a pending job and write its remaining chunks.
+
+    Returns the job, or None when it was not pending (already running
+    elsewhere, finished, or unknown).
+    """
+    claimed = PilgrimImportJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING',
+        error_message='',
+        attempts=F('attempts') + 1,
+        updated_at=timezone.now(),
+    )
+    if not claimed:
+        return None
+
+    job = PilgrimImportJob.objects.select_related('created_by').get(pk=job_id)
+    if job.started_at is None:
+        job.started_at = timezone.now()
+        job.save(update_fields=['started_at', 'updated_at'])
+
+    handler = import_string(IMPORT_JOB_HANDLERS[job.kind])
+    try:
+        while job.next_row < job.total_rows:
+            _run_chunk(job, handler)
+    except ImportJobSuperseded:
+        logger.warning("Pilgrim import job %s was taken over by another worker", job.pk)
+        return job
+    except Exception as exc:
+        logger.exception("Pilgrim import job %s failed at row %s", job.pk, job.next_row)
+        job.status = 'FAILED'
+        job.error_message = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+        return job
+
+    job.status = 'COMPLETED'
+    job.rows = []
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'rows', 'finished_at', 'updated_at'])
+    if job.session_id:
+        PilgrimImportSession.objects.filter(pk=job.session_id).update(
+            status='COMMITTED',
+            rows=[],
+            imported_count=job.created_count,
+            errors=job.errors,
+            committed_at=job.finished_at,
+        )
+    return job
+
+
+def _run_chunk(job, handler):
+    """Write the next chunk and advance the job's progress in one transaction."""
+    chunk = job.rows[job.next_row:job.next_row + job.chunk_size]
+    with transaction.atomic():
+        # Lock the job so a worker the stall sweep gave up on cannot write a chunk twice.
+        current = (
+            PilgrimImportJob.objects.select_for_update()
+            .filter(pk=job.pk)
+            .values_list('status', 'attempts', 'next_row')
+            .first()
+        )
+        if current != ('RUNNING', job.attempts, job.next_row):
+            raise ImportJobSuperseded(job.pk)
+        created, updated, errors = handler(chunk, job.created_by)
+        job.next_row += len(chunk)
+        job.processed_count += len(chunk)
+        job.created_count += created
+        job.updated_count += updated
+        job.failed_count += len(errors)
+        job.errors = job.errors + list(errors)
+        job.save(update_fields=CHUNK_PROGRESS_FIELDS)
+
+
+def resume_import_job(job):
+    """Queue a failed job to continue from its last committed chunk; return whether it was queued."""
+    if not PilgrimImportJob.objects.filter(pk=job.pk, status='FAILED').update(
+        status='PENDING', finished_at=None, updated_at=timezone.now()
+    ):
+        return False
+    enqueue_import_job(job.pk)
+    return True
+
+
+def resume_stalled_import_jobs(now=None):
+    """
+    Re-queue jobs that stopped making progress and return how many were queued.
+
+    A running job saves after every chunk, so one untouched for
+    ``IMPORT_JOB_STALL_SECONDS`` lost its worker. Pending jobs that old lost
+    their enqueue.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=settings.IMPORT_JOB_STALL_SECONDS)
+    stalled = list(
+        PilgrimImportJob.objects.filter(status__in=['PENDING', 'RUNNING'], updated_at__lt=cutoff)
+        .values_list('pk', flat=True)
+    )
+    if not stalled:
+        return 0
+
+    PilgrimImportJob.objects.filter(pk__in=stalled, status='RUNNING', updated_at__lt=cutoff).update(
+        status='PENDING', updated_at=now
+    )
+    for job_id in stalled:
+        enqueue_import_job(job_id)
+    return len(stalled)
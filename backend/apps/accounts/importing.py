@@ -0,0 +1,393 @@
+"""
+Bulk pilgrim import engine.
+
+Rows are streamed from the workbook with openpyxl's read-only reader, cleaned
+and checked for duplicates in a pure-Python pass against duplicate sets loaded
+once per import, and then written with ``bulk_create`` in chunks. Each chunk
+runs in its own savepoint; if a chunk fails, its rows are retried one by one so
+a single bad row only costs itself.
+
+The two-step flow stages the importable rows in a ``PilgrimImportSession`` at
+validation time, so committing applies them by id without re-reading the file.
+Both flows write through a background ``PilgrimImportJob`` (see
+``import_jobs``) with ``import_chunk`` as its per-chunk handler.
+"""
+from datetime import date, datetime, timedelta
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+from simple_history.utils import bulk_create_with_history
+
+from apps.common.encryption import blind_index
+
+from .import_jobs import start_import_job
+from .models import Account, PilgrimImportSession, PilgrimProfile
+
+IMPORT_HEADERS = [
+    'Full Name*',
+    'Passport Number*',
+    'Phone Number*',
+    'Date of Birth (YYYY-MM-DD)',
+    'Gender (MALE/FEMALE/OTHER)',
+    'Nationality (2-letter code)',
+    'Address',
+    'Emergency Contact Name',
+    'Emergency Contact Phone',
+    'Emergency Relationship',
+    'Medical Conditions',
+]
+
+# Fields kept for each importable row in an import session, in storage order.
+STAGED_COLUMNS = (
+    'row_number',
+    'full_name',
+    'passport_number',
+    'phone',
+    'dob',
+    'gender',
+    'nationality',
+    'address',
+    'emergency_name',
+    'emergency_phone',
+    'emergency_relationship',
+    'medical_conditions',
+)
+
+IMPORT_CHUNK_SIZE = 500
+LOOKUP_CHUNK_SIZE = 500
+IMPORT_SESSION_MAX_AGE = timedelta(hours=24)
+
+
+class ImportFileError(Exception):
+    """Raised when an uploaded workbook does not match the import template."""
+
+
+def _text(value):
+    """Return a stripped string, or ``None`` for empty cells."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def read_workbook_rows(file):
+    """
+    Yield ``(row_number, values)`` for each non-empty data row of the workbook.
+
+    Raises ``ImportFileError`` on the first iteration if the headers do not
+    match ``IMPORT_HEADERS``.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, ())
+        for index, expected in enumerate(IMPORT_HEADERS):
+            if index >= len(headers) or headers[index] != expected:
+                raise ImportFileError(f'Invalid template format. Expected header "{expected}" at column {index + 1}')
+
+        for row_number, values in enumerate(rows, start=2):
+            if all(_text(value) is None for value in values):
+                continue
+            values = tuple(values) + (None,) * (len(IMPORT_HEADERS) - len(values))
+            yield row_number, values
+    finally:
+        workbook.close()
+
+
+def clean_row(row_number, values):
+    """Return ``(row, errors)`` with the normalized fields and every validation error for one row."""
+    errors = []
+    full_name = _text(values[0])
+    passport_number = _text(values[1])
+    phone = _text(values[2])
+    dob_value = values[3]
+    gender = (_text(values[4]) or '').upper() or None
+    nationality = (_text(values[5]) or '').upper() or None
+
+    if not full_name:
+        errors.append('Full Name is required')
+    if not passport_number:
+        errors.append('Passport Number is required')
+    if not phone:
+        errors.append('Phone Number is required')
+
+    dob = None
+    if isinstance(dob_value, datetime):
+        dob = dob_value.date()
+    elif isinstance(dob_value, date):
+        dob = dob_value
+    elif _text(dob_value):
+        try:
+            dob = datetime.strptime(_text(dob_value), '%Y-%m-%d').date()
+        except ValueError:
+            errors.append('Invalid date format for Date of Birth. Use YYYY-MM-DD')
+
+    if gender and gender not in ['MALE', 'FEMALE', 'OTHER']:
+        errors.append('Gender must be MALE, FEMALE, or OTHER')
+    if nationality and len(nationality) != 2:
+        errors.append('Nationality must be a 2-letter ISO country code')
+
+    row = {
+        'row_number': row_number,
+        'full_name': full_name,
+        'passport_number': passport_number,
+        'phone': phone,
+        'dob': dob,
+        'gender': gender,
+        'nationality': nationality,
+        'address': _text(values[6]) or '',
+        'emergency_name': _text(values[7]) or '',
+        'emergency_phone': _text(values[8]) or '',
+        'emergency_relationship': _text(values[9]) or '',
+        'medical_conditions': _text(values[10]) or '',
+    }
+    return row, errors
+
+
+class DuplicateIndex:
+    """Phones and passport indexes already taken, loaded in a few ``IN`` queries."""
+
+    def __init__(self, rows):
+        phones = list({row['phone'] for row in rows if row['phone']})
+        passports = list({blind_index(row['passport_number']) for row in rows if row['passport_number']} - {None})
+
+        self.account_phones = set()
+        self.profile_phones = set()
+        self.passports = set()
+        for chunk in _chunks(phones, LOOKUP_CHUNK_SIZE):
+            self.account_phones.update(Account.objects.filter(phone__in=chunk).values_list('phone', flat=True))
+            self.profile_phones.update(PilgrimProfile.objects.filter(phone__in=chunk).values_list('phone', flat=True))
+        for chunk in _chunks(passports, LOOKUP_CHUNK_SIZE):
+            self.passports.update(
+                PilgrimProfile.objects.filter(passport_number_index__in=chunk).values_list('passport_number_index', flat=True)
+            )
+
+    def conflicts(self, row):
+        """Return ``(kind, message)`` for each identifier of the row that is already taken."""
+        conflicts = []
+        if row['passport_number'] and blind_index(row['passport_number']) in self.passports:
+            conflicts.append(('passport', f"Passport Number '{row['passport_number']}' already exists"))
+        if row['phone'] in self.profile_phones:
+            conflicts.append(('phone', f"Phone Number '{row['phone']}' already exists"))
+        elif row['phone'] in self.account_phones:
+            conflicts.append(('phone', f"An account with phone '{row['phone']}' already exists"))
+        return conflicts
+
+    def claim(self, row):
+        """Reserve a row's identifiers so later rows in the same file count as duplicates."""
+        self.passports.add(blind_index(row['passport_number']))
+        self.account_phones.add(row['phone'])
+        self.profile_phones.add(row['phone'])
+
+
+def classify_rows(rows):
+    """
+    Clean and de-duplicate parsed rows for preview.
+
+    Every returned row carries ``errors``, ``warnings`` and ``duplicate_type``
+    (``'phone'``, ``'passport'``, ``'both'`` or ``None``); duplicate messages
+    come first in its warnings.
+    """
+    cleaned = [clean_row(row_number, values) for row_number, values in rows]
+    duplicates = DuplicateIndex([row for row, row_errors in cleaned if not row_errors])
+
+    classified = []
+    for row, row_errors in cleaned:
+        conflicts = [] if row_errors else duplicates.conflicts(row)
+        kinds = {kind for kind, _message in conflicts}
+        warnings = [message for _kind, message in conflicts]
+        if row['phone'] and not row['phone'].startswith('+'):
+            warnings.append('Phone should include country code (e.g., +256...)')
+        if not row_errors and not conflicts:
+            duplicates.claim(row)
+
+        row.update({
+            'errors': row_errors,
+            'warnings': warnings,
+            'duplicate_type': 'both' if len(kinds) > 1 else next(iter(kinds), None),
+        })
+        classified.append(row)
+    return classified
+
+
+def validate_rows(rows):
+    """
+    Clean and de-duplicate parsed rows for a one-step import.
+
+    Returns ``(valid_rows, errors)`` where ``errors`` holds one
+    ``"Row N: message"`` entry per rejected row.
+    """
+    valid_rows = []
+    errors = []
+    for row in classify_rows(rows):
+        if row['errors']:
+            errors.append(f"Row {row['row_number']}: {row['errors'][0]}")
+        elif row['duplicate_type']:
+            errors.append(f"Row {row['row_number']}: {row['warnings'][0]}")
+        else:
+            valid_rows.append(row)
+    return valid_rows, errors
+
+
+def _insert_pilgrims(rows, created_by):
+    """Bulk-insert accounts and profiles for already validated rows."""
+    accounts = [
+        Account(phone=row['phone'], name=row['full_name'], role='PILGRIM', is_staff=False)
+        for row in rows
+    ]
+    Account.objects.bulk_create(accounts)
+    profiles = [
+        PilgrimProfile(
+            user=account,
+            full_name=row['full_name'],
+            passport_number=row['passport_number'],
+            # bulk_create skips save(), which normally maintains the blind index.
+            passport_number_index=blind_index(row['passport_number']),
+            phone=row['phone'],
+            dob=row['dob'],
+            gender=row['gender'],
+            nationality=row['nationality'],
+            address=row['address'],
+            emergency_name=row['emergency_name'],
+            emergency_phone=row['emergency_phone'],
+            emergency_relationship=row['emergency_relationship'],
+            medical_conditions=row['medical_conditions'],
+            created_by=created_by,
+        )
+        for account, row in zip(accounts, rows)
+    ]
+    bulk_create_with_history(profiles, PilgrimProfile, default_user=created_by)
+
+
+def create_pilgrims(rows, created_by=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Write validated rows in chunks and return ``(created_count, errors)``.
+
+    Each chunk is its own savepoint. A chunk that fails is retried row by row,
+    so only the offending rows are reported and skipped.
+    """
+    created = 0
+    errors = []
+    for chunk in _chunks(rows, chunk_size):
+        try:
+            with transaction.atomic():
+                _insert_pilgrims(chunk, created_by)
+            created += len(chunk)
+            continue
+        except DatabaseError:
+            pass
+
+        for row in chunk:
+            try:
+                with transaction.atomic():
+                    _insert_pilgrims([row], created_by)
+                created += 1
+            except DatabaseError as exc:
+                errors.append(f"Row {row['row_number']}: {exc}")
+    return created, errors
+
+
+def pack_rows(rows):
+    """Return rows as JSON-ready lists in ``STAGED_COLUMNS`` order."""
+    packed = []
+    for row in rows:
+        values = [row[column] for column in STAGED_COLUMNS]
+        values[STAGED_COLUMNS.index('dob')] = row['dob'].isoformat() if row['dob'] else None
+        packed.append(values)
+    return packed
+
+
+def unpack_rows(packed):
+    """Inverse of ``pack_rows``."""
+    rows = []
+    for values in packed:
+        row = dict(zip(STAGED_COLUMNS, values))
+        row['dob'] = date.fromisoformat(row['dob']) if row['dob'] else None
+        rows.append(row)
+    return rows
+
+
+def stage_import(rows, created_by=None, file_name=''):
+    """
+    Classify parsed rows and stage the importable ones in a new session.
+
+    Returns ``(session, classified_rows)``.
+    """
+    classified = classify_rows(rows)
+    importable = [row for row in classified if not row['errors'] and not row['duplicate_type']]
+    session = PilgrimImportSession.objects.create(
+        file_name=file_name,
+        rows=pack_rows(importable),
+        summary={
+            'total': len(classified),
+            'valid': len(importable),
+            'duplicates': sum(1 for row in classified if not row['errors'] and row['duplicate_type']),
+            'errors': sum(1 for row in classified if row['errors']),
+        },
+        created_by=created_by,
+    )
+    return session, classified
+
+
+class ImportSessionError(Exception):
+    """Raised when a staged import session cannot be committed."""
+
+
+def claim_import_session(session_id, created_by=None):
+    """
+    Mark a validated session as committing and return it.
+
+    Raises ``PilgrimImportSession.DoesNotExist`` for unknown sessions and
+    ``ImportSessionError`` for expired or already committed ones. The status
+    flip is a conditional UPDATE, so two concurrent commits of the same
+    session cannot both proceed.
+    """
+    sessions = PilgrimImportSession.objects.filter(pk=session_id)
+    if created_by is not None:
+        sessions = sessions.filter(created_by=created_by)
+    session = sessions.get()
+    if session.created_at < timezone.now() - IMPORT_SESSION_MAX_AGE:
+        raise ImportSessionError('Import session has expired; validate the file again')
+    if not sessions.filter(status='VALIDATED').update(status='COMMITTING'):
+        raise ImportSessionError('Import session has already been committed')
+    session.status = 'COMMITTING'
+    return session
+
+
+def commit_import_session(session, exclude_rows=(), created_by=None):
+    """
+    Queue a job writing a claimed session's staged rows and return it.
+
+    ``exclude_rows`` lists sheet row numbers the operator deselected. The job
+    marks the session committed when it completes.
+    """
+    excluded = {int(row_number) for row_number in exclude_rows}
+    row_number = STAGED_COLUMNS.index('row_number')
+    rows = [values for values in session.rows if values[row_number] not in excluded]
+    return start_import_job(
+        'EXCEL', rows, created_by=created_by, file_name=session.file_name, session=session
+    )
+
+
+def purge_import_sessions(now=None):
+    """
+    Delete sessions older than ``IMPORT_SESSION_MAX_AGE`` and return how many went.
+
+    Staged rows hold pilgrim PII and cannot be committed once expired.
+    Sessions still committing are left for their job to finish.
+    """
+    cutoff = (now or timezone.now()) - IMPORT_SESSION_MAX_AGE
+    deleted, _ = PilgrimImportSession.objects.filter(created_at__lt=cutoff).exclude(status='COMMITTING').delete()
+    return deleted
+
+
+def import_chunk(rows, created_by=None):
+    """Import job handler: write packed rows and return ``(created, updated, errors)``."""
+    created, errors = create_pilgrims(unpack_rows(rows), created_by=created_by)
+    return created, 0, errors
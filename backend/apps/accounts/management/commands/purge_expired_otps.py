@@ -0,0 +1,15 @@
+"""
+Management command to delete OTP codes that can no longer be used
+Usage: python manage.py purge_expired_otps
+"""
+from django.core.management.base import BaseCommand
+
+from apps.accounts.otp import get_otp_backend
+
+
+class Command(BaseCommand):
+    help = 'Deletes expired and consumed OTP codes from the configured OTP backend'
+
+    def handle(self, *args, **options):
+        deleted = get_otp_backend().purge()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} OTP codes"))
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_add_pilgrim_identity_fields"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="otpcode",
+            index=models.Index(fields=["expires_at"], name="otp_codes_expires_348c2d_idx"),
+        ),
+    ]
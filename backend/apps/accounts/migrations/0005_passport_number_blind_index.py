@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:40
+
+from django.db import migrations, models
+
+from apps.common.encryption import blind_index
+
+
+def backfill_passport_number_index(apps, schema_editor):
+    PilgrimProfile = apps.get_model("accounts", "PilgrimProfile")
+    profiles = []
+    for profile in PilgrimProfile.objects.exclude(passport_number__isnull=True).only("user_id", "passport_number").iterator():
+        profile.passport_number_index = blind_index(profile.passport_number)
+        profiles.append(profile)
+    PilgrimProfile.objects.bulk_update(profiles, ["passport_number_index"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_otp_expiry_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalpilgrimprofile",
+            name="passport_number_index",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Blind index (HMAC) of the normalized passport number for equality lookups",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="pilgrimprofile",
+            name="passport_number_index",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Blind index (HMAC) of the normalized passport number for equality lookups",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_passport_number_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:56
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_passport_number_blind_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PilgrimImportSession",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("file_name", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("VALIDATED", "Validated"), ("COMMITTING", "Committing"), ("COMMITTED", "Committed")],
+                        default="VALIDATED",
+                        max_length=12,
+                    ),
+                ),
+                ("rows", models.JSONField(default=list, help_text="Importable rows as lists in STAGED_COLUMNS order")),
+                ("summary", models.JSONField(default=dict, help_text="Row counts from validation")),
+                ("imported_count", models.PositiveIntegerField(default=0)),
+                ("errors", models.JSONField(default=list, help_text="Row errors reported while committing")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("committed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="pilgrim_import_sessions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pilgrim Import Session",
+                "verbose_name_plural": "Pilgrim Import Sessions",
+                "db_table": "pilgrim_import_sessions",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
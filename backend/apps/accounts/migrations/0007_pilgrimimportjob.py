@@ -0,0 +1,92 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_pilgrimimportsession"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PilgrimImportJob",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("kind", models.CharField(choices=[("EXCEL", "Excel workbook"), ("CSV", "CSV file")], max_length=8)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pending"),
+                            ("RUNNING", "Running"),
+                            ("COMPLETED", "Completed"),
+                            ("FAILED", "Failed"),
+                        ],
+                        db_index=True,
+                        default="PENDING",
+                        max_length=12,
+                    ),
+                ),
+                ("file_name", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "rows",
+                    models.JSONField(
+                        default=list, help_text="Parsed input rows in file order; cleared once the job completes"
+                    ),
+                ),
+                ("total_rows", models.PositiveIntegerField(default=0)),
+                ("chunk_size", models.PositiveIntegerField(default=500)),
+                (
+                    "next_row",
+                    models.PositiveIntegerField(default=0, help_text="Index of the first row not yet committed"),
+                ),
+                ("processed_count", models.PositiveIntegerField(default=0)),
+                ("created_count", models.PositiveIntegerField(default=0)),
+                ("updated_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                (
+                    "errors",
+                    models.JSONField(
+                        default=list, help_text="Row errors, including those found before the job started"
+                    ),
+                ),
+                ("error_message", models.TextField(blank=True, default="", help_text="Why the last run stopped early")),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="pilgrim_import_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "session",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="jobs",
+                        to="accounts.pilgrimimportsession",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pilgrim Import Job",
+                "verbose_name_plural": "Pilgrim Import Jobs",
+                "db_table": "pilgrim_import_jobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
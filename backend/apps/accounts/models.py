@@ -3,6 +3,8 @@ from django.db import models
 from uuid import uuid4
 from simple_history.models import HistoricalRecords
 
+from apps.common.encryption import blind_index
+
 
 class AccountManager(BaseUserManager):
     """Manager for custom Account model."""
@@ -111,6 +113,14 @@ class PilgrimProfile(models.Model):
     # Identity (Primary identifiers for future independent pilgrim records)
     full_name = models.CharField(max_length=200, null=True, blank=True, help_text='Full name as on passport')
     passport_number = models.CharField(max_length=128, unique=True, null=True, blank=True, db_index=True, help_text='Encrypted passport number')
+    passport_number_index = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Blind index (HMAC) of the normalized passport number for equality lookups',
+    )
     phone = models.CharField(max_length=24, unique=True, null=True, blank=True, db_index=True, help_text='Phone number for OTP verification')
     
     # Bio Data
@@ -157,6 +167,14 @@ class PilgrimProfile(models.Model):
             return f"{self.full_name} ({self.passport_number or 'N/A'})"
         return f"{self.user.name}"
 
+    def save(self, *args, **kwargs):
+        """Keep the passport blind index in step with the passport number."""
+        self.passport_number_index = blind_index(self.passport_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'passport_number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'passport_number_index'}
+        super().save(*args, **kwargs)
+
     @property
     def id(self):
         """Expose a stable id alias for clients that expect a conventional primary key."""
@@ -198,6 +216,119 @@ class OTPCode(models.Model):
         verbose_name = 'OTP Code'
         verbose_name_plural = 'OTP Codes'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
     
     def __str__(self):
         return f"{self.phone} - {self.code}"
+
+
+class PilgrimImportSession(models.Model):
+    """
+    Parsed pilgrim import rows staged between validate and commit.
+
+    ``rows`` holds the importable rows as lists in ``importing.STAGED_COLUMNS``
+    order, so committing needs neither the file nor another validation pass.
+    """
+
+    STATUS_CHOICES = [
+        ('VALIDATED', 'Validated'),
+        ('COMMITTING', 'Committing'),
+        ('COMMITTED', 'Committed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='VALIDATED')
+    rows = models.JSONField(default=list, help_text='Importable rows as lists in STAGED_COLUMNS order')
+    summary = models.JSONField(default=dict, help_text='Row counts from validation')
+    imported_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, help_text='Row errors reported while committing')
+    created_by = models.ForeignKey(
+        Account,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pilgrim_import_sessions',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    committed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'pilgrim_import_sessions'
+        verbose_name = 'Pilgrim Import Session'
+        verbose_name_plural = 'Pilgrim Import Sessions'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.file_name or self.id} ({self.status})"
+
+
+class PilgrimImportJob(models.Model):
+    """
+    A pilgrim import running in the background, chunk by chunk.
+
+    ``rows`` is the parsed input in the format the ``kind``'s chunk handler
+    expects. ``next_row`` only advances in the same transaction that writes a
+    chunk, so a failed or interrupted job resumes from its last committed chunk.
+    """
+
+    KIND_CHOICES = [
+        ('EXCEL', 'Excel workbook'),
+        ('CSV', 'CSV file'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    kind = models.CharField(max_length=8, choices=KIND_CHOICES)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    rows = models.JSONField(default=list, help_text='Parsed input rows in file order; cleared once the job completes')
+    total_rows = models.PositiveIntegerField(default=0)
+    chunk_size = models.PositiveIntegerField(default=500)
+    next_row = models.PositiveIntegerField(default=0, help_text='Index of the first row not yet committed')
+    processed_count = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, help_text='Row errors, including those found before the job started')
+    error_message = models.TextField(blank=True, default='', help_text='Why the last run stopped early')
+    attempts = models.PositiveIntegerField(default=0)
+    session = models.ForeignKey(
+        PilgrimImportSession,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs',
+    )
+    created_by = models.ForeignKey(
+        Account,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='pilgrim_import_jobs',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'pilgrim_import_jobs'
+        verbose_name = 'Pilgrim Import Job'
+        verbose_name_plural = 'Pilgrim Import Jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.file_name or self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('COMPLETED', 'FAILED')
@@ -0,0 +1,168 @@
+"""
+Pluggable storage for pilgrim one-time passwords.
+
+``OTP_BACKEND`` selects where codes live. The database backend keeps the
+``OTPCode`` table, counts attempts with conditional UPDATEs and relies on
+``purge_expired_otps`` to clear old rows. The Redis backend keeps authentication
+traffic off the primary database entirely: codes and attempt counters are TTL
+keys, attempts are counted with INCR and the resend throttle is a SET NX key.
+"""
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OTPCode
+
+VERIFIED = 'VERIFIED'
+NOT_FOUND = 'NOT_FOUND'
+EXPIRED = 'EXPIRED'
+TOO_MANY_ATTEMPTS = 'TOO_MANY_ATTEMPTS'
+INVALID = 'INVALID'
+
+
+def generate_otp_code() -> str:
+    """Return a random six-digit code."""
+    return f"{secrets.randbelow(1_000_000):06d}"
+
+
+class BaseOTPBackend:
+    """Interface every OTP backend implements."""
+
+    def acquire_resend_slot(self, phone) -> bool:
+        """Return ``True`` if a new code may be sent to ``phone`` now."""
+        raise NotImplementedError
+
+    def issue(self, phone) -> str:
+        """Store and return a new code for ``phone``, replacing any earlier one."""
+        raise NotImplementedError
+
+    def verify(self, phone, code) -> str:
+        """Check ``code`` for ``phone``, consume it on success and return a status constant."""
+        raise NotImplementedError
+
+    def purge(self, now=None) -> int:
+        """Delete codes that can no longer be used and return how many were removed."""
+        return 0
+
+
+class DatabaseOTPBackend(BaseOTPBackend):
+    """Store codes in the ``OTPCode`` table."""
+
+    def acquire_resend_slot(self, phone) -> bool:
+        window_start = timezone.now() - timedelta(seconds=settings.OTP_RESEND_SECONDS)
+        return not OTPCode.objects.filter(phone=phone, created_at__gte=window_start).exists()
+
+    def issue(self, phone) -> str:
+        code = generate_otp_code()
+        OTPCode.objects.create(
+            phone=phone,
+            code=code,
+            expires_at=timezone.now() + timedelta(seconds=settings.OTP_EXPIRY_SECONDS),
+            attempts=0,
+        )
+        return code
+
+    def verify(self, phone, code) -> str:
+        otp_record = OTPCode.objects.filter(
+            phone=phone,
+            consumed_at__isnull=True,
+        ).order_by('-created_at').first()
+        if not otp_record:
+            return NOT_FOUND
+
+        now = timezone.now()
+        if now > otp_record.expires_at:
+            return EXPIRED
+
+        if not hmac.compare_digest(otp_record.code, str(code)):
+            # Counting only below the limit keeps concurrent guesses from overshooting it.
+            counted = OTPCode.objects.filter(
+                pk=otp_record.pk,
+                attempts__lt=settings.OTP_MAX_ATTEMPTS,
+            ).update(attempts=F('attempts') + 1)
+            return INVALID if counted else TOO_MANY_ATTEMPTS
+
+        if otp_record.attempts >= settings.OTP_MAX_ATTEMPTS:
+            return TOO_MANY_ATTEMPTS
+
+        consumed = OTPCode.objects.filter(
+            pk=otp_record.pk,
+            consumed_at__isnull=True,
+        ).update(consumed_at=now)
+        return VERIFIED if consumed else NOT_FOUND
+
+    def purge(self, now=None) -> int:
+        now = now or timezone.now()
+        # Consumed codes are kept through the resend window because they still throttle resends.
+        resend_window_start = now - timedelta(seconds=settings.OTP_RESEND_SECONDS)
+        deleted, _ = OTPCode.objects.filter(
+            Q(expires_at__lt=now) | Q(consumed_at__isnull=False, created_at__lt=resend_window_start)
+        ).delete()
+        return deleted
+
+
+class RedisOTPBackend(BaseOTPBackend):
+    """Store codes as Redis keys that expire on their own."""
+
+    key_prefix = 'otp'
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(settings.OTP_REDIS_URL, decode_responses=True)
+        return self._client
+
+    def _key(self, kind, phone):
+        return f'{self.key_prefix}:{kind}:{phone}'
+
+    def acquire_resend_slot(self, phone) -> bool:
+        return bool(self.client.set(self._key('resend', phone), 1, nx=True, ex=settings.OTP_RESEND_SECONDS))
+
+    def issue(self, phone) -> str:
+        code = generate_otp_code()
+        pipeline = self.client.pipeline()
+        pipeline.set(self._key('code', phone), code, ex=settings.OTP_EXPIRY_SECONDS)
+        pipeline.set(self._key('attempts', phone), 0, ex=settings.OTP_EXPIRY_SECONDS)
+        pipeline.execute()
+        return code
+
+    def verify(self, phone, code) -> str:
+        code_key = self._key('code', phone)
+        stored_code = self.client.get(code_key)
+        if stored_code is None:
+            # An expired key is indistinguishable from one that was never issued.
+            return NOT_FOUND
+
+        # Every try counts, so a burst of concurrent guesses cannot get past the limit.
+        if self.client.incr(self._key('attempts', phone)) > settings.OTP_MAX_ATTEMPTS:
+            return TOO_MANY_ATTEMPTS
+
+        if not hmac.compare_digest(stored_code, str(code)):
+            return INVALID
+
+        # Only the request that deletes the key wins; a concurrent replay sees it gone.
+        if not self.client.delete(code_key):
+            return NOT_FOUND
+        self.client.delete(self._key('attempts', phone))
+        return VERIFIED
+
+
+_backend = None
+
+
+def get_otp_backend():
+    """Return the process-wide backend configured by ``OTP_BACKEND``."""
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.OTP_BACKEND)()
+    return _backend
@@ -0,0 +1,29 @@
+"""Account signals: invalidate cached authentication snapshots."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .auth_cache import invalidate_user_snapshot
+from .models import Account, PilgrimProfile, StaffProfile
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the snapshot now and again after commit so no request re-caches stale rows."""
+    user_id = instance.pk if sender is Account else instance.user_id
+    invalidate_user_snapshot(user_id)
+    transaction.on_commit(lambda: invalidate_user_snapshot(user_id))
+
+
+def connect_signals():
+    """Connect snapshot invalidation for accounts and their profiles."""
+    for model in (Account, StaffProfile, PilgrimProfile):
+        post_save.connect(
+            invalidate_cached_user,
+            sender=model,
+            dispatch_uid=f'auth-cache-save-{model._meta.label_lower}',
+        )
+        post_delete.connect(
+            invalidate_cached_user,
+            sender=model,
+            dispatch_uid=f'auth-cache-delete-{model._meta.label_lower}',
+        )
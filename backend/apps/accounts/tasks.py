@@ -0,0 +1,35 @@
+"""Background tasks for accounts and authentication."""
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def purge_expired_otps_task():
+    """Delete OTP codes that can no longer be used."""
+    from .otp import get_otp_backend
+
+    get_otp_backend().purge()
+
+
+@shared_task(ignore_result=True)
+def purge_import_sessions_task():
+    """Delete expired pilgrim import sessions and their staged rows."""
+    from .importing import purge_import_sessions
+
+    purge_import_sessions()
+
+
+@shared_task(ignore_result=True)
+def run_import_job_task(job_id):
+    """Write the remaining chunks of a pilgrim import job."""
+    from .import_jobs import run_import_job
+
+    run_import_job(job_id)
+
+
+@shared_task(ignore_result=True)
+def resume_stalled_import_jobs_task():
+    """Re-queue pilgrim import jobs whose worker died or whose enqueue was lost."""
+    from .import_jobs import resume_stalled_import_jobs
+
+    resume_stalled_import_jobs()
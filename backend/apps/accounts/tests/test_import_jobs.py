@@ -0,0 +1,153 @@
+"""
+Tests for background pilgrim import jobs.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts import import_jobs
+from apps.accounts.import_jobs import (
+    resume_import_job,
+    resume_stalled_import_jobs,
+    run_import_job,
+    start_import_job,
+)
+from apps.accounts.models import Account, PilgrimImportJob, PilgrimProfile
+from apps.trips.csv_import import import_chunk
+
+
+def csv_row(index, line=None):
+    """Return a parsed CSV row for pilgrim ``index``."""
+    return {
+        'name': f'Pilgrim {index}',
+        'phone': f'+2567002{index:05d}',
+        'email': '',
+        'dob': '1990-05-15',
+        'nationality': 'ug',
+        'emergency_name': '',
+        'emergency_phone': '',
+        'line': line or index + 1,
+    }
+
+
+@pytest.mark.django_db
+class TestPilgrimImportJobs:
+    """Chunked progress, resuming and the stalled-job sweep."""
+
+    def test_job_records_progress_per_chunk(self):
+        """Eager jobs finish immediately with created, updated and failed counts."""
+        Account.objects.create_user(phone='+256700200001', name='Existing', role='PILGRIM')
+        rows = [csv_row(index) for index in range(5)] + [{**csv_row(9), 'phone': None}]
+
+        job = start_import_job('CSV', rows, file_name='agency.csv', chunk_size=2)
+
+        assert job.status == 'COMPLETED'
+        assert (job.total_rows, job.processed_count, job.next_row) == (6, 6, 6)
+        assert (job.created_count, job.updated_count, job.failed_count) == (4, 1, 1)
+        assert job.errors[0].startswith('Row 10:')
+        assert job.rows == []
+        assert PilgrimProfile.objects.count() == 5
+
+    def test_failed_job_resumes_from_last_committed_chunk(self, monkeypatch):
+        """A chunk that raises rolls back alone; resuming writes only the remaining rows."""
+        calls = []
+
+        def flaky_import_chunk(rows, created_by=None):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise RuntimeError('worker lost its database connection')
+            return import_chunk(rows, created_by)
+
+        monkeypatch.setattr(import_jobs, 'import_string', lambda path: flaky_import_chunk)
+
+        job = start_import_job('CSV', [csv_row(index) for index in range(5)], chunk_size=2)
+
+        assert job.status == 'FAILED'
+        assert job.error_message == 'worker lost its database connection'
+        assert (job.next_row, job.created_count) == (2, 2)
+        assert PilgrimProfile.objects.count() == 2
+
+        assert resume_import_job(job)
+        job.refresh_from_db()
+
+        assert job.status == 'COMPLETED'
+        assert calls == [2, 2, 2, 1]
+        assert (job.processed_count, job.created_count, job.attempts) == (5, 5, 2)
+        assert PilgrimProfile.objects.count() == 5
+
+    def test_only_failed_jobs_resume(self):
+        """Completed jobs are not re-queued."""
+        job = start_import_job('CSV', [csv_row(1)])
+
+        assert not resume_import_job(job)
+
+    def test_sweep_requeues_stalled_jobs(self):
+        """Jobs whose worker stopped saving are picked up from where they left off."""
+        job = PilgrimImportJob.objects.create(
+            kind='CSV', status='RUNNING', rows=[csv_row(index) for index in range(3)], total_rows=3, next_row=1
+        )
+        PilgrimImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        assert resume_stalled_import_jobs() == 1
+        job.refresh_from_db()
+
+        assert job.status == 'COMPLETED'
+        assert (job.processed_count, job.created_count) == (2, 2)
+        assert not Account.objects.filter(phone=csv_row(0)['phone']).exists()
+
+    def test_running_jobs_are_not_claimed_twice(self):
+        """A job another worker holds is left alone."""
+        job = PilgrimImportJob.objects.create(kind='CSV', status='RUNNING', rows=[csv_row(1)], total_rows=1)
+
+        assert run_import_job(job.pk) is None
+        assert resume_stalled_import_jobs() == 0
+
+
+@pytest.mark.django_db
+class TestCsvBulkUpsert:
+    """The CSV chunk handler's bulk upsert keeps get_or_create's counting."""
+
+    def test_counts_match_get_or_create_semantics(self):
+        """Rows are created only when both account and profile are new."""
+        bare = Account.objects.create_user(phone=csv_row(1)['phone'], name='No Profile', role='PILGRIM')
+        full = Account.objects.create_user(phone=csv_row(2)['phone'], name='Has Profile', role='PILGRIM')
+        PilgrimProfile.objects.create(user=full, nationality='KE')
+        rows = [
+            csv_row(0),
+            csv_row(1),
+            {**csv_row(2), 'emergency_name': ' Amina '},
+            {**csv_row(0), 'line': 9, 'dob': '1991-01-01'},
+            {**csv_row(3), 'dob': 'not-a-date'},
+        ]
+
+        created, updated, errors = import_chunk(rows)
+
+        assert (created, updated, errors) == (2, 3, [])
+        assert PilgrimProfile.objects.get(user=bare).nationality == 'UG'
+        profile = PilgrimProfile.objects.get(user=full)
+        assert (profile.nationality, profile.emergency_name) == ('UG', 'Amina')
+        assert str(PilgrimProfile.objects.get(user__phone=csv_row(0)['phone']).dob) == '1991-01-01'
+        assert PilgrimProfile.objects.get(user__phone=csv_row(3)['phone']).dob is None
+        assert Account.objects.get(pk=full.pk).name == 'Has Profile'
+
+    def test_query_count_does_not_grow_with_rows(self, django_assert_max_num_queries):
+        """A chunk costs a fixed number of queries instead of several per row."""
+        existing = Account.objects.create_user(phone=csv_row(0)['phone'], name='Existing', role='PILGRIM')
+        PilgrimProfile.objects.create(user=existing)
+        rows = [csv_row(index) for index in range(50)]
+
+        with django_assert_max_num_queries(12):
+            created, updated, errors = import_chunk(rows)
+
+        assert (created, updated, errors) == (49, 1, [])
+        assert PilgrimProfile.history.count() == 51
+
+    def test_bad_rows_only_cost_themselves(self):
+        """Rows that break the bulk write are retried one by one."""
+        rows = [csv_row(0), {**csv_row(1), 'name': None}, {**csv_row(2), 'phone': None}]
+
+        created, updated, errors = import_chunk(rows)
+
+        assert (created, updated) == (1, 0)
+        assert [error.split(':')[0] for error in errors] == ['Row 2', 'Row 3']
@@ -0,0 +1,94 @@
+"""
+Tests for the bulk pilgrim import engine.
+"""
+import io
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from apps.accounts.importing import (
+    IMPORT_HEADERS,
+    ImportFileError,
+    create_pilgrims,
+    read_workbook_rows,
+    validate_rows,
+)
+from apps.accounts.models import Account, PilgrimProfile
+
+
+def workbook_file(rows, headers=IMPORT_HEADERS):
+    """Return an in-memory .xlsx with the given data rows."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(headers)
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def pilgrim_row(index, **overrides):
+    """Return a valid sheet row for pilgrim ``index``."""
+    row = [f'Pilgrim {index}', f'P{index:08d}', f'+2567001{index:05d}', '1990-05-15', 'male', 'ug', '', '', '', '', '']
+    for position, value in overrides.items():
+        row[int(position.lstrip('c'))] = value
+    return row
+
+
+@pytest.mark.django_db
+class TestPilgrimImportEngine:
+    """Streaming read, pure-Python validation and chunked bulk writes."""
+
+    def test_header_mismatch_is_reported(self):
+        """A workbook that does not follow the template is rejected before any row is read."""
+        with pytest.raises(ImportFileError, match='Expected header "Passport Number\\*" at column 2'):
+            list(read_workbook_rows(workbook_file([], headers=['Full Name*', 'Passport'])))
+
+    def test_duplicates_within_the_file_and_database_are_rejected(self, pilgrim):
+        """Rows repeating an existing or earlier passport or phone are reported with their row number."""
+        rows = [
+            pilgrim_row(1),
+            pilgrim_row(2, c1='p 0000 0001'),
+            pilgrim_row(3, c2=pilgrim.phone),
+            pilgrim_row(4, c0=''),
+        ]
+
+        valid_rows, errors = validate_rows(read_workbook_rows(workbook_file(rows)))
+
+        assert [row['row_number'] for row in valid_rows] == [2]
+        assert (valid_rows[0]['gender'], valid_rows[0]['nationality']) == ('MALE', 'UG')
+        assert errors == [
+            "Row 3: Passport Number 'p 0000 0001' already exists",
+            f"Row 4: Phone Number '{pilgrim.phone}' already exists",
+            'Row 5: Full Name is required',
+        ]
+
+    def test_query_count_does_not_grow_with_rows(self, staff_user):
+        """Validation and writes cost a fixed number of queries per chunk, not per row."""
+        def run(first, count):
+            rows = [pilgrim_row(index) for index in range(first, first + count)]
+            with CaptureQueriesContext(connection) as queries:
+                valid_rows, _errors = validate_rows(read_workbook_rows(workbook_file(rows)))
+                create_pilgrims(valid_rows, created_by=staff_user)
+            return len(queries)
+
+        assert run(1, 3) == run(100, 40)
+        assert PilgrimProfile.objects.count() == 43
+        profile = PilgrimProfile.objects.get(passport_number='P00000001')
+        assert profile.passport_number_index is not None
+        assert profile.history.get().history_user == staff_user
+
+    def test_failed_chunk_falls_back_to_single_rows(self, staff_user):
+        """A row that fails at write time only skips itself."""
+        valid_rows, _errors = validate_rows(read_workbook_rows(workbook_file([pilgrim_row(1), pilgrim_row(2)])))
+        Account.objects.create_user(phone=valid_rows[1]['phone'], name='Registered meanwhile', role='PILGRIM')
+
+        created, errors = create_pilgrims(valid_rows, created_by=staff_user)
+
+        assert created == 1
+        assert len(errors) == 1 and errors[0].startswith('Row 3:')
+        assert PilgrimProfile.objects.filter(passport_number='P00000001').exists()
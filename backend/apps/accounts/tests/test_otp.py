@@ -0,0 +1,118 @@
+"""
+Tests for the pluggable OTP backends.
+"""
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.accounts import otp
+from apps.accounts.models import OTPCode
+
+
+class InMemoryRedis:
+    """Minimal stand-in for the Redis commands the OTP backend uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = str(value)
+        self.ttls[key] = ex
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    def delete(self, key):
+        self.ttls.pop(key, None)
+        return 1 if self.values.pop(key, None) is not None else 0
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+@pytest.mark.django_db
+class TestDatabaseOTPBackend:
+    """OTPCode-backed storage."""
+
+    def test_issue_throttles_resends_and_verifies_once(self):
+        """A code can be verified once and resends wait for the throttle window."""
+        backend = otp.DatabaseOTPBackend()
+
+        assert backend.acquire_resend_slot('+256700000001') is True
+        code = backend.issue('+256700000001')
+        assert backend.acquire_resend_slot('+256700000001') is False
+
+        assert backend.verify('+256700000001', code) == otp.VERIFIED
+        assert backend.verify('+256700000001', code) == otp.NOT_FOUND
+
+    def test_attempts_stop_at_the_limit(self, otp_code, settings):
+        """Wrong guesses are counted until the attempt limit is reached."""
+        backend = otp.DatabaseOTPBackend()
+
+        for _ in range(settings.OTP_MAX_ATTEMPTS):
+            assert backend.verify(otp_code.phone, '000000') == otp.INVALID
+
+        assert backend.verify(otp_code.phone, otp_code.code) == otp.TOO_MANY_ATTEMPTS
+        otp_code.refresh_from_db()
+        assert otp_code.attempts == settings.OTP_MAX_ATTEMPTS
+
+    def test_purge_command_removes_unusable_codes(self, otp_code):
+        """Expired codes and consumed codes past the resend window are deleted."""
+        now = timezone.now()
+        OTPCode.objects.create(phone='+256700000002', code='111111', expires_at=now - timedelta(minutes=1))
+        consumed = OTPCode.objects.create(
+            phone='+256700000003',
+            code='222222',
+            expires_at=now + timedelta(minutes=5),
+            consumed_at=now,
+        )
+        OTPCode.objects.filter(pk=consumed.pk).update(created_at=now - timedelta(minutes=5))
+
+        call_command('purge_expired_otps')
+
+        assert list(OTPCode.objects.values_list('pk', flat=True)) == [otp_code.pk]
+
+
+class TestRedisOTPBackend:
+    """TTL-key storage."""
+
+    def test_codes_and_counters_expire_with_the_otp(self, settings):
+        """Codes, attempt counters and the resend throttle are written as TTL keys."""
+        client = InMemoryRedis()
+        backend = otp.RedisOTPBackend(client=client)
+
+        assert backend.acquire_resend_slot('+256700000001') is True
+        assert backend.acquire_resend_slot('+256700000001') is False
+        backend.issue('+256700000001')
+
+        assert client.ttls == {
+            'otp:resend:+256700000001': settings.OTP_RESEND_SECONDS,
+            'otp:code:+256700000001': settings.OTP_EXPIRY_SECONDS,
+            'otp:attempts:+256700000001': settings.OTP_EXPIRY_SECONDS,
+        }
+
+    def test_every_attempt_is_counted_and_success_consumes_the_code(self, settings):
+        """INCR counts each try, and a verified code cannot be replayed."""
+        backend = otp.RedisOTPBackend(client=InMemoryRedis())
+        code = backend.issue('+256700000001')
+
+        assert backend.verify('+256700000001', '000000') == otp.INVALID
+        assert backend.verify('+256700000001', code) == otp.VERIFIED
+        assert backend.verify('+256700000001', code) == otp.NOT_FOUND
+
+        code = backend.issue('+256700000001')
+        for _ in range(settings.OTP_MAX_ATTEMPTS):
+            backend.verify('+256700000001', '000000')
+        assert backend.verify('+256700000001', code) == otp.TOO_MANY_ATTEMPTS
@@ -6,3 +6,7 @@ class ApiConfig(AppConfig):
     name = 'apps.api'
     verbose_name = 'API'
 
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,52 @@
+"""
+JWT authentication backed by cached account snapshots.
+
+Access tokens carry the account role, staff role and pilgrim-profile presence
+(see ``tokens.py``). Authentication resolves the user from a short-lived cache
+instead of the database, so the staff and pilgrim permission checks that follow
+run without queries. Deactivated accounts are rejected as soon as their
+snapshot is invalidated, and tokens whose role claims no longer match the
+account are rejected so a role change forces a fresh sign-in.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.auth_cache import get_user_snapshot, user_from_snapshot
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Authenticate bearer tokens against cached account snapshots."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        snapshot = get_user_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        account = snapshot['account']
+        if not account['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Tokens issued before role claims existed are checked against the snapshot only.
+        current_claims = {'role': account['role'], 'staff_role': snapshot['staff_role']}
+        for claim, current_value in current_claims.items():
+            if claim in validated_token and validated_token[claim] != current_value:
+                raise AuthenticationFailed(
+                    _("The account's role has changed. Please sign in again."),
+                    code="role_changed",
+                )
+
+        user = user_from_snapshot(snapshot)
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # The password hash is not cached; reading it loads the deferred column.
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
@@ -6,6 +6,8 @@ Staff/Admin get normal expiring tokens.
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
 from datetime import timedelta
 
+from apps.common.permissions import get_staff_role
+
 
 class PilgrimAccessToken(AccessToken):
     """Access token with a convenient but bounded lifetime for pilgrims."""
@@ -24,6 +26,9 @@ class RoleBasedRefreshToken(RefreshToken):
     
     - PILGRIM: 30-day access, 180-day refresh with silent refresh on trusted devices
     - STAFF/ADMIN: Normal token lifetime from settings
+
+    Both carry role, staff role and pilgrim-profile claims, which are copied
+    into every access token minted from the refresh token.
     """
     
     @classmethod
@@ -38,5 +43,8 @@ class RoleBasedRefreshToken(RefreshToken):
         else:
             # Staff/Admin: Use default settings from SIMPLE_JWT config
             token = super().for_user(user)
-        
+
+        token['role'] = user.role
+        token['staff_role'] = get_staff_role(user)
+        token['has_pilgrim_profile'] = hasattr(user, 'pilgrim_profile')
         return token
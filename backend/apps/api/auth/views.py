@@ -6,14 +6,15 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.conf import settings
-from datetime import timedelta
-import random
 import logging
 import re
 
-from apps.accounts.models import Account, OTPCode
+from apps.accounts.models import Account
+from apps.accounts.otp import EXPIRED, NOT_FOUND, TOO_MANY_ATTEMPTS, VERIFIED, get_otp_backend
 from apps.common.models import PlatformSettings
 from apps.common.permissions import IsStaff
+from apps.common.sms import queue_sms
+from apps.common.throttling import ClientIPThrottle, PhoneThrottle, RouteThrottle
 from .serializers import StaffChangePasswordSerializer, StaffLoginSerializer
 from .tokens import RoleBasedRefreshToken
 
@@ -21,24 +22,11 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
-def send_sms_message(phone, message):
-    """Send an SMS using Africa's Talking."""
-    import africastalking
-
-    sms = africastalking.SMS
-    send_params = {
-        'message': message,
-        'recipients': [phone],
-    }
-    if settings.AFRICASTALKING_SENDER_ID:
-        send_params['sender_id'] = settings.AFRICASTALKING_SENDER_ID
-
-    return sms.send(**send_params)
-
-
 class RequestOTPView(APIView):
     """Request OTP for pilgrim authentication (NO OTP FOR STAFF/ADMINS)"""
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle, PhoneThrottle, RouteThrottle]
+    throttle_scope = 'otp-request'
     phone_pattern = re.compile(r'^\+\d{9,15}$')
 
     def post(self, request):
@@ -56,14 +44,10 @@ class RequestOTPView(APIView):
             )
 
         try:
-            platform_settings = PlatformSettings.get_solo()
-            # Check for recent OTP requests (rate limiting)
-            recent_otp = OTPCode.objects.filter(
-                phone=phone,
-                created_at__gte=timezone.now() - timedelta(seconds=60)
-            ).first()
-            
-            if recent_otp:
+            platform_settings = PlatformSettings.get_cached()
+            otp_backend = get_otp_backend()
+            # Throttle resends per phone (rate limiting)
+            if not otp_backend.acquire_resend_slot(phone):
                 return Response(
                     {'error': 'OTP already sent. Please wait before requesting again.'},
                     status=status.HTTP_429_TOO_MANY_REQUESTS
@@ -81,52 +65,32 @@ class RequestOTPView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Generate OTP
-            otp_code = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-            expires_at = timezone.now() + timedelta(minutes=10)
-            
-            # Create OTP record
-            OTPCode.objects.create(
-                phone=phone,
-                code=otp_code,
-                expires_at=expires_at,
-                attempts=0
-            )
-            
-            # Send OTP via SMS if enabled
-            sms_sent = False
+            # Generate and store OTP
+            otp_code = otp_backend.issue(phone)
+            expiry_minutes = settings.OTP_EXPIRY_SECONDS // 60
+
+            # Queue the OTP SMS; a background worker delivers it
+            sms_queued = False
             sms_error = None
-            
+
             if settings.SMS_ENABLED:
                 try:
-                    message = f"Your Al-Hilal verification code is: {otp_code}. Valid for 10 minutes. Do not share this code."
-                    response = send_sms_message(phone, message)
-                    
-                    # Log the response
-                    logger.info(f"SMS sent to {phone}: {response}")
-                    
-                    # Check if SMS was sent successfully
-                    if response['SMSMessageData']['Recipients']:
-                        recipient_status = response['SMSMessageData']['Recipients'][0]['status']
-                        if recipient_status.lower() == 'success':
-                            sms_sent = True
-                        else:
-                            sms_error = f"SMS delivery failed: {recipient_status}"
-                            logger.error(f"SMS delivery failed for {phone}: {recipient_status}")
-                    
+                    message = f"Your Al-Hilal verification code is: {otp_code}. Valid for {expiry_minutes} minutes. Do not share this code."
+                    queue_sms(phone, message, purpose='OTP')
+                    sms_queued = True
                 except Exception as e:
                     sms_error = str(e)
-                    logger.error(f"Failed to send SMS to {phone}: {e}")
+                    logger.error(f"Failed to queue SMS to {phone}: {e}")
             else:
                 logger.info(f"SMS disabled. OTP for {phone}: {otp_code}")
-            
+
             # Prepare response
             response_data = {
                 'sent': True,
-                'expires_in': 600,  # 10 minutes in seconds
-                'retry_after_seconds': 60,
+                'expires_in': settings.OTP_EXPIRY_SECONDS,
+                'retry_after_seconds': settings.OTP_RESEND_SECONDS,
                 'delivery_channel': 'SMS',
-                'message': 'OTP sent successfully' if sms_sent else 'OTP generated. Check console in development mode.',
+                'message': 'OTP sent successfully' if sms_queued else 'OTP generated. Check console in development mode.',
                 'fallback': {
                     'supportPhone': platform_settings.otp_support_phone,
                     'supportWhatsApp': platform_settings.otp_support_whatsapp,
@@ -154,6 +118,8 @@ class RequestOTPView(APIView):
 class VerifyOTPView(APIView):
     """Verify OTP and return JWT tokens (FOR PILGRIMS ONLY)"""
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle, PhoneThrottle]
+    throttle_scope = 'otp-verify'
 
     def post(self, request):
         phone = request.data.get('phone')
@@ -166,45 +132,32 @@ class VerifyOTPView(APIView):
             )
 
         try:
-            # Get the most recent OTP for this phone
-            otp_record = OTPCode.objects.filter(
-                phone=phone,
-                consumed_at__isnull=True
-            ).order_by('-created_at').first()
+            verification = get_otp_backend().verify(phone, otp)
 
-            if not otp_record:
+            if verification == NOT_FOUND:
                 return Response(
                     {'error': 'No OTP found. Please request a new OTP.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Check if OTP has expired
-            if timezone.now() > otp_record.expires_at:
+            if verification == EXPIRED:
                 return Response(
                     {'error': 'OTP has expired. Please request a new OTP.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Check max attempts
-            if otp_record.attempts >= 5:
+            if verification == TOO_MANY_ATTEMPTS:
                 return Response(
                     {'error': 'Maximum verification attempts exceeded. Please request a new OTP.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Verify OTP code
-            if otp_record.code != otp:
-                otp_record.attempts += 1
-                otp_record.save()
+            if verification != VERIFIED:
                 return Response(
                     {'error': 'Invalid OTP code.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Mark OTP as consumed
-            otp_record.consumed_at = timezone.now()
-            otp_record.save()
-
             # Get or create user
             user, created = User.objects.get_or_create(
                 phone=phone,
@@ -269,6 +222,8 @@ class VerifyOTPView(APIView):
 class StaffLoginView(APIView):
     """Staff/Admin login with phone and password (NO OTP REQUIRED)"""
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle, PhoneThrottle]
+    throttle_scope = 'staff-login'
 
     def post(self, request):
         serializer = StaffLoginSerializer(data=request.data)
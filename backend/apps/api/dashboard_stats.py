@@ -0,0 +1,83 @@
+"""
+Cached headline numbers for the staff dashboard.
+
+The stats are built with one conditional-aggregate query per table (trips,
+bookings, pilgrim profiles, documents) and cached for
+``DASHBOARD_STATS_CACHE_SECONDS``. Saving or deleting a trip, booking, pilgrim
+profile or document drops the cached payload once the write commits; the TTL
+bounds staleness from bulk writes that bypass signals and from trips ageing out
+of "active".
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.accounts.models import PilgrimProfile
+from apps.bookings.models import Booking
+from apps.pilgrims.models import Document
+from apps.trips.models import Trip
+
+DASHBOARD_STATS_CACHE_KEY = 'dashboard:stats'
+
+ACTIVE_BOOKING_STATUSES = ['BOOKED', 'CONFIRMED']
+
+
+def build_dashboard_stats():
+    """Compute the dashboard payload with four aggregate queries."""
+    trips = Trip.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(visibility='PUBLIC', end_date__gte=timezone.now().date())),
+    )
+
+    active_bookings = Q(status__in=ACTIVE_BOOKING_STATUSES)
+    bookings = Booking.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=active_bookings),
+        eoi=Count('id', filter=Q(status='EOI')),
+        revenue=Sum('amount_paid_minor_units', filter=active_bookings),
+    )
+
+    visas = Document.objects.filter(document_type='VISA').aggregate(
+        pending=Count('id', filter=Q(status='PENDING')),
+        approved=Count('id', filter=Q(status='VERIFIED')),
+    )
+
+    return {
+        'trips': {
+            'total': trips['total'],
+            'active': trips['active'],
+        },
+        'bookings': {
+            'total': bookings['total'],
+            'active': bookings['active'],
+            'eoi': bookings['eoi'],
+        },
+        'pilgrims': {
+            'total': PilgrimProfile.objects.count(),
+        },
+        'visas': {
+            'pending': visas['pending'],
+            'approved': visas['approved'],
+        },
+        'revenue': {
+            'totalMinorUnits': bookings['revenue'] or 0,
+        },
+    }
+
+
+def get_dashboard_stats():
+    """Return the cached dashboard payload, building it on a miss."""
+    stats = cache.get(DASHBOARD_STATS_CACHE_KEY)
+    if stats is None:
+        stats = build_dashboard_stats()
+        cache.set(DASHBOARD_STATS_CACHE_KEY, stats, timeout=settings.DASHBOARD_STATS_CACHE_SECONDS)
+    return stats
+
+
+def invalidate_dashboard_stats(sender=None, raw=False, **kwargs):
+    """Drop the cached dashboard payload after the current transaction commits."""
+    if raw:
+        return
+    transaction.on_commit(lambda: cache.delete(DASHBOARD_STATS_CACHE_KEY))
@@ -0,0 +1,161 @@
+"""
+Offline trip packs for pilgrims who lose connectivity in Makkah and Madinah.
+
+A pack is a gzip-compressed JSON bundle of everything a pilgrim needs during the
+journey for one trip package. Packs are rebuilt in the background after content
+changes and are served with their SHA-256 content hash as the ETag, so the app
+downloads a pack once and re-fetches it only when the hash changes.
+"""
+import gzip
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.api.serializers.support import (
+    OfflineDailyProgramSerializer,
+    OfflineGuideSectionSerializer,
+    OfflineItineraryItemSerializer,
+    OfflineTripResourceSerializer,
+)
+from apps.api.serializers.trips import (
+    ChecklistItemSerializer,
+    DuaSerializer,
+    EmergencyContactSerializer,
+    TripFAQSerializer,
+)
+from apps.api.views.support import build_daily_program
+from apps.content.models import Dua
+from apps.trips.models import (
+    ChecklistItem,
+    EmergencyContact,
+    ItineraryItem,
+    TripFAQ,
+    TripGuideSection,
+    TripOfflinePack,
+    TripPackage,
+    TripResource,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the payload shape changes so every pack is rebuilt with a new hash.
+OFFLINE_PACK_VERSION = 1
+REBUILD_QUEUED_CACHE_KEY = 'offline-pack:queued:{package_id}'
+
+
+def build_offline_pack_payload(package, now=None) -> dict:
+    """Return the offline bundle for a trip package as plain JSON-serializable data."""
+    now = now or timezone.now()
+    trip = package.trip
+    trip_or_package = Q(trip_id=trip.id) & (Q(package__isnull=True) | Q(package_id=package.id))
+
+    itinerary = ItineraryItem.objects.filter(trip_id=trip.id).order_by('day_index', 'start_time', 'created_at')
+    sections = TripGuideSection.objects.filter(trip_id=trip.id).order_by('order', 'title')
+    checklist = ChecklistItem.objects.filter(trip_or_package).select_related('package').order_by('category', 'label')
+    contacts = EmergencyContact.objects.filter(trip_id=trip.id).order_by('label')
+    faqs = TripFAQ.objects.filter(trip_id=trip.id).order_by('order')
+    duas = Dua.objects.order_by('category', 'created_at')
+    resources = TripResource.objects.filter(trip_or_package).filter(
+        is_pinned=True,
+        is_published=True,
+    ).select_related('package').order_by('order', 'title')
+
+    return {
+        'version': OFFLINE_PACK_VERSION,
+        'trip': {
+            'id': trip.id,
+            'code': trip.code,
+            'name': trip.name,
+            'cities': trip.cities,
+            'start_date': trip.start_date,
+            'end_date': trip.end_date,
+        },
+        'package': {
+            'id': package.id,
+            'name': package.name,
+        },
+        'itinerary': OfflineItineraryItemSerializer(itinerary, many=True).data,
+        'daily_program': OfflineDailyProgramSerializer(build_daily_program(trip, now=now)).data,
+        'guide_sections': OfflineGuideSectionSerializer(sections, many=True).data,
+        'checklist': ChecklistItemSerializer(checklist, many=True).data,
+        'contacts': EmergencyContactSerializer(contacts, many=True).data,
+        'faqs': TripFAQSerializer(faqs, many=True).data,
+        'duas': DuaSerializer(duas, many=True).data,
+        'resources': OfflineTripResourceSerializer(resources, many=True).data,
+    }
+
+
+def encode_offline_pack(payload) -> tuple[str, bytes]:
+    """Return the content hash and deterministic gzip bytes for a pack payload."""
+    body = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.sha256(body).hexdigest(), gzip.compress(body, mtime=0)
+
+
+def rebuild_offline_pack(package_id):
+    """Rebuild and store a package's offline pack, skipping the write when nothing changed."""
+    cache.delete(REBUILD_QUEUED_CACHE_KEY.format(package_id=package_id))
+
+    package = TripPackage.objects.select_related('trip').filter(pk=package_id).first()
+    if package is None:
+        return None
+
+    content_hash, compressed = encode_offline_pack(build_offline_pack_payload(package))
+    existing = TripOfflinePack.objects.filter(package=package).first()
+    if existing and existing.content_hash == content_hash:
+        return existing
+
+    pack, _ = TripOfflinePack.objects.update_or_create(
+        package=package,
+        defaults={
+            'trip': package.trip,
+            'content_hash': content_hash,
+            'payload': compressed,
+            'size_bytes': len(compressed),
+            'built_at': timezone.now(),
+        },
+    )
+    return pack
+
+
+def get_offline_pack(package):
+    """Return the stored pack for a package, building it inline if it does not exist yet."""
+    pack = TripOfflinePack.objects.filter(package=package).first()
+    return pack or rebuild_offline_pack(package.id)
+
+
+def schedule_offline_pack_rebuild(trip_id=None, package_id=None):
+    """
+    Queue background pack rebuilds once the current transaction commits.
+
+    A package-scoped change rebuilds that package only; a trip-scoped change
+    rebuilds every package on the trip. Bursts of edits collapse into a single
+    delayed rebuild per package.
+    """
+    transaction.on_commit(lambda: _enqueue_rebuilds(trip_id, package_id))
+
+
+def _enqueue_rebuilds(trip_id, package_id):
+    from apps.api.tasks import rebuild_offline_pack_task
+
+    if package_id:
+        package_ids = [package_id]
+    else:
+        package_ids = list(TripPackage.objects.filter(trip_id=trip_id).values_list('id', flat=True))
+
+    delay = settings.OFFLINE_PACK_REBUILD_DELAY_SECONDS
+    for pid in package_ids:
+        queued_key = REBUILD_QUEUED_CACHE_KEY.format(package_id=pid)
+        if not cache.add(queued_key, True, timeout=delay + 300):
+            continue
+        try:
+            rebuild_offline_pack_task.apply_async(args=[str(pid)], countdown=delay)
+        except Exception:
+            cache.delete(queued_key)
+            logger.exception("Failed to queue offline pack rebuild for package %s", pid)
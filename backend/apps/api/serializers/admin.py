@@ -1044,9 +1044,10 @@ class AdminTripUpdateSerializer(serializers.ModelSerializer):
         model = TripUpdate
         fields = [
             'id', 'trip', 'package', 'title', 'body_md', 'urgency',
-            'pinned', 'publish_at', 'attach_public_id', 'attach_url',
+            'pinned', 'publish_at', 'is_published', 'attach_public_id', 'attach_url',
             'created_at', 'updated_at'
         ]
+        read_only_fields = ['is_published']
 
 
 class AdminTripGuideSectionSerializer(serializers.ModelSerializer):
@@ -1125,9 +1126,10 @@ class AdminTripResourceSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'trip', 'package', 'title', 'description', 'resource_type',
             'order', 'file_public_id', 'file_format', 'file_url',
-            'viewer_mode', 'metadata', 'is_pinned', 'published_at',
+            'viewer_mode', 'metadata', 'is_pinned', 'published_at', 'is_published',
             'created_at', 'updated_at'
         ]
+        read_only_fields = ['is_published']
 
     def validate(self, attrs):
         """Ensure package resources stay within the selected trip."""
@@ -1140,6 +1142,95 @@ class AdminTripResourceSerializer(serializers.ModelSerializer):
         return attrs
 
 
+# ============================================================================
+# BULK TRIP CONTENT SERIALIZERS (Admin)
+# ============================================================================
+# Items of a bulk trip-content payload. The trip comes from the URL and
+# flights/hotels from the package they are nested under, so those relations
+# are read-only here; ``package_ref`` points at a package in the same payload.
+
+class BulkPackageSerializer(AdminPackageSerializer):
+    """Package in a bulk trip-content payload."""
+
+    ref = serializers.CharField(write_only=True, required=False, max_length=64)
+
+    class Meta(AdminPackageSerializer.Meta):
+        fields = AdminPackageSerializer.Meta.fields + ['ref']
+        read_only_fields = ['trip']
+
+
+class BulkPackageFlightSerializer(AdminPackageFlightSerializer):
+    """Flight nested under a package in a bulk trip-content payload."""
+
+    class Meta(AdminPackageFlightSerializer.Meta):
+        read_only_fields = ['package']
+
+
+class BulkPackageHotelSerializer(AdminPackageHotelSerializer):
+    """Hotel nested under a package in a bulk trip-content payload."""
+
+    class Meta(AdminPackageHotelSerializer.Meta):
+        read_only_fields = ['package']
+
+
+class BulkItineraryItemSerializer(AdminItineraryItemSerializer):
+    """Itinerary item in a bulk trip-content payload."""
+
+    class Meta(AdminItineraryItemSerializer.Meta):
+        read_only_fields = ['trip']
+
+
+class BulkTripMilestoneSerializer(AdminTripMilestoneSerializer):
+    """Milestone in a bulk trip-content payload."""
+
+    package_ref = serializers.CharField(write_only=True, required=False, max_length=64)
+
+    class Meta(AdminTripMilestoneSerializer.Meta):
+        fields = AdminTripMilestoneSerializer.Meta.fields + ['package_ref']
+        read_only_fields = ['trip']
+
+
+# ============================================================================
+# TRIP CLONE SERIALIZERS (Admin)
+# ============================================================================
+
+class TripCloneTargetSerializer(serializers.Serializer):
+    """
+    One copy requested from the trip clone endpoint.
+
+    ``start_date`` moves every date in the copy by the same number of days;
+    like ``duplicate``, copies start as private drafts unless told otherwise.
+    """
+
+    code = serializers.CharField(max_length=24)
+    name = serializers.CharField(max_length=120, required=False)
+    start_date = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=Trip.STATUS_CHOICES, default='DRAFT')
+    visibility = serializers.ChoiceField(choices=Trip.VISIBILITY_CHOICES, default='PRIVATE')
+    featured = serializers.BooleanField(default=False)
+
+
+class TripCloneSerializer(serializers.Serializer):
+    """Payload for cloning one trip into several new ones."""
+
+    clones = TripCloneTargetSerializer(many=True, allow_empty=False)
+
+    def validate_clones(self, value):
+        from apps.trips.cloning import MAX_TRIP_CLONES
+
+        if len(value) > MAX_TRIP_CLONES:
+            raise serializers.ValidationError(f"At most {MAX_TRIP_CLONES} clones can be created at once")
+
+        codes = [clone['code'] for clone in value]
+        if len(set(codes)) != len(codes):
+            raise serializers.ValidationError("Clone codes must be unique")
+
+        taken = sorted(Trip.objects.filter(code__in=codes).values_list('code', flat=True))
+        if taken:
+            raise serializers.ValidationError(f"Trip codes already exist: {', '.join(taken)}")
+        return value
+
+
 # ============================================================================
 # USER MANAGEMENT SERIALIZERS (Admin)
 # ============================================================================
@@ -2,7 +2,11 @@
 
 from rest_framework import serializers
 
-from apps.api.serializers.trips import TripResourceSerializer
+from apps.api.serializers.trips import (
+    GuideSectionSerializer,
+    ItineraryItemSerializer,
+    TripResourceSerializer,
+)
 from apps.common.models import PlatformSettings
 from apps.pilgrims.models import DeviceInstallation, NotificationPreference, TripFeedback
 
@@ -47,7 +51,7 @@ class NotificationPreferenceSerializer(serializers.ModelSerializer):
         ]
 
     def _get_settings(self) -> PlatformSettings:
-        return PlatformSettings.get_solo()
+        return PlatformSettings.get_cached()
 
     def get_support_phone(self, obj):
         return self._get_settings().mobile_support_phone
@@ -130,6 +134,44 @@ class TripDailyProgramSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField(allow_null=True)
 
 
+class OfflineTripResourceSerializer(TripResourceSerializer):
+    """Resource metadata for offline packs; signed file URLs expire, so they are fetched online."""
+
+    file_url_signed = None
+
+    class Meta(TripResourceSerializer.Meta):
+        fields = [field for field in TripResourceSerializer.Meta.fields if field != 'file_url_signed']
+
+
+class OfflineItineraryItemSerializer(ItineraryItemSerializer):
+    """Itinerary item for offline packs without expiring attachment URLs."""
+
+    attach_url_signed = None
+
+    class Meta(ItineraryItemSerializer.Meta):
+        fields = [field for field in ItineraryItemSerializer.Meta.fields if field != 'attach_url_signed']
+
+
+class OfflineGuideSectionSerializer(GuideSectionSerializer):
+    """Guide section for offline packs without expiring attachment URLs."""
+
+    attach_url_signed = None
+
+    class Meta(GuideSectionSerializer.Meta):
+        fields = [field for field in GuideSectionSerializer.Meta.fields if field != 'attach_url_signed']
+
+
+class OfflineDailyProgramSerializer(serializers.Serializer):
+    """Daily program for offline packs; the app derives the current day locally."""
+
+    trip_id = serializers.UUIDField()
+    trip_code = serializers.CharField()
+    trip_name = serializers.CharField()
+    pinned_resource = OfflineTripResourceSerializer(allow_null=True)
+    days = TripDailyProgramDaySerializer(many=True)
+    updated_at = serializers.DateTimeField(allow_null=True)
+
+
 class PilgrimTripFeedbackSerializer(serializers.ModelSerializer):
     """Serializer for pilgrim feedback state and submitted content."""
 
@@ -3,7 +3,9 @@ Serializers for trips, packages, and related data.
 """
 from collections.abc import Mapping
 
+from django.db import transaction
 from rest_framework import serializers
+from apps.common.activity import record_booking_created
 from apps.trips.models import (
     Trip, TripPackage, PackageFlight, PackageHotel,
     ItineraryItem, TripUpdate, TripGuideSection,
@@ -125,6 +127,18 @@ class TripPackageSerializer(serializers.ModelSerializer):
         ]
 
 
+class TripPackageSyncSerializer(TripPackageSerializer):
+    """Package serializer for delta sync, where flights and hotels sync as their own entities."""
+
+    flights = None
+    hotels = None
+
+    class Meta(TripPackageSerializer.Meta):
+        fields = [field for field in TripPackageSerializer.Meta.fields if field not in ('flights', 'hotels')] + [
+            'updated_at'
+        ]
+
+
 class ItineraryItemSerializer(serializers.ModelSerializer):
     """Serializer for itinerary items."""
     
@@ -432,11 +446,13 @@ class PilgrimBookingCreateSerializer(serializers.ModelSerializer):
             )
         
         # Create booking with EOI status
-        booking = Booking.objects.create(
-            pilgrim=pilgrim,
-            status='EOI',  # Expression of Interest
-            **validated_data
-        )
+        with transaction.atomic():
+            booking = Booking.objects.create(
+                pilgrim=pilgrim,
+                status='EOI',  # Expression of Interest
+                **validated_data
+            )
+            record_booking_created(booking, actor=request.user)
         
         return booking
 
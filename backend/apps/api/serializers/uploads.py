@@ -0,0 +1,21 @@
+"""Serializers for the direct-to-storage upload protocol."""
+
+from rest_framework import serializers
+
+from apps.common.uploads import UPLOAD_FOLDERS
+
+
+class DirectUploadSignSerializer(serializers.Serializer):
+    """Request body for signing a direct upload."""
+
+    target = serializers.ChoiceField(choices=sorted(UPLOAD_FOLDERS))
+    resource_type = serializers.ChoiceField(choices=['image', 'raw', 'video'], default='image')
+
+
+class DirectUploadFinalizeSerializer(serializers.Serializer):
+    """Storage response fields a client sends back after uploading."""
+
+    upload_token = serializers.CharField()
+    version = serializers.IntegerField()
+    signature = serializers.CharField()
+    format = serializers.CharField(max_length=10, required=False, allow_blank=True, default='')
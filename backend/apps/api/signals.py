@@ -0,0 +1,115 @@
+"""Signal handlers that keep pilgrim offline packs, live update streams and dashboard stats fresh."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.accounts.models import PilgrimProfile
+from apps.api.dashboard_stats import invalidate_dashboard_stats
+from apps.bookings.models import Booking
+from apps.content.models import Dua
+from apps.pilgrims.models import Document
+from apps.trips.models import (
+    ChecklistItem,
+    EmergencyContact,
+    ItineraryItem,
+    Trip,
+    TripFAQ,
+    TripGuideSection,
+    TripPackage,
+    TripResource,
+    TripUpdate,
+)
+from apps.trips.signals import content_published
+
+# Models counted on the staff dashboard.
+DASHBOARD_STATS_MODELS = [Trip, Booking, PilgrimProfile, Document]
+
+# Trip content models bundled into offline packs.
+OFFLINE_PACK_CONTENT_MODELS = [
+    ItineraryItem,
+    TripGuideSection,
+    ChecklistItem,
+    EmergencyContact,
+    TripFAQ,
+    TripResource,
+]
+
+
+def rebuild_packs_for_content(sender, instance, raw=False, **kwargs):
+    """Queue rebuilds for the packs that include a changed content row."""
+    from apps.api.offline_packs import schedule_offline_pack_rebuild
+
+    if raw:
+        return
+    schedule_offline_pack_rebuild(trip_id=instance.trip_id, package_id=getattr(instance, 'package_id', None))
+
+
+def rebuild_packs_for_trip(sender, instance, raw=False, **kwargs):
+    """Queue rebuilds for every package when trip details change."""
+    from apps.api.offline_packs import schedule_offline_pack_rebuild
+
+    if raw:
+        return
+    schedule_offline_pack_rebuild(trip_id=instance.id)
+
+
+def rebuild_pack_for_package(sender, instance, raw=False, **kwargs):
+    """Queue a rebuild when a package is created or renamed."""
+    from apps.api.offline_packs import schedule_offline_pack_rebuild
+
+    if raw:
+        return
+    schedule_offline_pack_rebuild(trip_id=instance.trip_id, package_id=instance.id)
+
+
+def rebuild_packs_for_duas(sender, instance, raw=False, **kwargs):
+    """Queue rebuilds for trips that have not ended when the shared dua library changes."""
+    from apps.api.offline_packs import schedule_offline_pack_rebuild
+
+    if raw:
+        return
+    trip_ids = Trip.objects.filter(end_date__gte=timezone.now().date()).values_list('id', flat=True)
+    for trip_id in trip_ids:
+        schedule_offline_pack_rebuild(trip_id=trip_id)
+
+
+def broadcast_visible_trip_update(sender, instance, raw=False, **kwargs):
+    """Push an already-visible trip update to live stream subscribers after commit."""
+    from apps.api.views.streams import broadcast_trip_update
+
+    if raw or instance.publish_at > timezone.now():
+        return
+    transaction.on_commit(lambda: broadcast_trip_update(instance.pk))
+
+
+def handle_content_published(sender, updates=(), resources=(), **kwargs):
+    """Broadcast newly published updates and refresh packs that bundle newly published resources."""
+    from apps.api.offline_packs import schedule_offline_pack_rebuild
+    from apps.api.views.streams import broadcast_trip_update
+
+    for update_id, _trip_id, _package_id in updates:
+        broadcast_trip_update(update_id)
+    for trip_id, package_id in {(trip_id, package_id) for _id, trip_id, package_id in resources}:
+        schedule_offline_pack_rebuild(trip_id=trip_id, package_id=package_id)
+
+
+def connect_signals():
+    """Connect offline-pack rebuild, live-stream and dashboard cache triggers."""
+    for model in OFFLINE_PACK_CONTENT_MODELS:
+        label = model._meta.label_lower
+        post_save.connect(rebuild_packs_for_content, sender=model, dispatch_uid=f'offline-pack-save-{label}')
+        post_delete.connect(rebuild_packs_for_content, sender=model, dispatch_uid=f'offline-pack-delete-{label}')
+
+    post_save.connect(rebuild_packs_for_trip, sender=Trip, dispatch_uid='offline-pack-save-trip')
+    post_save.connect(rebuild_pack_for_package, sender=TripPackage, dispatch_uid='offline-pack-save-package')
+    post_save.connect(rebuild_packs_for_duas, sender=Dua, dispatch_uid='offline-pack-save-dua')
+    post_delete.connect(rebuild_packs_for_duas, sender=Dua, dispatch_uid='offline-pack-delete-dua')
+
+    post_save.connect(broadcast_visible_trip_update, sender=TripUpdate, dispatch_uid='trip-update-stream-save')
+    content_published.connect(handle_content_published, dispatch_uid='api-content-published')
+
+    for model in DASHBOARD_STATS_MODELS:
+        label = model._meta.label_lower
+        post_save.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard-stats-save-{label}')
+        post_delete.connect(invalidate_dashboard_stats, sender=model, dispatch_uid=f'dashboard-stats-delete-{label}')
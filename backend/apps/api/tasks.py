@@ -0,0 +1,11 @@
+"""Background tasks for the pilgrim API."""
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def rebuild_offline_pack_task(package_id):
+    """Rebuild the offline trip pack for a package."""
+    from apps.api.offline_packs import rebuild_offline_pack
+
+    rebuild_offline_pack(package_id)
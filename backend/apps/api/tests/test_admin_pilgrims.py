@@ -9,6 +9,7 @@ from django.contrib.auth import get_user_model
 
 from apps.accounts.models import PilgrimProfile
 from apps.api.tests.helpers import create_staff_user
+from apps.common.encryption import blind_index
 
 Account = get_user_model()
 
@@ -350,6 +351,17 @@ class AdminPilgrimAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 1)
         self.assertEqual(response.data['results'][0]['passportNumber'], 'AB123456')
+
+    def test_search_by_passport_number_uses_blind_index(self):
+        """Passport search matches the blind index regardless of case and spacing."""
+        self.client.force_authenticate(user=self.staff_user)
+        self.assertEqual(self.pilgrim1.passport_number_index, blind_index('AB123456'))
+
+        response = self.client.get('/api/v1/pilgrims?search=ab 123456')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['passportNumber'], 'AB123456')
     
     def test_search_by_full_name(self):
         """Test searching pilgrims by full name."""
@@ -2,11 +2,13 @@
 Unit tests for Admin Trip API endpoints.
 Tests authentication, permissions, CRUD operations, filtering, and pagination.
 """
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
 from apps.trips.models import Trip, TripPackage
 from apps.common.models import Currency
@@ -274,3 +276,233 @@ class AdminTripAPITestCase(TestCase):
         # Check snake_case keys are NOT present
         self.assertNotIn('start_date', response.data)
         self.assertNotIn('end_date', response.data)
+
+
+class AdminTripBulkContentTestCase(TestCase):
+    """Test suite for the bulk trip-content endpoint."""
+    
+    def setUp(self):
+        """Set up a staff client and an empty trip."""
+        self.client = APIClient()
+        self.staff_user = create_staff_user(phone='+1234567890', name='Staff User')
+        self.client.force_authenticate(user=self.staff_user)
+        Currency.objects.get_or_create(code='USD', defaults={'name': 'US Dollar', 'symbol': '$'})
+        self.trip = Trip.objects.create(
+            code='UMR2026BULK',
+            name='Bulk Umrah',
+            cities=['Makkah', 'Madinah'],
+            start_date=date(2026, 12, 1),
+            end_date=date(2026, 12, 12),
+        )
+        self.url = f'/api/v1/trips/{self.trip.id}/bulk'
+    
+    def _payload(self):
+        """A trip graph with two packages, their flights/hotels, itinerary and milestones."""
+        packages = []
+        for code in ('STD', 'PRM'):
+            packages.append({
+                'ref': code.lower(),
+                'package_code': f'UMR2026BULK-{code}',
+                'name': f'{code} Package',
+                'price_minor_units': 150000,
+                'currency_code': 'USD',
+                'flights': [
+                    {
+                        'leg': 'OUTBOUND', 'carrier': 'QR', 'flight_no': f'{code}1',
+                        'dep_airport': 'EBB', 'dep_dt': '2026-12-01T03:00:00Z',
+                        'arr_airport': 'JED', 'arr_dt': '2026-12-01T08:00:00Z',
+                    },
+                    {
+                        'leg': 'RETURN', 'carrier': 'QR', 'flight_no': f'{code}2',
+                        'dep_airport': 'JED', 'dep_dt': '2026-12-12T18:00:00Z',
+                        'arr_airport': 'EBB', 'arr_dt': '2026-12-12T23:00:00Z',
+                    },
+                ],
+                'hotels': [
+                    {'name': 'Madinah Hotel', 'address': 'Madinah', 'check_in': '2026-12-01', 'check_out': '2026-12-06'},
+                    {'name': 'Makkah Hotel', 'address': 'Makkah', 'check_in': '2026-12-06', 'check_out': '2026-12-12'},
+                ],
+            })
+        return {
+            'packages': packages,
+            'itinerary_items': [{'day_index': day, 'title': f'Day {day}'} for day in range(1, 11)],
+            'milestones': [
+                {'milestone_type': 'HOTEL_CONTRACTED', 'package_ref': 'std'},
+                {'milestone_type': 'VISA_SUBMISSION'},
+            ],
+        }
+    
+    def test_bulk_creates_the_whole_graph(self):
+        """One request writes every section and maps package refs to ids."""
+        with self.assertNumQueries(12):
+            response = self.client.post(self.url, self._payload(), format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data['created'],
+            {'packages': 2, 'flights': 4, 'hotels': 4, 'itinerary_items': 10, 'milestones': 2},
+        )
+        standard = TripPackage.objects.get(id=response.data['package_refs']['std'])
+        self.assertEqual(standard.trip, self.trip)
+        self.assertEqual(standard.currency.code, 'USD')
+        self.assertEqual(standard.flights.count(), 2)
+        self.assertEqual(standard.hotels.count(), 2)
+        self.assertEqual(standard.milestones.get().milestone_type, 'HOTEL_CONTRACTED')
+        self.assertEqual(self.trip.itinerary_items.count(), 10)
+        self.assertEqual(standard.history.count(), 1)
+    
+    def test_invalid_items_are_reported_and_nothing_is_written(self):
+        """Per-item errors carry their path and roll back the whole payload."""
+        payload = self._payload()
+        payload['packages'][1]['hotels'][0]['check_in'] = 'not-a-date'
+        payload['itinerary_items'][3].pop('title')
+        payload['milestones'][0]['package_ref'] = 'missing'
+        
+        response = self.client.post(self.url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [error['path'] for error in response.data['errors']],
+            ['packages[1].hotels[0]', 'itinerary_items[3]', 'milestones[0]'],
+        )
+        self.assertIn('check_in', response.data['errors'][0]['errors'])
+        self.assertFalse(TripPackage.objects.filter(trip=self.trip).exists())
+    
+    def test_bulk_requires_write_role(self):
+        """Read-only staff cannot write trip content."""
+        viewer = create_staff_user(phone='+1234567891', name='Viewer', staff_role='AUDITOR')
+        self.client.force_authenticate(user=viewer)
+        
+        response = self.client.post(self.url, self._payload(), format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AdminTripCloneTestCase(TestCase):
+    """Test suite for cloning a trip with its whole content graph."""
+    
+    def setUp(self):
+        """Set up a staff client and a template trip with content under it."""
+        from apps.trips.models import ChecklistItem, PackageFlight, PackageHotel, TripMilestone, TripResource
+        
+        self.client = APIClient()
+        self.staff_user = create_staff_user(phone='+1234567890', name='Staff User')
+        self.client.force_authenticate(user=self.staff_user)
+        self.trip = Trip.objects.create(
+            code='UMR2026TPL',
+            name='Template Umrah',
+            cities=['Makkah', 'Madinah'],
+            status='OPEN_FOR_SALES',
+            visibility='PUBLIC',
+            start_date=date(2026, 12, 1),
+            end_date=date(2026, 12, 12),
+        )
+        self.package = TripPackage.objects.create(trip=self.trip, name='Standard', package_code='UMR2026TPL-STD')
+        PackageFlight.objects.create(
+            package=self.package, leg='OUTBOUND', carrier='QR', flight_no='QR1',
+            dep_airport='EBB', dep_dt=datetime(2026, 12, 1, 3, tzinfo=dt_timezone.utc),
+            arr_airport='JED', arr_dt=datetime(2026, 12, 1, 8, tzinfo=dt_timezone.utc),
+        )
+        PackageHotel.objects.create(
+            package=self.package, name='Makkah Hotel', address='Makkah',
+            check_in=date(2026, 12, 1), check_out=date(2026, 12, 12),
+        )
+        ChecklistItem.objects.create(trip=self.trip, package=self.package, label='Passport', category='DOCS')
+        TripMilestone.objects.create(
+            trip=self.trip, package=self.package, milestone_type='HOTEL_CONTRACTED',
+            status='DONE', target_date=date(2026, 10, 1), actual_date=date(2026, 9, 28),
+        )
+        TripResource.objects.create(
+            trip=self.trip, title='Guide', resource_type='UMRAH_GUIDE', file_public_id='guide',
+            published_at=datetime(2026, 11, 1, tzinfo=dt_timezone.utc),
+        )
+        self.url = f'/api/v1/trips/{self.trip.id}/clone'
+    
+    def test_clone_copies_the_graph_with_shifted_dates(self):
+        """Every clone gets its own packages and logistics, moved to its start date."""
+        clones = [
+            {'code': f'UMR2027M{month:02d}', 'start_date': f'2027-{month:02d}-01'}
+            for month in range(1, 13)
+        ]
+        
+        response = self.client.post(self.url, {'clones': clones}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual([item['code'] for item in response.data['results']], [clone['code'] for clone in clones])
+        
+        new_trip = Trip.objects.get(code='UMR2027M03')
+        offset = date(2027, 3, 1) - self.trip.start_date
+        self.assertEqual(new_trip.end_date, self.trip.end_date + offset)
+        self.assertEqual((new_trip.status, new_trip.visibility), ('DRAFT', 'PRIVATE'))
+        self.assertEqual(new_trip.name, 'Template Umrah (Copy)')
+        self.assertTrue(new_trip.slug)
+        self.assertEqual(Trip.objects.filter(slug=new_trip.slug).count(), 1)
+        
+        package = new_trip.packages.get()
+        self.assertNotEqual(package.id, self.package.id)
+        self.assertEqual(package.flights.get().dep_dt, datetime(2027, 3, 1, 3, tzinfo=dt_timezone.utc))
+        self.assertEqual(package.hotels.get().check_out, date(2027, 3, 12))
+        self.assertEqual(new_trip.checklist_items.get().package_id, package.id)
+        
+        milestone = new_trip.milestones.get()
+        self.assertEqual(milestone.package_id, package.id)
+        self.assertEqual(milestone.target_date, date(2026, 10, 1) + offset)
+        self.assertEqual((milestone.status, milestone.actual_date), ('NOT_STARTED', None))
+        self.assertEqual(new_trip.resources.get().is_published, False)
+        self.assertEqual(package.history.count(), 1)
+        
+        # The template itself is untouched.
+        self.assertEqual(self.trip.packages.count(), 1)
+        self.assertEqual(TripPackage.objects.count(), 13)
+    
+    def test_clone_query_count_does_not_grow_with_clones(self):
+        """Cloning twelve times costs the same queries as cloning once."""
+        def run(codes):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {'clones': [{'code': code} for code in codes]}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+        
+        single = run(['UMR2027ONE'])
+        many = run([f'UMR2027X{index:02d}' for index in range(12)])
+        
+        self.assertEqual(single, many)
+    
+    def test_clone_rejects_existing_codes(self):
+        """Codes that already exist reject the whole request."""
+        response = self.client.post(
+            self.url,
+            {'clones': [{'code': 'UMR2027NEW'}, {'code': self.trip.code}]},
+            format='json',
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Trip.objects.count(), 1)
+    
+    def test_clone_requires_write_role(self):
+        """Read-only staff cannot clone trips."""
+        viewer = create_staff_user(phone='+1234567891', name='Viewer', staff_role='AUDITOR')
+        self.client.force_authenticate(user=viewer)
+        
+        response = self.client.post(self.url, {'clones': [{'code': 'UMR2027NEW'}]}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_admin_duplicate_keeps_most_of_a_long_code(self):
+        """The admin duplicate action keeps the code's prefix and never reuses an existing code."""
+        from unittest import mock
+        from apps.trips.admin_actions import copy_trip_code
+        
+        long_trip = Trip.objects.create(code='UMR2026RAMADANPREMIUM01', name='Long', cities=['Makkah'],
+            start_date=date(2026, 12, 1), end_date=date(2026, 12, 12),
+        )
+        Trip.objects.create(code='UMR2026RAMADANPREM-CAAAA', name='Taken', cities=['Makkah'],
+            start_date=date(2026, 12, 1), end_date=date(2026, 12, 12),
+        )
+        
+        with mock.patch('apps.trips.admin_actions.secrets.choice', side_effect=['A'] * 4 + ['B'] * 4):
+            code = copy_trip_code(long_trip.code)
+        
+        self.assertEqual(code, 'UMR2026RAMADANPREM-CBBBB')
+        self.assertEqual(len(code), Trip._meta.get_field('code').max_length)
@@ -6,10 +6,9 @@ from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
-from unittest.mock import patch, MagicMock
 
 from apps.accounts.models import OTPCode
-from apps.common.models import PlatformSettings
+from apps.common.models import PlatformSettings, SmsOutboxMessage
 
 Account = get_user_model()
 
@@ -65,75 +64,89 @@ class TestOTPRequest:
         })
         assert response2.status_code == status.HTTP_429_TOO_MANY_REQUESTS
     
-    @patch('apps.api.auth.views.send_sms_message')
-    def test_sms_enabled_success(self, mock_sms_send, api_client, settings):
-        """Test OTP request with SMS enabled - successful send."""
+    def test_sms_enabled_success(self, api_client, settings, sms_provider, django_capture_on_commit_callbacks):
+        """Test OTP request with SMS enabled - the outbox worker delivers the code."""
         settings.SMS_ENABLED = True
-        
-        # Mock successful SMS response
-        mock_sms_send.return_value = {
-            'SMSMessageData': {
-                'Recipients': [
-                    {'status': 'Success', 'number': '+256712345678'}
-                ]
-            }
-        }
-        
-        response = api_client.post('/api/v1/auth/request-otp/', {
-            'phone': '+256712345678'
-        })
-        
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post('/api/v1/auth/request-otp/', {
+                'phone': '+256712345678'
+            })
+
         assert response.status_code == status.HTTP_200_OK
         assert response.data['sent'] is True
         assert 'otp' not in response.data  # OTP should not be in response in production
-        assert mock_sms_send.called
-    
-    @patch('apps.api.auth.views.send_sms_message')
-    def test_sms_enabled_failure(self, mock_sms_send, api_client, settings):
-        """Test OTP request with SMS enabled - failed send."""
+
+        otp = OTPCode.objects.get(phone='+256712345678')
+        outbox_message = SmsOutboxMessage.objects.get(phone='+256712345678')
+        assert outbox_message.purpose == 'OTP'
+        assert outbox_message.status == 'SENT'
+        assert outbox_message.message == ''  # The code is not kept once delivered.
+        [(body, phones)] = sms_provider.sent_messages
+        assert phones == ['+256712345678']
+        assert otp.code in body
+
+    def test_sms_enabled_returns_before_delivery(self, api_client, settings, sms_provider):
+        """Test OTP request with SMS enabled - the response does not wait for the gateway."""
         settings.SMS_ENABLED = True
-        
-        # Mock failed SMS response
-        mock_sms_send.return_value = {
-            'SMSMessageData': {
-                'Recipients': [
-                    {'status': 'Failed', 'number': '+256712345678'}
-                ]
-            }
-        }
-        
+
         response = api_client.post('/api/v1/auth/request-otp/', {
             'phone': '+256712345678'
         })
-        
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['sent'] is True
+        assert sms_provider.sent_messages == []
+        assert SmsOutboxMessage.objects.get(phone='+256712345678').status == 'QUEUED'
+
+    def test_sms_enabled_failure(self, api_client, settings, sms_provider, django_capture_on_commit_callbacks):
+        """Test OTP request with SMS enabled - gateway failure leaves the message queued for retry."""
+        settings.SMS_ENABLED = True
+
+        def fail_send(message, phones):
+            raise Exception("Network error")
+
+        sms_provider.send = fail_send
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post('/api/v1/auth/request-otp/', {
+                'phone': '+256712345678'
+            })
+
         assert response.status_code == status.HTTP_200_OK
         assert response.data['sent'] is True  # OTP still created in DB
-        assert 'sms_warning' in response.data  # Warning about SMS failure
-        
+
+        outbox_message = SmsOutboxMessage.objects.get(phone='+256712345678')
+        assert outbox_message.status == 'QUEUED'
+        assert outbox_message.attempts == 1
+        assert outbox_message.last_error == "Network error"
+        assert outbox_message.next_attempt_at > timezone.now()
+
         # OTP should still be in database
         otp = OTPCode.objects.filter(phone='+256712345678').first()
         assert otp is not None
-    
-    @patch('apps.api.auth.views.send_sms_message')
-    def test_sms_enabled_exception(self, mock_sms_send, api_client, settings):
-        """Test OTP request with SMS enabled - exception during send."""
+
+    def test_sms_enabled_queue_exception(self, api_client, settings, monkeypatch):
+        """Test OTP request with SMS enabled - the OTP is kept when queueing fails."""
         settings.SMS_ENABLED = True
-        
-        # Mock exception
-        mock_sms_send.side_effect = Exception("Network error")
-        
+
+        def raise_queue_error(*args, **kwargs):
+            raise Exception("Database unavailable")
+
+        monkeypatch.setattr('apps.api.auth.views.queue_sms', raise_queue_error)
+
         response = api_client.post('/api/v1/auth/request-otp/', {
             'phone': '+256712345678'
         })
-        
+
         assert response.status_code == status.HTTP_200_OK
         assert response.data['sent'] is True  # OTP still created in DB
         assert 'sms_warning' in response.data
-        
+
         # OTP should still be in database
         otp = OTPCode.objects.filter(phone='+256712345678').first()
         assert otp is not None
-    
+
     def test_sms_disabled_development(self, api_client, settings):
         """Test OTP request with SMS disabled (development mode)."""
         settings.SMS_ENABLED = False
@@ -0,0 +1,101 @@
+"""
+Tests for JWT authentication backed by cached account snapshots.
+"""
+import pytest
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts.auth_cache import get_user_snapshot
+from apps.accounts.models import Account
+from apps.api.auth.authentication import CachedJWTAuthentication
+from apps.api.auth.tokens import RoleBasedRefreshToken
+from apps.common.permissions import HasPilgrimProfile, IsStaff
+
+
+def bearer_request(user):
+    """Build a DRF-style request carrying a fresh access token for the user."""
+    access = RoleBasedRefreshToken.for_user(user).access_token
+    return APIRequestFactory().get('/api/v1/me/', HTTP_AUTHORIZATION=f"Bearer {access}")
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Snapshot-backed authentication and permission checks."""
+
+    def test_tokens_carry_role_claims(self, pilgrim_user, staff_user):
+        """Access tokens embed the role, staff role and pilgrim-profile presence."""
+        pilgrim_access = RoleBasedRefreshToken.for_user(pilgrim_user).access_token
+        staff_access = RoleBasedRefreshToken.for_user(staff_user).access_token
+
+        assert (pilgrim_access['role'], pilgrim_access['staff_role'], pilgrim_access['has_pilgrim_profile']) == (
+            'PILGRIM',
+            None,
+            True,
+        )
+        assert (staff_access['role'], staff_access['staff_role'], staff_access['has_pilgrim_profile']) == (
+            'STAFF',
+            'ADMIN',
+            False,
+        )
+
+    def test_warm_requests_authenticate_and_authorize_without_queries(
+        self,
+        pilgrim_user,
+        staff_user,
+        django_assert_num_queries,
+    ):
+        """After the first request, authentication and role checks are served from the cache."""
+        authenticator = CachedJWTAuthentication()
+        pilgrim_request = bearer_request(pilgrim_user)
+        staff_request = bearer_request(staff_user)
+        with django_assert_num_queries(1):
+            authenticator.authenticate(pilgrim_request)
+        with django_assert_num_queries(1):
+            authenticator.authenticate(staff_request)
+
+        with django_assert_num_queries(0):
+            pilgrim, _token = authenticator.authenticate(pilgrim_request)
+            staff, _token = authenticator.authenticate(staff_request)
+            pilgrim_request.user = pilgrim
+            staff_request.user = staff
+
+            assert HasPilgrimProfile().has_permission(pilgrim_request, None) is True
+            assert IsStaff().has_permission(pilgrim_request, None) is False
+            assert HasPilgrimProfile().has_permission(staff_request, None) is False
+            assert IsStaff().has_permission(staff_request, None) is True
+
+        assert pilgrim.pilgrim_profile.full_name == "Test Pilgrim"
+
+    def test_deactivated_accounts_are_rejected_immediately(self, authenticated_client, pilgrim_user):
+        """Saving an inactive account drops its cached snapshot."""
+        assert authenticated_client.get('/api/v1/me/').status_code == status.HTTP_200_OK
+
+        pilgrim_user.is_active = False
+        pilgrim_user.save()
+
+        assert authenticated_client.get('/api/v1/me/').status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_staff_role_change_revokes_existing_tokens(self, api_client, agent_user):
+        """Tokens minted for an earlier staff role stop working after the role changes."""
+        access = RoleBasedRefreshToken.for_user(agent_user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        assert api_client.get('/api/v1/auth/staff/profile/').status_code == status.HTTP_200_OK
+
+        agent_user.staff_profile.role = 'ADMIN'
+        agent_user.staff_profile.save()
+
+        response = api_client.get('/api/v1/auth/staff/profile/')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_snapshot_never_holds_or_writes_back_the_password(self, authenticated_client, pilgrim_user):
+        """Profile edits through a cached user write only the columns they change."""
+        assert authenticated_client.get('/api/v1/me/').status_code == status.HTTP_200_OK
+        assert 'password' not in get_user_snapshot(pilgrim_user.id)['account']
+
+        # Bulk updates bypass signals, so the cached snapshot is now stale.
+        Account.objects.filter(pk=pilgrim_user.pk).update(password='rotated', role='STAFF')
+        response = authenticated_client.put('/api/v1/profile/update/', {'full_name': "Renamed Pilgrim"}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        account = Account.objects.get(pk=pilgrim_user.pk)
+        assert (account.name, account.password, account.role) == ("Renamed Pilgrim", 'rotated', 'STAFF')
@@ -0,0 +1,72 @@
+"""
+Tests for memoized and batched Cloudinary URL signing.
+"""
+import pytest
+
+from apps.common import cloudinary as cloudinary_utils
+
+
+@pytest.fixture(autouse=True)
+def clear_signed_urls():
+    """Start every test with an empty signing memo."""
+    cloudinary_utils._signed_url.cache_clear()
+    yield
+    cloudinary_utils._signed_url.cache_clear()
+
+
+@pytest.fixture
+def fixed_expiry(monkeypatch):
+    """Pin the expiry bucket so tests cannot straddle a boundary."""
+    monkeypatch.setattr(cloudinary_utils, 'signed_expiry', lambda expires_in, now=None: 1_000_200)
+
+
+class TestResourceTypeDetection:
+    """The precompiled format table and legacy fallbacks."""
+
+    @pytest.mark.parametrize(
+        ('public_id', 'file_format', 'expected'),
+        [
+            ('documents/abc', 'PDF', 'raw'),
+            ('documents/abc', '.png', 'image'),
+            ('trips/briefing.MP4', None, 'video'),
+            ('trips/notes.docx', None, 'raw'),
+            ('passports/scan', None, 'image'),
+            ('trips/v1.2/handbook', None, 'raw'),
+        ],
+    )
+    def test_detects_resource_type(self, public_id, file_format, expected):
+        """Formats win over extensions, and extensionless document folders are images."""
+        assert cloudinary_utils.detect_resource_type(public_id, file_format) == expected
+
+
+class TestSignedDelivery:
+    """Expiry buckets and memoization."""
+
+    def test_expiry_rounds_up_to_the_bucket(self):
+        """URLs never expire sooner than requested and share a bucket boundary."""
+        bucket = cloudinary_utils.SIGNED_URL_BUCKET_SECONDS
+
+        assert cloudinary_utils.signed_expiry(600, now=bucket * 10 + 1) == bucket * 13
+        assert cloudinary_utils.signed_expiry(600, now=bucket * 10) == bucket * 12
+
+    def test_repeated_calls_reuse_the_signed_url(self, fixed_expiry):
+        """Identical requests within a bucket are signed once."""
+        first = cloudinary_utils.signed_delivery('documents/abc', file_format='pdf')
+        second = cloudinary_utils.signed_delivery('documents/abc', file_format='pdf')
+
+        assert first == second
+        assert cloudinary_utils._signed_url.cache_info().misses == 1
+
+    def test_batch_signs_each_unique_pair_once(self, fixed_expiry):
+        """The batch API keeps input order, dedupes pairs and passes blanks through."""
+        urls = cloudinary_utils.signed_delivery_batch([
+            ('documents/abc', 'pdf'),
+            ('', None),
+            ('passports/scan', None),
+            ('documents/abc', 'pdf'),
+        ])
+
+        assert urls[0] == urls[3] == cloudinary_utils.signed_delivery('documents/abc', file_format='pdf')
+        assert urls[1] == ''
+        assert '/image/authenticated/' in urls[2]
+        assert cloudinary_utils._signed_url.cache_info().misses == 2
@@ -0,0 +1,128 @@
+"""Staff dashboard activity feed tests."""
+
+from datetime import date, timedelta
+
+import pytest
+from django.contrib import admin
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.bookings.admin import BookingAdmin
+from apps.bookings.models import Booking
+from apps.common.activity import record_activity
+from apps.common.models import ActivityEvent
+from apps.pilgrims.admin import DocumentAdmin
+from apps.pilgrims.models import Document
+
+
+@pytest.mark.django_db
+class TestActivityEventWrites:
+    def test_payment_and_document_review_append_events(self, api_client, staff_user, booking, pilgrim):
+        """Recording a payment and reviewing a document each log one event."""
+        api_client.force_authenticate(user=staff_user)
+        api_client.post(
+            reverse('api:admin-booking-add-payment', kwargs={'pk': booking.id}),
+            {'amount_minor_units': 150000, 'payment_method': 'CASH', 'payment_date': date.today().isoformat()},
+            format='json',
+        )
+        document = Document.objects.create(
+            pilgrim=pilgrim, document_type='PASSPORT', title='Passport', file_public_id='doc1', status='PENDING'
+        )
+        api_client.post(f'/api/v1/documents/{document.id}/verify')
+
+        payment_event = ActivityEvent.objects.get(event_type='PAYMENT_RECORDED')
+        document_event = ActivityEvent.objects.get(event_type='DOCUMENT_REVIEWED')
+        assert payment_event.subject_id == str(booking.id)
+        assert payment_event.actor == staff_user
+        assert document_event.title == 'Passport verified'
+        assert document_event.status == 'VERIFIED'
+
+    def test_document_reviews_outside_the_review_actions_append_events(self, api_client, staff_user, pilgrim, rf):
+        """PATCHing a review status and the admin bulk actions log reviews; other edits do not."""
+        api_client.force_authenticate(user=staff_user)
+        patched, bulk = (
+            Document.objects.create(
+                pilgrim=pilgrim, document_type='VISA', title=title, file_public_id=title, status='PENDING'
+            )
+            for title in ('patched', 'bulk')
+        )
+
+        url = f'/api/v1/documents/{patched.id}'
+        assert api_client.patch(url, {'notes': 'Checked copy'}, format='json').status_code == status.HTTP_200_OK
+        assert not ActivityEvent.objects.exists()
+        response = api_client.patch(url, {'status': 'REJECTED', 'rejection_reason': 'Blurred scan'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        request = rf.post('/admin/pilgrims/document/')
+        request.user = staff_user
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        DocumentAdmin(Document, admin.site).mark_as_verified(request, Document.objects.filter(pk=bulk.pk))
+
+        events = ActivityEvent.objects.filter(event_type='DOCUMENT_REVIEWED').order_by('created_at')
+        assert [(event.subject_id, event.status) for event in events] == [
+            (str(patched.id), 'REJECTED'),
+            (str(bulk.id), 'VERIFIED'),
+        ]
+        bulk.refresh_from_db()
+        assert bulk.reviewed_at is not None
+
+    def test_bookings_created_in_django_admin_append_events(self, staff_user, pilgrim, trip_package, rf):
+        """The Django admin logs the bookings it creates, not the ones it edits."""
+        request = rf.post('/admin/bookings/booking/add/')
+        request.user = staff_user
+        booking_admin = BookingAdmin(Booking, admin.site)
+        booking = Booking(pilgrim=pilgrim, package=trip_package, status='BOOKED')
+
+        booking_admin.save_model(request, booking, None, change=False)
+        booking_admin.save_model(request, booking, None, change=True)
+
+        event = ActivityEvent.objects.get()
+        assert (event.event_type, event.subject_id, event.actor) == ('BOOKING_CREATED', str(booking.id), staff_user)
+
+    def test_public_lead_submission_appends_event(self, api_client):
+        """Anonymous lead submissions are logged without an actor."""
+        response = api_client.post('/api/v1/public/leads/', {
+            'name': 'Amina K',
+            'phone': '+256700123123',
+            'interest_type': 'CONSULTATION',
+            'source': 'homepage',
+            'page_path': '/',
+            'context_label': 'homepage',
+            'cta_label': 'consultation_form_submit',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        event = ActivityEvent.objects.get()
+        assert (event.event_type, event.description, event.actor) == ('LEAD_SUBMITTED', 'Amina K', None)
+
+
+@pytest.mark.django_db
+class TestDashboardActivityFeed:
+    def test_feed_pages_through_events_with_a_cursor(self, api_client, staff_user, django_assert_num_queries):
+        """Each page is one query over the event table; the cursor resumes after the last row."""
+        start = timezone.now()
+        for index in range(5):
+            event = record_activity('LEAD_SUBMITTED', index, f'Lead {index}')
+            ActivityEvent.objects.filter(pk=event.pk).update(created_at=start + timedelta(seconds=index))
+        api_client.force_authenticate(user=staff_user)
+        api_client.get('/api/v1/dashboard/activity/')
+
+        with django_assert_num_queries(1):
+            first = api_client.get('/api/v1/dashboard/activity/?page_size=3')
+        second = api_client.get(f"/api/v1/dashboard/activity/?page_size=3&cursor={first.data['nextCursor']}")
+
+        assert first.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in first.data['results']] == ['Lead 4', 'Lead 3', 'Lead 2']
+        assert first.data['results'][0]['type'] == 'lead'
+        assert [item['title'] for item in second.data['results']] == ['Lead 1', 'Lead 0']
+        assert second.data['nextCursor'] is None
+
+    def test_feed_rejects_malformed_cursor(self, api_client, staff_user):
+        api_client.force_authenticate(user=staff_user)
+
+        response = api_client.get('/api/v1/dashboard/activity/?cursor=not-a-cursor')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,47 @@
+"""Staff dashboard stats aggregation and caching tests."""
+
+import pytest
+from rest_framework import status
+
+from apps.api.auth.tokens import RoleBasedRefreshToken
+from apps.api.dashboard_stats import build_dashboard_stats, get_dashboard_stats
+
+
+def authenticate(client, user):
+    """Attach a bearer token for the given user."""
+    refresh = RoleBasedRefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}")
+    return client
+
+
+@pytest.mark.django_db
+class TestDashboardStats:
+    def test_stats_payload_counts_every_section(self, api_client, staff_user, booking, visa):
+        """The endpoint reports trips, bookings, pilgrims, visas and revenue."""
+        response = authenticate(api_client, staff_user).get("/api/v1/dashboard/stats/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["bookings"] == {"total": 1, "active": 1, "eoi": 0}
+        assert response.data["trips"]["total"] == 1
+        assert response.data["pilgrims"]["total"] >= 1
+        assert response.data["visas"] == {"pending": 1, "approved": 0}
+        assert response.data["revenue"] == {"totalMinorUnits": 0}
+
+    def test_stats_use_one_query_per_table(self, booking, visa, django_assert_num_queries):
+        """Trips, bookings, pilgrim profiles and documents are aggregated in one query each."""
+        with django_assert_num_queries(4):
+            build_dashboard_stats()
+
+    def test_stats_are_cached_until_a_write_commits(
+        self, booking, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        """Repeated reads hit the cache; saving a booking drops it after commit."""
+        assert get_dashboard_stats()["bookings"]["eoi"] == 0
+        with django_assert_num_queries(0):
+            get_dashboard_stats()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            booking.status = "EOI"
+            booking.save()
+
+        assert get_dashboard_stats()["bookings"]["eoi"] == 1
@@ -0,0 +1,60 @@
+"""Staff dashboard upcoming-trips endpoint tests."""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from apps.accounts.models import Account, PilgrimProfile
+from apps.bookings.models import Booking
+from apps.trips.models import Trip, TripPackage
+
+
+@pytest.fixture
+def upcoming_trips(currency_ugx):
+    """Ten public trips in the next 90 days, each with two packages and bookings."""
+    today = timezone.now().date()
+    trips = []
+    for index in range(10):
+        trip = Trip.objects.create(
+            code=f"UP{index:02d}",
+            name=f"Upcoming {index}",
+            cities=["Makkah"],
+            visibility="PUBLIC",
+            start_date=today + timedelta(days=5 + index),
+            end_date=today + timedelta(days=15 + index),
+        )
+        TripPackage.objects.create(trip=trip, name="Standard", capacity=20, currency=currency_ugx)
+        TripPackage.objects.create(trip=trip, name="Flexible", capacity=None)
+        trips.append(trip)
+
+    package = trips[0].packages.get(name="Standard")
+    for index, booking_status in enumerate(["BOOKED", "CONFIRMED", "EOI"]):
+        user = Account.objects.create_user(phone=f"+25678100000{index}", name=f"Pilgrim {index}", role="PILGRIM")
+        profile = PilgrimProfile.objects.create(user=user, full_name=f"Pilgrim {index}")
+        Booking.objects.create(pilgrim=profile, package=package, status=booking_status)
+    return trips
+
+
+@pytest.mark.django_db
+class TestDashboardUpcomingTrips:
+    def test_upcoming_trips_render_in_constant_queries(
+        self, api_client, staff_user, upcoming_trips, django_assert_max_num_queries
+    ):
+        """Ten trips with packages, counts and capacity render in at most three queries."""
+        api_client.force_authenticate(user=staff_user)
+        api_client.get("/api/v1/dashboard/upcoming-trips/")
+
+        with django_assert_max_num_queries(3):
+            response = api_client.get("/api/v1/dashboard/upcoming-trips/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 10
+
+        first = response.data[0]
+        assert first["code"] == "UP00"
+        assert first["bookingCount"] == 2
+        assert first["totalCapacity"] == 20
+        assert {pkg["currency"] for pkg in first["packages"]} == {"UGX", None}
+        assert all(trip["bookingCount"] == 0 for trip in response.data[1:])
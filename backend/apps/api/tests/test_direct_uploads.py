@@ -0,0 +1,121 @@
+"""
+Tests for the direct-to-storage upload protocol.
+"""
+import pytest
+from rest_framework import status
+
+from apps.common.models import FinalizedUpload
+from apps.pilgrims.models import Document
+from apps.trips.models import TripResource
+
+
+def sign_and_upload(api_client, storage, target, file_format='pdf'):
+    """Sign an upload, send it to the local storage and return both payloads."""
+    signed = api_client.post('/api/v1/uploads/sign/', {'target': target, 'resource_type': 'raw'}, format='json')
+    assert signed.status_code == status.HTTP_201_CREATED
+    uploaded = storage.receive(signed.data['fields'], file_format=file_format, size=2048)
+    return signed.data, uploaded
+
+
+@pytest.mark.django_db
+class TestDirectUploads:
+    """Sign, upload straight to storage, then finalize."""
+
+    def test_finalize_creates_document_for_signed_upload(self, api_client, staff_user, pilgrim, upload_storage):
+        """A verified upload becomes a document pointing at the reserved public_id."""
+        api_client.force_authenticate(user=staff_user)
+        signed, uploaded = sign_and_upload(api_client, upload_storage, 'document')
+
+        response = api_client.post('/api/v1/uploads/finalize/', {
+            'upload_token': signed['upload_token'],
+            'version': uploaded['version'],
+            'signature': uploaded['signature'],
+            'format': uploaded['format'],
+            'pilgrim': str(pilgrim.pk),
+            'document_type': 'PASSPORT',
+            'title': 'Passport - Uganda',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        document = Document.objects.get()
+        assert document.file_public_id == signed['public_id']
+        assert document.file_public_id.startswith('documents/')
+        assert (document.file_format, document.uploaded_by) == ('pdf', staff_user)
+
+    def test_finalize_creates_trip_resource(self, api_client, staff_user, trip, upload_storage):
+        """Trip resources are created through the same protocol."""
+        api_client.force_authenticate(user=staff_user)
+        signed, uploaded = sign_and_upload(api_client, upload_storage, 'trip_resource')
+
+        response = api_client.post('/api/v1/uploads/finalize/', {
+            'upload_token': signed['upload_token'],
+            'version': uploaded['version'],
+            'signature': uploaded['signature'],
+            'format': 'pdf',
+            'trip': str(trip.pk),
+            'title': 'Umrah Guide',
+            'resource_type': 'UMRAH_GUIDE',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert TripResource.objects.get().file_public_id == signed['public_id']
+
+    def test_finalize_rejects_forged_signature_and_replays(self, api_client, staff_user, pilgrim, upload_storage):
+        """Unverified uploads are refused and a finalized upload cannot be reused."""
+        api_client.force_authenticate(user=staff_user)
+        signed, uploaded = sign_and_upload(api_client, upload_storage, 'document')
+        body = {
+            'upload_token': signed['upload_token'],
+            'version': uploaded['version'],
+            'signature': 'forged',
+            'pilgrim': str(pilgrim.pk),
+            'document_type': 'VISA',
+            'title': 'Visa',
+        }
+
+        assert api_client.post('/api/v1/uploads/finalize/', body, format='json').status_code == status.HTTP_400_BAD_REQUEST
+
+        body['signature'] = uploaded['signature']
+        assert api_client.post('/api/v1/uploads/finalize/', body, format='json').status_code == status.HTTP_201_CREATED
+        assert api_client.post('/api/v1/uploads/finalize/', body, format='json').status_code == status.HTTP_409_CONFLICT
+
+    def test_invalid_record_data_does_not_claim_the_upload(self, api_client, staff_user, pilgrim, upload_storage):
+        """The claim is rolled back with a rejected record, so a corrected finalize succeeds once."""
+        api_client.force_authenticate(user=staff_user)
+        signed, uploaded = sign_and_upload(api_client, upload_storage, 'document')
+        body = {
+            'upload_token': signed['upload_token'],
+            'version': uploaded['version'],
+            'signature': uploaded['signature'],
+            'pilgrim': str(pilgrim.pk),
+            'document_type': 'NOT_A_TYPE',
+            'title': 'Visa',
+        }
+
+        assert api_client.post('/api/v1/uploads/finalize/', body, format='json').status_code == status.HTTP_400_BAD_REQUEST
+        assert not FinalizedUpload.objects.exists()
+
+        body['document_type'] = 'VISA'
+        assert api_client.post('/api/v1/uploads/finalize/', body, format='json').status_code == status.HTTP_201_CREATED
+        assert FinalizedUpload.objects.get().public_id == signed['public_id']
+
+    def test_upload_token_is_bound_to_the_requesting_user(self, api_client, staff_user, agent_user, upload_storage):
+        """A token issued to one staff member cannot be finalized by another."""
+        api_client.force_authenticate(user=staff_user)
+        signed, uploaded = sign_and_upload(api_client, upload_storage, 'document')
+
+        api_client.force_authenticate(user=agent_user)
+        response = api_client.post('/api/v1/uploads/finalize/', {
+            'upload_token': signed['upload_token'],
+            'version': uploaded['version'],
+            'signature': uploaded['signature'],
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_signing_is_staff_only(self, api_client, pilgrim_user, auditor_user, upload_storage):
+        """Pilgrims and read-only staff cannot request upload signatures."""
+        for user in (pilgrim_user, auditor_user):
+            api_client.force_authenticate(user=user)
+            response = api_client.post('/api/v1/uploads/sign/', {'target': 'document'}, format='json')
+            assert response.status_code == status.HTTP_403_FORBIDDEN
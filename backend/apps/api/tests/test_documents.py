@@ -104,6 +104,29 @@ class TestDocumentViewSet:
         assert response.data['count'] == 2
         assert len(response.data['results']) == 2
     
+    def test_search_documents_by_number(self, api_client, staff_user, pilgrim):
+        """Document numbers are searched through their blind index."""
+        passport = Document.objects.create(
+            pilgrim=pilgrim,
+            document_type='PASSPORT',
+            title='Passport 1',
+            document_number='B1234567',
+            file_public_id='doc1'
+        )
+        Document.objects.create(
+            pilgrim=pilgrim,
+            document_type='VISA',
+            title='Visa 1',
+            document_number='V7654321',
+            file_public_id='doc2'
+        )
+
+        api_client.force_authenticate(user=staff_user)
+        response = api_client.get('/api/v1/documents', {'search': 'b1234567'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [str(passport.id)]
+
     def test_filter_documents_by_type(self, api_client, staff_user, pilgrim):
         """Test filtering documents by type."""
         Document.objects.create(
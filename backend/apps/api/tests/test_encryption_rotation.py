@@ -0,0 +1,90 @@
+"""
+Tests for cached field ciphers and encryption key rotation.
+"""
+from io import StringIO
+
+import pytest
+from cryptography.fernet import Fernet
+from django.core.management import call_command
+
+from apps.common import encryption
+
+
+@pytest.fixture(autouse=True)
+def field_key(settings, monkeypatch):
+    """Use a valid single key; the build-time placeholder key cannot encrypt."""
+    key = Fernet.generate_key().decode()
+    monkeypatch.setattr(settings, 'FIELD_ENCRYPTION_KEYS', [key])
+    return key
+
+
+@pytest.fixture
+def rotated_keys(settings, monkeypatch, field_key):
+    """Configure a new primary key while keeping the original key for decryption."""
+    old_key = field_key
+    new_key = Fernet.generate_key().decode()
+    monkeypatch.setattr(settings, 'FIELD_ENCRYPTION_KEYS', [new_key, old_key])
+    return new_key, old_key
+
+
+class TestFieldCipher:
+    """Key-list handling for encrypted fields."""
+
+    def test_cipher_is_built_once_per_key_list(self):
+        """Repeated encrypt/decrypt calls reuse one cipher instance."""
+        assert encryption.get_cipher() is encryption.get_cipher()
+        assert encryption.decrypt_value(encryption.encrypt_value('A1234567')) == 'A1234567'
+
+    def test_old_ciphertexts_stay_readable_after_adding_a_key(self, rotated_keys):
+        """Values written under the previous key decrypt once a new primary is configured."""
+        new_key, old_key = rotated_keys
+        legacy = Fernet(old_key.encode()).encrypt(b'A1234567').decode()
+
+        assert encryption.decrypt_value(legacy) == 'A1234567'
+        assert Fernet(new_key.encode()).decrypt(encryption.encrypt_value('B7654321').encode()) == b'B7654321'
+
+    def test_rotate_tokens_moves_values_to_the_primary_key(self, rotated_keys):
+        """Rotated tokens decrypt under the new key alone; unreadable tokens come back as None."""
+        new_key, old_key = rotated_keys
+        legacy = Fernet(old_key.encode()).encrypt(b'A1234567').decode()
+        foreign = Fernet(Fernet.generate_key()).encrypt(b'C0000000').decode()
+
+        rotated, unreadable = encryption.rotate_tokens([new_key, old_key], [legacy, foreign])
+
+        assert Fernet(new_key.encode()).decrypt(rotated.encode()) == b'A1234567'
+        assert unreadable is None
+
+
+@pytest.mark.django_db
+class TestRotateEncryptionKeysCommand:
+    """The bulk re-encryption command."""
+
+    def test_start_after_requires_a_model(self):
+        """Resuming needs an explicit model so the primary key is unambiguous."""
+        with pytest.raises(Exception, match='--start-after requires --model'):
+            call_command('rotate_encryption_keys', '--start-after', '10')
+
+    def test_unknown_model_reports_no_columns(self):
+        """Filtering to a model without encrypted columns is a no-op."""
+        out = StringIO()
+        call_command('rotate_encryption_keys', '--model', 'trips.Trip', stdout=out)
+
+        assert 'No encrypted columns found' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestRebuildBlindIndexesCommand:
+    """Recomputing lookup digests after a BLIND_INDEX_KEY change."""
+
+    def test_indexes_follow_the_new_key(self, pilgrim, settings, monkeypatch):
+        """Stored digests are rewritten so lookups keep matching under the new key."""
+        pilgrim.passport_number = 'AB123456'
+        pilgrim.save()
+        monkeypatch.setattr(settings, 'BLIND_INDEX_KEY', 'rotated-blind-index-key')
+
+        out = StringIO()
+        call_command('rebuild_blind_indexes', '--model', 'accounts.PilgrimProfile', stdout=out)
+
+        pilgrim.refresh_from_db()
+        assert pilgrim.passport_number_index == encryption.blind_index('AB123456')
+        assert 'rebuilt 1 passport_number_index values' in out.getvalue()
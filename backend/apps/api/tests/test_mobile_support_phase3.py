@@ -2,6 +2,9 @@
 
 from datetime import timedelta
 
+import gzip
+import json
+
 import pytest
 from django.utils import timezone
 from rest_framework import status
@@ -9,7 +12,7 @@ from rest_framework import status
 from apps.api.tests.test_platform_and_rbac import authenticate
 from apps.common.models import PlatformSettings
 from apps.pilgrims.models import DeviceInstallation, NotificationPreference, TripFeedback
-from apps.trips.models import ItineraryItem, TripResource
+from apps.trips.models import ChecklistItem, ItineraryItem, TripOfflinePack, TripResource
 
 
 @pytest.mark.django_db
@@ -217,6 +220,65 @@ class TestDailyProgramAndFeedback:
         assert review_response.data['reviewedByName'] == staff_user.name
 
 
+@pytest.mark.django_db
+class TestOfflinePack:
+    """Offline trip pack coverage."""
+
+    def test_offline_pack_is_served_compressed_with_a_content_hash(
+        self,
+        authenticated_client,
+        booking,
+        other_pilgrim,
+    ):
+        """Booked pilgrims should download the pack once and receive 304 until it changes."""
+        trip = booking.package.trip
+        ItineraryItem.objects.create(trip=trip, day_index=1, title="Departure briefing")
+        url = f'/api/v1/me/trips/{trip.id}/offline-pack/'
+
+        response = authenticated_client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Encoding'] == 'gzip'
+        pack = json.loads(gzip.decompress(response.content))
+        assert pack['trip']['code'] == trip.code
+        assert pack['package']['id'] == str(booking.package_id)
+        assert pack['itinerary'][0]['title'] == "Departure briefing"
+        assert pack['daily_program']['days'][0]['items'][0]['title'] == "Departure briefing"
+        assert 'attach_url_signed' not in pack['itinerary'][0]
+
+        etag = response['ETag']
+        assert etag == f'"{response["X-Content-Hash"]}"'
+        not_modified = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        other_client = authenticated_client.__class__()
+        other_client.force_authenticate(user=other_pilgrim.user)
+        forbidden = other_client.get(url)
+        assert forbidden.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_content_changes_rebuild_the_pack_in_the_background(
+        self,
+        authenticated_client,
+        booking,
+        django_capture_on_commit_callbacks,
+    ):
+        """Saving pack content should rebuild the stored pack and change its hash."""
+        trip = booking.package.trip
+        url = f'/api/v1/me/trips/{trip.id}/offline-pack/'
+        first = authenticated_client.get(url)
+        assert first.status_code == status.HTTP_200_OK
+        assert json.loads(first.content)['checklist'] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ChecklistItem.objects.create(trip=trip, label="Pack ihram", category='PACKING')
+
+        stored = TripOfflinePack.objects.get(package=booking.package)
+        assert f'"{stored.content_hash}"' != first['ETag']
+
+        refreshed = authenticated_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        assert refreshed.status_code == status.HTTP_200_OK
+        assert [item['label'] for item in json.loads(refreshed.content)['checklist']] == ["Pack ihram"]
+
+
 @pytest.mark.django_db
 class TestDocumentCenterTruth:
     """Read-only document-center contract coverage."""
@@ -0,0 +1,153 @@
+"""
+Tests for notification fan-out to pilgrim devices.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts.models import Account, PilgrimProfile
+from apps.bookings.models import Booking
+from apps.common.push import LocalPushProvider, PushBatchResult
+from apps.content.dispatch import deliver_notification, dispatch_notification_logs
+from apps.content.models import NotificationLog
+from apps.pilgrims.models import DeviceInstallation, NotificationPreference
+from apps.trips.models import TripPackage
+
+
+def make_pilgrim_with_device(index, package, token, booking_status='BOOKED', **preferences):
+    """Create a booked pilgrim with one registered device and optional preference overrides."""
+    user = Account.objects.create_user(
+        phone=f"+2567005{index:05d}",
+        name=f"Pilgrim {index}",
+        role="PILGRIM",
+        password="testpass123",
+    )
+    pilgrim = PilgrimProfile.objects.create(user=user, full_name=user.name, phone=user.phone, nationality="UG")
+    Booking.objects.create(pilgrim=pilgrim, package=package, status=booking_status)
+    DeviceInstallation.objects.create(
+        pilgrim=pilgrim,
+        installation_id=f"install-{index}",
+        platform='ANDROID',
+        provider_token_fields={'nativeToken': token} if token else {},
+    )
+    if preferences:
+        NotificationPreference.objects.create(pilgrim=pilgrim, **preferences)
+    return pilgrim
+
+
+def trip_notification(trip, category='TRIP_UPDATE'):
+    """Create a due trip-scoped notification log."""
+    return NotificationLog.objects.create(
+        scope='TRIP',
+        scope_id=trip.id,
+        category=category,
+        title="Buses leave at 9",
+        message="Meet in the lobby.",
+        scheduled_at=timezone.now(),
+        sent_at=timezone.now(),
+    )
+
+
+@pytest.mark.django_db
+class TestNotificationFanout:
+    """Recipient resolution, batching and delivery accounting."""
+
+    def test_trip_broadcast_honors_bookings_and_preferences(self, trip_package, currency_ugx, push_enabled):
+        """Only active bookings with push and the category enabled receive the trip broadcast."""
+        trip = trip_package.trip
+        second_package = TripPackage.objects.create(trip=trip, name="Premium", currency=currency_ugx)
+        make_pilgrim_with_device(1, trip_package, 'token-default')
+        make_pilgrim_with_device(2, second_package, 'token-opted-in', trip_updates=True)
+        make_pilgrim_with_device(3, trip_package, 'token-push-off', push_enabled=False)
+        make_pilgrim_with_device(4, trip_package, 'token-updates-off', trip_updates=False)
+        make_pilgrim_with_device(5, trip_package, 'token-cancelled', booking_status='CANCELLED')
+        make_pilgrim_with_device(6, trip_package, None)
+        log = trip_notification(trip)
+
+        provider = LocalPushProvider()
+        sent, failed = deliver_notification(log, provider)
+
+        assert (sent, failed) == (2, 0)
+        assert sorted(provider.sent_batches[0][0]) == ['token-default', 'token-opted-in']
+        log.refresh_from_db()
+        assert log.count_sent == 2
+        assert log.count_failed == 0
+
+    def test_marketing_requires_an_explicit_opt_in(self, trip_package, push_enabled):
+        """Categories that default off skip pilgrims without a preference row."""
+        make_pilgrim_with_device(1, trip_package, 'token-default')
+        make_pilgrim_with_device(2, trip_package, 'token-marketing', marketing_updates=True)
+        log = trip_notification(trip_package.trip, category='MARKETING')
+
+        provider = LocalPushProvider()
+        deliver_notification(log, provider)
+
+        assert provider.sent_batches[0][0] == ['token-marketing']
+
+    def test_tokens_are_chunked_and_failures_recorded(self, trip_package, push_enabled):
+        """Large audiences are split into provider-sized batches and invalid tokens are disabled."""
+        for index in range(5):
+            make_pilgrim_with_device(index, trip_package, f'token-{index}')
+        log = trip_notification(trip_package.trip)
+
+        class SmallBatchProvider(LocalPushProvider):
+            batch_size = 2
+
+            def send_batch(self, tokens, message):
+                super().send_batch(tokens, message)
+                if 'token-4' in tokens:
+                    return PushBatchResult(sent=len(tokens) - 1, failed=1, invalid_tokens=['token-4'])
+                return PushBatchResult(sent=len(tokens))
+
+        provider = SmallBatchProvider()
+        sent, failed = deliver_notification(log, provider)
+
+        assert [len(tokens) for tokens, _message in provider.sent_batches] == [2, 2, 1]
+        assert (sent, failed) == (4, 1)
+        assert DeviceInstallation.objects.get(installation_id='install-4').notifications_enabled is False
+
+    def test_dispatch_is_skipped_while_push_is_disabled(self, trip_package):
+        """Platform settings gate delivery, and skipped logs are released for a later run."""
+        make_pilgrim_with_device(1, trip_package, 'token-default')
+        log = trip_notification(trip_package.trip)
+
+        assert dispatch_notification_logs([log.id]) == 0
+        log.refresh_from_db()
+        assert log.count_sent == 0
+        assert log.sent_at is None
+
+    def test_dispatch_uses_the_configured_provider(self, trip_package, push_enabled, settings, monkeypatch):
+        """The Celery-facing dispatcher sends every claimed log through the configured provider."""
+        monkeypatch.setattr('apps.common.push._provider', None)
+        settings.PUSH_PROVIDER = 'apps.common.push.LocalPushProvider'
+        make_pilgrim_with_device(1, trip_package, 'token-default')
+        log = trip_notification(trip_package.trip)
+
+        assert dispatch_notification_logs([log.id]) == 1
+
+    def test_dispatch_is_held_without_a_push_provider(self, trip_package, push_enabled, settings, monkeypatch):
+        """The platform toggle alone does not deliver when no PUSH_PROVIDER is configured."""
+        monkeypatch.setattr(settings, 'PUSH_PROVIDER', '')
+        make_pilgrim_with_device(1, trip_package, 'token-default')
+        log = trip_notification(trip_package.trip)
+
+        assert dispatch_notification_logs([log.id]) == 0
+        log.refresh_from_db()
+        assert log.sent_at is None
+
+    def test_stale_logs_are_skipped_instead_of_sent(self, trip_package, push_enabled, settings, monkeypatch):
+        """Logs held past NOTIFICATION_MAX_DELAY_SECONDS are marked skipped when delivery resumes."""
+        monkeypatch.setattr('apps.common.push._provider', None)
+        make_pilgrim_with_device(1, trip_package, 'token-default')
+        fresh = trip_notification(trip_package.trip)
+        stale = trip_notification(trip_package.trip)
+        NotificationLog.objects.filter(pk=stale.pk).update(
+            scheduled_at=timezone.now() - timedelta(seconds=settings.NOTIFICATION_MAX_DELAY_SECONDS + 60),
+        )
+
+        assert dispatch_notification_logs([fresh.id, stale.id]) == 1
+        fresh.refresh_from_db()
+        stale.refresh_from_db()
+        assert (fresh.skipped, fresh.count_sent) == (False, 1)
+        assert (stale.skipped, stale.count_sent) == (True, 0)
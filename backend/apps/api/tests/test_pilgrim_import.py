@@ -4,12 +4,15 @@ Unit tests for Pilgrim Import API endpoints.
 
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from openpyxl import Workbook
 import io
+import uuid
+from datetime import timedelta
 
-from apps.accounts.models import Account, PilgrimProfile
+from apps.accounts.models import Account, PilgrimImportSession, PilgrimProfile
 from apps.api.tests.helpers import create_staff_user
 
 
@@ -457,3 +460,158 @@ class PilgrimImportTests(TestCase):
         self.assertTrue(response.data['success'])
         self.assertEqual(response.data['imported'], 2)  # Only 2 valid rows
         self.assertEqual(len(response.data['errors']), 0)
+
+
+class PilgrimImportSessionTests(TestCase):
+    """Test suite for the staged validate -> commit import flow."""
+    
+    def setUp(self):
+        """Set up test client and create test user."""
+        self.client = APIClient()
+        self.staff_user = create_staff_user(
+            phone='+256700000000',
+            name='Test Staff',
+        )
+        self.client.force_authenticate(user=self.staff_user)
+    
+    def _workbook(self, rows):
+        """Build an import workbook with the template headers and ``rows``."""
+        wb = Workbook()
+        ws = wb.active
+        ws.append([
+            'Full Name*',
+            'Passport Number*',
+            'Phone Number*',
+            'Date of Birth (YYYY-MM-DD)',
+            'Gender (MALE/FEMALE/OTHER)',
+            'Nationality (2-letter code)',
+            'Address',
+            'Emergency Contact Name',
+            'Emergency Contact Phone',
+            'Emergency Relationship',
+            'Medical Conditions',
+        ])
+        for row in rows:
+            ws.append(row)
+        excel_file = io.BytesIO()
+        wb.save(excel_file)
+        excel_file.seek(0)
+        excel_file.name = 'pilgrims.xlsx'
+        return excel_file
+    
+    def _validate(self):
+        """Validate a three-row file with one invalid row and return the response."""
+        excel_file = self._workbook([
+            ['Ahmed Ibrahim', 'P60000001', '+256700600001', '1990-05-15', 'MALE', 'UG', '', '', '', '', ''],
+            ['Fatima Hassan', 'P60000002', '+256700600002', '1992-08-20', 'FEMALE', 'KE', '', '', '', '', ''],
+            ['', 'P60000003', '+256700600003', '', '', '', '', '', '', '', ''],
+        ])
+        return self.client.post(reverse('api:pilgrim-import-validate'), {'file': excel_file}, format='multipart')
+    
+    def test_validate_stages_importable_rows(self):
+        """Validation returns a session id and stages only rows without errors."""
+        response = self._validate()
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary']['valid'], 2)
+        self.assertEqual(response.data['summary']['errors'], 1)
+        self.assertEqual(response.data['valid_rows'][0]['dob'], '1990-05-15')
+        session = PilgrimImportSession.objects.get(id=response.data['session_id'])
+        self.assertEqual(session.status, 'VALIDATED')
+        self.assertEqual(len(session.rows), 2)
+        self.assertEqual(session.created_by, self.staff_user)
+    
+    def test_commit_creates_staged_rows_without_a_file(self):
+        """Committing imports the staged rows and skips deselected ones."""
+        session_id = self._validate().data['session_id']
+        
+        response = self.client.post(
+            reverse('api:pilgrim-import-commit'),
+            {'session_id': session_id, 'exclude_rows': [3]},
+            format='json',
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['imported'], 1)
+        self.assertTrue(Account.objects.filter(phone='+256700600001').exists())
+        self.assertFalse(Account.objects.filter(phone='+256700600002').exists())
+        profile = PilgrimProfile.objects.get(user__phone='+256700600001')
+        self.assertEqual(str(profile.dob), '1990-05-15')
+        session = PilgrimImportSession.objects.get(id=session_id)
+        self.assertEqual(session.status, 'COMMITTED')
+        self.assertEqual(session.imported_count, 1)
+        self.assertIsNotNone(session.committed_at)
+        self.assertEqual(session.rows, [])
+    
+    def test_expired_sessions_are_purged(self):
+        """Sessions past IMPORT_SESSION_MAX_AGE are deleted unless a job is still committing them."""
+        from apps.accounts.importing import IMPORT_SESSION_MAX_AGE, purge_import_sessions
+        
+        expired = PilgrimImportSession.objects.get(id=self._validate().data['session_id'])
+        committing = PilgrimImportSession.objects.create(status='COMMITTING', created_by=self.staff_user)
+        fresh = PilgrimImportSession.objects.create(created_by=self.staff_user)
+        PilgrimImportSession.objects.filter(pk__in=[expired.pk, committing.pk]).update(
+            created_at=timezone.now() - IMPORT_SESSION_MAX_AGE - timedelta(minutes=1),
+        )
+        
+        self.assertEqual(purge_import_sessions(), 1)
+        self.assertEqual(
+            set(PilgrimImportSession.objects.values_list('pk', flat=True)),
+            {committing.pk, fresh.pk},
+        )
+    
+    def test_commit_is_single_use(self):
+        """A committed session cannot be imported a second time."""
+        session_id = self._validate().data['session_id']
+        url = reverse('api:pilgrim-import-commit')
+        
+        self.client.post(url, {'session_id': session_id}, format='json')
+        response = self.client.post(url, {'session_id': session_id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(PilgrimProfile.objects.count(), 2)
+    
+    def test_commit_unknown_or_invalid_session(self):
+        """Unknown ids are 404s and malformed ids are 400s."""
+        url = reverse('api:pilgrim-import-commit')
+        
+        missing = self.client.post(url, {'session_id': str(uuid.uuid4())}, format='json')
+        malformed = self.client.post(url, {'session_id': 'not-a-uuid'}, format='json')
+        
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(malformed.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_commit_rejects_sessions_from_other_staff(self):
+        """Only the staff member who validated the file can commit it."""
+        session_id = self._validate().data['session_id']
+        other = create_staff_user(phone='+256700000009', name='Other Staff')
+        self.client.force_authenticate(user=other)
+        
+        response = self.client.post(reverse('api:pilgrim-import-commit'), {'session_id': session_id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(PilgrimProfile.objects.count(), 0)
+
+    def test_import_job_progress_endpoints(self):
+        """Imports report their job, which can be polled but not resumed once complete."""
+        excel_file = self._workbook([
+            ['Ahmed Ibrahim', 'P60000001', '+256700600001', '1990-05-15', 'MALE', 'UG', '', '', '', '', ''],
+            ['', 'P60000003', '+256700600003', '', '', '', '', '', '', '', ''],
+        ])
+        response = self.client.post(reverse('api:pilgrim-import'), {'file': excel_file}, format='multipart')
+        job_id = response.data['job']['id']
+        
+        progress = self.client.get(reverse('api:pilgrim-import-job', args=[job_id]))
+        resume = self.client.post(reverse('api:pilgrim-import-job-resume', args=[job_id]))
+        
+        self.assertEqual(progress.status_code, status.HTTP_200_OK)
+        self.assertEqual(progress.data['status'], 'COMPLETED')
+        self.assertEqual(
+            (progress.data['total_rows'], progress.data['processed'], progress.data['created'], progress.data['failed']),
+            (1, 1, 1, 1),
+        )
+        self.assertEqual(progress.data['progress'], 100)
+        self.assertEqual(len(progress.data['errors']), 1)
+        self.assertEqual(resume.status_code, status.HTTP_409_CONFLICT)
+        missing = self.client.get(reverse('api:pilgrim-import-job', args=[uuid.uuid4()]))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
@@ -2,12 +2,13 @@
 Tests for platform settings, public video feed fallback, and staff RBAC.
 """
 import pytest
+from datetime import timedelta
 from django.utils import timezone
 from rest_framework import status
 
 from apps.api.auth.tokens import RoleBasedRefreshToken
 from apps.common.models import PlatformSettings
-from apps.common.youtube import YouTubeSyncError
+from apps.common.youtube import LocalYouTubeClient, YouTubeSyncError, sync_platform_videos
 
 
 def authenticate(client, user):
@@ -65,6 +66,29 @@ class TestPlatformSettings:
         assert platform_settings.mobile_support_phone == '+256700111111'
         assert platform_settings.notification_provider_enabled is True
 
+    def test_cached_settings_reload_only_after_a_committed_save(
+        self,
+        db,
+        django_assert_num_queries,
+        django_capture_on_commit_callbacks,
+    ):
+        """Reads are served from the process copy until a save bumps the shared version."""
+        from django.core.cache import cache
+        from apps.common.models import PLATFORM_SETTINGS_VERSION_KEY
+
+        PlatformSettings.get_cached()
+        with django_assert_num_queries(0):
+            assert PlatformSettings.get_cached().mobile_support_phone == ''
+
+        version = cache.get(PLATFORM_SETTINGS_VERSION_KEY)
+        platform_settings = PlatformSettings.get_solo()
+        platform_settings.mobile_support_phone = '+256700333333'
+        with django_capture_on_commit_callbacks(execute=True):
+            platform_settings.save()
+
+        assert cache.get(PLATFORM_SETTINGS_VERSION_KEY) != version
+        assert PlatformSettings.get_cached().mobile_support_phone == '+256700333333'
+
     def test_public_videos_use_cached_payload_on_sync_failure(self, api_client, monkeypatch):
         """The public feed should serve cached videos when YouTube refresh fails."""
         platform_settings = PlatformSettings.get_solo()
@@ -92,6 +116,53 @@ class TestPlatformSettings:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['items'][0]['videoId'] == 'abc123'
 
+    def test_stale_videos_are_served_while_one_refresh_runs_in_the_background(self, api_client, monkeypatch):
+        """Stale payloads are returned immediately and concurrent requests queue a single refresh."""
+        platform_settings = PlatformSettings.get_solo()
+        platform_settings.youtube_cache_payload = [
+            {
+                'videoId': 'old',
+                'title': 'Old lesson',
+                'description': '',
+                'publishedAt': '2026-04-01T08:30:00Z',
+                'channelTitle': 'Al Hilal Travels',
+                'thumbnailUrl': None,
+                'youtubeUrl': 'https://www.youtube.com/watch?v=old',
+            }
+        ]
+        platform_settings.youtube_cache_synced_at = timezone.now() - timedelta(hours=1)
+        platform_settings.save()
+        queued = []
+        monkeypatch.setattr('apps.common.tasks.refresh_platform_videos_task.delay', lambda: queued.append(True))
+
+        responses = [api_client.get('/api/v1/public/videos/') for _ in range(3)]
+
+        assert [response.data['items'][0]['videoId'] for response in responses] == ['old', 'old', 'old']
+        assert queued == [True]
+
+    def test_background_refresh_pages_through_large_playlists(self, db, monkeypatch):
+        """Playlists longer than one API page are fetched with page tokens."""
+        videos = [
+            {'snippet': {'title': f'Lesson {index}'}, 'contentDetails': {'videoId': f'video-{index}'}}
+            for index in range(60)
+        ]
+        client = LocalYouTubeClient(playlists={'UUlessons': videos}, channel_uploads={'UClessons': 'UUlessons'})
+        monkeypatch.setattr('apps.common.youtube._client', client)
+        platform_settings = PlatformSettings.get_solo()
+        platform_settings.youtube_channel_id = 'UClessons'
+        platform_settings.save()
+
+        items, platform_settings, refreshed = sync_platform_videos(force_refresh=True, max_results=55)
+
+        assert refreshed is True
+        assert len(items) == 55
+        assert items[-1]['videoId'] == 'video-54'
+        assert [params.get('pageToken') for endpoint, params in client.requests if endpoint == 'playlistItems'] == [
+            None,
+            '50',
+        ]
+        assert PlatformSettings.get_cached().youtube_playlist_id == 'UUlessons'
+
 
 @pytest.mark.django_db
 class TestStaffRBAC:
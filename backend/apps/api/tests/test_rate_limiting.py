@@ -0,0 +1,102 @@
+"""
+Tests for token-bucket rate limiting on public and auth endpoints.
+"""
+import pytest
+from rest_framework import status
+
+
+@pytest.fixture
+def rate_limits(settings, monkeypatch):
+    """Enable rate limiting with small buckets for the scopes under test."""
+    monkeypatch.setattr(settings, 'RATELIMIT_ENABLE', True)
+    monkeypatch.setattr(settings, 'RATE_LIMITS', {
+        'otp-request': {'phone': '2/hour'},
+        'otp-verify': {'ip': '2/min'},
+        'lead-capture': {'ip': '1/hour'},
+        'public-catalog': {'ip': '3/min'},
+    })
+
+
+@pytest.mark.django_db
+class TestRateLimiting:
+    """Token buckets reject bursts with 429 and Retry-After."""
+
+    def test_public_catalog_burst_is_rejected_with_retry_after(self, api_client, rate_limits):
+        """Callers may burst up to the bucket capacity and then wait for a refill."""
+        responses = [api_client.get('/api/v1/public/trips/') for _ in range(4)]
+
+        assert [response.status_code for response in responses[:3]] == [status.HTTP_200_OK] * 3
+        assert responses[3].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert responses[3]['Retry-After'] == '20'
+
+    def test_lead_capture_is_limited_per_ip(self, api_client, rate_limits):
+        """A second lead from the same address inside the window is rejected before validation."""
+        first = api_client.post('/api/v1/public/leads/', {}, format='json')
+        second = api_client.post('/api/v1/public/leads/', {}, format='json')
+        other_ip = api_client.post('/api/v1/public/leads/', {}, format='json', REMOTE_ADDR='10.0.0.9')
+
+        assert first.status_code == status.HTTP_400_BAD_REQUEST
+        assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(second['Retry-After']) == 3600
+        assert other_ip.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_otp_requests_are_limited_per_phone(self, api_client, rate_limits, settings, monkeypatch):
+        """The phone bucket applies across IP addresses."""
+        monkeypatch.setattr(settings, 'OTP_RESEND_SECONDS', 0)
+        statuses = [
+            api_client.post(
+                '/api/v1/auth/request-otp/',
+                {'phone': '+256700000001'},
+                REMOTE_ADDR=f'10.0.0.{index}',
+            ).status_code
+            for index in range(3)
+        ]
+
+        assert statuses == [status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS]
+
+    def test_requests_refused_by_one_bucket_spend_nothing_from_the_others(self, api_client, settings, monkeypatch):
+        """A flood from one IP drains only its own bucket, not the phone or route buckets it also names."""
+        monkeypatch.setattr(settings, 'RATELIMIT_ENABLE', True)
+        monkeypatch.setattr(settings, 'OTP_RESEND_SECONDS', 0)
+        monkeypatch.setattr(settings, 'RATE_LIMITS', {
+            'otp-request': {'ip': '2/hour', 'phone': '3/hour', 'route': '4/min'},
+        })
+
+        flood = [
+            api_client.post('/api/v1/auth/request-otp/', {'phone': '+256700000001'}, REMOTE_ADDR='10.0.0.1')
+            for _ in range(20)
+        ]
+        same_phone = api_client.post('/api/v1/auth/request-otp/', {'phone': '+256700000001'}, REMOTE_ADDR='10.0.0.2')
+        other_phone = api_client.post('/api/v1/auth/request-otp/', {'phone': '+256700000002'}, REMOTE_ADDR='10.0.0.3')
+
+        assert [response.status_code for response in flood[:3]] == [
+            status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS,
+        ]
+        assert {response.status_code for response in flood[2:]} == {status.HTTP_429_TOO_MANY_REQUESTS}
+        assert int(flood[-1]['Retry-After']) == 1800
+        assert same_phone.status_code == status.HTTP_200_OK
+        assert other_phone.status_code == status.HTTP_200_OK
+
+    def test_rate_limiting_can_be_disabled(self, api_client, rate_limits, settings, monkeypatch):
+        """RATELIMIT_ENABLE switches every bucket off."""
+        monkeypatch.setattr(settings, 'RATELIMIT_ENABLE', False)
+
+        statuses = {
+            api_client.post('/api/v1/auth/verify-otp/', {'phone': '+256700000001', 'otp': '000000'}).status_code
+            for _ in range(3)
+        }
+
+        assert statuses == {status.HTTP_400_BAD_REQUEST}
+
+
+def test_concurrent_draws_never_overspend_a_bucket():
+    """Threads racing on one bucket are granted exactly its capacity."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from apps.common.throttling import take_tokens
+
+    buckets = [('ratelimit:test:ip:race', 5, 5 / 3600, 3600)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: take_tokens(buckets)[0], range(40)))
+
+    assert results.count(True) == 5
@@ -0,0 +1,177 @@
+"""
+Tests for the scheduled publishing engine.
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from apps.content.models import NotificationLog
+from apps.trips.models import TripResource, TripUpdate
+from apps.trips.publishing import NEXT_WAKE_CACHE_KEY, next_due_at, publish_due_content
+
+
+@pytest.mark.django_db
+class TestScheduledPublishing:
+    """Publisher coverage for updates, resources and notification logs."""
+
+    def test_due_content_is_flipped_published_in_one_run(self, authenticated_client, booking, push_enabled):
+        """Scheduled rows stay hidden until the publisher runs, then become readable."""
+        trip = booking.package.trip
+        update = TripUpdate.objects.create(
+            trip=trip,
+            title="Ziyarah tomorrow",
+            body_md="Buses at 8am.",
+            publish_at=timezone.now() + timedelta(hours=1),
+        )
+        resource = TripResource.objects.create(
+            trip=trip,
+            title="Madinah program",
+            resource_type='DAILY_PROGRAM',
+            file_public_id='guides/madinah',
+            published_at=timezone.now() + timedelta(hours=1),
+        )
+        assert update.is_published is False
+        assert resource.is_published is False
+
+        before = authenticated_client.get(f'/api/v1/me/trips/{trip.id}/updates/')
+        assert before.data['results'] == []
+
+        counts = publish_due_content(now=timezone.now() + timedelta(hours=2))
+
+        assert counts == {'updates': 1, 'resources': 1, 'notifications': 1}
+        update.refresh_from_db()
+        resource.refresh_from_db()
+        assert update.is_published is True
+        assert resource.is_published is True
+        assert NotificationLog.objects.get(scope_id=trip.id).sent_at is not None
+
+        updates = authenticated_client.get(f'/api/v1/me/trips/{trip.id}/updates/')
+        assert [item['title'] for item in updates.data['results']] == ["Ziyarah tomorrow"]
+        resources = authenticated_client.get(f'/api/v1/me/trips/{trip.id}/resources/')
+        assert resources.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in resources.data] == ["Madinah program"]
+
+        assert publish_due_content(now=timezone.now() + timedelta(hours=2)) == {
+            'updates': 0,
+            'resources': 0,
+            'notifications': 0,
+        }
+
+    def test_published_updates_are_broadcast_after_commit(
+        self,
+        booking,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+    ):
+        """Newly published updates are pushed to live stream subscribers."""
+        trip = booking.package.trip
+        update = TripUpdate.objects.create(
+            trip=trip,
+            title="Gate change",
+            body_md="Gate 4.",
+            publish_at=timezone.now() + timedelta(minutes=1),
+        )
+        TripUpdate.objects.filter(pk=update.pk).update(publish_at=timezone.now() - timedelta(seconds=1))
+        published = []
+        monkeypatch.setattr(
+            'apps.api.views.streams.publish_event',
+            lambda channel, message: published.append((channel, message['update']['title'])),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            publish_due_content()
+
+        assert published == [(f'trip-updates:{trip.id}', "Gate change")]
+
+    def test_scheduling_content_queues_a_wake_up_at_its_due_time(
+        self,
+        trip,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+    ):
+        """Saving future content asks Celery to run the publisher when it becomes due."""
+        cache.delete(NEXT_WAKE_CACHE_KEY)
+        queued = []
+        monkeypatch.setattr(
+            'apps.trips.tasks.publish_due_content_task.apply_async',
+            lambda **kwargs: queued.append(kwargs['eta']),
+        )
+        publish_at = timezone.now() + timedelta(hours=3)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TripResource.objects.create(
+                trip=trip,
+                title="Return checklist",
+                resource_type='CHECKLIST',
+                file_public_id='guides/return',
+                published_at=publish_at,
+            )
+
+        assert queued == [publish_at]
+
+    def test_notifications_stay_pending_while_push_is_disabled(self, trip):
+        """Due logs are not claimed or scheduled until push delivery is enabled."""
+        update = TripUpdate.objects.create(
+            trip=trip,
+            title="Ziyarah tomorrow",
+            body_md="Buses at 8am.",
+            publish_at=timezone.now() - timedelta(minutes=1),
+        )
+
+        assert publish_due_content()['notifications'] == 0
+        assert NotificationLog.objects.get(trip_update=update).sent_at is None
+        assert next_due_at() is None
+
+    def test_rescheduling_an_update_keeps_its_notification_in_step(self, trip, push_enabled):
+        """Editing a pending update re-syncs its single notification log."""
+        update = TripUpdate.objects.create(
+            trip=trip,
+            title="Ziyarah tomorrow",
+            body_md="Buses at 8am.",
+            publish_at=timezone.now() + timedelta(hours=1),
+        )
+        later = timezone.now() + timedelta(hours=5)
+
+        update.title = "Ziyarah postponed"
+        update.publish_at = later
+        update.save()
+
+        log = NotificationLog.objects.get(trip_update=update)
+        assert NotificationLog.objects.count() == 1
+        assert log.title == "Ziyarah postponed"
+        assert log.scheduled_at == later
+        assert publish_due_content(now=timezone.now() + timedelta(hours=2))['notifications'] == 0
+
+    def test_deleting_an_update_discards_only_unsent_notifications(self, trip):
+        """A deleted update no longer pushes, but delivered logs are kept."""
+        pending = TripUpdate.objects.create(
+            trip=trip, title="Pending", body_md="Later.", publish_at=timezone.now() + timedelta(hours=1),
+        )
+        delivered = TripUpdate.objects.create(
+            trip=trip, title="Delivered", body_md="Now.", publish_at=timezone.now() - timedelta(minutes=1),
+        )
+        NotificationLog.objects.filter(trip_update=delivered).update(sent_at=timezone.now())
+
+        pending.delete()
+        delivered.delete()
+
+        assert list(NotificationLog.objects.values_list('title', 'trip_update')) == [("Delivered", None)]
+
+    def test_management_command_runs_the_publisher(self, trip):
+        """The local runner publishes due content once without --loop."""
+        update = TripUpdate.objects.create(
+            trip=trip,
+            title="Lunch moved",
+            body_md="Now at 1pm.",
+            publish_at=timezone.now() + timedelta(minutes=5),
+        )
+        TripUpdate.objects.filter(pk=update.pk).update(publish_at=timezone.now() - timedelta(minutes=1))
+
+        call_command('publish_due_content')
+
+        update.refresh_from_db()
+        assert update.is_published is True
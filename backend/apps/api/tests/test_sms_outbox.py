@@ -0,0 +1,142 @@
+"""
+Tests for the SMS outbox worker and providers.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.common.models import SmsOutboxMessage
+from apps.common.sms import AfricasTalkingSmsProvider, SmsDeliveryResult, deliver_sms_outbox, purge_sms_outbox
+
+
+@pytest.mark.django_db
+class TestSmsOutbox:
+    """Batching, retry and failure handling for queued SMS."""
+
+    def test_identical_messages_are_grouped_into_one_provider_call(self, sms_provider):
+        """Recipients sharing a body go out in one multi-recipient send."""
+        for phone in ['+256700000001', '+256700000002', '+256700000003']:
+            SmsOutboxMessage.objects.create(phone=phone, message="Buses leave at 9.")
+        SmsOutboxMessage.objects.create(phone='+256700000004', message="Your code is 123456.", purpose='OTP')
+
+        summary = deliver_sms_outbox()
+
+        assert summary['sent'] == 4
+        assert sorted(sms_provider.sent_messages) == [
+            ("Buses leave at 9.", ['+256700000001', '+256700000002', '+256700000003']),
+            ("Your code is 123456.", ['+256700000004']),
+        ]
+        assert set(SmsOutboxMessage.objects.values_list('status', flat=True)) == {'SENT'}
+
+    def test_transient_failures_back_off_until_the_attempt_limit(self, sms_provider, settings, monkeypatch):
+        """Failed sends are retried later and given up on after SMS_MAX_ATTEMPTS."""
+        monkeypatch.setattr(settings, 'SMS_MAX_ATTEMPTS', 2)
+        outbox_message = SmsOutboxMessage.objects.create(phone='+256700000001', message="Hello")
+        sms_provider.send = lambda message, phones: {
+            phone: SmsDeliveryResult(success=False, error='GatewayError') for phone in phones
+        }
+
+        now = timezone.now()
+        summary = deliver_sms_outbox(now=now)
+
+        outbox_message.refresh_from_db()
+        assert summary['retry_ids'] == [str(outbox_message.id)]
+        assert outbox_message.status == 'QUEUED'
+        assert outbox_message.next_attempt_at == now + timedelta(seconds=settings.SMS_RETRY_BASE_SECONDS)
+        assert deliver_sms_outbox(now=now)['retrying'] == 0  # Not due yet.
+
+        deliver_sms_outbox(now=outbox_message.next_attempt_at)
+
+        outbox_message.refresh_from_db()
+        assert outbox_message.status == 'FAILED'
+        assert outbox_message.attempts == 2
+        assert outbox_message.last_error == 'GatewayError'
+
+    def test_permanent_failures_are_not_retried(self, sms_provider):
+        """Invalid numbers fail on the first attempt."""
+        outbox_message = SmsOutboxMessage.objects.create(phone='+256700000001', message="Hello")
+        sms_provider.send = lambda message, phones: {
+            phone: SmsDeliveryResult(success=False, error='InvalidPhoneNumber', permanent=True) for phone in phones
+        }
+
+        summary = deliver_sms_outbox()
+
+        outbox_message.refresh_from_db()
+        assert summary['failed'] == 1
+        assert outbox_message.status == 'FAILED'
+        assert outbox_message.next_attempt_at is None
+
+    def test_finished_messages_do_not_keep_their_body(self, sms_provider):
+        """Sent and failed rows are blanked so OTP codes are not stored once delivered."""
+        sent = SmsOutboxMessage.objects.create(phone='+256700000001', message="Your code is 123456.", purpose='OTP')
+        failed = SmsOutboxMessage.objects.create(phone='+256700000002', message="Hello")
+        sms_provider.send = lambda message, phones: {
+            phone: SmsDeliveryResult(success=True) if phone == sent.phone
+            else SmsDeliveryResult(success=False, error='InvalidPhoneNumber', permanent=True)
+            for phone in phones
+        }
+
+        deliver_sms_outbox()
+
+        assert SmsOutboxMessage.objects.get(pk=sent.pk).message == ''
+        assert SmsOutboxMessage.objects.get(pk=failed.pk).message == ''
+
+    def test_expired_and_superseded_otps_are_not_sent(self, sms_provider, settings):
+        """A retry never delivers a code the pilgrim can no longer use."""
+        now = timezone.now()
+        expired = SmsOutboxMessage.objects.create(phone='+256700000001', message="Your code is 111111.", purpose='OTP')
+        superseded = SmsOutboxMessage.objects.create(phone='+256700000002', message="Your code is 222222.", purpose='OTP')
+        current = SmsOutboxMessage.objects.create(phone='+256700000002', message="Your code is 333333.", purpose='OTP')
+        SmsOutboxMessage.objects.filter(pk=expired.pk).update(
+            created_at=now - timedelta(seconds=settings.OTP_EXPIRY_SECONDS + 1),
+        )
+        SmsOutboxMessage.objects.filter(pk=superseded.pk).update(created_at=current.created_at - timedelta(seconds=1))
+
+        summary = deliver_sms_outbox(now=now)
+
+        assert summary['sent'] == 1
+        assert summary['skipped'] == 2
+        assert sms_provider.sent_messages == [("Your code is 333333.", ['+256700000002'])]
+        for outbox_message in SmsOutboxMessage.objects.filter(pk__in=[expired.pk, superseded.pk]):
+            assert outbox_message.status == 'FAILED'
+            assert outbox_message.message == ''
+
+    def test_purge_deletes_only_old_finished_messages(self, settings):
+        """Rows past SMS_OUTBOX_RETENTION_DAYS go once they are sent or failed."""
+        now = timezone.now()
+        old = now - timedelta(days=settings.SMS_OUTBOX_RETENTION_DAYS + 1)
+        old_sent = SmsOutboxMessage.objects.create(phone='+256700000001', message='', status='SENT')
+        old_queued = SmsOutboxMessage.objects.create(phone='+256700000002', message="Hello")
+        recent_failed = SmsOutboxMessage.objects.create(phone='+256700000003', message='', status='FAILED')
+        SmsOutboxMessage.objects.filter(pk__in=[old_sent.pk, old_queued.pk]).update(updated_at=old)
+
+        assert purge_sms_outbox(now=now) == 1
+        assert set(SmsOutboxMessage.objects.values_list('pk', flat=True)) == {old_queued.pk, recent_failed.pk}
+
+    def test_africastalking_statuses_map_to_delivery_results(self, monkeypatch):
+        """Per-recipient gateway statuses are translated into delivery results."""
+        import africastalking
+
+        class FakeSms:
+            @staticmethod
+            def send(message, recipients, **kwargs):
+                return {
+                    'SMSMessageData': {
+                        'Recipients': [
+                            {'number': recipients[0], 'status': 'Success', 'statusCode': 101, 'messageId': 'ATXid_1'},
+                            {'number': recipients[1], 'status': 'InvalidPhoneNumber', 'statusCode': 403},
+                            {'number': recipients[2], 'status': 'InsufficientBalance', 'statusCode': 405},
+                        ],
+                    },
+                }
+
+        monkeypatch.setattr(africastalking, 'SMS', FakeSms, raising=False)
+
+        results = AfricasTalkingSmsProvider().send("Hello", ['+256700000001', '+256700000002', '+256700000003'])
+
+        assert results['+256700000001'].success is True
+        assert results['+256700000001'].message_id == 'ATXid_1'
+        assert results['+256700000002'].permanent is True
+        assert results['+256700000003'].success is False
+        assert results['+256700000003'].permanent is False
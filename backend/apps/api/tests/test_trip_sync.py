@@ -0,0 +1,159 @@
+"""
+Tests for the pilgrim trip delta-sync endpoint.
+"""
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from apps.api.views.sync import CURSOR_VERSION
+from apps.trips.models import ChecklistItem, ItineraryItem, SyncTombstone, TripMilestone, TripPackage, TripUpdate
+from apps.trips.publishing import publish_due_content
+
+
+def sync(client, trip_id, cursor=None):
+    """Call the sync endpoint, optionally with a cursor."""
+    url = f'/api/v1/me/trips/{trip_id}/sync/'
+    params = {'cursor': cursor} if cursor else {}
+    return client.get(url, params)
+
+
+def encode_raw_cursor(state):
+    """Encode an arbitrary cursor payload the way the server does."""
+    raw = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+@pytest.mark.django_db
+class TestTripSync:
+    """Delta-sync coverage for the mobile trip bundle."""
+
+    def test_first_sync_returns_full_snapshot(self, authenticated_client, booking, flight, hotel):
+        """A cursor-less request should return every visible entity and a cursor."""
+        trip = booking.package.trip
+        ItineraryItem.objects.create(trip=trip, day_index=1, title="Departure briefing")
+        TripUpdate.objects.create(
+            trip=trip,
+            title="Visible update",
+            body_md="Live",
+            publish_at=timezone.now() - timedelta(minutes=5),
+        )
+        TripUpdate.objects.create(
+            trip=trip,
+            title="Scheduled update",
+            body_md="Later",
+            publish_at=timezone.now() + timedelta(days=1),
+        )
+        TripMilestone.objects.create(trip=trip, milestone_type='DARASA_ONE', is_public=False)
+
+        response = sync(authenticated_client, trip.id)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reset'] is True
+        assert response.data['cursor']
+        assert response.data['trip']['code'] == trip.code
+        assert response.data['package']['id'] == str(booking.package_id)
+        assert response.data['readiness'] is not None
+        assert [item['title'] for item in response.data['changes']['itinerary']] == ["Departure briefing"]
+        assert [item['title'] for item in response.data['changes']['updates']] == ["Visible update"]
+        assert response.data['changes']['milestones'] == []
+        assert len(response.data['changes']['flights']) == 1
+        assert len(response.data['changes']['hotels']) == 1
+
+    def test_warm_sync_returns_only_changes_and_tombstones(self, authenticated_client, booking):
+        """A cursor should limit the payload to changed rows and deletions."""
+        trip = booking.package.trip
+        kept = ItineraryItem.objects.create(trip=trip, day_index=1, title="Kept item")
+        removed = ItineraryItem.objects.create(trip=trip, day_index=2, title="Removed item")
+        milestone = TripMilestone.objects.create(trip=trip, milestone_type='DARASA_ONE', is_public=True)
+
+        first = sync(authenticated_client, trip.id)
+        cursor = first.data['cursor']
+
+        unchanged = sync(authenticated_client, trip.id, cursor)
+        assert unchanged.data['reset'] is False
+        assert unchanged.data['has_changes'] is False
+        assert unchanged.data['trip'] is None
+        assert unchanged.data['changes']['itinerary'] == []
+
+        kept.title = "Renamed item"
+        kept.save()
+        removed_id = str(removed.id)
+        removed.delete()
+        milestone.is_public = False
+        milestone.save()
+        ChecklistItem.objects.create(trip=trip, label="Pack ihram", category='PACKING')
+
+        delta = sync(authenticated_client, trip.id, unchanged.data['cursor'])
+
+        assert delta.data['reset'] is False
+        assert delta.data['has_changes'] is True
+        assert [item['title'] for item in delta.data['changes']['itinerary']] == ["Renamed item"]
+        assert delta.data['deleted']['itinerary'] == [removed_id]
+        assert delta.data['deleted']['milestones'] == [str(milestone.id)]
+        assert [item['label'] for item in delta.data['changes']['checklist']] == ["Pack ihram"]
+        assert SyncTombstone.objects.filter(entity='itinerary', object_id=removed_id).exists()
+
+    def test_scheduled_update_appears_once_it_becomes_visible(self, authenticated_client, booking):
+        """Updates published by the scheduler after the last sync should be delivered."""
+        trip = booking.package.trip
+        update = TripUpdate.objects.create(
+            trip=trip,
+            title="Boarding reminder",
+            body_md="Assemble at the lobby.",
+            publish_at=timezone.now() + timedelta(days=1),
+        )
+
+        first = sync(authenticated_client, trip.id)
+        assert first.data['changes']['updates'] == []
+
+        # The publish time passes and the scheduler flips the row live.
+        TripUpdate.objects.filter(pk=update.pk).update(publish_at=timezone.now() - timedelta(seconds=1))
+        publish_due_content()
+
+        delta = sync(authenticated_client, trip.id, first.data['cursor'])
+        assert [item['title'] for item in delta.data['changes']['updates']] == ["Boarding reminder"]
+
+    def test_other_package_content_and_invalid_cursors(self, authenticated_client, booking, currency_ugx):
+        """Package-scoped rows for other packages stay hidden and bad cursors force a reset."""
+        trip = booking.package.trip
+        other_package = TripPackage.objects.create(trip=trip, name="Premium", currency=currency_ugx)
+        ChecklistItem.objects.create(trip=trip, package=other_package, label="Premium lounge", category='OTHER')
+        ChecklistItem.objects.create(trip=trip, package=booking.package, label="Gold lounge", category='OTHER')
+
+        response = sync(authenticated_client, trip.id, 'not-a-cursor')
+
+        assert response.data['reset'] is True
+        assert [item['label'] for item in response.data['changes']['checklist']] == ["Gold lounge"]
+
+    def test_naive_cursor_timestamps_are_read_as_utc(self, authenticated_client, booking):
+        """A cursor with naive timestamps resumes a delta sync instead of failing."""
+        trip = booking.package.trip
+        as_of = timezone.now().replace(tzinfo=None).isoformat()
+        cursor = encode_raw_cursor({'v': CURSOR_VERSION, 'p': str(booking.package.id), 't': as_of, 'm': {'checklist': as_of}})
+
+        response = sync(authenticated_client, trip.id, cursor)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reset'] is False
+
+    @pytest.mark.parametrize('marks', [['checklist'], 'checklist'])
+    def test_cursor_marks_that_are_not_an_object_force_a_reset(self, authenticated_client, booking, marks):
+        """A cursor whose marks are not a mapping is treated as malformed."""
+        trip = booking.package.trip
+        as_of = timezone.now().isoformat()
+        cursor = encode_raw_cursor({'v': CURSOR_VERSION, 'p': str(booking.package.id), 't': as_of, 'm': marks})
+
+        response = sync(authenticated_client, trip.id, cursor)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reset'] is True
+
+    def test_sync_requires_a_booking(self, authenticated_client, trip):
+        """Pilgrims without an active booking cannot sync the trip."""
+        response = sync(authenticated_client, trip.id)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
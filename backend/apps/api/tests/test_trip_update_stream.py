@@ -0,0 +1,167 @@
+"""
+Tests for the live trip update server-sent event stream.
+"""
+import json
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncRequestFactory, RequestFactory
+from django.utils import timezone
+
+from apps.api.views.streams import trip_updates_stream
+from apps.common.realtime import get_broker, trip_updates_channel
+from apps.trips.models import TripPackage, TripUpdate
+
+
+def stream_request(trip_id, token=None, last_event_id=None, factory=AsyncRequestFactory):
+    """Build a GET request for the trip update stream, served over ASGI unless another factory is given."""
+    headers = {}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    if last_event_id:
+        headers['Last-Event-ID'] = last_event_id
+    return factory().get(f'/api/v1/me/trips/{trip_id}/updates/stream/', headers=headers)
+
+
+def parse_event(chunk):
+    """Return the JSON data of an SSE frame."""
+    text = chunk.decode() if isinstance(chunk, bytes) else chunk
+    data_line = next(line for line in text.splitlines() if line.startswith('data: '))
+    return json.loads(data_line[len('data: '):])
+
+
+@pytest.mark.django_db
+class TestTripUpdateStream:
+    """Live update stream coverage."""
+
+    def test_stream_pushes_newly_published_updates(
+        self,
+        booking,
+        pilgrim_tokens,
+        currency_ugx,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        """Published updates for the pilgrim's trip and package reach the open stream."""
+        settings.TRIP_UPDATE_STREAM_HEARTBEAT_SECONDS = 0.05
+        trip = booking.package.trip
+        other_package = TripPackage.objects.create(trip=trip, name="Premium", currency=currency_ugx)
+
+        def publish_updates():
+            with django_capture_on_commit_callbacks(execute=True):
+                TripUpdate.objects.create(
+                    trip=trip,
+                    package=other_package,
+                    title="Premium lounge",
+                    body_md="Only for premium.",
+                    publish_at=timezone.now(),
+                )
+                TripUpdate.objects.create(
+                    trip=trip,
+                    title="Buses leave at 9",
+                    body_md="Meet in the lobby.",
+                    publish_at=timezone.now(),
+                )
+
+        async def consume():
+            response = await trip_updates_stream(stream_request(trip.id, pilgrim_tokens['access']), trip_id=trip.id)
+            assert response.status_code == 200
+            assert response['Content-Type'] == 'text/event-stream'
+
+            events = response.streaming_content.__aiter__()
+            assert (await events.__anext__()).startswith(b'retry:')
+
+            await sync_to_async(publish_updates)()
+
+            chunks = []
+            while not any(b'event: trip_update' in chunk for chunk in chunks):
+                chunks.append(await events.__anext__())
+            await events.aclose()
+            return chunks
+
+        chunks = async_to_sync(consume)()
+        updates = [parse_event(chunk) for chunk in chunks if b'event: trip_update' in chunk]
+
+        assert [update['title'] for update in updates] == ["Buses leave at 9"]
+        assert trip_updates_channel(trip.id) not in get_broker()._subscribers
+
+    def test_stream_replays_missed_updates_and_sends_heartbeats(self, booking, pilgrim_tokens, settings):
+        """Reconnecting clients receive updates since their last event id, then keep-alives."""
+        settings.TRIP_UPDATE_STREAM_HEARTBEAT_SECONDS = 0.01
+        trip = booking.package.trip
+        TripUpdate.objects.create(
+            trip=trip,
+            title="Missed update",
+            body_md="Sent while offline.",
+            publish_at=timezone.now() - timedelta(minutes=5),
+        )
+        since = (timezone.now() - timedelta(minutes=10)).isoformat()
+
+        async def consume():
+            request = stream_request(trip.id, pilgrim_tokens['access'], last_event_id=since)
+            response = await trip_updates_stream(request, trip_id=trip.id)
+            events = response.streaming_content.__aiter__()
+            chunks = [await events.__anext__() for _ in range(3)]
+            await events.aclose()
+            return chunks
+
+        retry, replayed, heartbeat = async_to_sync(consume)()
+
+        assert retry.startswith(b'retry:')
+        assert parse_event(replayed)['title'] == "Missed update"
+        assert heartbeat == b': keep-alive\n\n'
+
+    def test_stream_resumes_after_the_last_event_id(self, booking, pilgrim_tokens, settings):
+        """Reconnecting with the last event id replays only later updates, and edits get a new id."""
+        settings.TRIP_UPDATE_STREAM_HEARTBEAT_SECONDS = 0.01
+        trip = booking.package.trip
+        publish_at = timezone.now() - timedelta(minutes=5)
+        seen = TripUpdate.objects.create(trip=trip, title="Seen", body_md="Already delivered.", publish_at=publish_at)
+        TripUpdate.objects.create(trip=trip, title="Missed", body_md="Same publish time.", publish_at=publish_at)
+        since = (timezone.now() - timedelta(minutes=10)).isoformat()
+
+        def consume(last_event_id, count):
+            async def run():
+                request = stream_request(trip.id, pilgrim_tokens['access'], last_event_id=last_event_id)
+                response = await trip_updates_stream(request, trip_id=trip.id)
+                events = response.streaming_content.__aiter__()
+                chunks = [await events.__anext__() for _ in range(count)]
+                await events.aclose()
+                return chunks[1:]
+            return async_to_sync(run)()
+
+        def event_id(chunk):
+            return next(line for line in chunk.decode().splitlines() if line.startswith('id: '))[len('id: '):]
+
+        first, second = consume(since, 3)
+        ids = {parse_event(chunk)['title']: event_id(chunk) for chunk in (first, second)}
+        assert set(ids) == {"Seen", "Missed"}
+
+        resumed, heartbeat = consume(event_id(first), 3)
+        assert parse_event(resumed)['title'] == parse_event(second)['title']
+        assert heartbeat == b': keep-alive\n\n'
+
+        seen.title = "Seen (edited)"
+        seen.save()
+        edited = {parse_event(chunk)['title']: event_id(chunk) for chunk in consume(since, 3)}
+        assert edited["Seen (edited)"] != ids["Seen"]
+
+    def test_stream_rejects_anonymous_and_unbooked_pilgrims(self, trip, pilgrim_tokens):
+        """The stream applies the same access rules as the polling endpoint."""
+        anonymous = async_to_sync(trip_updates_stream)(stream_request(trip.id), trip_id=trip.id)
+        assert anonymous.status_code == 401
+
+        unbooked = async_to_sync(trip_updates_stream)(
+            stream_request(trip.id, pilgrim_tokens['access']),
+            trip_id=trip.id,
+        )
+        assert unbooked.status_code == 403
+
+    def test_stream_is_refused_under_a_wsgi_worker(self, booking, pilgrim_tokens):
+        """A sync worker would be pinned for the stream's lifetime, so clients are told to poll."""
+        request = stream_request(booking.package.trip_id, pilgrim_tokens['access'], factory=RequestFactory)
+
+        response = async_to_sync(trip_updates_stream)(request, trip_id=booking.package.trip_id)
+
+        assert response.status_code == 503
@@ -0,0 +1,164 @@
+"""
+Bulk writes of a trip's content graph.
+
+The admin dashboard and importers can send a trip's packages (with their
+flights and hotels), itinerary and milestones in one request instead of one
+POST per row. Every item is validated with the admin serializers first; only
+when all of them pass is the graph written with ``bulk_create`` in a single
+transaction, so a payload lands completely or not at all.
+"""
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history
+
+from apps.api.offline_packs import schedule_offline_pack_rebuild
+from apps.api.serializers.admin import (
+    BulkItineraryItemSerializer,
+    BulkPackageFlightSerializer,
+    BulkPackageHotelSerializer,
+    BulkPackageSerializer,
+    BulkTripMilestoneSerializer,
+)
+from apps.trips.models import ItineraryItem, PackageFlight, PackageHotel, TripMilestone, TripPackage
+
+# Upper bound on items across the whole payload.
+MAX_BULK_ITEMS = 2000
+
+
+class TripContentGraph:
+    """
+    Validated, unsaved content for one trip.
+
+    Built by ``validate``; ``errors`` lists ``{'path': ..., 'errors': ...}``
+    entries, one per rejected item, with paths such as
+    ``packages[1].flights[0]``.
+    """
+
+    def __init__(self, trip):
+        self.trip = trip
+        self.errors = []
+        self.packages = []
+        self.flights = []
+        self.hotels = []
+        self.itinerary_items = []
+        self.milestones = []
+        self._package_refs = {}
+
+    @classmethod
+    def validate(cls, trip, data):
+        """Validate a bulk payload for ``trip`` and return the graph."""
+        graph = cls(trip)
+        if not isinstance(data, dict):
+            graph.errors.append({'path': '', 'errors': ['Expected an object of content sections']})
+            return graph
+
+        sections = {
+            name: data.get(name) or []
+            for name in ('packages', 'itinerary_items', 'milestones')
+        }
+        for name, items in sections.items():
+            if not isinstance(items, list):
+                graph.errors.append({'path': name, 'errors': ['Expected a list']})
+                sections[name] = []
+
+        total = sum(len(items) for items in sections.values()) + sum(
+            len(item.get('flights') or []) + len(item.get('hotels') or [])
+            for item in sections['packages']
+            if isinstance(item, dict)
+        )
+        if total > MAX_BULK_ITEMS:
+            graph.errors.append({'path': '', 'errors': [f'At most {MAX_BULK_ITEMS} items can be written at once']})
+            return graph
+
+        for index, item in enumerate(sections['packages']):
+            graph._add_package(f'packages[{index}]', item)
+        for index, item in enumerate(sections['itinerary_items']):
+            attrs = graph._validated(BulkItineraryItemSerializer, f'itinerary_items[{index}]', item)
+            if attrs is not None:
+                graph.itinerary_items.append(ItineraryItem(trip=trip, **attrs))
+        for index, item in enumerate(sections['milestones']):
+            graph._add_milestone(f'milestones[{index}]', item)
+        return graph
+
+    @property
+    def is_valid(self):
+        return not self.errors
+
+    def _validated(self, serializer_class, path, item):
+        """Return the item's validated data, or record its errors and return None."""
+        if not isinstance(item, dict):
+            self.errors.append({'path': path, 'errors': ['Expected an object']})
+            return None
+        serializer = serializer_class(data=item)
+        if not serializer.is_valid():
+            self.errors.append({'path': path, 'errors': serializer.errors})
+            return None
+        return dict(serializer.validated_data)
+
+    def _add_package(self, path, item):
+        children = {}
+        if isinstance(item, dict):
+            item = dict(item)
+            children = {'flights': item.pop('flights', None) or [], 'hotels': item.pop('hotels', None) or []}
+
+        attrs = self._validated(BulkPackageSerializer, path, item)
+        package = None
+        if attrs is not None:
+            ref = attrs.pop('ref', None)
+            package = TripPackage(trip=self.trip, **attrs)
+            if ref in self._package_refs:
+                self.errors.append({'path': path, 'errors': {'ref': [f'Duplicate package ref "{ref}"']}})
+            elif ref:
+                self._package_refs[ref] = package
+            self.packages.append(package)
+
+        # Children are validated even when their package is not, so every error is reported at once.
+        for model, serializer_class, rows, name in (
+            (PackageFlight, BulkPackageFlightSerializer, self.flights, 'flights'),
+            (PackageHotel, BulkPackageHotelSerializer, self.hotels, 'hotels'),
+        ):
+            for index, child in enumerate(children.get(name, [])):
+                child_attrs = self._validated(serializer_class, f'{path}.{name}[{index}]', child)
+                if child_attrs is not None and package is not None:
+                    rows.append(model(package=package, **child_attrs))
+
+    def _add_milestone(self, path, item):
+        attrs = self._validated(BulkTripMilestoneSerializer, path, item)
+        if attrs is None:
+            return
+
+        ref = attrs.pop('package_ref', None)
+        if ref:
+            if ref not in self._package_refs:
+                self.errors.append({'path': path, 'errors': {'package_ref': [f'Unknown package ref "{ref}"']}})
+                return
+            attrs['package'] = self._package_refs[ref]
+        elif attrs.get('package') and attrs['package'].trip_id != self.trip.id:
+            self.errors.append({'path': path, 'errors': ["Milestone package must belong to the selected trip"]})
+            return
+        self.milestones.append(TripMilestone(trip=self.trip, **attrs))
+
+    @transaction.atomic
+    def write(self, user=None):
+        """Insert the validated graph with one ``bulk_create`` per model."""
+        bulk_create_with_history(self.packages, TripPackage, default_user=user)
+        PackageFlight.objects.bulk_create(self.flights)
+        PackageHotel.objects.bulk_create(self.hotels)
+        ItineraryItem.objects.bulk_create(self.itinerary_items)
+        TripMilestone.objects.bulk_create(self.milestones)
+
+        # bulk_create skips the post_save signals that refresh offline packs.
+        schedule_offline_pack_rebuild(trip_id=self.trip.id)
+
+    def summary(self):
+        """Created counts per model plus the ids assigned to package refs."""
+        return {
+            'created': {
+                'packages': len(self.packages),
+                'flights': len(self.flights),
+                'hotels': len(self.hotels),
+                'itinerary_items': len(self.itinerary_items),
+                'milestones': len(self.milestones),
+            },
+            'package_refs': {ref: str(package.id) for ref, package in self._package_refs.items()},
+            'package_ids': [str(package.id) for package in self.packages],
+        }
@@ -38,15 +38,26 @@ from .views.admin import (
     AdminUserListView, AdminUserDetailView, AdminUserChangePasswordView
 )
 from .views.documents import DocumentViewSet, MyDocumentsListView, MyDocumentDetailView
-from .views.admin.pilgrim_import import download_template, validate_import, import_pilgrims
+from .views.admin.pilgrim_import import (
+    download_template,
+    validate_import,
+    commit_import,
+    import_pilgrims,
+    import_job_status,
+    resume_import_job_view,
+)
+from .views.streams import trip_updates_stream
+from .views.sync import TripSyncView
 from .views.platform import PlatformSettingsView, PublicVideoFeedView
 from .views.leads import PublicWebsiteLeadCreateView
+from .views.uploads import DirectUploadFinalizeView, DirectUploadSignView
 from .views.support import (
     DeviceInstallationDetailView,
     DeviceInstallationListView,
     NotificationPreferenceView,
     TripDailyProgramView,
     TripFeedbackView,
+    TripOfflinePackView,
 )
 
 app_name = 'api'
@@ -79,6 +90,8 @@ urlpatterns = [
     
     # Common utilities
     path('common/', include('apps.common.urls')),
+    path('uploads/sign/', DirectUploadSignView.as_view(), name='upload-sign'),
+    path('uploads/finalize/', DirectUploadFinalizeView.as_view(), name='upload-finalize'),
     
     # Public endpoints (no authentication required)
     path('public/trips/', PublicTripListView.as_view(), name='public-trips'),
@@ -121,12 +134,15 @@ urlpatterns = [
     path('me/trips/<uuid:pk>/', TripDetailView.as_view(), name='my-trip-detail'),
     path('me/trips/<uuid:trip_id>/itinerary/', TripItineraryView.as_view(), name='my-trip-itinerary'),
     path('me/trips/<uuid:trip_id>/updates/', TripUpdatesView.as_view(), name='my-trip-updates'),
+    path('me/trips/<uuid:trip_id>/updates/stream/', trip_updates_stream, name='my-trip-updates-stream'),
     path('me/trips/<uuid:trip_id>/essentials/', TripEssentialsView.as_view(), name='my-trip-essentials'),
     path('me/trips/<uuid:trip_id>/milestones/', TripMilestonesView.as_view(), name='my-trip-milestones'),
     path('me/trips/<uuid:trip_id>/resources/', TripResourcesView.as_view(), name='my-trip-resources'),
     path('me/trips/<uuid:trip_id>/readiness/', TripReadinessView.as_view(), name='my-trip-readiness'),
     path('me/trips/<uuid:trip_id>/daily-program/', TripDailyProgramView.as_view(), name='my-trip-daily-program'),
+    path('me/trips/<uuid:trip_id>/offline-pack/', TripOfflinePackView.as_view(), name='my-trip-offline-pack'),
     path('me/trips/<uuid:trip_id>/feedback/', TripFeedbackView.as_view(), name='my-trip-feedback'),
+    path('me/trips/<uuid:trip_id>/sync/', TripSyncView.as_view(), name='my-trip-sync'),
     
     # Package endpoints (pilgrim-facing)
     path('me/packages/<uuid:pk>/', PackageDetailView.as_view(), name='my-package-detail'),
@@ -145,7 +161,10 @@ urlpatterns = [
     # Admin Pilgrim Import (staff only)
     path('pilgrims/import/template/', download_template, name='pilgrim-import-template'),
     path('pilgrims/import/validate/', validate_import, name='pilgrim-import-validate'),
+    path('pilgrims/import/commit/', commit_import, name='pilgrim-import-commit'),
     path('pilgrims/import/', import_pilgrims, name='pilgrim-import'),
+    path('pilgrims/import/jobs/<uuid:job_id>/', import_job_status, name='pilgrim-import-job'),
+    path('pilgrims/import/jobs/<uuid:job_id>/resume/', resume_import_job_view, name='pilgrim-import-job-resume'),
     
     # Admin ViewSets (staff only) - registered via router
     path('', include(router.urls)),
@@ -2,6 +2,7 @@
 Admin ViewSet for Booking management.
 Staff can create, read, update, delete bookings.
 """
+from django.db import transaction
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -10,6 +11,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from apps.bookings.models import Booking, Payment
 from apps.api.serializers.admin import AdminBookingListSerializer, AdminBookingDetailSerializer, AdminPaymentSerializer
+from apps.common.activity import record_booking_created, record_payment_recorded
 from apps.common.permissions import StaffActionRolePermission, StaffRoleAccessMixin, user_has_staff_role
 
 
@@ -99,6 +101,12 @@ class AdminBookingViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
+    def perform_create(self, serializer):
+        """Save the booking and log it to the activity feed."""
+        with transaction.atomic():
+            booking = serializer.save()
+            record_booking_created(booking, actor=self.request.user)
+    
     def update(self, request, *args, **kwargs):
         """Update a booking."""
         return super().update(request, *args, **kwargs)
@@ -156,7 +164,9 @@ class AdminBookingViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         )
         
         if serializer.is_valid():
-            serializer.save(booking=booking)
+            with transaction.atomic():
+                payment = serializer.save(booking=booking)
+                record_payment_recorded(payment, actor=request.user)
             # Refresh booking to get updated payment status
             booking.refresh_from_db()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
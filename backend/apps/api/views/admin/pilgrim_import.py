@@ -3,21 +3,34 @@ Pilgrim Import API Views for Admin Dashboard.
 
 Provides functionality to:
 1. Download a template Excel file for bulk pilgrim import
-2. Upload and process Excel file to import pilgrims
+2. Validate an Excel file and stage its rows in an import session
+3. Commit a staged session, or upload and import a file in one step
+4. Follow and resume the background jobs that write the imports
 """
 
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.http import HttpResponse
-from django.db import transaction
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from datetime import datetime
 import io
 
-from apps.accounts.models import Account, PilgrimProfile
+from apps.accounts.import_jobs import resume_import_job, start_import_job
+from apps.accounts.importing import (
+    ImportFileError,
+    ImportSessionError,
+    claim_import_session,
+    commit_import_session,
+    pack_rows,
+    read_workbook_rows,
+    stage_import,
+    validate_rows,
+)
+from apps.accounts.models import PilgrimImportJob, PilgrimImportSession
 from apps.common.permissions import STAFF_WRITE_ROLES, IsStaff, user_has_staff_role
 
 
@@ -172,10 +185,11 @@ def validate_import(request):
     Validate pilgrim import file and check for duplicates.
     
     This is step 1 of a 2-phase import process:
-    1. Validate & Preview - Parse file, check duplicates, return preview
-    2. Confirm Import - Actually create the records
+    1. Validate & Preview - Parse file, check duplicates, stage the rows, return preview
+    2. Confirm Import - Create the staged records with ``commit_import``
     
     Returns:
+    - session_id: Id of the staged import for the commit step
     - valid_rows: Rows that can be imported
     - duplicate_rows: Rows that match existing pilgrims
     - error_rows: Rows with validation errors
@@ -202,170 +216,81 @@ def validate_import(request):
         )
     
     try:
-        # Load workbook
-        wb = load_workbook(file, read_only=False, data_only=True)
-        ws = wb.active
-        
-        # Validate headers
-        expected_headers = [
-            'Full Name*',
-            'Passport Number*',
-            'Phone Number*',
-            'Date of Birth (YYYY-MM-DD)',
-            'Gender (MALE/FEMALE/OTHER)',
-            'Nationality (2-letter code)',
-            'Address',
-            'Emergency Contact Name',
-            'Emergency Contact Phone',
-            'Emergency Relationship',
-            'Medical Conditions',
-        ]
-        
-        actual_headers = [cell.value for cell in ws[1]]
-        
-        for i, expected in enumerate(expected_headers):
-            if i >= len(actual_headers) or actual_headers[i] != expected:
-                return Response(
-                    {
-                        'error': f'Invalid template format. Expected header "{expected}" at column {i+1}',
-                        'hint': 'Please download the latest template and try again'
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        valid_rows = []
-        duplicate_rows = []
-        error_rows = []
-        
-        # Get existing phone numbers and passport numbers for duplicate checking
-        existing_phones = set(Account.objects.filter(role='PILGRIM').values_list('phone', flat=True))
-        existing_passports = set(PilgrimProfile.objects.exclude(passport_number='').values_list('passport_number', flat=True))
-        
-        # Process each row (skip header row)
-        for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-            # Skip empty rows
-            if not any(row):
-                continue
-            
-            # Extract fields
-            full_name = row[0]
-            passport_number = row[1]
-            phone = row[2]
-            dob_str = row[3]
-            gender_str = row[4]
-            nationality = row[5]
-            address = row[6]
-            emergency_name = row[7]
-            emergency_phone = row[8]
-            emergency_relationship = row[9]
-            medical_conditions = row[10]
-            
-            row_errors = []
-            row_warnings = []
-            duplicate_type = None
-            
-            # Validate required fields
-            if not full_name or str(full_name).strip() == '':
-                row_errors.append('Full Name is required')
-            
-            if not passport_number or str(passport_number).strip() == '':
-                row_errors.append('Passport Number is required')
-            else:
-                passport_number = str(passport_number).strip()
-            
-            if not phone or str(phone).strip() == '':
-                row_errors.append('Phone Number is required')
-            else:
-                phone = str(phone).strip()
-                # Basic phone validation
-                if not phone.startswith('+'):
-                    row_warnings.append('Phone should include country code (e.g., +256...)')
-            
-            # Parse date of birth
-            dob = None
-            if dob_str:
-                try:
-                    if isinstance(dob_str, datetime):
-                        dob = dob_str.date()
-                    else:
-                        dob = datetime.strptime(str(dob_str), '%Y-%m-%d').date()
-                except ValueError:
-                    row_errors.append(f'Invalid date format: {dob_str}. Expected YYYY-MM-DD')
-            
-            # Validate gender
-            gender = None
-            if gender_str:
-                gender_upper = str(gender_str).strip().upper()
-                if gender_upper not in ['MALE', 'FEMALE', 'OTHER']:
-                    row_errors.append(f'Invalid gender: {gender_str}. Must be MALE, FEMALE, or OTHER')
-                else:
-                    gender = gender_upper
-            
-            # Validate nationality (2-letter code)
-            if nationality and len(str(nationality).strip()) != 2:
-                row_warnings.append(f'Nationality should be 2-letter country code, got: {nationality}')
-            
-            # Check for duplicates
-            if phone and phone in existing_phones:
-                duplicate_type = 'phone'
-                row_warnings.append(f'Phone number {phone} already exists')
-            
-            if passport_number and passport_number in existing_passports:
-                if duplicate_type:
-                    duplicate_type = 'both'
-                else:
-                    duplicate_type = 'passport'
-                row_warnings.append(f'Passport number {passport_number} already exists')
-            
-            # Build row data
-            row_data = {
-                'row_number': row_num,
-                'full_name': full_name,
-                'passport_number': passport_number,
-                'phone': phone,
-                'dob': str(dob) if dob else None,
-                'gender': gender,
-                'nationality': nationality,
-                'address': address,
-                'emergency_name': emergency_name,
-                'emergency_phone': emergency_phone,
-                'emergency_relationship': emergency_relationship,
-                'medical_conditions': medical_conditions,
-                'errors': row_errors,
-                'warnings': row_warnings,
-                'duplicate_type': duplicate_type,
-            }
-            
-            # Categorize row
-            if row_errors:
-                error_rows.append(row_data)
-            elif duplicate_type:
-                duplicate_rows.append(row_data)
-            else:
-                valid_rows.append(row_data)
-        
-        # Prepare response
-        response_data = {
-            'success': True,
-            'summary': {
-                'total': len(valid_rows) + len(duplicate_rows) + len(error_rows),
-                'valid': len(valid_rows),
-                'duplicates': len(duplicate_rows),
-                'errors': len(error_rows),
+        session, rows = stage_import(read_workbook_rows(file), created_by=request.user, file_name=file.name)
+    except ImportFileError as exc:
+        return Response(
+            {
+                'error': str(exc),
+                'hint': 'Please download the latest template and try again'
             },
-            'valid_rows': valid_rows,
-            'duplicate_rows': duplicate_rows,
-            'error_rows': error_rows,
-            'message': f'Found {len(valid_rows)} valid row(s), {len(duplicate_rows)} duplicate(s), {len(error_rows)} error(s)'
-        }
-        
-        return Response(response_data, status=status.HTTP_200_OK)
-        
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return Response(
             {'error': f'Failed to process file: {str(e)}'},
             status=status.HTTP_400_BAD_REQUEST
         )
+    
+    valid_rows = []
+    duplicate_rows = []
+    error_rows = []
+    for row in rows:
+        row['dob'] = str(row['dob']) if row['dob'] else None
+        if row['errors']:
+            error_rows.append(row)
+        elif row['duplicate_type']:
+            duplicate_rows.append(row)
+        else:
+            valid_rows.append(row)
+    
+    # Prepare response
+    response_data = {
+        'success': True,
+        'session_id': str(session.id),
+        'summary': session.summary,
+        'valid_rows': valid_rows,
+        'duplicate_rows': duplicate_rows,
+        'error_rows': error_rows,
+        'message': f'Found {len(valid_rows)} valid row(s), {len(duplicate_rows)} duplicate(s), {len(error_rows)} error(s)'
+    }
+    
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsStaff])
+def commit_import(request):
+    """
+    Import the rows staged by ``validate_import``.
+    
+    This is step 2 of the 2-phase import process. No file is uploaded and
+    nothing is re-validated; the staged rows are written as they were previewed.
+    
+    Expected body:
+    - session_id: Id returned by the validate step
+    - exclude_rows: Optional list of sheet row numbers the operator deselected
+    
+    Returns the same shape as ``import_pilgrims``.
+    """
+    if not user_has_staff_role(request.user, STAFF_WRITE_ROLES):
+        return Response(
+            {'error': 'You do not have permission to manage pilgrim imports.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    exclude_rows = request.data.get('exclude_rows') or []
+    try:
+        exclude_rows = [int(row_number) for row_number in exclude_rows]
+        session = claim_import_session(request.data.get('session_id'), created_by=request.user)
+    except (TypeError, ValueError, DjangoValidationError):
+        return Response({'error': 'Invalid session_id or exclude_rows'}, status=status.HTTP_400_BAD_REQUEST)
+    except PilgrimImportSession.DoesNotExist:
+        return Response({'error': 'Import session not found'}, status=status.HTTP_404_NOT_FOUND)
+    except ImportSessionError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+    
+    job = commit_import_session(session, exclude_rows=exclude_rows, created_by=request.user)
+    return _job_response(job)
 
 
 @api_view(['POST'])
@@ -407,163 +332,111 @@ def import_pilgrims(request):
         )
     
     try:
-        # Load workbook
-        wb = load_workbook(file, read_only=False, data_only=True)
-        ws = wb.active
-        
-        # Validate headers (first row)
-        expected_headers = [
-            'Full Name*',
-            'Passport Number*',
-            'Phone Number*',
-            'Date of Birth (YYYY-MM-DD)',
-            'Gender (MALE/FEMALE/OTHER)',
-            'Nationality (2-letter code)',
-            'Address',
-            'Emergency Contact Name',
-            'Emergency Contact Phone',
-            'Emergency Relationship',
-            'Medical Conditions',
-        ]
-        
-        actual_headers = [cell.value for cell in ws[1]]
-        
-        # Check if headers match (allowing for extra columns)
-        for i, expected in enumerate(expected_headers):
-            if i >= len(actual_headers) or actual_headers[i] != expected:
-                return Response(
-                    {
-                        'error': f'Invalid template format. Expected header "{expected}" at column {i+1}',
-                        'hint': 'Please download the latest template and try again'
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        # Process rows
-        imported_count = 0
-        errors = []
-        warnings = []
-        
-        # Start transaction
-        with transaction.atomic():
-            for row_num in range(2, ws.max_row + 1):
-                row = ws[row_num]
-                
-                # Skip empty rows
-                if all(cell.value is None or str(cell.value).strip() == '' for cell in row):
-                    continue
-                
-                try:
-                    # Extract data
-                    full_name = str(row[0].value).strip() if row[0].value else None
-                    passport_number = str(row[1].value).strip() if row[1].value else None
-                    phone = str(row[2].value).strip() if row[2].value else None
-                    dob_value = row[3].value
-                    gender = str(row[4].value).strip().upper() if row[4].value else None
-                    nationality = str(row[5].value).strip().upper() if row[5].value else None
-                    address = str(row[6].value).strip() if row[6].value else None
-                    emergency_name = str(row[7].value).strip() if row[7].value else None
-                    emergency_phone = str(row[8].value).strip() if row[8].value else None
-                    emergency_relationship = str(row[9].value).strip() if row[9].value else None
-                    medical_conditions = str(row[10].value).strip() if row[10].value else None
-                    
-                    # Validate required fields
-                    if not full_name:
-                        errors.append(f"Row {row_num}: Full Name is required")
-                        continue
-                    
-                    if not passport_number:
-                        errors.append(f"Row {row_num}: Passport Number is required")
-                        continue
-                    
-                    if not phone:
-                        errors.append(f"Row {row_num}: Phone Number is required")
-                        continue
-                    
-                    # Validate and parse date of birth
-                    dob = None
-                    if dob_value:
-                        try:
-                            if isinstance(dob_value, datetime):
-                                dob = dob_value.date()
-                            elif isinstance(dob_value, str):
-                                dob = datetime.strptime(dob_value, '%Y-%m-%d').date()
-                        except ValueError:
-                            errors.append(f"Row {row_num}: Invalid date format for Date of Birth. Use YYYY-MM-DD")
-                            continue
-                    
-                    # Validate gender
-                    if gender and gender not in ['MALE', 'FEMALE', 'OTHER']:
-                        errors.append(f"Row {row_num}: Gender must be MALE, FEMALE, or OTHER")
-                        continue
-                    
-                    # Validate nationality (2-letter code)
-                    if nationality and len(nationality) != 2:
-                        errors.append(f"Row {row_num}: Nationality must be a 2-letter ISO country code")
-                        continue
-                    
-                    # Check for duplicate passport number
-                    if PilgrimProfile.objects.filter(passport_number=passport_number).exists():
-                        errors.append(f"Row {row_num}: Passport Number '{passport_number}' already exists")
-                        continue
-                    
-                    # Check for duplicate phone
-                    if PilgrimProfile.objects.filter(phone=phone).exists():
-                        errors.append(f"Row {row_num}: Phone Number '{phone}' already exists")
-                        continue
-                    
-                    # Check if account with this phone exists
-                    if Account.objects.filter(phone=phone).exists():
-                        errors.append(f"Row {row_num}: An account with phone '{phone}' already exists")
-                        continue
-                    
-                    # Create Account
-                    account = Account.objects.create_user(
-                        phone=phone,
-                        name=full_name,
-                        role='PILGRIM',
-                        is_staff=False
-                    )
-                    
-                    # Create PilgrimProfile
-                    pilgrim = PilgrimProfile.objects.create(
-                        user=account,
-                        full_name=full_name,
-                        passport_number=passport_number,
-                        phone=phone,
-                        dob=dob,
-                        gender=gender,
-                        nationality=nationality,
-                        address=address or '',
-                        emergency_name=emergency_name or '',
-                        emergency_phone=emergency_phone or '',
-                        emergency_relationship=emergency_relationship or '',
-                        medical_conditions=medical_conditions or '',
-                        created_by=request.user
-                    )
-                    
-                    imported_count += 1
-                    
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
-                    continue
-        
-        # Prepare response
-        response_data = {
-            'success': imported_count > 0,
-            'imported': imported_count,
-            'errors': errors,
-            'warnings': warnings,
-            'message': f'Successfully imported {imported_count} pilgrim(s)'
-        }
-        
-        if errors:
-            response_data['message'] = f'Imported {imported_count} pilgrim(s) with {len(errors)} error(s)'
-        
-        return Response(response_data, status=status.HTTP_200_OK)
-        
+        valid_rows, errors = validate_rows(read_workbook_rows(file))
+    except ImportFileError as exc:
+        return Response(
+            {
+                'error': str(exc),
+                'hint': 'Please download the latest template and try again'
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return Response(
             {'error': f'Failed to process file: {str(e)}'},
             status=status.HTTP_400_BAD_REQUEST
         )
+    
+    job = start_import_job(
+        'EXCEL', pack_rows(valid_rows), created_by=request.user, file_name=file.name, errors=errors
+    )
+    return _job_response(job)
+
+
+def _job_payload(job):
+    """Progress of an import job as returned by the job endpoints."""
+    return {
+        'id': str(job.id),
+        'kind': job.kind,
+        'status': job.status,
+        'file_name': job.file_name,
+        'total_rows': job.total_rows,
+        'processed': job.processed_count,
+        'created': job.created_count,
+        'updated': job.updated_count,
+        'failed': job.failed_count,
+        'progress': round(job.processed_count * 100 / job.total_rows) if job.total_rows else 100,
+        'error_message': job.error_message,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+
+
+def _job_response(job):
+    """
+    Respond to an import request with its job.
+
+    Finished jobs (always the case with eager Celery) keep the original
+    synchronous response shape with a 200; queued ones answer 202 and the
+    client polls ``import_job_status``.
+    """
+    response_data = {
+        'success': job.created_count > 0,
+        'imported': job.created_count,
+        'errors': job.errors,
+        'warnings': [],
+        'message': f'Successfully imported {job.created_count} pilgrim(s)',
+        'job': _job_payload(job),
+    }
+    
+    if not job.is_finished:
+        response_data['message'] = f'Importing {job.total_rows} pilgrim(s) in the background'
+        return Response(response_data, status=status.HTTP_202_ACCEPTED)
+    
+    if job.status == 'FAILED':
+        response_data['message'] = f'Import stopped after {job.created_count} pilgrim(s): {job.error_message}'
+    elif job.errors:
+        response_data['message'] = f'Imported {job.created_count} pilgrim(s) with {len(job.errors)} error(s)'
+    
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStaff])
+def import_job_status(request, job_id):
+    """
+    Report the progress of a pilgrim import job.
+    
+    Returns the job's counters plus the row errors collected so far.
+    """
+    try:
+        job = PilgrimImportJob.objects.get(pk=job_id)
+    except PilgrimImportJob.DoesNotExist:
+        return Response({'error': 'Import job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response({**_job_payload(job), 'errors': job.errors}, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsStaff])
+def resume_import_job_view(request, job_id):
+    """
+    Resume a failed pilgrim import job from its last committed chunk.
+    """
+    if not user_has_staff_role(request.user, STAFF_WRITE_ROLES):
+        return Response(
+            {'error': 'You do not have permission to manage pilgrim imports.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    try:
+        job = PilgrimImportJob.objects.get(pk=job_id)
+    except PilgrimImportJob.DoesNotExist:
+        return Response({'error': 'Import job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if not resume_import_job(job):
+        return Response({'error': 'Only failed import jobs can be resumed'}, status=status.HTTP_409_CONFLICT)
+    
+    job.refresh_from_db()
+    return _job_response(job)
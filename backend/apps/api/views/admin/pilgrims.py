@@ -6,6 +6,7 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 
@@ -16,6 +17,8 @@ from apps.api.serializers.admin import (
     AdminPilgrimDetailSerializer,
     AdminPilgrimReadinessSerializer,
 )
+from apps.common.activity import record_readiness_validated
+from apps.common.filters import BlindIndexSearchFilter
 from apps.common.permissions import StaffActionRolePermission, StaffRoleAccessMixin, user_has_staff_role
 from apps.pilgrims.models import Document, PilgrimReadiness
 
@@ -32,9 +35,10 @@ class AdminPilgrimViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated, StaffActionRolePermission]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BlindIndexSearchFilter, filters.OrderingFilter]
     filterset_fields = ['nationality', 'gender']
-    search_fields = ['user__name', 'user__phone', 'user__email', 'full_name', 'passport_number', 'phone']
+    search_fields = ['user__name', 'user__phone', 'user__email', 'full_name', 'phone']
+    blind_index_search_fields = ['passport_number_index']
     ordering_fields = ['created_at', 'user__name', 'full_name']
     ordering = ['-created_at']
     
@@ -237,7 +241,9 @@ class AdminPilgrimReadinessViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         readiness.validated_at = timezone.now()
         if request.data.get('validation_notes'):
             readiness.validation_notes = request.data['validation_notes']
-        readiness.refresh_status(save=True)
+        with transaction.atomic():
+            readiness.refresh_status(save=True)
+            record_readiness_validated(readiness, actor=request.user)
 
         serializer = self.get_serializer(readiness)
         return Response(serializer.data)
@@ -1,7 +1,6 @@
 """
 Admin ViewSets for Trip content: Updates, Guides, Checklists, Contacts, FAQs.
 """
-from django.db import models
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -196,12 +195,7 @@ class AdminTripResourceViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         published_filter = self.request.query_params.get('published')
 
         if published_filter is not None:
-            is_published = published_filter.lower() == 'true'
-            now = timezone.now()
-            if is_published:
-                queryset = queryset.filter(published_at__isnull=False, published_at__lte=now)
-            else:
-                queryset = queryset.filter(models.Q(published_at__isnull=True) | models.Q(published_at__gt=now))
+            queryset = queryset.filter(is_published=published_filter.lower() == 'true')
 
         return queryset
 
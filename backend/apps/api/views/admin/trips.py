@@ -8,8 +8,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.api.trip_content_bulk import TripContentGraph
 from apps.trips.models import Trip
-from apps.api.serializers.admin import AdminTripListSerializer, AdminTripDetailSerializer
+from apps.api.serializers.admin import AdminTripListSerializer, AdminTripDetailSerializer, TripCloneSerializer
+from apps.trips.cloning import clone_trip
 from apps.common.permissions import StaffActionRolePermission, StaffRoleAccessMixin, user_has_staff_role
 
 
@@ -22,6 +24,10 @@ class AdminTripViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
     retrieve: GET /trips/:id - Get trip details
     update: PATCH /trips/:id - Update trip
     destroy: DELETE /trips/:id - Delete trip
+    bulk_content: POST /trips/:id/bulk - Create packages, flights, hotels,
+        itinerary items and milestones in one request
+    clone: POST /trips/:id/clone - Copy a trip with its packages, logistics
+        and content into one or more new trips
     """
     
     permission_classes = [IsAuthenticated, StaffActionRolePermission]
@@ -132,3 +138,50 @@ class AdminTripViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         
         serializer = self.get_serializer(new_trip)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'], url_path='bulk')
+    def bulk_content(self, request, pk=None):
+        """
+        Create a trip's content graph in one transaction.
+        
+        Body: ``packages`` (each optionally with a ``ref`` and nested
+        ``flights``/``hotels``), ``itinerary_items`` and ``milestones``
+        (which may point at a new package with ``package_ref``). Nothing is
+        written unless every item is valid; otherwise the response lists
+        per-item errors by path.
+        """
+        trip = self.get_object()
+        graph = TripContentGraph.validate(trip, request.data)
+        if not graph.is_valid:
+            return Response({'errors': graph.errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        graph.write(user=request.user)
+        return Response(graph.summary(), status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def clone(self, request, pk=None):
+        """
+        Clone a trip and everything planned under it.
+        
+        Body: ``clones``, a list of ``{code, name?, start_date?, status?,
+        visibility?, featured?}``. Each copy gets the trip's packages,
+        flights, hotels, itinerary, guide, checklist, contacts, FAQs,
+        milestones and resources, with dates shifted to its ``start_date``.
+        """
+        trip = self.get_object()
+        serializer = TripCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        clones = [
+            {'name': f"{trip.name} (Copy)", **clone}
+            for clone in serializer.validated_data['clones']
+        ]
+        new_trips = clone_trip(trip, clones, history_user=request.user)
+        
+        data = AdminTripListSerializer(
+            Trip.objects.filter(pk__in=[new_trip.pk for new_trip in new_trips]).prefetch_related('packages'),
+            many=True,
+        ).data
+        order = {str(new_trip.pk): index for index, new_trip in enumerate(new_trips)}
+        data = sorted(data, key=lambda item: order[str(item['id'])])
+        return Response({'results': data, 'count': len(data)}, status=status.HTTP_201_CREATED)
@@ -7,6 +7,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from apps.api.serializers.platform import GuidanceArticleDetailSerializer, GuidanceArticleListSerializer
 from apps.content.models import Dua, GuidanceArticle
 from apps.common.permissions import HasPilgrimProfile
+from apps.common.throttling import ClientIPThrottle
 from apps.api.serializers.trips import DuaSerializer
 
 
@@ -39,6 +40,8 @@ class PublicGuidanceArticleListView(generics.ListAPIView):
     """List published guidance articles for public website and mobile surfaces."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle]
+    throttle_scope = 'public-catalog'
     serializer_class = GuidanceArticleListSerializer
     pagination_class = None
 
@@ -76,6 +79,8 @@ class PublicGuidanceArticleDetailView(generics.RetrieveAPIView):
     """Retrieve one published guidance article by slug."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle]
+    throttle_scope = 'public-catalog'
     serializer_class = GuidanceArticleDetailSerializer
     lookup_field = 'slug'
 
@@ -2,86 +2,41 @@
 Dashboard API views for staff users.
 Provides statistics, recent activity, and quick insights.
 """
+import base64
+import binascii
+import json
+from uuid import UUID
+
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q, Sum
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from datetime import timedelta
 
-from apps.accounts.models import Account, PilgrimProfile
-from apps.trips.models import Trip
+from apps.accounts.models import Account
+from apps.trips.models import Trip, TripPackage
 from apps.bookings.models import Booking
-from apps.pilgrims.models import Document
+from apps.api.dashboard_stats import ACTIVE_BOOKING_STATUSES, get_dashboard_stats
+from apps.common.models import ActivityEvent
 from apps.common.permissions import STAFF_READ_ROLES, StaffActionRolePermission, StaffRoleAccessMixin
 
 
 class DashboardStatsView(StaffRoleAccessMixin, APIView):
     """
     Get dashboard statistics overview.
-    Returns key metrics for trips, bookings, pilgrims, and visas.
+    Returns key metrics for trips, bookings, pilgrims, and visas, served from
+    a short-lived cache that writes invalidate.
     """
     permission_classes = [IsAuthenticated, StaffActionRolePermission]
     method_staff_roles = {'GET': STAFF_READ_ROLES}
 
     def get(self, request):
         try:
-            # Trip statistics
-            total_trips = Trip.objects.count()
-            active_trips = Trip.objects.filter(
-                visibility='PUBLIC',
-                end_date__gte=timezone.now().date()
-            ).count()
-            
-            # Booking statistics
-            total_bookings = Booking.objects.count()
-            active_bookings = Booking.objects.filter(
-                status__in=['BOOKED', 'CONFIRMED']
-            ).count()
-            eoi_bookings = Booking.objects.filter(status='EOI').count()
-            
-            # Pilgrim statistics
-            total_pilgrims = PilgrimProfile.objects.count()
-            
-            # Document statistics (visas)
-            pending_visas = Document.objects.filter(
-                document_type='VISA',
-                status='PENDING'
-            ).count()
-            approved_visas = Document.objects.filter(
-                document_type='VISA',
-                status='VERIFIED'
-            ).count()
-            
-            # Revenue (in minor units)
-            total_revenue = Booking.objects.filter(
-                status__in=['BOOKED', 'CONFIRMED']
-            ).aggregate(
-                total=Sum('amount_paid_minor_units')
-            )['total'] or 0
-
-            return Response({
-                'trips': {
-                    'total': total_trips,
-                    'active': active_trips,
-                },
-                'bookings': {
-                    'total': total_bookings,
-                    'active': active_bookings,
-                    'eoi': eoi_bookings,
-                },
-                'pilgrims': {
-                    'total': total_pilgrims,
-                },
-                'visas': {
-                    'pending': pending_visas,
-                    'approved': approved_visas,
-                },
-                'revenue': {
-                    'totalMinorUnits': total_revenue,
-                },
-            }, status=status.HTTP_200_OK)
+            return Response(get_dashboard_stats(), status=status.HTTP_200_OK)
 
         except Exception as e:
             return Response(
@@ -90,52 +45,81 @@ class DashboardStatsView(StaffRoleAccessMixin, APIView):
             )
 
 
+ACTIVITY_PAGE_SIZE = 15
+ACTIVITY_MAX_PAGE_SIZE = 50
+
+
+def encode_activity_cursor(event):
+    """Encode the position after ``event`` as an opaque, URL-safe cursor."""
+    raw = json.dumps({'t': event.created_at.isoformat(), 'i': str(event.id)}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_activity_cursor(cursor):
+    """Decode a cursor into ``(created_at, id)``, or None when it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(state['t'])
+        event_id = UUID(state['i'])
+    except (binascii.Error, ValueError, UnicodeDecodeError, KeyError, TypeError, AttributeError):
+        return None
+    if created_at is None:
+        return None
+    return created_at, event_id
+
+
 class DashboardActivityView(StaffRoleAccessMixin, APIView):
     """
     Get recent activity feed.
-    Returns the latest bookings, visa updates, and trip changes.
+    Returns the latest bookings, payments, document reviews, readiness
+    validations, leads and feedback, newest first, from the activity event
+    log. Pages are keyset-paginated on ``(created_at, id)``: pass the
+    response's ``nextCursor`` as ``?cursor=`` to fetch the next page.
     """
     permission_classes = [IsAuthenticated, StaffActionRolePermission]
     method_staff_roles = {'GET': STAFF_READ_ROLES}
 
     def get(self, request):
         try:
-            activities = []
-            
-            # Recent bookings (last 7 days)
-            recent_bookings = Booking.objects.select_related(
-                'pilgrim__user', 'package__trip'
-            ).filter(
-                created_at__gte=timezone.now() - timedelta(days=7)
-            ).order_by('-created_at')[:10]
-
-            for booking in recent_bookings:
-                activities.append({
-                    'id': str(booking.id),
-                    'type': 'booking',
-                    'title': f'New {booking.status} booking',
-                    'description': f'{booking.pilgrim.user.name} - {booking.package.trip.name}',
-                    'timestamp': booking.created_at.isoformat(),
-                    'relatedId': str(booking.id),
-                    'status': booking.status,
-                })
-
-            # Sort by timestamp descending
-            activities.sort(key=lambda x: x['timestamp'], reverse=True)
-
-            return Response(activities[:15], status=status.HTTP_200_OK)
-
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to fetch activity feed: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            page_size = int(request.query_params.get('page_size', ACTIVITY_PAGE_SIZE))
+        except ValueError:
+            page_size = ACTIVITY_PAGE_SIZE
+        page_size = max(1, min(page_size, ACTIVITY_MAX_PAGE_SIZE))
+
+        events = ActivityEvent.objects.order_by('-created_at', '-id')
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            position = decode_activity_cursor(cursor)
+            if position is None:
+                return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+            created_at, event_id = position
+            events = events.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=event_id))
+
+        page = list(events[:page_size + 1])
+        next_cursor = encode_activity_cursor(page[page_size - 1]) if len(page) > page_size else None
+
+        return Response({
+            'results': [{
+                'id': str(event.id),
+                'type': event.event_type.split('_')[0].lower(),
+                'eventType': event.event_type,
+                'title': event.title,
+                'description': event.description,
+                'timestamp': event.created_at.isoformat(),
+                'relatedId': event.subject_id,
+                'status': event.status,
+            } for event in page[:page_size]],
+            'nextCursor': next_cursor,
+        }, status=status.HTTP_200_OK)
 
 
 class DashboardUpcomingTripsView(StaffRoleAccessMixin, APIView):
     """
     Get upcoming trips with booking counts.
-    Returns trips starting within the next 90 days.
+    Returns trips starting within the next 90 days. Booking counts and
+    capacity are annotated and packages prefetched, so the page costs two
+    queries however many trips it lists.
     """
     permission_classes = [IsAuthenticated, StaffActionRolePermission]
     method_staff_roles = {'GET': STAFF_READ_ROLES}
@@ -146,42 +130,41 @@ class DashboardUpcomingTripsView(StaffRoleAccessMixin, APIView):
             today = timezone.now().date()
             ninety_days_later = today + timedelta(days=90)
             
+            active_bookings = Booking.objects.filter(
+                package__trip=OuterRef('pk'),
+                status__in=ACTIVE_BOOKING_STATUSES,
+            ).order_by().values('package__trip').annotate(count=Count('id')).values('count')
+
             upcoming_trips = Trip.objects.filter(
                 start_date__gte=today,
                 start_date__lte=ninety_days_later,
                 visibility='PUBLIC'
-            ).prefetch_related('packages').order_by('start_date')[:10]
-
-            trips_data = []
-            for trip in upcoming_trips:
-                # Count bookings for this trip
-                booking_count = Booking.objects.filter(
-                    package__trip=trip,
-                    status__in=['BOOKED', 'CONFIRMED']
-                ).count()
-
-                # Calculate total capacity across all packages
-                total_capacity = sum(pkg.capacity for pkg in trip.packages.all())
-
-                trips_data.append({
-                    'id': str(trip.id),
-                    'code': trip.code,
-                    'name': trip.name,
-                    'cities': trip.cities,
-                    'startDate': str(trip.start_date),
-                    'endDate': str(trip.end_date),
-                    'coverImage': trip.cover_image,
-                    'visibility': trip.visibility,
-                    'bookingCount': booking_count,
-                    'totalCapacity': total_capacity,
-                    'packages': [{
-                        'id': str(pkg.id),
-                        'name': pkg.name,
-                        'priceMinorUnits': pkg.price_minor_units,
-                        'currency': pkg.currency,
-                        'capacity': pkg.capacity,
-                    } for pkg in trip.packages.all()],
-                })
+            ).annotate(
+                booking_count=Coalesce(Subquery(active_bookings), 0),
+                total_capacity=Coalesce(Sum('packages__capacity'), 0),
+            ).prefetch_related(
+                Prefetch('packages', queryset=TripPackage.objects.select_related('currency'))
+            ).order_by('start_date')[:10]
+
+            trips_data = [{
+                'id': str(trip.id),
+                'code': trip.code,
+                'name': trip.name,
+                'cities': trip.cities,
+                'startDate': str(trip.start_date),
+                'endDate': str(trip.end_date),
+                'coverImage': trip.cover_image,
+                'visibility': trip.visibility,
+                'bookingCount': trip.booking_count,
+                'totalCapacity': trip.total_capacity,
+                'packages': [{
+                    'id': str(pkg.id),
+                    'name': pkg.name,
+                    'priceMinorUnits': pkg.price_minor_units,
+                    'currency': pkg.currency.code if pkg.currency else None,
+                    'capacity': pkg.capacity,
+                } for pkg in trip.packages.all()],
+            } for trip in upcoming_trips]
 
             return Response(trips_data, status=status.HTTP_200_OK)
 
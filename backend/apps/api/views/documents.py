@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import viewsets, generics, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -13,8 +14,10 @@ from apps.api.serializers.documents import (
     DocumentCreateSerializer,
     DocumentUpdateSerializer
 )
+from apps.common.activity import record_document_reviewed
+from apps.common.filters import BlindIndexSearchFilter
 from apps.common.permissions import HasPilgrimProfile, StaffActionRolePermission, StaffRoleAccessMixin
-from apps.common.cloudinary import signed_delivery
+from apps.common.cloudinary import signed_delivery_batch
 
 
 class DocumentViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
@@ -25,9 +28,10 @@ class DocumentViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
     """
     
     permission_classes = [IsAuthenticated, StaffActionRolePermission]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, BlindIndexSearchFilter, filters.OrderingFilter]
     filterset_fields = ['pilgrim', 'document_type', 'status', 'trip', 'booking']
-    search_fields = ['title', 'document_number', 'pilgrim__user__name', 'pilgrim__user__phone']
+    search_fields = ['title', 'pilgrim__user__name', 'pilgrim__user__phone']
+    blind_index_search_fields = ['document_number_index']
     ordering_fields = ['created_at', 'expiry_date', 'updated_at']
     ordering = ['-created_at']
     
@@ -45,6 +49,14 @@ class DocumentViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
             return DocumentUpdateSerializer
         return DocumentSerializer
     
+    def perform_update(self, serializer):
+        """Save the document and record a review when its status moves to verified or rejected."""
+        previous_status = serializer.instance.status
+        with transaction.atomic():
+            document = serializer.save()
+            if document.status != previous_status and document.status in ('VERIFIED', 'REJECTED'):
+                record_document_reviewed(document, actor=self.request.user)
+    
     @action(detail=False, methods=['get'])
     def expiring_soon(self, request):
         """Get documents expiring within specified days (default 30)."""
@@ -80,7 +92,9 @@ class DocumentViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         document = self.get_object()
         document.status = 'VERIFIED'
         document.rejection_reason = None
-        document.save()
+        with transaction.atomic():
+            document.save()
+            record_document_reviewed(document, actor=request.user)
         
         serializer = self.get_serializer(document)
         return Response(serializer.data)
@@ -99,7 +113,9 @@ class DocumentViewSet(StaffRoleAccessMixin, viewsets.ModelViewSet):
         
         document.status = 'REJECTED'
         document.rejection_reason = rejection_reason
-        document.save()
+        with transaction.atomic():
+            document.save()
+            record_document_reviewed(document, actor=request.user)
         
         serializer = self.get_serializer(document)
         return Response(serializer.data)
@@ -154,16 +170,9 @@ class MyDocumentsListView(generics.ListAPIView):
         }
 
     @staticmethod
-    def _serialize_document(document: Document):
-        """Return a document-center row for an existing document."""
+    def _serialize_document(document: Document, file_url: str):
+        """Return a document-center row for an existing document and its signed file URL."""
         trip = document.trip or (document.booking.package.trip if document.booking_id else None)
-        file_url = None
-        if document.file_public_id:
-            file_url = signed_delivery(
-                document.file_public_id,
-                expires_in=600,
-                file_format=document.file_format,
-            )
 
         return {
             'id': str(document.id),
@@ -171,7 +180,7 @@ class MyDocumentsListView(generics.ListAPIView):
             'title': document.title,
             'document_number': document.document_number,
             'issuing_country': document.issuing_country,
-            'file_url': file_url,
+            'file_url': file_url or None,
             'file_format': document.file_format,
             'issue_date': document.issue_date,
             'expiry_date': document.expiry_date,
@@ -206,17 +215,29 @@ class MyDocumentsListView(generics.ListAPIView):
         for document in documents:
             latest_by_type.setdefault(document.document_type, document)
 
+        required = [
+            (document_type, latest_by_type.pop(document_type, None))
+            for document_type in ['PASSPORT', 'VISA', 'VACCINATION']
+        ]
+        shown = [document for _, document in required if document] + list(latest_by_type.values())
+        file_urls = dict(zip(
+            (document.id for document in shown),
+            signed_delivery_batch(
+                [(document.file_public_id, document.file_format) for document in shown],
+                expires_in=600,
+            ),
+        ))
+
         rows = []
-        for document_type in ['PASSPORT', 'VISA', 'VACCINATION']:
-            document = latest_by_type.pop(document_type, None)
+        for document_type, document in required:
             rows.append(
-                self._serialize_document(document)
+                self._serialize_document(document, file_urls[document.id])
                 if document
                 else self._build_missing_row(document_type)
             )
 
         for document in latest_by_type.values():
-            rows.append(self._serialize_document(document))
+            rows.append(self._serialize_document(document, file_urls[document.id]))
 
         serializer = self.get_serializer(rows, many=True)
         return Response(serializer.data)
@@ -2,13 +2,16 @@
 
 import logging
 
+from django.db import transaction
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.api.serializers.platform import WebsiteLeadPublicCreateSerializer
+from apps.common.activity import record_lead_submitted
 from apps.common.notifications import send_website_lead_notification
+from apps.common.throttling import ClientIPThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +20,16 @@ class PublicWebsiteLeadCreateView(APIView):
     """Accept website lead submissions from public forms."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle]
+    throttle_scope = 'lead-capture'
 
     def post(self, request):
         """Create a new website lead."""
         serializer = WebsiteLeadPublicCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        lead = serializer.save()
+        with transaction.atomic():
+            lead = serializer.save()
+            record_lead_submitted(lead)
 
         try:
             send_website_lead_notification(lead)
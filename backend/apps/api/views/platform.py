@@ -8,7 +8,13 @@ from rest_framework.views import APIView
 from apps.api.serializers.platform import PlatformSettingsSerializer, PublicVideoFeedSerializer
 from apps.common.models import PlatformSettings
 from apps.common.permissions import ADMIN_ONLY_ROLES, StaffActionRolePermission, StaffRoleAccessMixin
-from apps.common.youtube import YouTubeSyncError, sync_platform_videos
+from apps.common.throttling import ClientIPThrottle
+from apps.common.youtube import (
+    YouTubeSyncError,
+    is_video_cache_stale,
+    schedule_video_refresh,
+    sync_platform_videos,
+)
 
 
 class PlatformSettingsView(StaffRoleAccessMixin, APIView):
@@ -45,18 +51,23 @@ class PublicVideoFeedView(APIView):
     """Public endpoint for lesson videos sourced from YouTube."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle]
+    throttle_scope = 'public-catalog'
 
     def get(self, request):
-        """Return cached or freshly synced videos."""
+        """Return the stored videos, refreshing them in the background when stale."""
         force_refresh = request.query_params.get('refresh') == 'true'
+        platform_settings = PlatformSettings.get_cached()
 
-        try:
-            items, platform_settings, _ = sync_platform_videos(force_refresh=force_refresh)
-        except YouTubeSyncError as exc:
-            platform_settings = PlatformSettings.get_solo()
-            if platform_settings.youtube_cache_payload:
-                items = platform_settings.youtube_cache_payload
-            else:
+        if platform_settings.youtube_cache_payload:
+            items = platform_settings.youtube_cache_payload
+            if force_refresh or is_video_cache_stale(platform_settings):
+                schedule_video_refresh()
+        else:
+            # Nothing to serve yet, so the first request syncs inline.
+            try:
+                items, platform_settings, _ = sync_platform_videos(force_refresh=True)
+            except YouTubeSyncError as exc:
                 return Response(
                     {
                         'error': str(exc),
@@ -71,7 +71,7 @@ class UpdateProfileView(APIView):
                 profile.full_name = full_name
                 # Also update the user's name field
                 user.name = full_name
-                user.save()
+                user.save(update_fields=['name', 'updated_at'])
             
             # Update profile fields
             if 'dob' in request.data:
@@ -0,0 +1,175 @@
+"""
+Server-sent event streams for pilgrim-facing live data.
+
+These views are plain async Django views rather than DRF views so that each
+open connection parks on the event loop instead of holding a worker thread.
+That only holds when they are served through ``alhilal/asgi.py`` (the Procfile
+runs gunicorn with uvicorn workers); under a WSGI worker a stream would pin the
+worker for its whole lifetime, so the views refuse and clients keep polling.
+"""
+import asyncio
+import json
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework.settings import api_settings
+
+from apps.api.serializers.trips import TripUpdateSerializer
+from apps.api.views.support import get_trip_booking_for_request
+from apps.common.permissions import HasPilgrimProfile
+from apps.common.realtime import get_broker, publish_event, trip_updates_channel
+from apps.trips.models import TripUpdate
+
+# Updates replayed to a reconnecting client before live events resume.
+STREAM_BACKLOG_LIMIT = 50
+
+
+def broadcast_trip_update(update_id):
+    """Publish a visible trip update to live subscribers of its trip."""
+    update = TripUpdate.objects.select_related('trip', 'package').filter(pk=update_id).first()
+    if update is None or not update.is_published:
+        return
+
+    publish_event(
+        trip_updates_channel(update.trip_id),
+        {'package_id': update.package_id, **_update_message(update)},
+    )
+
+
+def _update_message(update):
+    """
+    The stream message for one update.
+
+    The event id is ``<publish_at>|<update id>|<updated_at>``, built here at
+    full precision because the broker's JSON encoding truncates datetimes.
+    ``updated_at`` gives an edit a new id rather than repeating the original.
+    """
+    return {
+        'event_id': f"{update.publish_at.isoformat()}|{update.id}|{update.updated_at.isoformat()}",
+        'update': TripUpdateSerializer(update).data,
+    }
+
+
+def parse_last_event_id(value):
+    """
+    Split a ``Last-Event-ID`` into ``(publish_at, update_id)``.
+
+    Event ids are built by ``_update_message``; a bare ISO
+    timestamp (an old event id or ``?since=``) has no update id. Returns
+    ``(None, None)`` when the value cannot be parsed.
+    """
+    publish_at, _, rest = (value or '').partition('|')
+    try:
+        since = parse_datetime(publish_at)
+        update_id = UUID(rest.partition('|')[0]) if rest else None
+    except ValueError:
+        return None, None
+    if since is None:
+        return None, None
+    return since, update_id
+
+
+def _resolve_stream_booking(request, trip_id):
+    """Authenticate the request and return ``(booking, error_response)``."""
+    user = None
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(request)
+        except AuthenticationFailed as exc:
+            return None, JsonResponse({'detail': exc.detail}, status=401)
+        if result:
+            user = result[0]
+            break
+
+    if user is None:
+        return None, JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+    request.user = user
+    if not HasPilgrimProfile().has_permission(request, None):
+        return None, JsonResponse({'detail': HasPilgrimProfile.message}, status=403)
+
+    try:
+        return get_trip_booking_for_request(request, trip_id), None
+    except PermissionDenied as exc:
+        return None, JsonResponse({'detail': exc.detail}, status=403)
+
+
+def _load_backlog(trip_id, package_id, since, after_id=None):
+    """Return serialized updates published after the client's last event, keyed on ``(publish_at, id)``."""
+    if since is None:
+        return []
+
+    after = Q(publish_at__gt=since)
+    if after_id is not None:
+        after |= Q(publish_at=since, id__gt=after_id)
+    updates = TripUpdate.objects.select_related('trip', 'package').filter(
+        Q(trip_id=trip_id, package__isnull=True) | Q(trip_id=trip_id, package_id=package_id),
+        after,
+        is_published=True,
+    ).order_by('publish_at', 'id')[:STREAM_BACKLOG_LIMIT]
+    return [_update_message(update) for update in updates]
+
+
+def _format_event(message):
+    """Render a trip update message as an SSE frame."""
+    data = json.dumps(message['update'], cls=DjangoJSONEncoder)
+    return f"id: {message['event_id']}\nevent: trip_update\ndata: {data}\n\n"
+
+
+async def _trip_update_events(trip_id, package_id, since, after_id=None):
+    """Yield SSE frames for a pilgrim's trip until the connection lifetime is reached."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.TRIP_UPDATE_STREAM_MAX_SECONDS
+    heartbeat = settings.TRIP_UPDATE_STREAM_HEARTBEAT_SECONDS
+    package_id = str(package_id)
+
+    async with get_broker().subscribe(trip_updates_channel(trip_id)) as subscription:
+        yield f"retry: {settings.TRIP_UPDATE_STREAM_RETRY_MS}\n\n"
+
+        for message in await sync_to_async(_load_backlog)(trip_id, package_id, since, after_id):
+            yield _format_event(message)
+
+        while loop.time() < deadline:
+            message = await subscription.get(timeout=min(heartbeat, max(deadline - loop.time(), 0)))
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            if message.get('package_id') not in (None, package_id):
+                continue
+            yield _format_event(message)
+
+
+@require_GET
+async def trip_updates_stream(request, trip_id):
+    """
+    Stream newly published trip updates for a booked pilgrim.
+
+    GET /api/v1/me/trips/{trip_id}/updates/stream/
+
+    Replaces polling ``/updates/?since=``. Reconnecting clients send the last
+    event id in ``Last-Event-ID`` (or an ISO publish time in ``?since=``) to
+    replay anything published after it.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Live updates are not available; poll /updates/ instead.'}, status=503)
+
+    booking, error_response = await sync_to_async(_resolve_stream_booking)(request, trip_id)
+    if error_response is not None:
+        return error_response
+
+    since, after_id = parse_last_event_id(request.headers.get('Last-Event-ID') or request.GET.get('since'))
+    response = StreamingHttpResponse(
+        _trip_update_events(trip_id, booking.package_id, since, after_id),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,14 +1,19 @@
 """Phase 3 mobile pilgrim support views."""
 
+import gzip
 from datetime import timedelta
 
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.http import http_date, parse_etags
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.bookings.models import Booking
+from apps.common.activity import record_feedback_submitted
 from apps.common.permissions import HasPilgrimProfile
 from apps.pilgrims.models import DeviceInstallation, NotificationPreference, TripFeedback
 from apps.trips.models import ItineraryItem, TripResource
@@ -20,7 +25,6 @@ from apps.api.serializers.support import (
     PilgrimTripFeedbackUpsertSerializer,
     TripDailyProgramSerializer,
 )
-from apps.api.serializers.trips import TripResourceSerializer
 
 
 ACTIVE_BOOKING_STATUSES = ['EOI', 'BOOKED', 'CONFIRMED']
@@ -49,6 +53,66 @@ def is_feedback_eligible(trip) -> tuple[bool, str]:
     return False, 'Feedback opens after the trip has returned or moved into its post-trip state.'
 
 
+def build_daily_program(trip, now=None) -> dict:
+    """Return a trip's itinerary grouped by day together with its pinned daily-program resource."""
+    now = now or timezone.now()
+    itinerary_items = list(
+        ItineraryItem.objects.filter(trip_id=trip.id).order_by('day_index', 'start_time', 'created_at')
+    )
+    pinned_resource = TripResource.objects.filter(
+        trip_id=trip.id,
+        resource_type='DAILY_PROGRAM',
+        is_published=True,
+    ).order_by('-is_pinned', 'order', 'title').first()
+
+    grouped_days: dict[int, dict] = {}
+    updated_candidates = [trip.updated_at]
+
+    for item in itinerary_items:
+        date_value = trip.start_date + timedelta(days=max(item.day_index - 1, 0))
+        grouped_days.setdefault(
+            item.day_index,
+            {
+                'id': f'{trip.id}:day:{item.day_index}',
+                'day_index': item.day_index,
+                'label': f'Day {item.day_index}',
+                'date': date_value,
+                'items': [],
+            },
+        )
+        grouped_days[item.day_index]['items'].append(
+            {
+                'id': str(item.id),
+                'day_index': item.day_index,
+                'title': item.title,
+                'location': item.location,
+                'notes': item.notes,
+                'start_time': item.start_time,
+                'end_time': item.end_time,
+            }
+        )
+        updated_candidates.append(item.updated_at)
+
+    if pinned_resource:
+        updated_candidates.append(pinned_resource.updated_at)
+
+    total_days = max((trip.end_date - trip.start_date).days + 1, 1)
+    today = now.date()
+    current_day_index = min(max((today - trip.start_date).days + 1, 1), total_days)
+
+    return {
+        'trip_id': trip.id,
+        'trip_code': trip.code,
+        'trip_name': trip.name,
+        'trip_status': trip.status,
+        'current_day_index': current_day_index,
+        'is_trip_live': trip.start_date <= today <= trip.end_date,
+        'pinned_resource': pinned_resource,
+        'days': list(grouped_days.values()),
+        'updated_at': max(updated_candidates) if updated_candidates else None,
+    }
+
+
 class NotificationPreferenceView(APIView):
     """Get and update pilgrim notification preferences."""
 
@@ -127,68 +191,50 @@ class TripDailyProgramView(APIView):
 
     def get(self, request, trip_id):
         booking = get_trip_booking_for_request(request, trip_id)
-        trip = booking.package.trip
-
-        itinerary_items = list(
-            ItineraryItem.objects.filter(trip_id=trip_id).order_by('day_index', 'start_time', 'created_at')
-        )
-        pinned_resource = TripResource.objects.filter(
-            trip_id=trip_id,
-            resource_type='DAILY_PROGRAM',
-            published_at__isnull=False,
-            published_at__lte=timezone.now(),
-        ).order_by('-is_pinned', 'order', 'title').first()
-
-        grouped_days: dict[int, dict] = {}
-        updated_candidates = [trip.updated_at]
-
-        for item in itinerary_items:
-            date_value = trip.start_date + timedelta(days=max(item.day_index - 1, 0))
-            grouped_days.setdefault(
-                item.day_index,
-                {
-                    'id': f'{trip.id}:day:{item.day_index}',
-                    'day_index': item.day_index,
-                    'label': f'Day {item.day_index}',
-                    'date': date_value,
-                    'items': [],
-                },
-            )
-            grouped_days[item.day_index]['items'].append(
-                {
-                    'id': str(item.id),
-                    'day_index': item.day_index,
-                    'title': item.title,
-                    'location': item.location,
-                    'notes': item.notes,
-                    'start_time': item.start_time,
-                    'end_time': item.end_time,
-                }
-            )
-            updated_candidates.append(item.updated_at)
-
-        if pinned_resource:
-            updated_candidates.append(pinned_resource.updated_at)
-
-        total_days = max((trip.end_date - trip.start_date).days + 1, 1)
-        today = timezone.now().date()
-        current_day_index = min(max((today - trip.start_date).days + 1, 1), total_days)
-
-        payload = {
-            'trip_id': trip.id,
-            'trip_code': trip.code,
-            'trip_name': trip.name,
-            'trip_status': trip.status,
-            'current_day_index': current_day_index,
-            'is_trip_live': trip.start_date <= today <= trip.end_date,
-            'pinned_resource': TripResourceSerializer(pinned_resource).data if pinned_resource else None,
-            'days': list(grouped_days.values()),
-            'updated_at': max(updated_candidates) if updated_candidates else None,
-        }
-        serializer = TripDailyProgramSerializer(payload)
+        serializer = TripDailyProgramSerializer(build_daily_program(booking.package.trip))
         return Response(serializer.data)
 
 
+class TripOfflinePackView(APIView):
+    """
+    Serve the pre-built offline content pack for a booked pilgrim's package.
+
+    GET /api/v1/me/trips/{trip_id}/offline-pack/
+
+    The pack's content hash is returned as the ETag; clients send it back in
+    If-None-Match and receive 304 until the pack content changes.
+    """
+
+    permission_classes = [IsAuthenticated, HasPilgrimProfile]
+
+    def get(self, request, trip_id):
+        from apps.api.offline_packs import get_offline_pack
+
+        booking = get_trip_booking_for_request(request, trip_id)
+        pack = get_offline_pack(booking.package)
+        etag = f'"{pack.content_hash}"'
+
+        client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in client_etags or f'W/{etag}' in client_etags:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+        body = bytes(pack.payload)
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response = HttpResponse(body, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(body), content_type='application/json')
+
+        response['ETag'] = etag
+        response['X-Content-Hash'] = pack.content_hash
+        response['Last-Modified'] = http_date(pack.built_at.timestamp())
+        response['Cache-Control'] = 'private, no-cache'
+        response['Vary'] = 'Accept-Encoding, Authorization'
+        return response
+
+
 class TripFeedbackView(APIView):
     """Return and update post-trip feedback for a booked pilgrim."""
 
@@ -230,12 +276,15 @@ class TripFeedbackView(APIView):
         if target_status == 'SUBMITTED' and submitted_at is None:
             submitted_at = timezone.now()
 
-        instance = serializer.save(
-            pilgrim=request.user.pilgrim_profile,
-            booking=booking,
-            trip=trip,
-            status=target_status,
-            submitted_at=submitted_at,
-        )
+        with transaction.atomic():
+            instance = serializer.save(
+                pilgrim=request.user.pilgrim_profile,
+                booking=booking,
+                trip=trip,
+                status=target_status,
+                submitted_at=submitted_at,
+            )
+            if target_status == 'SUBMITTED':
+                record_feedback_submitted(instance, actor=request.user)
         response_status = status.HTTP_200_OK if feedback else status.HTTP_201_CREATED
         return Response(PilgrimTripFeedbackSerializer(instance).data, status=response_status)
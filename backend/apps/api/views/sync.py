@@ -0,0 +1,294 @@
+"""
+Delta-sync endpoint for the pilgrim trip bundle.
+
+The mobile app opens a trip with a single request to
+``GET /api/v1/me/trips/{trip_id}/sync/?cursor=<opaque>`` instead of calling the
+itinerary, updates, essentials, milestones, resources, readiness, flights and
+hotels endpoints separately. The cursor carries per-entity ``updated_at``
+high-water marks so warm opens only return rows that changed or disappeared.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db.models import BooleanField, Case, Q, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.api.serializers.trips import (
+    ChecklistItemSerializer,
+    EmergencyContactSerializer,
+    FlightSerializer,
+    GuideSectionSerializer,
+    HotelSerializer,
+    ItineraryItemSerializer,
+    PilgrimTripReadinessSerializer,
+    TripDetailSerializer,
+    TripFAQSerializer,
+    TripMilestoneSerializer,
+    TripPackageSyncSerializer,
+    TripResourceSerializer,
+    TripUpdateSerializer,
+)
+from apps.api.views.support import get_trip_booking_for_request
+from apps.common.permissions import HasPilgrimProfile
+from apps.pilgrims.models import PilgrimReadiness
+from apps.trips.models import (
+    ChecklistItem,
+    EmergencyContact,
+    ItineraryItem,
+    PackageFlight,
+    PackageHotel,
+    SyncTombstone,
+    TripFAQ,
+    TripGuideSection,
+    TripMilestone,
+    TripResource,
+    TripUpdate,
+)
+
+CURSOR_VERSION = 1
+
+
+class SyncEntity:
+    """Describe how one pilgrim-facing model participates in delta sync."""
+
+    def __init__(self, key, model, serializer_class, scope, select_related=(), visible=None):
+        self.key = key
+        self.model = model
+        self.serializer_class = serializer_class
+        self.scope = scope
+        self.select_related = select_related
+        self.visible = visible
+
+    def scope_q(self, trip_id, package_id):
+        """Return the rows the pilgrim's booking can ever see."""
+        if self.scope == 'package':
+            return Q(package_id=package_id)
+        if self.scope == 'trip_or_package':
+            return Q(trip_id=trip_id) & (Q(package__isnull=True) | Q(package_id=package_id))
+        return Q(trip_id=trip_id)
+
+    def visible_q(self, now):
+        """Return the filter for rows that are currently visible to pilgrims."""
+        return self.visible(now) if self.visible else Q()
+
+
+SYNC_ENTITIES = [
+    SyncEntity('itinerary', ItineraryItem, ItineraryItemSerializer, 'trip'),
+    SyncEntity(
+        'updates',
+        TripUpdate,
+        TripUpdateSerializer,
+        'trip_or_package',
+        select_related=('trip', 'package'),
+        visible=lambda now: Q(is_published=True),
+    ),
+    SyncEntity('guide_sections', TripGuideSection, GuideSectionSerializer, 'trip'),
+    SyncEntity('checklist', ChecklistItem, ChecklistItemSerializer, 'trip_or_package', select_related=('package',)),
+    SyncEntity('contacts', EmergencyContact, EmergencyContactSerializer, 'trip'),
+    SyncEntity('faqs', TripFAQ, TripFAQSerializer, 'trip'),
+    SyncEntity(
+        'milestones',
+        TripMilestone,
+        TripMilestoneSerializer,
+        'trip_or_package',
+        select_related=('package',),
+        visible=lambda now: Q(is_public=True),
+    ),
+    SyncEntity(
+        'resources',
+        TripResource,
+        TripResourceSerializer,
+        'trip_or_package',
+        select_related=('package',),
+        visible=lambda now: Q(is_published=True),
+    ),
+    SyncEntity('flights', PackageFlight, FlightSerializer, 'package'),
+    SyncEntity('hotels', PackageHotel, HotelSerializer, 'package'),
+]
+
+
+def encode_cursor(package_id, as_of, marks):
+    """Encode sync state as an opaque, URL-safe cursor."""
+    state = {
+        'v': CURSOR_VERSION,
+        'p': str(package_id),
+        't': as_of.isoformat(),
+        'm': {key: value.isoformat() for key, value in marks.items() if value},
+    }
+    raw = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _parse_aware(value):
+    """Parse an ISO timestamp, reading naive values (legacy or hand-made cursors) as UTC."""
+    try:
+        parsed = parse_datetime(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def decode_cursor(cursor):
+    """Decode a cursor, returning None when it is missing, malformed or from an old version."""
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+
+    if not isinstance(state, dict) or state.get('v') != CURSOR_VERSION:
+        return None
+
+    as_of = _parse_aware(state.get('t'))
+    raw_marks = state.get('m', {})
+    if as_of is None or not isinstance(raw_marks, dict):
+        return None
+
+    marks = {}
+    for key, value in raw_marks.items():
+        parsed = _parse_aware(value)
+        if parsed:
+            marks[key] = parsed
+
+    return {'package_id': state.get('p'), 'as_of': as_of, 'marks': marks}
+
+
+class TripSyncView(APIView):
+    """
+    Return every pilgrim-facing entity for a booked trip in one payload.
+
+    GET /api/v1/me/trips/{trip_id}/sync/?cursor=<opaque>
+
+    Without a cursor (or with one that is stale, malformed, or issued for a
+    different package) the response is a full snapshot with ``reset`` set.
+    With a valid cursor only rows changed since the last sync are returned,
+    and rows that were deleted or hidden are listed under ``deleted``.
+    """
+
+    permission_classes = [IsAuthenticated, HasPilgrimProfile]
+
+    def get(self, request, trip_id):
+        booking = get_trip_booking_for_request(request, trip_id)
+        trip = booking.package.trip
+        package = booking.package
+        now = timezone.now()
+
+        state = decode_cursor(request.query_params.get('cursor'))
+        retention_cutoff = now - timedelta(days=SyncTombstone.RETENTION_DAYS)
+        if (
+            state is None
+            or state['package_id'] != str(package.id)
+            or state['as_of'] < retention_cutoff
+        ):
+            state = None
+
+        reset = state is None
+        previous_marks = state['marks'] if state else {}
+        previous_as_of = state['as_of'] if state else None
+        marks = {}
+        changes = {}
+        deleted = {}
+
+        for entity in SYNC_ENTITIES:
+            entity_changes, hidden_ids, mark = self._collect_entity(
+                entity, trip.id, package.id, now, previous_marks.get(entity.key)
+            )
+            changes[entity.key] = entity_changes
+            deleted[entity.key] = hidden_ids
+            marks[entity.key] = mark or previous_marks.get(entity.key)
+
+        if not reset:
+            tombstones = SyncTombstone.objects.filter(
+                Q(trip_id=trip.id, package_id__isnull=True)
+                | Q(trip_id=trip.id, package_id=package.id)
+                | Q(trip_id__isnull=True, package_id=package.id),
+                deleted_at__gt=previous_as_of - timedelta(seconds=1),
+            ).values_list('entity', 'object_id')
+            for entity_key, object_id in tombstones:
+                if entity_key in deleted and str(object_id) not in deleted[entity_key]:
+                    deleted[entity_key].append(str(object_id))
+
+        trip_payload = None
+        if reset or trip.updated_at > previous_marks.get('trip', trip.updated_at):
+            trip_payload = TripDetailSerializer(trip).data
+        marks['trip'] = trip.updated_at
+
+        package_payload = None
+        if reset or package.updated_at > previous_marks.get('package', package.updated_at):
+            package_payload = TripPackageSyncSerializer(package).data
+        marks['package'] = package.updated_at
+
+        readiness_payload = None
+        readiness = PilgrimReadiness.objects.select_related('booking', 'package', 'trip').filter(booking=booking).first()
+        if readiness:
+            if reset or readiness.updated_at > previous_marks.get('readiness', readiness.updated_at):
+                readiness_payload = PilgrimTripReadinessSerializer(readiness).data
+            marks['readiness'] = readiness.updated_at
+
+        has_changes = bool(
+            trip_payload
+            or package_payload
+            or readiness_payload
+            or any(changes.values())
+            or any(deleted.values())
+        )
+
+        return Response({
+            'trip_id': str(trip.id),
+            'package_id': str(package.id),
+            'reset': reset,
+            'has_changes': has_changes,
+            'server_time': now,
+            'cursor': encode_cursor(package.id, now, marks),
+            'trip': trip_payload,
+            'package': package_payload,
+            'readiness': readiness_payload,
+            'changes': changes,
+            'deleted': deleted,
+        })
+
+    def _collect_entity(self, entity, trip_id, package_id, now, mark):
+        """Return serialized changed rows, ids that became invisible, and the new high-water mark."""
+        queryset = entity.model.objects.filter(entity.scope_q(trip_id, package_id))
+        if entity.select_related:
+            queryset = queryset.select_related(*entity.select_related)
+
+        if mark is None:
+            rows = list(queryset.filter(entity.visible_q(now)))
+            hidden_ids = []
+            new_mark = max((row.updated_at for row in rows), default=None)
+        else:
+            # The publisher bumps updated_at when scheduled rows go live.
+            annotated = queryset.filter(updated_at__gt=mark)
+            if entity.visible:
+                annotated = annotated.annotate(
+                    sync_visible=Case(
+                        When(entity.visible_q(now), then=Value(True)),
+                        default=Value(False),
+                        output_field=BooleanField(),
+                    )
+                )
+            else:
+                annotated = annotated.annotate(sync_visible=Value(True, output_field=BooleanField()))
+            rows = []
+            hidden_ids = []
+            new_mark = None
+            for row in annotated:
+                if row.sync_visible:
+                    rows.append(row)
+                else:
+                    hidden_ids.append(str(row.pk))
+                new_mark = max(new_mark, row.updated_at) if new_mark else row.updated_at
+
+        return entity.serializer_class(rows, many=True).data, hidden_ids, new_mark
@@ -9,6 +9,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from apps.trips.models import Trip, ItineraryItem, TripUpdate, TripMilestone, TripResource
 from apps.bookings.models import Booking
 from apps.common.permissions import HasPilgrimProfile
+from apps.common.throttling import ClientIPThrottle
 from apps.pilgrims.models import PilgrimReadiness
 from apps.api.serializers.trips import (
     TripListSerializer,
@@ -149,7 +150,7 @@ class TripUpdatesView(generics.ListAPIView):
             Q(trip_id=trip_id, package__isnull=True) |  # Trip-level updates
             Q(trip_id=trip_id, package=booking.package)  # Package-specific updates
         ).filter(
-            publish_at__lte=timezone.now()  # Only published updates
+            is_published=True
         ).order_by('-pinned', '-publish_at')
         
         # Filter by since parameter if provided
@@ -219,8 +220,7 @@ class TripEssentialsView(generics.RetrieveAPIView):
             Q(trip=trip, package__isnull=True) |
             Q(trip=trip, package=booking.package)
         ).filter(
-            published_at__isnull=False,
-            published_at__lte=timezone.now()
+            is_published=True
         ).order_by('-is_pinned', 'order', 'title')
         
         return {
@@ -295,8 +295,7 @@ class TripResourcesView(generics.ListAPIView):
             Q(trip_id=trip_id, package__isnull=True) |
             Q(trip_id=trip_id, package=booking.package)
         ).filter(
-            published_at__isnull=False,
-            published_at__lte=timezone.now()
+            is_published=True
         ).order_by('-is_pinned', 'order', 'title')
 
 
@@ -353,6 +352,8 @@ class PublicTripListView(generics.ListAPIView):
     """
     
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle]
+    throttle_scope = 'public-catalog'
     serializer_class = TripListSerializer
     
     def get_queryset(self):
@@ -387,6 +388,8 @@ class PublicTripDetailView(generics.RetrieveAPIView):
     """
     
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle]
+    throttle_scope = 'public-catalog'
     serializer_class = PublicTripDetailSerializer
     lookup_field = 'id'
     
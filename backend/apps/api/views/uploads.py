@@ -0,0 +1,97 @@
+"""
+Direct-to-storage upload views (staff only).
+
+POST /api/v1/uploads/sign/      - reserve a public_id and return signed upload fields
+POST /api/v1/uploads/finalize/  - verify the storage response and create the record
+"""
+from django.core import signing
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.api.serializers.admin import AdminTripResourceSerializer
+from apps.api.serializers.documents import DocumentCreateSerializer, DocumentSerializer
+from apps.api.serializers.uploads import DirectUploadFinalizeSerializer, DirectUploadSignSerializer
+from apps.common.models import FinalizedUpload
+from apps.common.permissions import StaffActionRolePermission, StaffRoleAccessMixin
+from apps.common.uploads import get_upload_storage, issue_upload, read_upload_token
+from apps.pilgrims.models import Document
+from apps.trips.models import TripResource
+
+# Per target: the model, the serializer that creates it and the one that renders it.
+FINALIZE_TARGETS = {
+    'document': (Document, DocumentCreateSerializer, DocumentSerializer),
+    'trip_resource': (TripResource, AdminTripResourceSerializer, AdminTripResourceSerializer),
+}
+
+
+class DirectUploadSignView(StaffRoleAccessMixin, APIView):
+    """Issue signed parameters so the client uploads the file straight to storage."""
+
+    permission_classes = [IsAuthenticated, StaffActionRolePermission]
+
+    def post(self, request):
+        serializer = DirectUploadSignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        payload = issue_upload(
+            serializer.validated_data['target'],
+            serializer.validated_data['resource_type'],
+            request.user,
+        )
+        return Response(payload, status=status.HTTP_201_CREATED)
+
+
+class DirectUploadFinalizeView(StaffRoleAccessMixin, APIView):
+    """
+    Create the Document or TripResource for a completed direct upload.
+
+    The body carries the upload token, the storage's ``version`` and
+    ``signature`` for the asset, and the record's own fields. The record is
+    created together with a ``FinalizedUpload`` claim on the public id, so an
+    upload is finalized at most once even under concurrent calls.
+    """
+
+    permission_classes = [IsAuthenticated, StaffActionRolePermission]
+
+    def post(self, request):
+        upload = DirectUploadFinalizeSerializer(data=request.data)
+        upload.is_valid(raise_exception=True)
+
+        try:
+            claims = read_upload_token(upload.validated_data['upload_token'], request.user)
+        except signing.BadSignature:
+            return Response({'error': 'Upload token is invalid or expired'}, status=status.HTTP_400_BAD_REQUEST)
+
+        public_id = claims['public_id']
+        if not get_upload_storage().verify_upload(
+            public_id,
+            upload.validated_data['version'],
+            upload.validated_data['signature'],
+        ):
+            return Response({'error': 'Upload signature does not match'}, status=status.HTTP_400_BAD_REQUEST)
+
+        model, create_serializer_class, output_serializer_class = FINALIZE_TARGETS[claims['target']]
+        data = {
+            key: value
+            for key, value in request.data.items()
+            if key not in DirectUploadFinalizeSerializer().fields
+        }
+        data['file_public_id'] = public_id
+        data['file_format'] = upload.validated_data['format'] or None
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    FinalizedUpload.objects.create(public_id=public_id, target=claims['target'])
+            except IntegrityError:
+                return Response({'error': 'Upload has already been finalized'}, status=status.HTTP_409_CONFLICT)
+            # Records finalized before claims existed have no claim row; keep the new one.
+            if model.objects.filter(file_public_id=public_id).exists():
+                return Response({'error': 'Upload has already been finalized'}, status=status.HTTP_409_CONFLICT)
+
+            serializer = create_serializer_class(data=data, context={'request': request})
+            serializer.is_valid(raise_exception=True)
+            instance = serializer.save()
+        return Response(output_serializer_class(instance).data, status=status.HTTP_201_CREATED)
@@ -1,4 +1,7 @@
 from django.contrib import admin
+
+from apps.common.activity import record_booking_created, record_payment_recorded
+
 from .models import Booking, Payment
 from .admin_actions import (
     convert_eoi_to_booked, cancel_bookings,
@@ -30,6 +33,19 @@ class BookingAdmin(admin.ModelAdmin):
         export_bookings_csv
     ]
 
+    def save_model(self, request, obj, form, change):
+        """Record an activity event for bookings created here."""
+        super().save_model(request, obj, form, change)
+        if not change:
+            record_booking_created(obj, actor=request.user)
+
+    def save_formset(self, request, form, formset, change):
+        """Record an activity event for payments added inline."""
+        super().save_formset(request, form, formset, change)
+        for instance in formset.new_objects:
+            if isinstance(instance, Payment):
+                record_payment_recorded(instance, actor=request.user)
+
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
@@ -41,3 +57,9 @@ class PaymentAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'payment_date'
 
+    def save_model(self, request, obj, form, change):
+        """Record an activity event for payments recorded here."""
+        super().save_model(request, obj, form, change)
+        if not change:
+            record_payment_recorded(obj, actor=request.user)
+
@@ -0,0 +1,92 @@
+"""
+Activity events behind the staff dashboard feed.
+
+Write paths call these helpers inside the transaction that makes the change,
+so an event is stored exactly when the change it describes commits. Each row
+is denormalized at write time; the feed reads ``ActivityEvent`` alone.
+"""
+from .models import ActivityEvent
+
+
+def record_activity(event_type, subject_id, title, description='', status='', actor=None):
+    """Append one activity event."""
+    if actor is not None and not actor.is_authenticated:
+        actor = None
+    return ActivityEvent.objects.create(
+        event_type=event_type,
+        subject_id=str(subject_id),
+        title=title[:160],
+        description=description[:255],
+        status=status or '',
+        actor=actor,
+    )
+
+
+def record_booking_created(booking, actor=None):
+    return record_activity(
+        'BOOKING_CREATED',
+        booking.id,
+        f'New {booking.status} booking',
+        f'{booking.pilgrim.user.name} - {booking.package.trip.name}',
+        booking.status,
+        actor,
+    )
+
+
+def record_payment_recorded(payment, actor=None):
+    booking = payment.booking
+    amount = f'{payment.amount_minor_units / 100:,.2f}'
+    if payment.currency:
+        amount = f'{payment.currency.code} {amount}'
+    return record_activity(
+        'PAYMENT_RECORDED',
+        booking.id,
+        f'Payment of {amount} recorded',
+        f'{booking.pilgrim.user.name} - {booking.package.trip.name}',
+        booking.payment_status,
+        actor,
+    )
+
+
+def record_document_reviewed(document, actor=None):
+    outcome = 'verified' if document.status == 'VERIFIED' else 'rejected'
+    return record_activity(
+        'DOCUMENT_REVIEWED',
+        document.id,
+        f'{document.get_document_type_display()} {outcome}',
+        document.pilgrim.user.name,
+        document.status,
+        actor,
+    )
+
+
+def record_readiness_validated(readiness, actor=None):
+    return record_activity(
+        'READINESS_VALIDATED',
+        readiness.id,
+        'Travel-ready pass issued',
+        f'{readiness.pilgrim.user.name} - {readiness.trip.name}',
+        readiness.status,
+        actor,
+    )
+
+
+def record_lead_submitted(lead):
+    return record_activity(
+        'LEAD_SUBMITTED',
+        lead.id,
+        f'New {lead.get_interest_type_display().lower()} lead',
+        lead.name,
+        lead.status,
+    )
+
+
+def record_feedback_submitted(feedback, actor=None):
+    return record_activity(
+        'FEEDBACK_SUBMITTED',
+        feedback.id,
+        'Trip feedback submitted',
+        f'{feedback.pilgrim.user.name} - {feedback.trip.name}',
+        feedback.status,
+        actor,
+    )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Currency, PlatformSettings, WebsiteLead
+from .models import ActivityEvent, Currency, PlatformSettings, SmsOutboxMessage, WebsiteLead
 
 
 @admin.register(Currency)
@@ -70,3 +70,46 @@ class WebsiteLeadAdmin(admin.ModelAdmin):
     list_display = ['name', 'interest_type', 'status', 'source', 'trip', 'assigned_to', 'created_at']
     list_filter = ['interest_type', 'status', 'source', 'created_at']
     search_fields = ['name', 'phone', 'email', 'source', 'context_label', 'page_path', 'trip__name', 'trip__code']
+
+
+@admin.register(SmsOutboxMessage)
+class SmsOutboxMessageAdmin(admin.ModelAdmin):
+    """Read-only admin for the SMS outbox."""
+
+    list_display = ['phone', 'purpose', 'status', 'attempts', 'provider', 'next_attempt_at', 'sent_at', 'created_at']
+    list_filter = ['purpose', 'status', 'provider', 'created_at']
+    search_fields = ['phone', 'provider_message_id']
+    # OTP bodies carry live verification codes.
+    exclude = ['message']
+    readonly_fields = [
+        'phone',
+        'purpose',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'provider',
+        'provider_message_id',
+        'last_error',
+        'sent_at',
+        'created_at',
+        'updated_at',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    """Read-only admin for the append-only activity log."""
+
+    list_display = ['event_type', 'title', 'description', 'status', 'actor', 'created_at']
+    list_filter = ['event_type', 'created_at']
+    search_fields = ['title', 'description', 'subject_id']
+    readonly_fields = ['event_type', 'title', 'description', 'status', 'subject_id', 'actor', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,85 @@
+"""
+Bulk insert-or-update helpers.
+
+``bulk_upsert`` replaces per-row ``get_or_create`` + ``save()`` loops: it
+resolves every key with chunked ``IN`` queries, splits the rows into inserts
+and updates in Python, and writes each group with one ``bulk_create`` or
+``bulk_update`` per batch. Models tracked by django-simple-history get their
+history rows written in bulk as well.
+
+``bulk_create``/``bulk_update`` skip ``save()`` and model signals, so callers
+must set any values ``save()`` would derive and handle what signals would do.
+``auto_now`` fields are stamped here.
+"""
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+UPSERT_BATCH_SIZE = 500
+
+
+def _has_history(model):
+    return hasattr(model._meta, 'simple_history_manager_attribute')
+
+
+def bulk_upsert(model, items, key_field, create, update=None, update_fields=(),
+                batch_size=UPSERT_BATCH_SIZE, history_user=None):
+    """
+    Insert or update ``model`` rows keyed on the unique ``key_field``.
+
+    ``items`` is a sequence of ``(key, data)`` pairs. ``create(data)`` builds an
+    unsaved instance for a new key; ``update(instance, data)`` applies ``data``
+    to an existing one, and only ``update_fields`` are written back. Without
+    ``update`` existing rows are left untouched, as with ``get_or_create``. A
+    key repeated within ``items`` is created once and then updated, exactly as
+    sequential ``get_or_create`` calls would see it.
+
+    Returns ``[(instance, created), ...]`` aligned with ``items``.
+    """
+    keys = list({key for key, _ in items})
+    existing = {}
+    for start in range(0, len(keys), batch_size):
+        for instance in model._default_manager.filter(**{f'{key_field}__in': keys[start:start + batch_size]}):
+            existing[getattr(instance, key_field)] = instance
+
+    results = []
+    to_create = {}
+    to_update = {}
+    for key, data in items:
+        if key in existing:
+            instance = existing[key]
+            if update is not None:
+                update(instance, data)
+                to_update[key] = instance
+            results.append((instance, False))
+        elif key in to_create:
+            instance = to_create[key]
+            if update is not None:
+                update(instance, data)
+            results.append((instance, False))
+        else:
+            instance = to_create[key] = create(data)
+            results.append((instance, True))
+
+    if to_create:
+        if _has_history(model):
+            bulk_create_with_history(list(to_create.values()), model, batch_size=batch_size, default_user=history_user)
+        else:
+            model._default_manager.bulk_create(list(to_create.values()), batch_size=batch_size)
+
+    if to_update and update_fields:
+        fields = list(update_fields)
+        now = timezone.now()
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for instance in to_update.values():
+                    setattr(instance, field.attname, now)
+                if field.name not in fields:
+                    fields.append(field.name)
+        if _has_history(model):
+            bulk_update_with_history(
+                list(to_update.values()), model, fields, batch_size=batch_size, default_user=history_user
+            )
+        else:
+            model._default_manager.bulk_update(list(to_update.values()), fields, batch_size=batch_size)
+
+    return results
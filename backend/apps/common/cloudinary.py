@@ -5,22 +5,83 @@ import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 from django.conf import settings
+from functools import lru_cache
 from typing import Optional
 import time
 
 
+IMAGE_FORMATS = ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'svg', 'tiff', 'tif', 'ico')
+VIDEO_FORMATS = ('mp4', 'mov', 'avi', 'wmv', 'flv', 'webm', 'mkv')
+DOCUMENT_FORMATS = ('pdf', 'doc', 'docx', 'xls', 'xlsx', 'txt')
+
+# Precompiled format -> resource type table used for every signing call.
+RESOURCE_TYPE_BY_FORMAT = {
+    **{fmt: 'image' for fmt in IMAGE_FORMATS},
+    **{fmt: 'video' for fmt in VIDEO_FORMATS},
+    **{fmt: 'raw' for fmt in DOCUMENT_FORMATS},
+}
+
+# Document folders often contain images (scanned docs without extensions).
+DOCUMENT_FOLDERS = ('passports', 'visas', 'documents', 'vaccinations', 'id_cards', 'birth_certificates')
+
+# Expiries are rounded up to these buckets so repeated requests produce identical,
+# cacheable URLs; each URL stays valid for at least the requested lifetime.
+SIGNED_URL_BUCKET_SECONDS = 300
+SIGNED_URL_CACHE_SIZE = 4096
+
+
+def detect_resource_type(public_id: str, file_format: str = None) -> str:
+    """Return the Cloudinary resource type for a public_id and optional format."""
+    if file_format:
+        resource_type = RESOURCE_TYPE_BY_FORMAT.get(file_format.lower().lstrip('.'))
+        if resource_type:
+            return resource_type
+
+    public_id_lower = public_id.lower()
+    _, dot, extension = public_id_lower.rpartition('.')
+    if dot and '/' not in extension:
+        resource_type = RESOURCE_TYPE_BY_FORMAT.get(extension)
+        if resource_type:
+            return resource_type
+
+    # No extension detected - use folder-based heuristic for legacy uploads
+    if public_id_lower.startswith(DOCUMENT_FOLDERS):
+        return 'image'
+    return 'raw'
+
+
+def signed_expiry(expires_in: int, now: float = None) -> int:
+    """Return ``now + expires_in`` rounded up to the next expiry bucket."""
+    now = time.time() if now is None else now
+    return -(-int(now + expires_in) // SIGNED_URL_BUCKET_SECONDS) * SIGNED_URL_BUCKET_SECONDS
+
+
+@lru_cache(maxsize=SIGNED_URL_CACHE_SIZE)
+def _signed_url(public_id: str, resource_type: str, expires_at: int) -> str:
+    """Sign one URL; memoized because the expiry is part of the key."""
+    url, options = cloudinary.utils.cloudinary_url(
+        public_id,
+        resource_type=resource_type,
+        type='authenticated',  # Use authenticated type for non-public resources
+        sign_url=True,
+        expires_at=expires_at,
+        secure=True
+    )
+    return url
+
+
 def signed_delivery(public_id: str, expires_in: int = 600, resource_type: str = None, file_format: str = None) -> str:
     """
     Generate a signed URL for private Cloudinary resources.
     
     Args:
         public_id: The Cloudinary public_id of the resource
-        expires_in: Expiration time in seconds (default: 10 minutes)
+        expires_in: Minimum lifetime in seconds (default: 10 minutes)
         resource_type: Type of resource ('raw', 'image', 'video', etc.). If None, auto-detects.
         file_format: File format/extension (jpg, pdf, png, etc.). Used for detection if provided.
         
     Returns:
-        Signed URL that expires after the specified time
+        Signed URL valid for at least the requested time
         
     Example:
         >>> url = signed_delivery('passports/abc123', file_format='pdf')
@@ -29,60 +90,34 @@ def signed_delivery(public_id: str, expires_in: int = 600, resource_type: str =
     if not public_id:
         return ''
     
-    # Auto-detect resource type if not provided
     if resource_type is None:
-        # First, try using the provided file_format
-        if file_format:
-            format_lower = file_format.lower().lstrip('.')
-            
-            image_formats = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'svg', 'tiff', 'tif', 'ico']
-            video_formats = ['mp4', 'mov', 'avi', 'wmv', 'flv', 'webm', 'mkv']
-            document_formats = ['pdf', 'doc', 'docx', 'xls', 'xlsx', 'txt']
-            
-            if format_lower in image_formats:
-                resource_type = 'image'
-            elif format_lower in video_formats:
-                resource_type = 'video'
-            elif format_lower in document_formats:
-                resource_type = 'raw'
-        
-        # Fallback: Check file extension in public_id
-        if resource_type is None:
-            public_id_lower = public_id.lower()
-            
-            image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg', '.tiff', '.ico']
-            video_extensions = ['.mp4', '.mov', '.avi', '.wmv', '.flv', '.webm', '.mkv']
-            document_extensions = ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.txt']
-            
-            if any(public_id_lower.endswith(ext) for ext in image_extensions):
-                resource_type = 'image'
-            elif any(public_id_lower.endswith(ext) for ext in video_extensions):
-                resource_type = 'video'
-            elif any(public_id_lower.endswith(ext) for ext in document_extensions):
-                resource_type = 'raw'
-            else:
-                # No extension detected - use folder-based heuristic for legacy uploads
-                # Document folders often contain images (scanned docs without extensions)
-                document_folders = ['passports', 'visas', 'documents', 'vaccinations', 'id_cards', 'birth_certificates']
-                if any(public_id_lower.startswith(folder) for folder in document_folders):
-                    resource_type = 'image'
-                else:
-                    resource_type = 'raw'
-    
-    # Calculate expiration timestamp
-    expiration = int(time.time()) + expires_in
-    
-    # Generate signed URL
-    url, options = cloudinary.utils.cloudinary_url(
-        public_id,
-        resource_type=resource_type,
-        type='authenticated',  # Use authenticated type for non-public resources
-        sign_url=True,
-        expires_at=expiration,
-        secure=True
-    )
+        resource_type = detect_resource_type(public_id, file_format)
     
-    return url
+    return _signed_url(public_id, resource_type, signed_expiry(expires_in))
+
+
+def signed_delivery_batch(items, expires_in: int = 600) -> list[str]:
+    """
+    Generate signed URLs for many ``(public_id, file_format)`` pairs at once.
+    
+    All URLs share one expiry bucket, and repeated pairs are signed only once.
+    Blank public_ids map to ``''`` like ``signed_delivery``.
+    
+    Example:
+        >>> signed_delivery_batch([('passports/a', 'pdf'), ('visas/b', None)])
+    """
+    expires_at = signed_expiry(expires_in)
+    urls = {}
+    results = []
+    for public_id, file_format in items:
+        if not public_id:
+            results.append('')
+            continue
+        key = (public_id, file_format)
+        if key not in urls:
+            urls[key] = _signed_url(public_id, detect_resource_type(public_id, file_format), expires_at)
+        results.append(urls[key])
+    return results
 
 
 def upload_file(file, folder: str = '', public_id: Optional[str] = None, resource_type: str = 'raw', is_public: bool = False) -> dict:
@@ -159,34 +194,40 @@ def delete_file(public_id: str, resource_type: str = 'raw') -> bool:
         return False
 
 
-def get_signed_upload_params(folder: str = '', resource_type: str = 'raw') -> dict:
+def get_signed_upload_params(folder: str = '', resource_type: str = 'raw', public_id: Optional[str] = None) -> dict:
     """
-    Generate signed upload parameters for client-side uploads (if needed in future).
+    Generate signed upload parameters for direct client-side uploads.
     
     Args:
         folder: Cloudinary folder to upload to
         resource_type: Type of resource ('raw', 'image', 'video', etc.)
+        public_id: Exact public_id the upload must be stored under (optional)
         
     Returns:
-        Dict with signature, timestamp, and other params for client upload
+        Dict with signature, timestamp, and other params for client upload,
+        plus the ``upload_url`` to POST them to
     """
     timestamp = int(time.time())
     
     params = {
         'timestamp': timestamp,
-        'folder': folder,
-        'resource_type': resource_type,
         'type': 'authenticated',
     }
+    if folder:
+        params['folder'] = folder
+    if public_id:
+        params['public_id'] = public_id
     
-    # Generate signature
+    # resource_type selects the upload endpoint and is not part of the signature
     signature = cloudinary.utils.api_sign_request(params, settings.CLOUDINARY_STORAGE['API_SECRET'])
+    cloud_name = settings.CLOUDINARY_STORAGE['CLOUD_NAME']
     
     return {
         **params,
         'signature': signature,
         'api_key': settings.CLOUDINARY_STORAGE['API_KEY'],
-        'cloud_name': settings.CLOUDINARY_STORAGE['CLOUD_NAME'],
+        'cloud_name': cloud_name,
+        'upload_url': f'https://api.cloudinary.com/v1_1/{cloud_name}/{resource_type}/upload',
     }
 
 
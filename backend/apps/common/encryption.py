@@ -1,10 +1,87 @@
 """
 Field-level encryption utilities using Fernet (symmetric encryption).
+
+``FIELD_ENCRYPTION_KEYS`` is an ordered key list: the first key encrypts and
+every key can decrypt, so a new key can be deployed first and old ciphertexts
+re-encrypted afterwards with ``manage.py rotate_encryption_keys``. The
+``MultiFernet`` built from the list is cached per process.
+
+Fernet ciphertexts are randomized, so encrypted identifiers cannot be matched
+in SQL. ``blind_index`` gives them a deterministic HMAC companion value that
+equality lookups and unique checks can use instead.
 """
+import hashlib
+import hmac
+import logging
+from functools import lru_cache
+
 from django.conf import settings
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from django.db import models
 
+logger = logging.getLogger(__name__)
+
+
+def get_encryption_keys() -> list[str]:
+    """Return the configured keys, primary first."""
+    keys = list(getattr(settings, 'FIELD_ENCRYPTION_KEYS', None) or [])
+    if not keys and getattr(settings, 'FIELD_ENCRYPTION_KEY', None):
+        keys = [settings.FIELD_ENCRYPTION_KEY]
+    if not keys:
+        raise ValueError(
+            "FIELD_ENCRYPTION_KEY must be set in settings. "
+            "Generate with: from cryptography.fernet import Fernet; Fernet.generate_key().decode()"
+        )
+    return keys
+
+
+@lru_cache(maxsize=4)
+def build_cipher(keys: tuple) -> MultiFernet:
+    """Return a ``MultiFernet`` for an ordered key tuple."""
+    return MultiFernet([Fernet(key.encode() if isinstance(key, str) else key) for key in keys])
+
+
+def get_cipher() -> MultiFernet:
+    """Return the cached cipher for the configured keys."""
+    return build_cipher(tuple(get_encryption_keys()))
+
+
+def normalize_identifier(value) -> str:
+    """Strip whitespace and upper-case an identifier such as a passport number."""
+    return ''.join(str(value).split()).upper()
+
+
+def blind_index(value) -> str | None:
+    """
+    Return the HMAC-SHA256 lookup digest for an identifier, or ``None`` if blank.
+
+    Keyed by ``BLIND_INDEX_KEY``, which is separate from the encryption keys so
+    that rotating them does not invalidate stored indexes.
+    """
+    if value is None:
+        return None
+    normalized = normalize_identifier(value)
+    if not normalized:
+        return None
+    return hmac.new(settings.BLIND_INDEX_KEY.encode(), normalized.encode(), hashlib.sha256).hexdigest()
+
+
+def rotate_tokens(keys, tokens) -> list:
+    """
+    Re-encrypt Fernet tokens under the primary key.
+
+    Tokens that no key can decrypt come back as ``None``. Takes the keys
+    explicitly so it can run in a worker process.
+    """
+    cipher = build_cipher(tuple(keys))
+    rotated = []
+    for token in tokens:
+        try:
+            rotated.append(cipher.rotate(token.encode()).decode())
+        except InvalidToken:
+            rotated.append(None)
+    return rotated
+
 
 class EncryptedCharField(models.CharField):
     """
@@ -25,16 +102,8 @@ class EncryptedCharField(models.CharField):
         # The key will be validated when actually encrypting/decrypting data
     
     def get_cipher(self):
-        """Get Fernet cipher instance."""
-        if not hasattr(settings, 'FIELD_ENCRYPTION_KEY') or not settings.FIELD_ENCRYPTION_KEY:
-            raise ValueError(
-                "FIELD_ENCRYPTION_KEY must be set in settings. "
-                "Generate with: from cryptography.fernet import Fernet; Fernet.generate_key().decode()"
-            )
-        key = settings.FIELD_ENCRYPTION_KEY
-        if isinstance(key, str):
-            key = key.encode()
-        return Fernet(key)
+        """Get the cached cipher instance."""
+        return get_cipher()
     
     def from_db_value(self, value, expression, connection):
         """Decrypt value when loading from database."""
@@ -47,8 +116,6 @@ class EncryptedCharField(models.CharField):
             return decrypted.decode()
         except Exception as e:
             # Log error but don't expose sensitive data
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Failed to decrypt field: {type(e).__name__}")
             return "***DECRYPTION_ERROR***"
     
@@ -73,8 +140,6 @@ class EncryptedCharField(models.CharField):
             encrypted = cipher.encrypt(str(value).encode())
             return encrypted.decode()
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Failed to encrypt field: {type(e).__name__}")
             raise
 
@@ -92,12 +157,7 @@ def encrypt_value(value: str) -> str:
     if not value:
         return value
     
-    key = settings.FIELD_ENCRYPTION_KEY
-    if isinstance(key, str):
-        key = key.encode()
-    
-    cipher = Fernet(key)
-    encrypted = cipher.encrypt(value.encode())
+    encrypted = get_cipher().encrypt(value.encode())
     return encrypted.decode()
 
 
@@ -114,12 +174,7 @@ def decrypt_value(encrypted_value: str) -> str:
     if not encrypted_value:
         return encrypted_value
     
-    key = settings.FIELD_ENCRYPTION_KEY
-    if isinstance(key, str):
-        key = key.encode()
-    
-    cipher = Fernet(key)
-    decrypted = cipher.decrypt(encrypted_value.encode())
+    decrypted = get_cipher().decrypt(encrypted_value.encode())
     return decrypted.decode()
 
 
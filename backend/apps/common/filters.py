@@ -0,0 +1,34 @@
+"""
+Search filters shared by API views.
+"""
+from django.db.models import Q
+from rest_framework.filters import SearchFilter
+
+from apps.common.encryption import blind_index
+
+
+class BlindIndexSearchFilter(SearchFilter):
+    """
+    ``SearchFilter`` that also matches the search text against blind indexes.
+
+    Views list their index columns in ``blind_index_search_fields``. Encrypted
+    identifiers cannot be searched with ``icontains``, so a search equal to the
+    full identifier (ignoring case and spacing) is matched with an indexed
+    equality lookup instead.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        matched = super().filter_queryset(request, queryset, view)
+        index_fields = getattr(view, 'blind_index_search_fields', None)
+        search_terms = self.get_search_terms(request)
+        if not index_fields or not search_terms:
+            return matched
+
+        digest = blind_index(''.join(search_terms))
+        lookup = Q()
+        for field in index_fields:
+            lookup |= Q(**{field: digest})
+        indexed = queryset.filter(lookup)
+        if matched.query.distinct:
+            indexed = indexed.distinct()
+        return matched | indexed
@@ -0,0 +1,66 @@
+"""
+Management command to recompute blind-index columns under the current BLIND_INDEX_KEY
+Usage: python manage.py rebuild_blind_indexes [--batch-size 500] [--model pilgrims.Document]
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.common.encryption import blind_index
+
+# (model label, source field, index field) for every blind-indexed identifier.
+BLIND_INDEXED_FIELDS = [
+    ('accounts.PilgrimProfile', 'passport_number', 'passport_number_index'),
+    ('pilgrims.Document', 'document_number', 'document_number_index'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Recomputes every blind-index column with the configured BLIND_INDEX_KEY'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows read and written per transaction')
+        parser.add_argument('--model', help='Only rebuild this model (app_label.ModelName)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        targets = [
+            (apps.get_model(label), source, index)
+            for label, source, index in BLIND_INDEXED_FIELDS
+            if not options['model'] or label.lower() == options['model'].lower()
+        ]
+        if not targets:
+            raise CommandError(f"No blind-indexed columns on {options['model']}")
+
+        for model, source, index in targets:
+            self.rebuild_model(model, source, index, batch_size)
+
+    def rebuild_model(self, model, source, index, batch_size):
+        """Rewrite one index column in primary-key order, touching only rows whose digest changed."""
+        label = model._meta.label
+        queryset = model._default_manager.order_by('pk').only('pk', source, index)
+        changed_total = 0
+        last_pk = None
+        while True:
+            page = queryset.filter(pk__gt=last_pk) if last_pk is not None else queryset
+            rows = list(page[:batch_size])
+            if not rows:
+                break
+
+            changed = []
+            for row in rows:
+                digest = blind_index(getattr(row, source))
+                if getattr(row, index) != digest:
+                    setattr(row, index, digest)
+                    changed.append(row)
+            if changed:
+                with transaction.atomic():
+                    model._default_manager.bulk_update(changed, [index])
+
+            changed_total += len(changed)
+            last_pk = rows[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f"{label}: rebuilt {changed_total} {index} values"))
@@ -0,0 +1,128 @@
+"""
+Management command to re-encrypt EncryptedCharField columns under the primary key
+Usage: python manage.py rotate_encryption_keys [--batch-size 500] [--workers 4] [--model pilgrims.Document] [--start-after <pk>]
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import CharField
+from django.db.models.functions import Cast
+
+from apps.common.encryption import EncryptedCharField, get_encryption_keys, rotate_tokens
+
+
+def encrypted_models(label=None):
+    """Return ``(model, [field, ...])`` for every model storing encrypted columns."""
+    found = []
+    for model in apps.get_models():
+        if label and model._meta.label_lower != label.lower():
+            continue
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        fields = [field for field in model._meta.concrete_fields if isinstance(field, EncryptedCharField)]
+        if fields:
+            found.append((model, fields))
+    return found
+
+
+class Command(BaseCommand):
+    help = 'Re-encrypts every EncryptedCharField value with the first key in FIELD_ENCRYPTION_KEYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows read and written per transaction')
+        parser.add_argument('--workers', type=int, default=1, help='Processes used to re-encrypt each batch')
+        parser.add_argument('--model', help='Only rotate this model (app_label.ModelName)')
+        parser.add_argument(
+            '--start-after',
+            help='Resume after this primary key; requires --model',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        workers = options['workers']
+        if batch_size < 1 or workers < 1:
+            raise CommandError('--batch-size and --workers must be positive')
+        if options['start_after'] and not options['model']:
+            raise CommandError('--start-after requires --model')
+
+        targets = encrypted_models(options['model'])
+        if not targets:
+            self.stdout.write('No encrypted columns found')
+            return
+
+        keys = get_encryption_keys()
+        self.workers = workers
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for model, fields in targets:
+                self.rotate_model(model, fields, keys, batch_size, executor, options['start_after'])
+        finally:
+            if executor:
+                executor.shutdown()
+
+    def rotate_model(self, model, fields, keys, batch_size, executor, start_after):
+        """Rotate one model in primary-key order, printing a resume point after every batch."""
+        label = model._meta.label
+        # Cast reads the stored ciphertext instead of letting the field decrypt it.
+        raw = {f'raw_{field.attname}': Cast(field.attname, CharField()) for field in fields}
+        queryset = model._default_manager.order_by('pk')
+        if start_after is not None:
+            queryset = queryset.filter(pk__gt=start_after)
+
+        rotated_total = failed_total = 0
+        while True:
+            rows = list(queryset.annotate(**raw).values('pk', *raw)[:batch_size])
+            if not rows:
+                break
+
+            updated, failed = self.rotate_batch(model, fields, rows, keys, executor)
+            rotated_total += updated
+            failed_total += failed
+            last_pk = rows[-1]['pk']
+            self.stdout.write(f"{label}: rotated {rotated_total} rows, last pk {last_pk}")
+            queryset = model._default_manager.order_by('pk').filter(pk__gt=last_pk)
+
+        if failed_total:
+            self.stdout.write(self.style.WARNING(f"{label}: {failed_total} values could not be decrypted with any key"))
+        self.stdout.write(self.style.SUCCESS(f"{label}: rotated {rotated_total} rows"))
+
+    def rotate_batch(self, model, fields, rows, keys, executor):
+        """Re-encrypt one batch and write it back with a single ``bulk_update``."""
+        columns = []
+        for field in fields:
+            tokens = [row[f'raw_{field.attname}'] for row in rows]
+            present = [token for token in tokens if token]
+            if executor and present:
+                chunk = max(1, -(-len(present) // self.workers))
+                chunks = [present[i:i + chunk] for i in range(0, len(present), chunk)]
+                rotated = [token for part in executor.map(rotate_tokens, [keys] * len(chunks), chunks) for token in part]
+            else:
+                rotated = rotate_tokens(keys, present)
+            rotated_iter = iter(rotated)
+            columns.append([next(rotated_iter) if token else None for token in tokens])
+
+        objects = []
+        failed = 0
+        for index, row in enumerate(rows):
+            instance = model(pk=row['pk'])
+            changed = []
+            for field, values in zip(fields, columns):
+                if row[f'raw_{field.attname}'] and values[index] is None:
+                    failed += 1
+                    continue
+                if values[index]:
+                    setattr(instance, field.attname, values[index])
+                    changed.append(field.attname)
+            if changed:
+                objects.append((instance, changed))
+
+        # Rows missing a column's value still get the others; bulk_update needs one field list.
+        with transaction.atomic():
+            for attnames in {tuple(changed) for _instance, changed in objects}:
+                model._default_manager.bulk_update(
+                    [instance for instance, changed in objects if tuple(changed) == attnames],
+                    list(attnames),
+                )
+        return len(objects), failed
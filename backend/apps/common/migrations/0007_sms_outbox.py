@@ -0,0 +1,63 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:12
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0006_platformsettings_mobile_support_and_notifications"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SmsOutboxMessage",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("phone", models.CharField(max_length=24)),
+                ("message", models.TextField()),
+                (
+                    "purpose",
+                    models.CharField(
+                        choices=[("OTP", "One-time password"), ("NOTIFICATION", "Notification")],
+                        default="NOTIFICATION",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("QUEUED", "Queued"), ("SENT", "Sent"), ("FAILED", "Failed")],
+                        default="QUEUED",
+                        max_length=8,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(blank=True, help_text="Earliest time the worker may retry", null=True),
+                ),
+                ("provider", models.CharField(blank=True, default="", max_length=32)),
+                ("provider_message_id", models.CharField(blank=True, default="", max_length=100)),
+                ("last_error", models.CharField(blank=True, default="", max_length=255)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "SMS Outbox Message",
+                "verbose_name_plural": "SMS Outbox Messages",
+                "db_table": "sms_outbox_messages",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="smsoutboxmessage",
+            index=models.Index(fields=["status", "next_attempt_at"], name="sms_outbox__status_6956c9_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="smsoutboxmessage",
+            index=models.Index(fields=["phone", "created_at"], name="sms_outbox__phone_4a0e83_idx"),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:28
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0007_sms_outbox"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityEvent",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("BOOKING_CREATED", "Booking Created"),
+                            ("PAYMENT_RECORDED", "Payment Recorded"),
+                            ("DOCUMENT_REVIEWED", "Document Reviewed"),
+                            ("READINESS_VALIDATED", "Readiness Validated"),
+                            ("LEAD_SUBMITTED", "Lead Submitted"),
+                            ("FEEDBACK_SUBMITTED", "Feedback Submitted"),
+                        ],
+                        max_length=24,
+                    ),
+                ),
+                ("title", models.CharField(max_length=160)),
+                ("description", models.CharField(blank=True, default="", max_length=255)),
+                ("status", models.CharField(blank=True, default="", max_length=32)),
+                (
+                    "subject_id",
+                    models.CharField(help_text="Primary key of the booking, document, lead, etc.", max_length=64),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Activity Event",
+                "verbose_name_plural": "Activity Events",
+                "db_table": "activity_events",
+                "ordering": ["-created_at", "-id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="activityevent",
+            name="actor",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="activity_events",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activityevent",
+            index=models.Index(fields=["created_at"], name="activity_ev_created_cc5c13_idx"),
+        ),
+    ]
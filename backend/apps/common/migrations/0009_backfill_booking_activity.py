@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_recent_bookings(apps, schema_editor):
+    """Seed the activity feed with the last week of bookings it used to read directly."""
+    ActivityEvent = apps.get_model('common', 'ActivityEvent')
+    Booking = apps.get_model('bookings', 'Booking')
+
+    bookings = Booking.objects.select_related('pilgrim__user', 'package__trip').filter(
+        created_at__gte=timezone.now() - timedelta(days=7)
+    )
+    for booking in bookings:
+        event = ActivityEvent.objects.create(
+            event_type='BOOKING_CREATED',
+            title=f'New {booking.status} booking',
+            description=f'{booking.pilgrim.user.name} - {booking.package.trip.name}'[:255],
+            status=booking.status,
+            subject_id=str(booking.id),
+        )
+        # created_at is auto_now_add; carry over the booking's own timestamp.
+        ActivityEvent.objects.filter(pk=event.pk).update(created_at=booking.created_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0008_activityevent'),
+        ('bookings', '0006_remove_booking_currency_code_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_recent_bookings, migrations.RunPython.noop),
+    ]
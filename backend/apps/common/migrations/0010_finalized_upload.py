@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0009_backfill_booking_activity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FinalizedUpload",
+            fields=[
+                ("public_id", models.CharField(max_length=160, primary_key=True, serialize=False)),
+                ("target", models.CharField(max_length=16)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Finalized Upload",
+                "verbose_name_plural": "Finalized Uploads",
+                "db_table": "finalized_uploads",
+            },
+        ),
+    ]
@@ -1,9 +1,17 @@
 """
 Common models shared across the application.
 """
-from django.db import models
+import copy
+
+from django.core.cache import cache
+from django.db import models, transaction
 from uuid import uuid4
 
+PLATFORM_SETTINGS_VERSION_KEY = 'platform-settings:version'
+
+# Process-local copy of the settings row and the shared version it was loaded at.
+_platform_settings_local = {'version': None, 'instance': None}
+
 
 class Currency(models.Model):
     """Currency model to manage different currencies in the system."""
@@ -68,12 +76,43 @@ class PlatformSettings(models.Model):
     def __str__(self):
         return 'Platform Settings'
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.invalidate_cache()
+
     @classmethod
     def get_solo(cls):
         """Return the singleton settings row."""
         settings_obj, _ = cls.objects.get_or_create(key='default')
         return settings_obj
 
+    @classmethod
+    def get_cached(cls):
+        """
+        Return a copy of the singleton from this process's cache.
+
+        The copy is reloaded only when the version stamp in the shared cache
+        changes, which happens after any save commits. Use ``get_solo`` when the
+        row is about to be edited.
+        """
+        version = cache.get(PLATFORM_SETTINGS_VERSION_KEY)
+        if version is None:
+            cache.add(PLATFORM_SETTINGS_VERSION_KEY, uuid4().hex, timeout=None)
+            version = cache.get(PLATFORM_SETTINGS_VERSION_KEY)
+
+        if _platform_settings_local['instance'] is None or _platform_settings_local['version'] != version:
+            _platform_settings_local['instance'] = cls.get_solo()
+            _platform_settings_local['version'] = version
+        return copy.copy(_platform_settings_local['instance'])
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop this process's copy now and tell every other process once the save commits."""
+        _platform_settings_local['instance'] = None
+        transaction.on_commit(
+            lambda: cache.set(PLATFORM_SETTINGS_VERSION_KEY, uuid4().hex, timeout=None)
+        )
+
 
 class WebsiteLead(models.Model):
     """Website lead captured from public conversion forms."""
@@ -142,3 +181,111 @@ class WebsiteLead(models.Model):
 
     def __str__(self):
         return f"{self.name} - {self.interest_type}"
+
+
+class SmsOutboxMessage(models.Model):
+    """Outgoing SMS persisted on the request path and delivered by a background worker."""
+
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    PURPOSE_CHOICES = [
+        ('OTP', 'One-time password'),
+        ('NOTIFICATION', 'Notification'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    phone = models.CharField(max_length=24)
+    message = models.TextField()
+    purpose = models.CharField(max_length=16, choices=PURPOSE_CHOICES, default='NOTIFICATION')
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default='QUEUED')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True, help_text='Earliest time the worker may retry')
+    provider = models.CharField(max_length=32, blank=True, default='')
+    provider_message_id = models.CharField(max_length=100, blank=True, default='')
+    last_error = models.CharField(max_length=255, blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'sms_outbox_messages'
+        verbose_name = 'SMS Outbox Message'
+        verbose_name_plural = 'SMS Outbox Messages'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['phone', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.phone} - {self.purpose} ({self.status})"
+
+
+class FinalizedUpload(models.Model):
+    """
+    Claim on a direct upload that has been turned into a record.
+
+    The primary key is the upload's ``public_id``, so concurrent finalize
+    calls for one upload cannot both create a record.
+    """
+
+    public_id = models.CharField(max_length=160, primary_key=True)
+    target = models.CharField(max_length=16)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'finalized_uploads'
+        verbose_name = 'Finalized Upload'
+        verbose_name_plural = 'Finalized Uploads'
+
+    def __str__(self):
+        return f"{self.target} - {self.public_id}"
+
+
+class ActivityEvent(models.Model):
+    """
+    Append-only record of staff-relevant activity for the dashboard feed.
+
+    Rows carry everything the feed renders, so reading a page never joins
+    the tables the events came from.
+    """
+
+    EVENT_TYPE_CHOICES = [
+        ('BOOKING_CREATED', 'Booking Created'),
+        ('PAYMENT_RECORDED', 'Payment Recorded'),
+        ('DOCUMENT_REVIEWED', 'Document Reviewed'),
+        ('READINESS_VALIDATED', 'Readiness Validated'),
+        ('LEAD_SUBMITTED', 'Lead Submitted'),
+        ('FEEDBACK_SUBMITTED', 'Feedback Submitted'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    event_type = models.CharField(max_length=24, choices=EVENT_TYPE_CHOICES)
+    title = models.CharField(max_length=160)
+    description = models.CharField(max_length=255, blank=True, default='')
+    status = models.CharField(max_length=32, blank=True, default='')
+    subject_id = models.CharField(max_length=64, help_text='Primary key of the booking, document, lead, etc.')
+    actor = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'activity_events'
+        verbose_name = 'Activity Event'
+        verbose_name_plural = 'Activity Events'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} - {self.title}"
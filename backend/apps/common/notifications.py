@@ -63,7 +63,7 @@ def build_website_lead_notification_body(lead: WebsiteLead) -> str:
 
 def send_website_lead_notification(lead: WebsiteLead) -> bool:
     """Send an internal email notification for a newly captured website lead."""
-    platform_settings = PlatformSettings.get_solo()
+    platform_settings = PlatformSettings.get_cached()
     to_email = platform_settings.lead_notification_to_email.strip()
     if not to_email:
         logger.info("Skipping website lead notification for lead %s because no recipient is configured.", lead.id)
@@ -10,9 +10,20 @@ ADMIN_ONLY_ROLES = ('ADMIN',)
 
 def get_staff_role(user):
     """Return the staff role for an authenticated staff user."""
+    # Set by CachedJWTAuthentication from the cached account snapshot.
+    if hasattr(user, 'staff_role'):
+        return user.staff_role
     return getattr(getattr(user, 'staff_profile', None), 'role', None)
 
 
+def user_has_pilgrim_profile(user):
+    """Check whether a user has an attached pilgrim profile."""
+    # Set by CachedJWTAuthentication from the cached account snapshot.
+    if hasattr(user, 'has_pilgrim_profile'):
+        return user.has_pilgrim_profile
+    return hasattr(user, 'pilgrim_profile')
+
+
 def user_has_staff_role(user, allowed_roles):
     """Check whether a user has one of the allowed staff roles."""
     if not user or not user.is_authenticated:
@@ -59,7 +70,7 @@ class HasPilgrimProfile(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        return hasattr(request.user, 'pilgrim_profile')
+        return user_has_pilgrim_profile(request.user)
 
 
 class IsStaff(permissions.BasePermission):
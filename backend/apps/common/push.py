@@ -0,0 +1,78 @@
+"""
+Pluggable push notification providers.
+
+Providers receive device tokens in batches no larger than ``batch_size`` and
+report how many deliveries succeeded, how many failed, and which tokens the
+provider rejected as permanently invalid. ``PUSH_PROVIDER`` selects the class;
+the local provider records batches in memory for tests and development. With
+no provider configured, delivery stays off whatever the platform toggle says.
+"""
+import logging
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import PlatformSettings
+
+logger = logging.getLogger(__name__)
+
+
+class PushMessage:
+    """Provider-neutral push notification content."""
+
+    def __init__(self, title, body, data=None):
+        self.title = title
+        self.body = body
+        self.data = data or {}
+
+
+class PushBatchResult:
+    """Outcome of sending one batch of tokens."""
+
+    def __init__(self, sent=0, failed=0, invalid_tokens=None):
+        self.sent = sent
+        self.failed = failed
+        self.invalid_tokens = invalid_tokens or []
+
+
+class BasePushProvider:
+    """Interface every push provider implements."""
+
+    name = 'base'
+    # Key inside DeviceInstallation.provider_token_fields that holds this provider's token.
+    token_field = 'nativeToken'
+    batch_size = 500
+
+    def send_batch(self, tokens, message) -> PushBatchResult:
+        """Send one message to up to ``batch_size`` tokens."""
+        raise NotImplementedError
+
+
+class LocalPushProvider(BasePushProvider):
+    """Provider stub that records batches instead of contacting a push service."""
+
+    name = 'local'
+
+    def __init__(self):
+        self.sent_batches = []
+
+    def send_batch(self, tokens, message) -> PushBatchResult:
+        self.sent_batches.append((list(tokens), message))
+        logger.info("Local push provider accepted %s tokens for %r", len(tokens), message.title)
+        return PushBatchResult(sent=len(tokens))
+
+
+_provider = None
+
+
+def push_delivery_enabled():
+    """Return whether a push provider is configured and platform settings allow delivery."""
+    return bool(settings.PUSH_PROVIDER) and PlatformSettings.get_cached().notification_provider_enabled
+
+
+def get_push_provider():
+    """Return the process-wide provider configured by ``PUSH_PROVIDER``."""
+    global _provider
+    if _provider is None:
+        _provider = import_string(settings.PUSH_PROVIDER)()
+    return _provider
@@ -0,0 +1,139 @@
+"""
+Pub/sub brokers for pushing live events to long-lived streaming connections.
+
+Publishers run in ordinary synchronous Django code (request handlers, signal
+handlers, Celery tasks); subscribers are async streaming views. The Redis
+broker fans messages out across every ASGI worker, while the local broker keeps
+everything in-process for tests and single-process development servers.
+"""
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBroker:
+    """In-process broker that fans messages out to asyncio queues."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set] = {}
+
+    def publish(self, channel, message):
+        """Deliver a message to every subscriber of a channel."""
+        # Round-trip through JSON so subscribers see the same shapes as with Redis.
+        message = json.loads(json.dumps(message, cls=DjangoJSONEncoder))
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        """Subscribe to a channel for the lifetime of the context."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            yield LocalSubscription(subscriber[1])
+        finally:
+            with self._lock:
+                channel_subscribers = self._subscribers.get(channel, set())
+                channel_subscribers.discard(subscriber)
+                if not channel_subscribers:
+                    self._subscribers.pop(channel, None)
+
+
+class LocalSubscription:
+    """Receive side of a local broker subscription."""
+
+    def __init__(self, queue):
+        self._queue = queue
+
+    async def get(self, timeout):
+        """Return the next message, or None if nothing arrives before the timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RedisBroker:
+    """Redis pub/sub broker shared by every worker process."""
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+
+    def publish(self, channel, message):
+        """Publish a JSON-encoded message to a Redis channel."""
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        """Subscribe to a Redis channel for the lifetime of the context."""
+        import redis.asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            yield RedisSubscription(pubsub)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class RedisSubscription:
+    """Receive side of a Redis broker subscription."""
+
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    async def get(self, timeout):
+        """Return the next decoded message, or None if nothing arrives before the timeout."""
+        message = await self._pubsub.get_message(timeout=timeout)
+        if not message or message.get('type') != 'message':
+            return None
+        return json.loads(message['data'])
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker selected by ``REALTIME_BROKER``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if settings.REALTIME_BROKER == 'redis':
+                    _broker = RedisBroker(settings.REALTIME_REDIS_URL)
+                else:
+                    _broker = LocalBroker()
+    return _broker
+
+
+def publish_event(channel, message):
+    """Publish a message, logging instead of raising so writes never fail on a broker outage."""
+    try:
+        get_broker().publish(channel, message)
+    except Exception:
+        logger.exception("Failed to publish realtime event to %s", channel)
+
+
+def trip_updates_channel(trip_id):
+    """Return the pub/sub channel carrying live updates for a trip."""
+    return f'trip-updates:{trip_id}'
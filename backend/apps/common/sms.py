@@ -0,0 +1,281 @@
+"""
+SMS outbox and pluggable SMS providers.
+
+Request handlers never talk to the SMS gateway. They call ``queue_sms`` to
+persist an ``SmsOutboxMessage`` and return; a Celery worker claims queued rows,
+groups identical message bodies into multi-recipient provider calls, and
+records the outcome. Transient failures are retried with exponential backoff
+until ``SMS_MAX_ATTEMPTS``; permanent failures (invalid or blacklisted
+numbers) are marked failed straight away. Celery beat sweeps the outbox every
+minute so rows whose enqueue was lost are still delivered.
+
+Message bodies can hold one-time passwords, so a row's body is blanked as soon
+as it is sent or given up on, an OTP that has expired or been replaced by a
+newer one is dropped rather than sent late, and finished rows are deleted
+after ``SMS_OUTBOX_RETENTION_DAYS``.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import SmsOutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed row stays invisible to other workers before a sweep may retry it.
+CLAIM_TIMEOUT_SECONDS = 300
+MAX_RETRY_DELAY_SECONDS = 1800
+
+
+class SmsDeliveryResult:
+    """Provider outcome for one recipient."""
+
+    def __init__(self, success, message_id='', error='', permanent=False):
+        self.success = success
+        self.message_id = message_id
+        self.error = error
+        self.permanent = permanent
+
+
+class BaseSmsProvider:
+    """Interface every SMS provider implements."""
+
+    name = 'base'
+    # Largest recipient list the provider accepts for one message body.
+    max_recipients = 1
+
+    def send(self, message, phones) -> dict:
+        """Send one body to ``phones`` and return ``{phone: SmsDeliveryResult}``."""
+        raise NotImplementedError
+
+
+class AfricasTalkingSmsProvider(BaseSmsProvider):
+    """Africa's Talking bulk SMS provider."""
+
+    name = 'africastalking'
+    max_recipients = 100
+    SUCCESS_STATUS_CODES = {100, 101, 102}
+    # Invalid phone number, unsupported number type, recipient blacklisted.
+    PERMANENT_STATUS_CODES = {403, 404, 406}
+
+    def send(self, message, phones) -> dict:
+        import africastalking
+
+        send_params = {
+            'message': message,
+            'recipients': list(phones),
+        }
+        if settings.AFRICASTALKING_SENDER_ID:
+            send_params['sender_id'] = settings.AFRICASTALKING_SENDER_ID
+
+        response = africastalking.SMS.send(**send_params)
+        results = {}
+        for recipient in response.get('SMSMessageData', {}).get('Recipients', []):
+            status_code = recipient.get('statusCode')
+            status_text = recipient.get('status', '')
+            success = status_code in self.SUCCESS_STATUS_CODES or status_text.lower() == 'success'
+            results[recipient.get('number')] = SmsDeliveryResult(
+                success=success,
+                message_id=recipient.get('messageId', ''),
+                error='' if success else status_text or f'Status code {status_code}',
+                permanent=status_code in self.PERMANENT_STATUS_CODES,
+            )
+        return results
+
+
+class LocalSmsProvider(BaseSmsProvider):
+    """Provider stub that records messages instead of contacting a gateway."""
+
+    name = 'local'
+    max_recipients = 100
+
+    def __init__(self):
+        self.sent_messages = []
+
+    def send(self, message, phones) -> dict:
+        self.sent_messages.append((message, list(phones)))
+        logger.info("Local SMS provider accepted %s recipients", len(phones))
+        return {
+            phone: SmsDeliveryResult(success=True, message_id=f'local-{len(self.sent_messages)}')
+            for phone in phones
+        }
+
+
+_provider = None
+
+
+def get_sms_provider():
+    """Return the process-wide provider configured by ``SMS_PROVIDER``."""
+    global _provider
+    if _provider is None:
+        _provider = import_string(settings.SMS_PROVIDER)()
+    return _provider
+
+
+def queue_sms(phone, message, purpose='NOTIFICATION'):
+    """Persist an outgoing SMS and hand it to the worker once the transaction commits."""
+    outbox_message = SmsOutboxMessage.objects.create(phone=phone, message=message, purpose=purpose)
+    transaction.on_commit(lambda: _enqueue_delivery([str(outbox_message.id)]))
+    return outbox_message
+
+
+def _enqueue_delivery(message_ids, eta=None):
+    from .tasks import deliver_sms_outbox_task
+
+    try:
+        deliver_sms_outbox_task.apply_async(args=[message_ids], eta=eta)
+    except Exception:
+        # The beat sweep delivers anything left queued.
+        logger.exception("Failed to queue SMS delivery for %s messages", len(message_ids))
+
+
+def retry_delay(attempts) -> timedelta:
+    """Return the backoff before the next attempt after ``attempts`` tries."""
+    seconds = settings.SMS_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, MAX_RETRY_DELAY_SECONDS))
+
+
+def claim_sms_messages(message_ids=None, now=None) -> list:
+    """Claim due queued messages for this worker and count the attempt."""
+    now = now or timezone.now()
+    due = Q(status='QUEUED') & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+
+    with transaction.atomic():
+        queryset = SmsOutboxMessage.objects.select_for_update(skip_locked=True).filter(due)
+        if message_ids is not None:
+            queryset = queryset.filter(pk__in=message_ids)
+        claimed_ids = list(
+            queryset.order_by('created_at').values_list('id', flat=True)[:settings.SMS_OUTBOX_BATCH_SIZE]
+        )
+        if not claimed_ids:
+            return []
+        SmsOutboxMessage.objects.filter(pk__in=claimed_ids).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT_SECONDS),
+        )
+
+    return list(SmsOutboxMessage.objects.filter(pk__in=claimed_ids).order_by('created_at'))
+
+
+def deliver_sms_outbox(message_ids=None, provider=None, now=None) -> dict:
+    """
+    Deliver claimed outbox messages and return a summary.
+
+    The summary counts sent, retrying and failed rows and carries the ids and
+    earliest time of the rows that should be retried.
+    """
+    provider = provider or get_sms_provider()
+    now = now or timezone.now()
+    messages = claim_sms_messages(message_ids, now=now)
+    summary = {'sent': 0, 'retrying': 0, 'failed': 0, 'skipped': 0, 'retry_ids': [], 'retry_at': None}
+
+    groups = {}
+    for outbox_message in _drop_stale_otps(messages, now, summary):
+        groups.setdefault(outbox_message.message, []).append(outbox_message)
+
+    for body, group in groups.items():
+        for start in range(0, len(group), provider.max_recipients):
+            chunk = group[start:start + provider.max_recipients]
+            phones = list(dict.fromkeys(outbox_message.phone for outbox_message in chunk))
+            try:
+                results = provider.send(body, phones)
+            except Exception as exc:
+                logger.exception("SMS provider %s failed a batch of %s recipients", provider.name, len(phones))
+                results = {phone: SmsDeliveryResult(success=False, error=str(exc)) for phone in phones}
+
+            for outbox_message in chunk:
+                result = results.get(outbox_message.phone) or SmsDeliveryResult(
+                    success=False,
+                    error='No delivery status returned',
+                )
+                _record_result(outbox_message, result, provider, now, summary)
+
+    SmsOutboxMessage.objects.bulk_update(
+        messages,
+        [
+            'message', 'status', 'next_attempt_at', 'provider', 'provider_message_id',
+            'last_error', 'sent_at', 'updated_at',
+        ],
+    )
+    return summary
+
+
+def _drop_stale_otps(messages, now, summary):
+    """Fail OTPs that expired or were superseded by a newer code, and return the messages still to send."""
+    otp_phones = {outbox_message.phone for outbox_message in messages if outbox_message.purpose == 'OTP'}
+    if not otp_phones:
+        return messages
+
+    latest = dict(
+        SmsOutboxMessage.objects.filter(purpose='OTP', phone__in=otp_phones)
+        .order_by()
+        .values('phone')
+        .annotate(latest=Max('created_at'))
+        .values_list('phone', 'latest')
+    )
+    expired_before = now - timedelta(seconds=settings.OTP_EXPIRY_SECONDS)
+
+    deliverable = []
+    for outbox_message in messages:
+        if outbox_message.purpose != 'OTP':
+            deliverable.append(outbox_message)
+        elif outbox_message.created_at < latest[outbox_message.phone]:
+            _finish(outbox_message, 'FAILED', now, error='Superseded by a newer OTP')
+            summary['skipped'] += 1
+        elif outbox_message.created_at <= expired_before:
+            _finish(outbox_message, 'FAILED', now, error='OTP expired before delivery')
+            summary['skipped'] += 1
+        else:
+            deliverable.append(outbox_message)
+    return deliverable
+
+
+def _finish(outbox_message, status, now, error=''):
+    """Close out a row and blank its body so the text is not kept once it is no longer needed."""
+    outbox_message.status = status
+    outbox_message.message = ''
+    outbox_message.next_attempt_at = None
+    outbox_message.last_error = error[:255]
+    outbox_message.updated_at = now
+
+
+def _record_result(outbox_message, result, provider, now, summary):
+    outbox_message.provider = provider.name
+    outbox_message.updated_at = now
+    if result.success:
+        _finish(outbox_message, 'SENT', now)
+        outbox_message.sent_at = now
+        outbox_message.provider_message_id = result.message_id[:100]
+        summary['sent'] += 1
+        return
+
+    if result.permanent or outbox_message.attempts >= settings.SMS_MAX_ATTEMPTS:
+        _finish(outbox_message, 'FAILED', now, error=result.error)
+        summary['failed'] += 1
+        logger.warning("Giving up on SMS %s to %s: %s", outbox_message.id, outbox_message.phone, result.error)
+        return
+
+    outbox_message.last_error = result.error[:255]
+    outbox_message.next_attempt_at = now + retry_delay(outbox_message.attempts)
+    summary['retrying'] += 1
+    summary['retry_ids'].append(str(outbox_message.id))
+    if summary['retry_at'] is None or outbox_message.next_attempt_at < summary['retry_at']:
+        summary['retry_at'] = outbox_message.next_attempt_at
+
+
+def schedule_sms_retry(summary):
+    """Queue a delivery run for the rows a previous run left retrying."""
+    if summary['retry_ids']:
+        _enqueue_delivery(summary['retry_ids'], eta=summary['retry_at'])
+
+
+def purge_sms_outbox(now=None) -> int:
+    """Delete sent and failed rows older than ``SMS_OUTBOX_RETENTION_DAYS`` and return how many went."""
+    cutoff = (now or timezone.now()) - timedelta(days=settings.SMS_OUTBOX_RETENTION_DAYS)
+    deleted, _ = SmsOutboxMessage.objects.filter(status__in=['SENT', 'FAILED'], updated_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,27 @@
+"""Background tasks for shared platform services."""
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def deliver_sms_outbox_task(message_ids=None):
+    """Deliver queued SMS outbox messages and queue a retry for transient failures."""
+    from .sms import deliver_sms_outbox, schedule_sms_retry
+
+    schedule_sms_retry(deliver_sms_outbox(message_ids))
+
+
+@shared_task(ignore_result=True)
+def purge_sms_outbox_task():
+    """Delete finished SMS outbox rows past their retention period."""
+    from .sms import purge_sms_outbox
+
+    purge_sms_outbox()
+
+
+@shared_task(ignore_result=True)
+def refresh_platform_videos_task():
+    """Refresh the public lesson video feed from YouTube."""
+    from .youtube import refresh_platform_videos
+
+    refresh_platform_videos()
@@ -0,0 +1,186 @@
+"""
+Token-bucket rate limiting for public and authentication endpoints.
+
+Each bucket holds up to ``capacity`` tokens and refills evenly over its period,
+so clients can burst up to the capacity and then settle at the average rate.
+Views opt in with ``throttle_classes`` and a ``throttle_scope``; the rates for
+each scope live in ``RATE_LIMITS`` keyed by what the bucket is keyed on
+(``ip``, ``phone`` or ``route``). Buckets are stored in the default cache, so
+rejected requests never reach the database.
+
+All buckets of a view are drawn from together and only if each has a token,
+so a request refused by one bucket (say its IP's) spends nothing from the
+others (the phone's or the route's). On the shared Redis cache the buckets are
+refilled and drawn from by one Lua script, so concurrent requests on any
+worker cannot spend the same token.
+Other cache backends are per process and fall back to a read-modify-write
+under a process-local lock.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import BaseThrottle
+
+PERIOD_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# KEYS are the buckets; ARGV is now, then capacity, refill per second and timeout for each key.
+# Every bucket is refilled, and one token is drawn from each only if all of them have one.
+# Returns {allowed, tokens...}; tokens are strings so Lua keeps the fraction.
+TAKE_TOKENS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[3 * i - 1])
+    local refill = tonumber(ARGV[3 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    levels[i] = math.min(capacity, tokens + math.max(0, now - updated_at) * refill)
+    if levels[i] < 1 then
+        allowed = 0
+    end
+end
+local result = {allowed}
+for i, key in ipairs(KEYS) do
+    levels[i] = levels[i] - allowed
+    redis.call('HSET', key, 'tokens', tostring(levels[i]), 'updated_at', tostring(now))
+    redis.call('EXPIRE', key, ARGV[3 * i + 1])
+    result[i + 1] = tostring(levels[i])
+end
+return result
+"""
+
+_local_lock = threading.Lock()
+
+
+def take_tokens(buckets) -> tuple[bool, list[float]]:
+    """
+    Refill each ``(key, capacity, refill_per_second, timeout)`` bucket and draw one token from
+    every bucket only if all of them have one. Returns ``(allowed, tokens_left)`` with the
+    levels in the order the buckets were given.
+    """
+    now = time.time()
+    backend = caches['default']
+    if isinstance(backend, RedisCache):
+        keys = [backend.make_and_validate_key(key) for key, *_ in buckets]
+        args = [now]
+        for _, capacity, refill_per_second, timeout in buckets:
+            args += [capacity, refill_per_second, timeout]
+        client = backend._cache.get_client(keys[0], write=True)
+        allowed, *levels = client.eval(TAKE_TOKENS_SCRIPT, len(keys), *keys, *args)
+        return bool(allowed), [float(tokens) for tokens in levels]
+
+    with _local_lock:
+        levels = []
+        for key, capacity, refill_per_second, _ in buckets:
+            tokens, updated_at = cache.get(key, (capacity, now))
+            levels.append(min(capacity, tokens + max(0, now - updated_at) * refill_per_second))
+        allowed = all(tokens >= 1 for tokens in levels)
+        if allowed:
+            levels = [tokens - 1 for tokens in levels]
+        for (key, _, _, timeout), tokens in zip(buckets, levels):
+            cache.set(key, (tokens, now), timeout=timeout)
+    return allowed, levels
+
+
+def parse_rate(rate) -> tuple[int, float]:
+    """Return ``(capacity, tokens_per_second)`` for a ``"<count>/<period>"`` rate."""
+    count, period = rate.split('/')
+    capacity = int(count)
+    return capacity, capacity / PERIOD_SECONDS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Token bucket keyed by one attribute of the request."""
+
+    key_kind = None
+    cache_format = 'ratelimit:{scope}:{kind}:{ident}'
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_bucket_ident(self, request, view):
+        """Return the value this bucket is keyed on, or ``None`` to skip the bucket."""
+        raise NotImplementedError
+
+    def get_bucket(self, request, view):
+        """Return ``(key, capacity, refill_per_second, timeout)`` for this request, or ``None``."""
+        scope = getattr(view, 'throttle_scope', None)
+        rate = settings.RATE_LIMITS.get(scope, {}).get(self.key_kind)
+        ident = self.get_bucket_ident(request, view)
+        if not rate or not ident:
+            return None
+
+        capacity, refill_per_second = parse_rate(rate)
+        key = self.cache_format.format(scope=scope, kind=self.key_kind, ident=ident)
+        # An untouched bucket refills completely within one period, so it can expire then.
+        return key, capacity, refill_per_second, math.ceil(capacity / refill_per_second)
+
+    def allow_request(self, request, view):
+        if not settings.RATELIMIT_ENABLE:
+            return True
+
+        bucket = self.get_bucket(request, view)
+        if bucket is None:
+            return True
+
+        # DRF asks every throttle even after one refuses, so the first one asked draws
+        # from all of the view's buckets at once and the rest reuse its result.
+        drawn = getattr(request, '_token_buckets_drawn', None)
+        if drawn is None:
+            buckets = {}
+            for throttle in view.get_throttles():
+                if isinstance(throttle, TokenBucketThrottle):
+                    other = throttle.get_bucket(request, view)
+                    if other is not None:
+                        buckets[other[0]] = other
+            allowed, levels = take_tokens(list(buckets.values()))
+            drawn = request._token_buckets_drawn = (allowed, dict(zip(buckets, levels)))
+
+        allowed, levels = drawn
+        key, _, refill_per_second, _ = bucket
+        # Only the buckets that ran dry refuse; DRF rejects the request if any of them does.
+        if allowed or levels[key] >= 1:
+            return True
+        self.wait_seconds = (1 - levels[key]) / refill_per_second
+        return False
+
+    def wait(self):
+        if self.wait_seconds is None:
+            return None
+        return math.ceil(self.wait_seconds)
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    """Bucket per client IP address."""
+
+    key_kind = 'ip'
+
+    def get_bucket_ident(self, request, view):
+        return self.get_ident(request)
+
+
+class PhoneThrottle(TokenBucketThrottle):
+    """Bucket per phone number submitted in the request body."""
+
+    key_kind = 'phone'
+
+    def get_bucket_ident(self, request, view):
+        phone = request.data.get('phone') if hasattr(request.data, 'get') else None
+        if not isinstance(phone, str):
+            return None
+        return ''.join(phone.split()) or None
+
+
+class RouteThrottle(TokenBucketThrottle):
+    """One bucket shared by every caller of the view."""
+
+    key_kind = 'route'
+
+    def get_bucket_ident(self, request, view):
+        return 'all'
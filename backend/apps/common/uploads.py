@@ -0,0 +1,139 @@
+"""
+Direct-to-storage uploads.
+
+Instead of streaming files through a Django worker, the server signs upload
+parameters, the client sends the file straight to storage, and a finalize call
+checks the storage's response signature before any record points at the file.
+``UPLOAD_STORAGE`` selects the backend; ``LocalUploadStorage`` stands in for
+Cloudinary offline and in tests.
+"""
+import hashlib
+import hmac
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core import signing
+from django.utils.module_loading import import_string
+
+UPLOAD_TOKEN_SALT = 'apps.common.uploads'
+
+# Upload targets and the private folder their files are stored in.
+UPLOAD_FOLDERS = {
+    'document': 'documents',
+    'trip_resource': 'resources',
+}
+
+
+class BaseUploadStorage:
+    """Interface every direct-upload backend implements."""
+
+    def sign_upload(self, public_id, resource_type) -> dict:
+        """Return ``{'url': ..., 'fields': {...}}`` for a client to POST the file to."""
+        raise NotImplementedError
+
+    def verify_upload(self, public_id, version, signature) -> bool:
+        """Return whether ``signature`` is the storage's signature for the uploaded asset."""
+        raise NotImplementedError
+
+
+class CloudinaryUploadStorage(BaseUploadStorage):
+    """Signed uploads straight to Cloudinary's upload API."""
+
+    def sign_upload(self, public_id, resource_type) -> dict:
+        from .cloudinary import get_signed_upload_params
+
+        params = get_signed_upload_params(resource_type=resource_type, public_id=public_id)
+        return {'url': params.pop('upload_url'), 'fields': params}
+
+    def verify_upload(self, public_id, version, signature) -> bool:
+        import cloudinary.utils
+
+        expected = cloudinary.utils.api_sign_request(
+            {'public_id': public_id, 'version': version},
+            settings.CLOUDINARY_STORAGE['API_SECRET'],
+        )
+        return hmac.compare_digest(expected, str(signature))
+
+
+class LocalUploadStorage(BaseUploadStorage):
+    """
+    In-process stand-in for Cloudinary.
+
+    ``receive`` plays the storage side of the protocol: it checks the signed
+    fields, records the upload and returns a Cloudinary-shaped response.
+    """
+
+    def __init__(self):
+        self.uploads = {}
+
+    def _sign(self, params) -> str:
+        payload = '&'.join(f'{key}={params[key]}' for key in sorted(params))
+        return hmac.new(settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+    def sign_upload(self, public_id, resource_type) -> dict:
+        fields = {'public_id': public_id, 'timestamp': int(time.time()), 'type': 'authenticated'}
+        return {
+            'url': f'local://uploads/{resource_type}/upload',
+            'fields': {**fields, 'signature': self._sign(fields)},
+        }
+
+    def verify_upload(self, public_id, version, signature) -> bool:
+        expected = self._sign({'public_id': public_id, 'version': version})
+        return hmac.compare_digest(expected, str(signature))
+
+    def receive(self, fields, file_format='pdf', size=0) -> dict:
+        """Accept an upload the way storage would and return its response."""
+        signed = {key: value for key, value in fields.items() if key != 'signature'}
+        if not hmac.compare_digest(self._sign(signed), str(fields.get('signature'))):
+            raise ValueError('Invalid upload signature')
+
+        public_id = fields['public_id']
+        version = int(time.time())
+        self.uploads[public_id] = {'format': file_format, 'bytes': size, 'version': version}
+        return {
+            'public_id': public_id,
+            'version': version,
+            'signature': self._sign({'public_id': public_id, 'version': version}),
+            'format': file_format,
+            'bytes': size,
+        }
+
+
+_storage = None
+
+
+def get_upload_storage():
+    """Return the process-wide storage configured by ``UPLOAD_STORAGE``."""
+    global _storage
+    if _storage is None:
+        _storage = import_string(settings.UPLOAD_STORAGE)()
+    return _storage
+
+
+def issue_upload(target, resource_type, user) -> dict:
+    """
+    Reserve a public_id for ``target`` and sign an upload for it.
+
+    The returned ``upload_token`` binds the public_id to the requesting user so
+    finalize cannot be pointed at someone else's file.
+    """
+    public_id = f'{UPLOAD_FOLDERS[target]}/{uuid4().hex}'
+    token = signing.dumps(
+        {'public_id': public_id, 'target': target, 'resource_type': resource_type, 'user': str(user.pk)},
+        salt=UPLOAD_TOKEN_SALT,
+    )
+    return {
+        'upload_token': token,
+        'public_id': public_id,
+        'resource_type': resource_type,
+        **get_upload_storage().sign_upload(public_id, resource_type),
+    }
+
+
+def read_upload_token(token, user) -> dict:
+    """Return the claims of a valid upload token issued to ``user``, or raise ``signing.BadSignature``."""
+    claims = signing.loads(token, salt=UPLOAD_TOKEN_SALT, max_age=settings.UPLOAD_TOKEN_MAX_AGE)
+    if claims.get('user') != str(user.pk):
+        raise signing.BadSignature('Upload token was issued to another user')
+    return claims
@@ -30,6 +30,9 @@ def upload_file_view(request):
     """
     Upload a file to Cloudinary
     
+    The file passes through this worker; new clients should use the direct
+    upload endpoints (``/api/v1/uploads/sign/`` and ``/finalize/``) instead.
+    
     Expected form data:
     - file: The file to upload
     - folder: Cloudinary folder (optional, default: 'uploads')
@@ -3,40 +3,97 @@
 from __future__ import annotations
 
 import json
+import logging
 from datetime import timedelta
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.module_loading import import_string
 
 from .models import PlatformSettings
 
+logger = logging.getLogger(__name__)
+
 
 class YouTubeSyncError(Exception):
     """Raised when the configured YouTube source cannot be synced."""
 
 
 YOUTUBE_API_BASE = 'https://www.googleapis.com/youtube/v3'
+# The Data API returns at most 50 playlist items per page.
+YOUTUBE_PAGE_SIZE = 50
+VIDEO_CACHE_TTL = timedelta(minutes=15)
+REFRESH_LOCK_KEY = 'youtube:refresh-lock'
+# Held while a refresh runs; a failed refresh keeps it so retries back off until it expires.
+# The lock is a cache.add() on the default cache, so it only spans workers when
+# that cache is shared (Redis outside tests).
+REFRESH_LOCK_SECONDS = 300
 
 
-def _youtube_request(endpoint: str, params: dict) -> dict:
-    """Call the YouTube Data API and return parsed JSON."""
-    api_key = getattr(settings, 'YOUTUBE_DATA_API_KEY', '')
-    if not api_key:
-        raise YouTubeSyncError('YOUTUBE_DATA_API_KEY is not configured')
+class YouTubeDataClient:
+    """Client for the YouTube Data API v3."""
 
-    query = urlencode({**params, 'key': api_key})
-    url = f'{YOUTUBE_API_BASE}/{endpoint}?{query}'
+    def request(self, endpoint: str, params: dict) -> dict:
+        """Call the YouTube Data API and return parsed JSON."""
+        api_key = getattr(settings, 'YOUTUBE_DATA_API_KEY', '')
+        if not api_key:
+            raise YouTubeSyncError('YOUTUBE_DATA_API_KEY is not configured')
+
+        query = urlencode({**params, 'key': api_key})
+        url = f'{YOUTUBE_API_BASE}/{endpoint}?{query}'
+
+        try:
+            with urlopen(url, timeout=10) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except HTTPError as exc:
+            raise YouTubeSyncError(f'YouTube API error: {exc.code}') from exc
+        except URLError as exc:
+            raise YouTubeSyncError(f'YouTube network error: {exc.reason}') from exc
+
+
+class LocalYouTubeClient:
+    """In-memory stand-in for the Data API used in tests and offline development."""
+
+    def __init__(self, playlists: dict | None = None, channel_uploads: dict | None = None):
+        self.playlists = playlists or {}
+        self.channel_uploads = channel_uploads or {}
+        self.requests = []
+
+    def request(self, endpoint: str, params: dict) -> dict:
+        self.requests.append((endpoint, dict(params)))
+        if endpoint == 'channels':
+            uploads = self.channel_uploads.get(params['id'])
+            if not uploads:
+                return {'items': []}
+            return {'items': [{'contentDetails': {'relatedPlaylists': {'uploads': uploads}}}]}
+
+        items = self.playlists.get(params['playlistId'], [])
+        start = int(params.get('pageToken') or 0)
+        end = start + int(params['maxResults'])
+        payload = {'items': items[start:end]}
+        if end < len(items):
+            payload['nextPageToken'] = str(end)
+        return payload
 
-    try:
-        with urlopen(url, timeout=10) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except HTTPError as exc:
-        raise YouTubeSyncError(f'YouTube API error: {exc.code}') from exc
-    except URLError as exc:
-        raise YouTubeSyncError(f'YouTube network error: {exc.reason}') from exc
+
+_client = None
+
+
+def get_youtube_client():
+    """Return the process-wide client configured by ``YOUTUBE_CLIENT``."""
+    global _client
+    if _client is None:
+        _client = import_string(settings.YOUTUBE_CLIENT)()
+    return _client
+
+
+def _youtube_request(endpoint: str, params: dict) -> dict:
+    """Call the YouTube Data API through the configured client and return parsed JSON."""
+    return get_youtube_client().request(endpoint, params)
 
 
 def _resolve_playlist_id(platform_settings: PlatformSettings) -> str:
@@ -99,30 +156,47 @@ def _normalize_playlist_items(items: list[dict]) -> list[dict]:
     return normalized_items
 
 
-def sync_platform_videos(force_refresh: bool = False, max_results: int = 12) -> tuple[list[dict], PlatformSettings, bool]:
-    """Return normalized platform videos, refreshing cache when needed."""
-    platform_settings = PlatformSettings.get_solo()
-    stale = (
+def _fetch_playlist_items(playlist_id: str, max_results: int) -> list[dict]:
+    """Page through a playlist until ``max_results`` playable videos are collected."""
+    items = []
+    page_token = None
+    while len(items) < max_results:
+        params = {
+            'part': 'snippet,contentDetails',
+            'playlistId': playlist_id,
+            'maxResults': min(YOUTUBE_PAGE_SIZE, max_results - len(items)),
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        payload = _youtube_request('playlistItems', params)
+        # Private and deleted videos are dropped here, so later pages fill the gap.
+        items.extend(_normalize_playlist_items(payload.get('items', [])))
+        page_token = payload.get('nextPageToken')
+        if not page_token:
+            break
+    return items[:max_results]
+
+
+def is_video_cache_stale(platform_settings: PlatformSettings) -> bool:
+    """Return whether the stored feed is older than the cache TTL."""
+    return (
         not platform_settings.youtube_cache_synced_at
-        or platform_settings.youtube_cache_synced_at <= timezone.now() - timedelta(minutes=15)
+        or platform_settings.youtube_cache_synced_at <= timezone.now() - VIDEO_CACHE_TTL
     )
 
-    if not force_refresh and platform_settings.youtube_cache_payload and not stale:
+
+def sync_platform_videos(force_refresh: bool = False, max_results: int = 12) -> tuple[list[dict], PlatformSettings, bool]:
+    """Return normalized platform videos, refreshing cache when needed."""
+    platform_settings = PlatformSettings.get_cached()
+
+    if not force_refresh and platform_settings.youtube_cache_payload and not is_video_cache_stale(platform_settings):
         return platform_settings.youtube_cache_payload, platform_settings, False
 
     if not platform_settings.youtube_playlist_id and not platform_settings.youtube_channel_id:
         return [], platform_settings, False
 
     playlist_id = _resolve_playlist_id(platform_settings)
-    payload = _youtube_request(
-        'playlistItems',
-        {
-            'part': 'snippet,contentDetails',
-            'playlistId': playlist_id,
-            'maxResults': max_results,
-        },
-    )
-    items = _normalize_playlist_items(payload.get('items', []))
+    items = _fetch_playlist_items(playlist_id, max_results)
 
     platform_settings.youtube_cache_payload = items
     platform_settings.youtube_cache_synced_at = timezone.now()
@@ -133,3 +207,33 @@ def sync_platform_videos(force_refresh: bool = False, max_results: int = 12) ->
     )
 
     return items, platform_settings, True
+
+
+def schedule_video_refresh() -> bool:
+    """
+    Queue one background feed refresh unless another is already running or backing off.
+
+    Only one refresh runs across all workers as long as the default cache is shared.
+    """
+    from .tasks import refresh_platform_videos_task
+
+    if not cache.add(REFRESH_LOCK_KEY, True, timeout=REFRESH_LOCK_SECONDS):
+        return False
+
+    try:
+        refresh_platform_videos_task.delay()
+    except Exception:
+        cache.delete(REFRESH_LOCK_KEY)
+        logger.exception("Failed to queue YouTube feed refresh")
+        return False
+    return True
+
+
+def refresh_platform_videos():
+    """Refresh the stored feed and release the refresh lock on success."""
+    try:
+        sync_platform_videos(force_refresh=True)
+    except YouTubeSyncError as exc:
+        logger.warning("YouTube feed refresh failed: %s", exc)
+        return
+    cache.delete(REFRESH_LOCK_KEY)
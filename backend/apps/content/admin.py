@@ -16,8 +16,8 @@ class DuaAdmin(admin.ModelAdmin):
 class NotificationLogAdmin(admin.ModelAdmin):
     """Admin for NotificationLog model."""
     
-    list_display = ['scope', 'title', 'scheduled_at', 'sent_at', 'count_sent']
-    list_filter = ['scope', 'sent_at']
+    list_display = ['scope', 'category', 'title', 'scheduled_at', 'sent_at', 'count_sent', 'count_failed', 'skipped']
+    list_filter = ['scope', 'category', 'sent_at', 'skipped']
     search_fields = ['title', 'message']
     readonly_fields = ['created_at']
 
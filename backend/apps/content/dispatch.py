@@ -0,0 +1,125 @@
+"""
+Fan-out delivery of due notification logs to pilgrim devices.
+
+Recipients are resolved with one query per log. The query joins device
+installations to active bookings for the log's trip or package, and LEFT JOINs
+notification preferences so pilgrims without a preference row get the model
+defaults. Tokens are sent through the configured push provider in
+provider-sized batches, and delivery counts are recorded on the log. Logs
+claimed more than ``NOTIFICATION_MAX_DELAY_SECONDS`` after their scheduled time
+(say, after push was switched off for a while) are marked skipped instead, so
+re-enabling push does not send a backlog of stale messages.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.common.push import PushMessage, get_push_provider, push_delivery_enabled
+from apps.pilgrims.models import DeviceInstallation, NotificationPreference
+
+from .models import NotificationLog
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_BOOKING_STATUSES = ['EOI', 'BOOKED', 'CONFIRMED']
+
+
+def resolve_recipient_tokens(log, token_field) -> list[str]:
+    """Return the distinct device tokens that should receive a notification log."""
+    installations = DeviceInstallation.objects.filter(notifications_enabled=True)
+
+    if log.scope == 'TRIP':
+        installations = installations.filter(
+            pilgrim__bookings__package__trip_id=log.scope_id,
+            pilgrim__bookings__status__in=ACTIVE_BOOKING_STATUSES,
+        )
+    elif log.scope == 'PACKAGE':
+        installations = installations.filter(
+            pilgrim__bookings__package_id=log.scope_id,
+            pilgrim__bookings__status__in=ACTIVE_BOOKING_STATUSES,
+        )
+    else:
+        installations = installations.filter(pilgrim__user_id=log.scope_id)
+
+    preference_field = NotificationLog.CATEGORY_PREFERENCE_FIELDS[log.category]
+    opted_in = Q(
+        pilgrim__notification_preferences__push_enabled=True,
+        **{f'pilgrim__notification_preferences__{preference_field}': True},
+    )
+    if NotificationPreference._meta.get_field(preference_field).default:
+        opted_in |= Q(pilgrim__notification_preferences__isnull=True)
+
+    tokens = installations.filter(opted_in).values_list(
+        f'provider_token_fields__{token_field}',
+        flat=True,
+    ).distinct()
+    return [token for token in tokens if isinstance(token, str) and token]
+
+
+def deliver_notification(log, provider) -> tuple[int, int]:
+    """Send one notification log to its audience and return ``(sent, failed)``."""
+    tokens = resolve_recipient_tokens(log, provider.token_field)
+    message = PushMessage(
+        title=log.title,
+        body=log.message,
+        data={
+            'notification_id': str(log.id),
+            'category': log.category,
+            'scope': log.scope,
+            'scope_id': str(log.scope_id),
+        },
+    )
+
+    sent = failed = 0
+    invalid_tokens = []
+    for start in range(0, len(tokens), provider.batch_size):
+        batch = tokens[start:start + provider.batch_size]
+        try:
+            result = provider.send_batch(batch, message)
+        except Exception:
+            logger.exception("Push provider %s failed a batch of %s for notification %s", provider.name, len(batch), log.id)
+            failed += len(batch)
+            continue
+        sent += result.sent
+        failed += result.failed
+        invalid_tokens.extend(result.invalid_tokens)
+
+    NotificationLog.objects.filter(pk=log.pk).update(
+        count_sent=F('count_sent') + sent,
+        count_failed=F('count_failed') + failed,
+    )
+    if invalid_tokens:
+        DeviceInstallation.objects.filter(
+            **{f'provider_token_fields__{provider.token_field}__in': invalid_tokens}
+        ).update(notifications_enabled=False)
+
+    return sent, failed
+
+
+def dispatch_notification_logs(log_ids) -> int:
+    """
+    Deliver a batch of claimed notification logs and return the number of devices reached.
+
+    If push delivery was switched off after the publisher claimed the logs, the
+    claim is released so they go out once delivery is enabled again.
+    """
+    if not push_delivery_enabled():
+        logger.info("Push delivery is disabled; releasing %s notifications", len(log_ids))
+        NotificationLog.objects.filter(pk__in=log_ids).update(sent_at=None)
+        return 0
+
+    logs = NotificationLog.objects.filter(pk__in=log_ids)
+    cutoff = timezone.now() - timedelta(seconds=settings.NOTIFICATION_MAX_DELAY_SECONDS)
+    skipped = logs.filter(scheduled_at__lt=cutoff).update(skipped=True)
+    if skipped:
+        logger.warning("Skipped %s notifications scheduled before %s", skipped, cutoff.isoformat())
+
+    provider = get_push_provider()
+    total_sent = 0
+    for log in logs.filter(scheduled_at__gte=cutoff):
+        sent, _failed = deliver_notification(log, provider)
+        total_sent += sent
+    return total_sent
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0002_guidancearticle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationlog",
+            name="category",
+            field=models.CharField(
+                choices=[
+                    ("TRIP_UPDATE", "Trip Update"),
+                    ("DOCUMENT", "Document"),
+                    ("READINESS", "Readiness"),
+                    ("DAILY_PROGRAM", "Daily Program"),
+                    ("SUPPORT", "Support"),
+                    ("MARKETING", "Marketing"),
+                ],
+                default="TRIP_UPDATE",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationlog",
+            name="count_failed",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="notificationlog",
+            name="scope_id",
+            field=models.UUIDField(help_text="Trip, package, or account id depending on scope"),
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(fields=["sent_at", "scheduled_at"], name="notificatio_sent_at_2241cc_idx"),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_trip_update_logs(apps, schema_editor):
+    """Attach existing trip-update logs to the update they were created for."""
+    NotificationLog = apps.get_model("content", "NotificationLog")
+    TripUpdate = apps.get_model("trips", "TripUpdate")
+
+    for update in TripUpdate.objects.all().iterator():
+        log = (
+            NotificationLog.objects.filter(
+                trip_update__isnull=True,
+                category="TRIP_UPDATE",
+                scope_id=update.package_id or update.trip_id,
+                title=update.title,
+                created_at__gte=update.created_at,
+            )
+            .order_by("created_at")
+            .first()
+        )
+        if log is not None:
+            log.trip_update_id = update.id
+            log.save(update_fields=["trip_update"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0003_notification_delivery"),
+        ("trips", "0010_scheduled_publishing"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationlog",
+            name="trip_update",
+            field=models.OneToOneField(
+                blank=True,
+                help_text="Trip update this log announces, kept in sync until it is sent",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="notification_log",
+                to="trips.tripupdate",
+            ),
+        ),
+        migrations.RunPython(link_trip_update_logs, migrations.RunPython.noop),
+    ]
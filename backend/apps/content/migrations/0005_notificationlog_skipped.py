@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("content", "0004_notificationlog_trip_update"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationlog",
+            name="skipped",
+            field=models.BooleanField(
+                default=False,
+                help_text="Not delivered because it was older than NOTIFICATION_MAX_DELAY_SECONDS when claimed",
+            ),
+        ),
+    ]
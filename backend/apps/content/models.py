@@ -31,22 +31,54 @@ class Dua(models.Model):
 
 
 class NotificationLog(models.Model):
-    """Log of notifications (MVP - no actual sending)."""
+    """Scheduled push notification for a trip, package, or single account."""
     
     SCOPE_CHOICES = [
         ('TRIP', 'Trip'),
         ('PACKAGE', 'Package'),
         ('USER', 'User'),
     ]
+
+    # Each category maps to the NotificationPreference flag that can mute it.
+    CATEGORY_CHOICES = [
+        ('TRIP_UPDATE', 'Trip Update'),
+        ('DOCUMENT', 'Document'),
+        ('READINESS', 'Readiness'),
+        ('DAILY_PROGRAM', 'Daily Program'),
+        ('SUPPORT', 'Support'),
+        ('MARKETING', 'Marketing'),
+    ]
+    CATEGORY_PREFERENCE_FIELDS = {
+        'TRIP_UPDATE': 'trip_updates',
+        'DOCUMENT': 'document_updates',
+        'READINESS': 'readiness_updates',
+        'DAILY_PROGRAM': 'daily_program_updates',
+        'SUPPORT': 'support_updates',
+        'MARKETING': 'marketing_updates',
+    }
     
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
-    scope_id = models.UUIDField()
+    scope_id = models.UUIDField(help_text='Trip, package, or account id depending on scope')
+    trip_update = models.OneToOneField(
+        'trips.TripUpdate',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notification_log',
+        help_text='Trip update this log announces, kept in sync until it is sent',
+    )
+    category = models.CharField(max_length=16, choices=CATEGORY_CHOICES, default='TRIP_UPDATE')
     title = models.CharField(max_length=200)
     message = models.TextField()
     scheduled_at = models.DateTimeField()
     sent_at = models.DateTimeField(null=True, blank=True)
     count_sent = models.IntegerField(default=0)
+    count_failed = models.IntegerField(default=0)
+    skipped = models.BooleanField(
+        default=False,
+        help_text='Not delivered because it was older than NOTIFICATION_MAX_DELAY_SECONDS when claimed',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -54,6 +86,9 @@ class NotificationLog(models.Model):
         verbose_name = 'Notification Log'
         verbose_name_plural = 'Notification Logs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['sent_at', 'scheduled_at']),
+        ]
     
     def __str__(self):
         return f"{self.scope} - {self.title}"
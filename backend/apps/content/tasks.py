@@ -0,0 +1,11 @@
+"""Background tasks for content and notifications."""
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def dispatch_notification_logs_task(log_ids):
+    """Dispatch a batch of due notification logs."""
+    from .dispatch import dispatch_notification_logs
+
+    dispatch_notification_logs(log_ids)
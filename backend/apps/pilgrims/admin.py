@@ -1,6 +1,13 @@
 from django.contrib import admin
+from django.db import transaction
+
+from apps.common.activity import record_document_reviewed
+from apps.common.encryption import blind_index
+
 from .models import DeviceInstallation, Document, NotificationPreference, PilgrimReadiness, TripFeedback
 
+REVIEWED_STATUSES = ('VERIFIED', 'REJECTED')
+
 
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
@@ -8,9 +15,53 @@ class DocumentAdmin(admin.ModelAdmin):
     
     list_display = ['pilgrim', 'document_type', 'title', 'status', 'expiry_date', 'trip', 'created_at']
     list_filter = ['document_type', 'status', 'trip', 'issuing_country']
-    search_fields = ['pilgrim__user__name', 'pilgrim__user__phone', 'title', 'document_number']
+    search_fields = ['pilgrim__user__name', 'pilgrim__user__phone', 'title']
     readonly_fields = ['id', 'created_at', 'updated_at', 'uploaded_by', 'reviewed_at']
     autocomplete_fields = ['pilgrim', 'trip', 'booking']
+
+    def get_search_results(self, request, queryset, search_term):
+        """Also match a full document number through its blind index."""
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        digest = blind_index(search_term)
+        if digest:
+            results |= queryset.filter(document_number_index=digest)
+        return results, may_have_duplicates
+
+    actions = ['mark_as_verified', 'mark_as_pending', 'mark_as_rejected']
+
+    def save_model(self, request, obj, form, change):
+        """Record a review when the change form verifies or rejects a document."""
+        previous_status = form.initial.get('status') if change else None
+        super().save_model(request, obj, form, change)
+        if obj.status != previous_status and obj.status in REVIEWED_STATUSES:
+            record_document_reviewed(obj, actor=request.user)
+
+    def _set_status(self, request, queryset, status):
+        """Save each document whose status changes so review dates, readiness and activity follow."""
+        updated = 0
+        with transaction.atomic():
+            for document in queryset.exclude(status=status).select_related('pilgrim__user'):
+                document.status = status
+                document.save()
+                if status in REVIEWED_STATUSES:
+                    record_document_reviewed(document, actor=request.user)
+                updated += 1
+        return updated
+
+    def mark_as_verified(self, request, queryset):
+        updated = self._set_status(request, queryset, 'VERIFIED')
+        self.message_user(request, f'{updated} document(s) marked as verified.')
+    mark_as_verified.short_description = 'Mark selected documents as verified'
+
+    def mark_as_pending(self, request, queryset):
+        updated = self._set_status(request, queryset, 'PENDING')
+        self.message_user(request, f'{updated} document(s) marked as pending.')
+    mark_as_pending.short_description = 'Mark selected documents as pending'
+
+    def mark_as_rejected(self, request, queryset):
+        updated = self._set_status(request, queryset, 'REJECTED')
+        self.message_user(request, f'{updated} document(s) marked as rejected.')
+    mark_as_rejected.short_description = 'Mark selected documents as rejected'
     
     fieldsets = (
         ('Document Information', {
@@ -63,23 +114,6 @@ class TripFeedbackAdmin(admin.ModelAdmin):
     list_filter = ['status', 'follow_up_requested', 'testimonial_opt_in', 'trip']
     search_fields = ['booking__reference_number', 'pilgrim__full_name', 'pilgrim__user__name', 'trip__code']
     readonly_fields = ['id', 'pilgrim', 'booking', 'trip', 'created_at', 'updated_at', 'submitted_at']
-    
-    actions = ['mark_as_verified', 'mark_as_pending', 'mark_as_rejected']
-    
-    def mark_as_verified(self, request, queryset):
-        updated = queryset.update(status='VERIFIED')
-        self.message_user(request, f'{updated} document(s) marked as verified.')
-    mark_as_verified.short_description = 'Mark selected documents as verified'
-    
-    def mark_as_pending(self, request, queryset):
-        updated = queryset.update(status='PENDING')
-        self.message_user(request, f'{updated} document(s) marked as pending.')
-    mark_as_pending.short_description = 'Mark selected documents as pending'
-    
-    def mark_as_rejected(self, request, queryset):
-        updated = queryset.update(status='REJECTED')
-        self.message_user(request, f'{updated} document(s) marked as rejected.')
-    mark_as_rejected.short_description = 'Mark selected documents as rejected'
 
 
 @admin.register(PilgrimReadiness)
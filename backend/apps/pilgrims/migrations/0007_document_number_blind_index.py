@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:40
+
+from django.db import migrations, models
+
+from apps.common.encryption import blind_index
+
+
+def backfill_document_number_index(apps, schema_editor):
+    Document = apps.get_model("pilgrims", "Document")
+    documents = []
+    for document in Document.objects.exclude(document_number__isnull=True).only("id", "document_number").iterator():
+        document.document_number_index = blind_index(document.document_number)
+        documents.append(document)
+    Document.objects.bulk_update(documents, ["document_number_index"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pilgrims", "0006_document_reviewed_at_and_support_models"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="document_number_index",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Blind index (HMAC) of the normalized document number for equality lookups",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicaldocument",
+            name="document_number_index",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Blind index (HMAC) of the normalized document number for equality lookups",
+                max_length=64,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_document_number_index, migrations.RunPython.noop),
+    ]
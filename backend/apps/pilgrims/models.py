@@ -5,6 +5,8 @@ from django.utils import timezone as django_timezone
 from uuid import uuid4
 from simple_history.models import HistoricalRecords
 
+from apps.common.encryption import blind_index
+
 
 class Document(models.Model):
     """Unified document storage for pilgrims (passports, visas, vaccinations, etc.)."""
@@ -41,6 +43,14 @@ class Document(models.Model):
     document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPE_CHOICES)
     title = models.CharField(max_length=200, help_text="e.g., 'Passport - Uganda', 'Visa - Umrah 2025'")
     document_number = models.CharField(max_length=100, null=True, blank=True, help_text="Passport number, visa number, etc.")
+    document_number_index = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Blind index (HMAC) of the normalized document number for equality lookups",
+    )
     issuing_country = models.CharField(max_length=2, null=True, blank=True, help_text="ISO 2-letter country code")
     
     # File storage (Cloudinary)
@@ -143,6 +153,11 @@ class Document(models.Model):
         if self.status != 'PENDING' and (self.reviewed_at is None or previous_status != self.status):
             self.reviewed_at = django_timezone.now()
 
+        self.document_number_index = blind_index(self.document_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'document_number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'document_number_index'}
+
         super().save(*args, **kwargs)
         self.sync_readiness_records()
 
@@ -2,10 +2,24 @@
 Custom admin actions for Trip management.
 """
 import csv
+import secrets
+import string
 from django.http import HttpResponse
 from django.contrib import messages
-from django.utils import timezone
-from django.db import transaction
+
+COPY_TOKEN_ALPHABET = string.digits + string.ascii_uppercase
+
+
+def copy_trip_code(code):
+    """Return a free trip code for a copy of ``code``: the original prefix plus ``-C`` and a base36 token."""
+    from apps.trips.models import Trip
+
+    max_length = Trip._meta.get_field('code').max_length
+    while True:
+        suffix = '-C' + ''.join(secrets.choice(COPY_TOKEN_ALPHABET) for _ in range(4))
+        candidate = f"{code[:max_length - len(suffix)]}{suffix}"
+        if not Trip.objects.filter(code=candidate).exists():
+            return candidate
 
 
 def duplicate_trip(modeladmin, request, queryset):
@@ -22,114 +36,26 @@ def duplicate_trip(modeladmin, request, queryset):
     - Checklist items
     - Emergency contacts
     - FAQs
+    - Milestones (reset to not started)
+    - Resources
     
     Does NOT duplicate:
     - Bookings
     - Visas
     - Updates
     """
+    from apps.trips.cloning import clone_trip
+
     duplicated_count = 0
     
     for trip in queryset:
         try:
-            with transaction.atomic():
-                # Store old ID for relations
-                old_trip_id = trip.id
-                
-                # Duplicate trip
-                trip.pk = None
-                trip.id = None
-                trip.code = f"{trip.code}_COPY_{timezone.now().strftime('%Y%m%d%H%M%S')}"
-                trip.name = f"{trip.name} (Copy)"
-                trip.save()
-                new_trip = trip
-                
-                # Duplicate packages with flights and hotels
-                from apps.trips.models import TripPackage, PackageFlight, PackageHotel
-                
-                old_packages = TripPackage.objects.filter(trip_id=old_trip_id)
-                package_mapping = {}  # old_id -> new_package
-                
-                for old_package in old_packages:
-                    old_package_id = old_package.id
-                    
-                    # Duplicate package
-                    old_package.pk = None
-                    old_package.id = None
-                    old_package.trip = new_trip
-                    old_package.save()
-                    new_package = old_package
-                    package_mapping[old_package_id] = new_package
-                    
-                    # Duplicate flights
-                    old_flights = PackageFlight.objects.filter(package_id=old_package_id)
-                    for flight in old_flights:
-                        flight.pk = None
-                        flight.id = None
-                        flight.package = new_package
-                        flight.save()
-                    
-                    # Duplicate hotels
-                    old_hotels = PackageHotel.objects.filter(package_id=old_package_id)
-                    for hotel in old_hotels:
-                        hotel.pk = None
-                        hotel.id = None
-                        hotel.package = new_package
-                        hotel.save()
-                
-                # Duplicate itinerary items
-                from apps.trips.models import ItineraryItem
-                old_items = ItineraryItem.objects.filter(trip_id=old_trip_id)
-                for item in old_items:
-                    item.pk = None
-                    item.id = None
-                    item.trip = new_trip
-                    item.save()
-                
-                # Duplicate guide sections
-                from apps.trips.models import TripGuideSection
-                old_sections = TripGuideSection.objects.filter(trip_id=old_trip_id)
-                for section in old_sections:
-                    section.pk = None
-                    section.id = None
-                    section.trip = new_trip
-                    section.save()
-                
-                # Duplicate checklist items
-                from apps.trips.models import ChecklistItem
-                old_checklist = ChecklistItem.objects.filter(trip_id=old_trip_id)
-                for item in old_checklist:
-                    old_package_id = item.package_id
-                    item.pk = None
-                    item.id = None
-                    item.trip = new_trip
-                    # Map to new package if package-specific
-                    if old_package_id and old_package_id in package_mapping:
-                        item.package = package_mapping[old_package_id]
-                    else:
-                        item.package = None
-                    item.save()
-                
-                # Duplicate emergency contacts
-                from apps.trips.models import EmergencyContact
-                old_contacts = EmergencyContact.objects.filter(trip_id=old_trip_id)
-                for contact in old_contacts:
-                    contact.pk = None
-                    contact.id = None
-                    contact.trip = new_trip
-                    contact.save()
-                
-                # Duplicate FAQs
-                from apps.trips.models import TripFAQ
-                old_faqs = TripFAQ.objects.filter(trip_id=old_trip_id)
-                for faq in old_faqs:
-                    faq.pk = None
-                    faq.id = None
-                    faq.trip = new_trip
-                    faq.save()
-                
-                duplicated_count += 1
-                
+            clone_trip(
+                trip,
+                [{'code': copy_trip_code(trip.code), 'name': f"{trip.name} (Copy)"}],
+                history_user=request.user,
+            )
+            duplicated_count += 1
         except Exception as e:
             messages.error(request, f"Error duplicating trip {trip.code}: {str(e)}")
             continue
@@ -13,7 +13,10 @@ def import_pilgrims_view(request):
     View for importing pilgrims from CSV.
     """
     if request.method == 'POST':
-        import_pilgrims_from_csv(None, request)
+        job = import_pilgrims_from_csv(None, request)
+        if job is not None:
+            # The job page shows progress while the import runs in the background.
+            return redirect('admin:accounts_pilgrimimportjob_change', job.pk)
         return redirect('admin:accounts_pilgrimprofile_changelist')
     
     context = {
@@ -6,3 +6,7 @@ class TripsConfig(AppConfig):
     name = 'apps.trips'
     verbose_name = 'Trips'
 
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,190 @@
+"""
+Bulk cloning of a trip and everything planned under it.
+
+``collect_subtree`` loads a root row and its descendants with one query per
+model; ``clone_subtree`` copies that snapshot any number of times in memory,
+remapping foreign keys between copied rows and shifting date fields by a day
+offset, and then inserts each model with a single ``bulk_create``. Cloning a
+seasonal template twelve times costs the same handful of queries as cloning
+it once.
+
+``bulk_create`` skips ``save()`` and signals, so values ``save()`` derives are
+set here. Offline packs for the new packages are built on first request.
+"""
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+from simple_history.utils import bulk_create_with_history
+
+from .models import (
+    ChecklistItem,
+    EmergencyContact,
+    ItineraryItem,
+    PackageFlight,
+    PackageHotel,
+    Trip,
+    TripFAQ,
+    TripGuideSection,
+    TripMilestone,
+    TripPackage,
+    TripResource,
+)
+
+
+class CloneStep:
+    """
+    One model in a clone graph.
+
+    ``parent_field`` is the foreign key that ties its rows to an earlier model
+    in the graph. ``reset`` maps field names to the values copies start with.
+    """
+
+    def __init__(self, model, parent_field, reset=None):
+        self.model = model
+        self.parent_field = parent_field
+        self.reset = reset or {}
+
+
+# Everything planned under a trip, parents before children. Bookings, visas
+# and trip updates belong to a specific departure and are never copied.
+TRIP_CLONE_GRAPH = (
+    CloneStep(TripPackage, 'trip'),
+    CloneStep(PackageFlight, 'package'),
+    CloneStep(PackageHotel, 'package'),
+    CloneStep(ItineraryItem, 'trip'),
+    CloneStep(TripGuideSection, 'trip'),
+    CloneStep(ChecklistItem, 'trip'),
+    CloneStep(EmergencyContact, 'trip'),
+    CloneStep(TripFAQ, 'trip'),
+    CloneStep(TripMilestone, 'trip', reset={'status': 'NOT_STARTED', 'actual_date': None}),
+    CloneStep(TripResource, 'trip'),
+)
+
+MAX_TRIP_CLONES = 24
+
+
+def collect_subtree(root, graph):
+    """Return ``{model: [rows]}`` for ``root`` and its descendants, one query per model."""
+    subtree = {type(root): [root]}
+    for step in graph:
+        parent_model = step.model._meta.get_field(step.parent_field).related_model
+        parent_ids = [row.pk for row in subtree.get(parent_model, [])]
+        subtree[step.model] = list(
+            step.model._default_manager.filter(**{f'{step.parent_field}__in': parent_ids}).order_by('pk')
+        ) if parent_ids else []
+    return subtree
+
+
+def _copy_row(row, mapping, offset):
+    """Return an unsaved copy of ``row`` with remapped keys and shifted dates."""
+    model = type(row)
+    copy = model()
+    for field in model._meta.concrete_fields:
+        if field.primary_key or getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            continue
+        value = getattr(row, field.attname)
+        if field.is_relation:
+            # Keys into the copied graph follow the copy; others (currency, owner) are shared.
+            target = mapping.get((field.related_model, value))
+            if target is not None:
+                value = target.pk
+        elif offset and value is not None and isinstance(field, models.DateField):
+            value = value + offset
+        setattr(copy, field.attname, value)
+    return copy
+
+
+def clone_subtree(subtree, graph, copies, prepare=None, history_user=None):
+    """
+    Insert copies of a collected subtree and return the new roots.
+
+    ``copies`` is a list of ``(overrides, offset_days)`` pairs, one per copy;
+    ``overrides`` are field values for the new root. ``prepare``, if given, is
+    called with ``{model: [copies]}`` before anything is written. Every model
+    is inserted with one ``bulk_create`` (history-tracked models together with
+    their history rows).
+    """
+    root_model = next(iter(subtree))
+    resets = {step.model: step.reset for step in graph}
+    created = {model: [] for model in subtree}
+
+    for overrides, offset_days in copies:
+        offset = timedelta(days=offset_days)
+        mapping = {}
+        for model, rows in subtree.items():
+            for row in rows:
+                copy = _copy_row(row, mapping, offset)
+                for name, value in resets.get(model, {}).items():
+                    setattr(copy, name, value)
+                if model is root_model:
+                    for name, value in overrides.items():
+                        setattr(copy, name, value)
+                mapping[(model, row.pk)] = copy
+                created[model].append(copy)
+
+    if prepare is not None:
+        prepare(created)
+
+    for model, rows in created.items():
+        if not rows:
+            continue
+        if hasattr(model._meta, 'simple_history_manager_attribute'):
+            bulk_create_with_history(rows, model, default_user=history_user)
+        else:
+            model._default_manager.bulk_create(rows)
+    return created[root_model]
+
+
+def _assign_unique_slugs(trips):
+    """Give new trips the unique slugs ``Trip.save()`` would, with one lookup query."""
+    bases = {trip.pk: (slugify(trip.slug or trip.name or trip.code) or slugify(trip.code) or str(trip.id))[:180] for trip in trips}
+    taken = set(
+        Trip.objects.filter(reduce(or_, (Q(slug__startswith=base) for base in set(bases.values()))))
+        .values_list('slug', flat=True)
+    )
+    for trip in trips:
+        base = bases[trip.pk]
+        candidate = base
+        index = 2
+        while candidate in taken:
+            suffix = f"-{index}"
+            candidate = f"{base[: 180 - len(suffix)]}{suffix}"
+            index += 1
+        taken.add(candidate)
+        trip.slug = candidate
+
+
+def _sync_published_flags(resources):
+    """Mirror ``TripResource.save()`` for shifted publish dates."""
+    now = timezone.now()
+    for resource in resources:
+        resource.is_published = bool(resource.published_at and resource.published_at <= now)
+
+
+@transaction.atomic
+def clone_trip(trip, clones, history_user=None):
+    """
+    Clone ``trip`` with its packages, logistics and content, once per entry in ``clones``.
+
+    Each entry holds field values for the new trip and must include a unique
+    ``code``. A ``start_date`` shifts every date in the copy by the distance
+    from the source's start date; other fields default to the source's values.
+    Returns the new trips in the order requested.
+    """
+    subtree = collect_subtree(trip, TRIP_CLONE_GRAPH)
+    copies = []
+    for clone in clones:
+        overrides = {'slug': None, **{key: value for key, value in clone.items() if key != 'start_date'}}
+        offset_days = (clone['start_date'] - trip.start_date).days if clone.get('start_date') else 0
+        copies.append((overrides, offset_days))
+
+    def prepare(created):
+        _assign_unique_slugs(created[Trip])
+        _sync_published_flags(created[TripResource])
+
+    return clone_subtree(subtree, TRIP_CLONE_GRAPH, copies, prepare=prepare, history_user=history_user)
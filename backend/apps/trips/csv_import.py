@@ -2,101 +2,168 @@
 CSV import utilities for Trip admin.
 """
 import csv
+from datetime import datetime
 from io import StringIO
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from apps.accounts.auth_cache import invalidate_user_snapshot
+from apps.accounts.import_jobs import start_import_job
+from apps.common.bulk import bulk_upsert
+
 Account = get_user_model()
 
 
+def read_csv_rows(csv_file):
+    """Parse an uploaded CSV into row dicts, each tagged with its ``line`` number."""
+    reader = csv.DictReader(StringIO(csv_file.read().decode('utf-8')))
+    return [{**row, 'line': reader.line_num} for row in reader]
+
+
+# Profile columns a CSV row can update.
+PROFILE_FIELDS = ['dob', 'nationality', 'emergency_name', 'emergency_phone']
+
+
+def _new_account(row):
+    phone = row['phone']
+    return Account(
+        phone=phone,
+        name=row.get('name', '').strip() or f'Pilgrim {phone[-4:]}',
+        email=row.get('email', '').strip() or None,
+        role='PILGRIM',
+        is_active=True,
+    )
+
+
+def _apply_profile_fields(profile, row):
+    """Copy the CSV's profile columns onto ``profile`` and return it."""
+    if row.get('dob'):
+        try:
+            profile.dob = datetime.strptime(row['dob'], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+
+    if row.get('nationality'):
+        profile.nationality = row['nationality'].strip()[:2].upper()
+
+    if row.get('emergency_name'):
+        profile.emergency_name = row['emergency_name'].strip()
+
+    if row.get('emergency_phone'):
+        profile.emergency_phone = row['emergency_phone'].strip()
+
+    return profile
+
+
+def _upsert_rows(rows, created_by=None):
+    """
+    Create or update accounts and profiles for ``rows`` in bulk.
+
+    Existing accounts are kept as they are and their profiles updated, like
+    the ``get_or_create`` calls this replaces. Returns one flag per row that is
+    True when both the account and the profile were new.
+    """
+    from apps.accounts.models import PilgrimProfile
+
+    accounts = bulk_upsert(Account, [(row['phone'], row) for row in rows], 'phone', create=_new_account)
+    profiles = bulk_upsert(
+        PilgrimProfile,
+        [(account.pk, (account, row)) for (account, _), row in zip(accounts, rows)],
+        'user_id',
+        create=lambda data: _apply_profile_fields(PilgrimProfile(user=data[0]), data[1]),
+        update=lambda profile, data: _apply_profile_fields(profile, data[1]),
+        update_fields=PROFILE_FIELDS,
+        history_user=created_by,
+    )
+
+    # Bulk writes skip the signals that drop cached auth snapshots.
+    existing_ids = {account.pk for account, account_created in accounts if not account_created}
+    for user_id in existing_ids:
+        invalidate_user_snapshot(user_id)
+    transaction.on_commit(lambda: [invalidate_user_snapshot(user_id) for user_id in existing_ids])
+
+    return [
+        account_created and profile_created
+        for (_, account_created), (_, profile_created) in zip(accounts, profiles)
+    ]
+
+
+def import_chunk(rows, created_by=None):
+    """
+    Import job handler: write parsed CSV rows and return ``(created, updated, errors)``.
+
+    The chunk is upserted in bulk. If that fails, its rows are retried one by
+    one so a single bad row only costs itself.
+    """
+    errors = []
+    valid_rows = []
+    for row in rows:
+        try:
+            valid_rows.append({**row, 'phone': row['phone'].strip()})
+        except (KeyError, AttributeError) as e:
+            errors.append((row['line'], str(e)))
+
+    flags = []
+    try:
+        with transaction.atomic():
+            flags = _upsert_rows(valid_rows, created_by)
+    except Exception:
+        flags = []
+        for row in valid_rows:
+            try:
+                with transaction.atomic():
+                    flags.extend(_upsert_rows([row], created_by))
+            except Exception as e:
+                errors.append((row['line'], str(e)))
+
+    created = sum(flags)
+    return created, len(flags) - created, [f"Row {line}: {message}" for line, message in sorted(errors)]
+
+
 def import_pilgrims_from_csv(modeladmin, request):
     """
     Import pilgrims from CSV file.
-    
+
     Expected CSV format:
     name,phone,email,dob,nationality,emergency_name,emergency_phone
-    
+
     Creates:
     - Account (if not exists)
     - PilgrimProfile (if not exists)
+
+    The rows are written by a background import job, which is returned.
     """
     if request.method == 'POST' and request.FILES.get('csv_file'):
         csv_file = request.FILES['csv_file']
-        
-        # Decode CSV
-        decoded_file = csv_file.read().decode('utf-8')
-        io_string = StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
-        
-        created = 0
-        updated = 0
-        errors = []
-        
+
         try:
-            with transaction.atomic():
-                for row in reader:
-                    try:
-                        # Get or create account
-                        phone = row['phone'].strip()
-                        user, user_created = Account.objects.get_or_create(
-                            phone=phone,
-                            defaults={
-                                'name': row.get('name', '').strip() or f'Pilgrim {phone[-4:]}',
-                                'email': row.get('email', '').strip() or None,
-                                'role': 'PILGRIM',
-                                'is_active': True
-                            }
-                        )
-                        
-                        # Get or create profile
-                        from apps.accounts.models import PilgrimProfile
-                        from datetime import datetime
-                        
-                        profile, profile_created = PilgrimProfile.objects.get_or_create(
-                            user=user,
-                            defaults={}
-                        )
-                        
-                        # Update profile fields
-                        if row.get('dob'):
-                            try:
-                                profile.dob = datetime.strptime(row['dob'], '%Y-%m-%d').date()
-                            except ValueError:
-                                pass
-                        
-                        if row.get('nationality'):
-                            profile.nationality = row['nationality'].strip()[:2].upper()
-                        
-                        if row.get('emergency_name'):
-                            profile.emergency_name = row['emergency_name'].strip()
-                        
-                        if row.get('emergency_phone'):
-                            profile.emergency_phone = row['emergency_phone'].strip()
-                        
-                        profile.save()
-                        
-                        if user_created and profile_created:
-                            created += 1
-                        else:
-                            updated += 1
-                            
-                    except Exception as e:
-                        errors.append(f"Row {reader.line_num}: {str(e)}")
-            
-            # Report results
-            if created:
-                messages.success(request, f"Created {created} new pilgrim(s).")
-            if updated:
-                messages.info(request, f"Updated {updated} existing pilgrim(s).")
-            if errors:
-                for error in errors[:5]:
-                    messages.error(request, error)
-                if len(errors) > 5:
-                    messages.warning(request, f"...and {len(errors) - 5} more errors.")
-                    
-        except Exception as e:
+            rows = read_csv_rows(csv_file)
+        except (UnicodeDecodeError, csv.Error) as e:
             messages.error(request, f"Import failed: {str(e)}")
-    
+            return None
+
+        job = start_import_job('CSV', rows, created_by=request.user, file_name=csv_file.name)
+        report_import_job(request, job)
+        return job
+
     return None
 
+
+def report_import_job(request, job):
+    """Summarise an import job in admin messages."""
+    if not job.is_finished:
+        messages.info(request, f"Importing {job.total_rows} row(s) in the background.")
+        return
+
+    if job.status == 'FAILED':
+        messages.error(request, f"Import stopped after {job.processed_count} row(s): {job.error_message}")
+    if job.created_count:
+        messages.success(request, f"Created {job.created_count} new pilgrim(s).")
+    if job.updated_count:
+        messages.info(request, f"Updated {job.updated_count} existing pilgrim(s).")
+    if job.errors:
+        for error in job.errors[:5]:
+            messages.error(request, error)
+        if len(job.errors) > 5:
+            messages.warning(request, f"...and {len(job.errors) - 5} more errors.")
@@ -0,0 +1,36 @@
+"""
+Management command to publish scheduled trip content
+Usage: python manage.py publish_due_content [--loop] [--max-sleep 60]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.trips.publishing import next_due_at, publish_due_content
+
+
+class Command(BaseCommand):
+    help = 'Publishes due trip updates and resources and dispatches due notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and wake at the next due time')
+        parser.add_argument('--max-sleep', type=int, default=60, help='Longest sleep between runs in seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            counts = publish_due_content()
+            if any(counts.values()):
+                self.stdout.write(self.style.SUCCESS(
+                    f"Published {counts['updates']} updates and {counts['resources']} resources; "
+                    f"dispatched {counts['notifications']} notifications"
+                ))
+
+            if not options['loop']:
+                return
+
+            due_at = next_due_at()
+            sleep_for = options['max_sleep']
+            if due_at is not None:
+                sleep_for = min(sleep_for, max((due_at - timezone.now()).total_seconds(), 0))
+            time.sleep(max(sleep_for, 1))
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-19 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trips", "0007_historicaltrip_commercial_month_label_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncTombstone",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("entity", models.CharField(max_length=32)),
+                ("object_id", models.UUIDField()),
+                ("trip_id", models.UUIDField(blank=True, null=True)),
+                ("package_id", models.UUIDField(blank=True, null=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Sync Tombstone",
+                "verbose_name_plural": "Sync Tombstones",
+                "db_table": "sync_tombstones",
+                "ordering": ["deleted_at"],
+                "indexes": [
+                    models.Index(fields=["trip_id", "deleted_at"], name="sync_tombst_trip_id_8c6f6c_idx"),
+                    models.Index(fields=["package_id", "deleted_at"], name="sync_tombst_package_78cc37_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-19 06:53
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trips", "0008_sync_tombstone"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TripOfflinePack",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("payload", models.BinaryField()),
+                ("size_bytes", models.PositiveIntegerField(default=0)),
+                ("built_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "package",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="offline_pack", to="trips.trippackage"
+                    ),
+                ),
+                (
+                    "trip",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="offline_packs", to="trips.trip"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Trip Offline Pack",
+                "verbose_name_plural": "Trip Offline Packs",
+                "db_table": "trip_offline_packs",
+                "indexes": [models.Index(fields=["trip"], name="trip_offlin_trip_id_022dfa_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:00
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_published_flags(apps, schema_editor):
+    TripUpdate = apps.get_model("trips", "TripUpdate")
+    TripResource = apps.get_model("trips", "TripResource")
+    now = timezone.now()
+
+    TripUpdate.objects.filter(publish_at__lte=now).update(is_published=True)
+    TripResource.objects.filter(published_at__isnull=False, published_at__lte=now).update(is_published=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trips", "0009_trip_offline_pack"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tripresource",
+            name="is_published",
+            field=models.BooleanField(default=False, help_text="Set once published_at has passed"),
+        ),
+        migrations.AddField(
+            model_name="tripupdate",
+            name="is_published",
+            field=models.BooleanField(default=False, help_text="Set once publish_at has passed"),
+        ),
+        migrations.AddIndex(
+            model_name="tripresource",
+            index=models.Index(fields=["trip", "is_published"], name="trip_resour_trip_id_b96ea3_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tripresource",
+            index=models.Index(fields=["is_published", "published_at"], name="trip_resour_is_publ_8064c5_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tripupdate",
+            index=models.Index(fields=["trip", "is_published"], name="trip_update_trip_id_32a229_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tripupdate",
+            index=models.Index(fields=["is_published", "publish_at"], name="trip_update_is_publ_7354b0_idx"),
+        ),
+        migrations.RunPython(backfill_published_flags, migrations.RunPython.noop),
+    ]
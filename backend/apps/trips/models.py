@@ -304,6 +304,7 @@ class TripUpdate(models.Model):
     urgency = models.CharField(max_length=10, choices=URGENCY_CHOICES, default='INFO')
     pinned = models.BooleanField(default=False)
     publish_at = models.DateTimeField()
+    is_published = models.BooleanField(default=False, help_text='Set once publish_at has passed')
     attach_public_id = models.CharField(max_length=160, null=True, blank=True)
     attach_url = models.URLField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -314,28 +315,38 @@ class TripUpdate(models.Model):
         verbose_name = 'Trip Update'
         verbose_name_plural = 'Trip Updates'
         ordering = ['-pinned', '-publish_at']
+        indexes = [
+            models.Index(fields=['trip', 'is_published']),
+            models.Index(fields=['is_published', 'publish_at']),
+        ]
     
     def __str__(self):
         return f"{self.trip.code} - {self.title}"
     
     def save(self, *args, **kwargs):
-        """Create notification log on publish."""
+        """Sync the published flag and keep the update's unsent notification log in step."""
+        from django.utils import timezone
+
         is_new = self._state.adding
+        self.is_published = self.publish_at <= timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'publish_at' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'is_published'}
         super().save(*args, **kwargs)
-        
+
+        from apps.content.models import NotificationLog
+        log_values = {
+            'scope': 'PACKAGE' if self.package_id else 'TRIP',
+            'scope_id': self.package_id or self.trip_id,
+            'title': self.title,
+            'message': self.body_md[:500],
+            'scheduled_at': self.publish_at,
+        }
         if is_new:
-            # Create notification log (MVP stub)
-            from apps.content.models import NotificationLog
-            scope = 'PACKAGE' if self.package else 'TRIP'
-            scope_id = self.package_id if self.package else self.trip_id
-            
-            NotificationLog.objects.create(
-                scope=scope,
-                scope_id=scope_id,
-                title=self.title,
-                message=self.body_md[:500],
-                scheduled_at=self.publish_at,
-            )
+            NotificationLog.objects.create(trip_update=self, **log_values)
+        else:
+            # A log that has gone out is history; only a pending one follows edits.
+            NotificationLog.objects.filter(trip_update=self, sent_at__isnull=True).update(**log_values)
 
 
 class TripGuideSection(models.Model):
@@ -542,6 +553,7 @@ class TripResource(models.Model):
     metadata = models.JSONField(default=dict, blank=True)
     is_pinned = models.BooleanField(default=False)
     published_at = models.DateTimeField(null=True, blank=True)
+    is_published = models.BooleanField(default=False, help_text='Set once published_at has passed')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -554,17 +566,22 @@ class TripResource(models.Model):
             models.Index(fields=['trip', 'resource_type']),
             models.Index(fields=['package']),
             models.Index(fields=['published_at']),
+            models.Index(fields=['trip', 'is_published']),
+            models.Index(fields=['is_published', 'published_at']),
         ]
 
     def __str__(self):
         return f"{self.trip.code} - {self.title}"
 
-    @property
-    def is_published(self):
-        """Return whether the resource should be visible to pilgrims."""
+    def save(self, *args, **kwargs):
+        """Keep the published flag in step with published_at."""
         from django.utils import timezone
 
-        return bool(self.published_at and self.published_at <= timezone.now())
+        self.is_published = bool(self.published_at and self.published_at <= timezone.now())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'published_at' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'is_published'}
+        super().save(*args, **kwargs)
 
     def clean(self):
         """Ensure package-scoped resources stay within the selected trip."""
@@ -572,3 +589,64 @@ class TripResource(models.Model):
 
         if self.package and self.package.trip_id != self.trip_id:
             raise ValidationError("Resource package must belong to the selected trip")
+
+
+class SyncTombstone(models.Model):
+    """Record of a deleted pilgrim-facing row so delta-sync clients can drop it."""
+
+    id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=32)
+    object_id = models.UUIDField()
+    trip_id = models.UUIDField(null=True, blank=True)
+    package_id = models.UUIDField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    RETENTION_DAYS = 90
+
+    class Meta:
+        db_table = 'sync_tombstones'
+        verbose_name = 'Sync Tombstone'
+        verbose_name_plural = 'Sync Tombstones'
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['trip_id', 'deleted_at']),
+            models.Index(fields=['package_id', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} {self.object_id} deleted at {self.deleted_at}"
+
+    @classmethod
+    def purge_expired(cls):
+        """Delete tombstones older than the retention window and return the count."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        cutoff = timezone.now() - timedelta(days=cls.RETENTION_DAYS)
+        deleted, _ = cls.objects.filter(deleted_at__lt=cutoff).delete()
+        return deleted
+
+
+class TripOfflinePack(models.Model):
+    """Pre-built, gzip-compressed pilgrim content bundle for offline use during the journey."""
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    trip = models.ForeignKey(Trip, on_delete=models.CASCADE, related_name='offline_packs')
+    package = models.OneToOneField(TripPackage, on_delete=models.CASCADE, related_name='offline_pack')
+    content_hash = models.CharField(max_length=64)
+    payload = models.BinaryField()
+    size_bytes = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'trip_offline_packs'
+        verbose_name = 'Trip Offline Pack'
+        verbose_name_plural = 'Trip Offline Packs'
+        indexes = [
+            models.Index(fields=['trip']),
+        ]
+
+    def __str__(self):
+        return f"{self.package} offline pack ({self.content_hash[:12]})"
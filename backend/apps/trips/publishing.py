@@ -0,0 +1,114 @@
+"""
+Scheduled publishing for trip updates, trip resources and notification logs.
+
+Staff schedule content by setting ``TripUpdate.publish_at`` or
+``TripResource.published_at`` in the future. The publisher flips due rows to
+``is_published`` in one indexed UPDATE, bumps ``updated_at`` so delta-sync
+clients pick them up, announces them through ``content_published`` and hands
+every due ``NotificationLog`` to the dispatcher in a single batch. While push
+delivery is disabled in platform settings or no ``PUSH_PROVIDER`` is set,
+notification logs stay pending and are left out of the wake-up schedule.
+
+Celery beat runs the publisher every minute as a safety net. Saves also queue
+an ``eta`` run at the next due time so content goes live on the minute it is
+scheduled for. ``manage.py publish_due_content --loop`` is the local runner.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.common.push import push_delivery_enabled
+from apps.content.models import NotificationLog
+
+from .models import TripResource, TripUpdate
+from .signals import content_published
+
+logger = logging.getLogger(__name__)
+
+NEXT_WAKE_CACHE_KEY = 'publishing:next-wake'
+
+
+def publish_due_content(now=None) -> dict:
+    """Publish every due update and resource, dispatch due notifications, and return counts."""
+    from apps.content.tasks import dispatch_notification_logs_task
+
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        updates = list(
+            TripUpdate.objects.select_for_update(skip_locked=True)
+            .filter(is_published=False, publish_at__lte=now)
+            .values_list('id', 'trip_id', 'package_id')
+        )
+        if updates:
+            TripUpdate.objects.filter(pk__in=[row[0] for row in updates]).update(is_published=True, updated_at=now)
+
+        resources = list(
+            TripResource.objects.select_for_update(skip_locked=True)
+            .filter(is_published=False, published_at__isnull=False, published_at__lte=now)
+            .values_list('id', 'trip_id', 'package_id')
+        )
+        if resources:
+            TripResource.objects.filter(pk__in=[row[0] for row in resources]).update(
+                is_published=True,
+                updated_at=now,
+            )
+
+        log_ids = list(
+            NotificationLog.objects.select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True, scheduled_at__lte=now)
+            .values_list('id', flat=True)
+        ) if push_delivery_enabled() else []
+        if log_ids:
+            NotificationLog.objects.filter(pk__in=log_ids).update(sent_at=now)
+
+        if updates or resources:
+            transaction.on_commit(
+                lambda: content_published.send(sender=TripUpdate, updates=updates, resources=resources)
+            )
+        if log_ids:
+            transaction.on_commit(
+                lambda: dispatch_notification_logs_task.delay([str(log_id) for log_id in log_ids])
+            )
+
+    return {'updates': len(updates), 'resources': len(resources), 'notifications': len(log_ids)}
+
+
+def next_due_at():
+    """Return the earliest pending publish or notification time, if any."""
+    candidates = [
+        TripUpdate.objects.filter(is_published=False).aggregate(due=Min('publish_at'))['due'],
+        TripResource.objects.filter(is_published=False, published_at__isnull=False).aggregate(
+            due=Min('published_at')
+        )['due'],
+    ]
+    if push_delivery_enabled():
+        candidates.append(
+            NotificationLog.objects.filter(sent_at__isnull=True).aggregate(due=Min('scheduled_at'))['due']
+        )
+    candidates = [value for value in candidates if value is not None]
+    return min(candidates) if candidates else None
+
+
+def schedule_publish_wake(due_at):
+    """Queue a publisher run at ``due_at`` unless an earlier future run is already queued."""
+    from .tasks import publish_due_content_task
+
+    if due_at is None:
+        return
+
+    now = timezone.now()
+    due_at = max(due_at, now)
+    queued_at = cache.get(NEXT_WAKE_CACHE_KEY)
+    if queued_at and now <= queued_at <= due_at:
+        return
+
+    cache.set(NEXT_WAKE_CACHE_KEY, due_at, timeout=int((due_at - now).total_seconds()) + 300)
+    try:
+        publish_due_content_task.apply_async(eta=due_at)
+    except Exception:
+        cache.delete(NEXT_WAKE_CACHE_KEY)
+        logger.exception("Failed to queue publisher wake-up for %s", due_at)
@@ -0,0 +1,97 @@
+"""Trip content signals: delta-sync tombstones, update notifications and scheduled-publishing events."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal
+
+from apps.content.models import NotificationLog
+
+from .models import (
+    ChecklistItem,
+    EmergencyContact,
+    ItineraryItem,
+    PackageFlight,
+    PackageHotel,
+    SyncTombstone,
+    TripFAQ,
+    TripGuideSection,
+    TripMilestone,
+    TripResource,
+    TripUpdate,
+)
+
+# Sent after commit when the scheduler publishes due content. Receivers get
+# ``updates`` and ``resources`` as lists of ``(id, trip_id, package_id)``.
+content_published = Signal()
+
+# Model -> entity key used in the `/me/trips/<id>/sync/` payload.
+SYNC_ENTITY_MODELS = {
+    ItineraryItem: 'itinerary',
+    TripUpdate: 'updates',
+    TripGuideSection: 'guide_sections',
+    ChecklistItem: 'checklist',
+    EmergencyContact: 'contacts',
+    TripFAQ: 'faqs',
+    TripMilestone: 'milestones',
+    TripResource: 'resources',
+    PackageFlight: 'flights',
+    PackageHotel: 'hotels',
+}
+
+
+def record_sync_tombstone(sender, instance, **kwargs):
+    """Persist a tombstone for a deleted sync entity."""
+    SyncTombstone.objects.create(
+        entity=SYNC_ENTITY_MODELS[sender],
+        object_id=instance.pk,
+        trip_id=getattr(instance, 'trip_id', None),
+        package_id=getattr(instance, 'package_id', None),
+    )
+
+
+def discard_unsent_update_notification(sender, instance, **kwargs):
+    """Drop a deleted trip update's notification log unless it has already gone out."""
+    NotificationLog.objects.filter(trip_update=instance, sent_at__isnull=True).delete()
+
+
+def schedule_publisher_for_pending_content(sender, instance, raw=False, **kwargs):
+    """Wake the publisher at the due time of newly scheduled content or notifications."""
+    from .publishing import schedule_publish_wake
+
+    if raw:
+        return
+
+    if sender is NotificationLog:
+        due_at = None if instance.sent_at else instance.scheduled_at
+    elif sender is TripUpdate:
+        due_at = None if instance.is_published else instance.publish_at
+    else:
+        due_at = None if instance.is_published else instance.published_at
+
+    if due_at is not None:
+        transaction.on_commit(lambda: schedule_publish_wake(due_at))
+
+
+def connect_signals():
+    """Connect tombstone recorders, notification cleanup and scheduled-publishing triggers."""
+    for model in SYNC_ENTITY_MODELS:
+        post_delete.connect(
+            record_sync_tombstone,
+            sender=model,
+            dispatch_uid=f'sync-tombstone-{model._meta.label_lower}',
+        )
+
+    # Runs before delete so the log is still linked; ``SET_NULL`` clears the
+    # link ahead of ``post_delete``.
+    pre_delete.connect(
+        discard_unsent_update_notification,
+        sender=TripUpdate,
+        dispatch_uid='discard-unsent-trip-update-notification',
+    )
+
+    for model in (TripUpdate, TripResource, NotificationLog):
+        post_save.connect(
+            schedule_publisher_for_pending_content,
+            sender=model,
+            dispatch_uid=f'publish-wake-{model._meta.label_lower}',
+        )
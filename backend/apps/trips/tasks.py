@@ -0,0 +1,12 @@
+"""Background tasks for trip content."""
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def publish_due_content_task():
+    """Publish due trip content and queue the next wake-up."""
+    from .publishing import next_due_at, publish_due_content, schedule_publish_wake
+
+    publish_due_content()
+    schedule_publish_wake(next_due_at())
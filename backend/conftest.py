@@ -11,6 +11,14 @@ from django.utils import timezone
 Account = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache so rate-limit buckets and cached state do not leak."""
+    from django.core.cache import cache
+
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Return an API client for testing."""
@@ -300,6 +308,37 @@ def settings():
     return settings
 
 
+@pytest.fixture
+def push_enabled(db):
+    """Enable push delivery in platform settings."""
+    from apps.common.models import PlatformSettings
+
+    platform_settings = PlatformSettings.get_solo()
+    platform_settings.notification_provider_enabled = True
+    platform_settings.save()
+    return platform_settings
+
+
+@pytest.fixture
+def sms_provider(monkeypatch):
+    """Route outbox SMS through a fresh local provider and return it."""
+    from apps.common import sms
+
+    provider = sms.LocalSmsProvider()
+    monkeypatch.setattr(sms, '_provider', provider)
+    return provider
+
+
+@pytest.fixture
+def upload_storage(monkeypatch):
+    """Route direct uploads through a fresh local storage and return it."""
+    from apps.common import uploads
+
+    storage = uploads.LocalUploadStorage()
+    monkeypatch.setattr(uploads, '_storage', storage)
+    return storage
+
+
 @pytest.fixture
 def flight(trip_package):
     """Create a test flight."""
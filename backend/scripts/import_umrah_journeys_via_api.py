@@ -8,15 +8,21 @@ Use --apply to execute writes against an API environment (including production).
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
 import os
+import queue
+import random
 import re
 import sys
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
 from typing import Any
-from urllib import error, parse, request
+from urllib import parse
 
 
 DEFAULT_SOURCE = "/Users/kiberusharif/Downloads/umrah_calendar_2026_2027_normalized.md"
@@ -349,10 +355,52 @@ def build_plan(row: JourneyRow) -> JourneyPlan:
     )
 
 
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "PATCH", "DELETE", "OPTIONS"}
+# Statuses worth retrying; a POST is only retried when the server says it did not process it.
+RETRY_STATUSES = {429, 502, 503, 504}
+POST_RETRY_STATUSES = {429, 503}
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class RequestOutcomeUnknown(RuntimeError):
+    """A non-idempotent request was sent but the connection failed before a response arrived."""
+
+
 class SimpleApiClient:
-    def __init__(self, api_base: str, timeout_seconds: int = 30):
+    """
+    Thread-safe JSON client over a pool of keep-alive connections.
+
+    Each request borrows a connection from the pool (opening one when none is
+    idle) and returns it afterwards, so concurrent workers reuse sockets
+    instead of paying a TCP/TLS handshake per call. Failed requests are
+    retried with exponential backoff: idempotent methods on connection errors
+    and 429/5xx, POSTs only when the request could not be sent or the server
+    answered 429/503. A POST whose connection fails after it was sent raises
+    ``RequestOutcomeUnknown``, since the server may have processed it; the
+    importer then looks the entity up by its upsert key before posting again.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        timeout_seconds: int = 30,
+        pool_size: int = 8,
+        max_retries: int = 4,
+        backoff_seconds: float = 0.5,
+    ):
         self.api_base = api_base.rstrip("/")
         self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        parts = parse.urlsplit(self.api_base)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported API base URL: {api_base}")
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._base_path = parts.path.rstrip("/")
+        self._pool: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=pool_size)
 
     def _url(self, endpoint: str, params: dict[str, Any] | None = None) -> str:
         path = endpoint.lstrip("/")
@@ -363,6 +411,37 @@ class SimpleApiClient:
                 url = f"{url}?{query}"
         return url
 
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout_seconds)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout_seconds)
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """Return an idle pooled connection, or a new one; the flag says whether it was reused."""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _backoff(self, attempt: int, retry_after: str | None = None) -> None:
+        delay = self.backoff_seconds * (2 ** (attempt - 1))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        time_module.sleep(delay + random.uniform(0, delay / 2))
+
     def request(
         self,
         method: str,
@@ -371,30 +450,59 @@ class SimpleApiClient:
         payload: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
     ) -> Any:
+        method = method.upper()
         url = self._url(endpoint, params)
+        target = self._base_path + url[len(self.api_base):]
         body: bytes | None = None
-        headers = {"Content-Type": "application/json"}
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
         if token:
             headers["Authorization"] = f"Bearer {token}"
         if payload is not None:
             body = json.dumps(payload).encode("utf-8")
 
-        req = request.Request(url=url, method=method.upper(), headers=headers, data=body)
-        try:
-            with request.urlopen(req, timeout=self.timeout_seconds) as resp:
-                raw = resp.read().decode("utf-8")
-        except error.HTTPError as exc:
-            err_body = exc.read().decode("utf-8", errors="replace")
-            raise RuntimeError(
-                f"{method.upper()} {url} failed ({exc.code}): {err_body}"
-            ) from exc
-
-        if not raw:
+        idempotent = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            attempt += 1
+            conn, reused = self._acquire()
+            sent = False
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                sent = True
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                if attempt <= self.max_retries and (idempotent or not sent):
+                    # The server closes idle keep-alive sockets; retry those on a fresh one at once.
+                    if not (reused and isinstance(exc, STALE_CONNECTION_ERRORS)):
+                        self._backoff(attempt)
+                    continue
+                if sent and not idempotent:
+                    raise RequestOutcomeUnknown(f"{method} {url} failed after sending: {exc}") from exc
+                raise RuntimeError(f"{method} {url} failed: {exc}") from exc
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            retryable = RETRY_STATUSES if idempotent else POST_RETRY_STATUSES
+            if resp.status in retryable and attempt <= self.max_retries:
+                self._backoff(attempt, resp.getheader("Retry-After"))
+                continue
+            if resp.status >= 300:
+                err_body = raw.decode("utf-8", errors="replace")
+                raise RuntimeError(f"{method} {url} failed ({resp.status}): {err_body}")
+            break
+
+        text = raw.decode("utf-8")
+        if not text:
             return None
         try:
-            return json.loads(raw)
+            return json.loads(text)
         except json.JSONDecodeError:
-            return raw
+            return text
 
 
 def extract_results(payload: Any) -> list[dict[str, Any]]:
@@ -426,6 +534,15 @@ def primary_carrier(airline: str) -> str | None:
 
 
 class JourneyImporter:
+    """
+    Plans and applies journey imports.
+
+    Journeys are applied concurrently, each as a dependency chain: trip, then
+    package, then flights and hotels side by side. Every entity is matched on
+    its upsert key (trip code, package code, flight leg/number/departure, hotel
+    name/dates) before it is created, so re-running an import is safe.
+    """
+
     def __init__(
         self,
         client: SimpleApiClient,
@@ -433,12 +550,18 @@ class JourneyImporter:
         update_existing: bool,
         include_operations: bool,
         verbose: bool,
+        workers: int = 8,
     ):
         self.client = client
         self.apply = apply
         self.update_existing = update_existing
         self.include_operations = include_operations
         self.verbose = verbose
+        self.workers = max(workers, 1)
+        self.failures: list[str] = []
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
 
         self.trip_created = 0
         self.trip_updated = 0
@@ -450,11 +573,20 @@ class JourneyImporter:
         self.hotel_created = 0
 
     def log(self, message: str) -> None:
-        print(message)
+        # Worker threads buffer their lines so each journey prints as one block.
+        lines = getattr(self._local, "lines", None)
+        if lines is None:
+            print(message)
+        else:
+            lines.append(message)
 
     def v(self, message: str) -> None:
         if self.verbose:
-            print(message)
+            self.log(message)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
 
     def login(self, phone: str, password: str) -> str:
         data = self.client.request(
@@ -511,6 +643,35 @@ class JourneyImporter:
         )
         return extract_results(payload)
 
+    def find_package(self, token: str, trip_id: str, code: str | None, name: str | None) -> dict[str, Any] | None:
+        packages = self.list_packages_for_trip(token, trip_id)
+        for package in packages:
+            if code and package.get("package_code") == code:
+                return package
+        for package in packages:
+            if name and package.get("name") == name:
+                return package
+        return None
+
+    def create(self, token: str, endpoint: str, payload: dict[str, Any], find_existing) -> Any:
+        """
+        POST ``payload`` and return the created entity.
+
+        If a POST may have reached the server without an answer, ``find_existing``
+        re-runs the upsert-key lookup and its match is returned instead of posting again.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self.client.request("POST", endpoint, token=token, payload=payload)
+            except RequestOutcomeUnknown:
+                attempt += 1
+                existing = find_existing()
+                if existing is not None:
+                    return existing
+                if attempt > self.client.max_retries:
+                    raise
+
     def ensure_trip(self, token: str, plan: JourneyPlan) -> str:
         code = plan.trip_payload["code"]
         existing = self.find_trip_by_code(token, code)
@@ -524,16 +685,16 @@ class JourneyImporter:
                     token=token,
                     payload=plan.trip_payload,
                 )
-                self.trip_updated += 1
+                self.count("trip_updated")
                 self.log(f"  ~ Updated trip {code}")
             else:
-                self.trip_skipped += 1
+                self.count("trip_skipped")
                 self.log(f"  - Trip exists {code} (skipped update)")
             return trip_id
 
-        created = self.client.request("POST", "trips", token=token, payload=plan.trip_payload)
+        created = self.create(token, "trips", plan.trip_payload, lambda: self.find_trip_by_code(token, code))
         trip_id = str(created["id"])
-        self.trip_created += 1
+        self.count("trip_created")
         self.log(f"  + Created trip {code}")
         return trip_id
 
@@ -541,17 +702,7 @@ class JourneyImporter:
         desired_code = plan.package_payload.get("package_code")
         desired_name = plan.package_payload.get("name")
 
-        packages = self.list_packages_for_trip(token, trip_id)
-        existing = None
-        for package in packages:
-            if desired_code and package.get("package_code") == desired_code:
-                existing = package
-                break
-        if existing is None:
-            for package in packages:
-                if desired_name and package.get("name") == desired_name:
-                    existing = package
-                    break
+        existing = self.find_package(token, trip_id, desired_code, desired_name)
 
         payload = dict(plan.package_payload)
         payload["trip"] = trip_id
@@ -565,16 +716,21 @@ class JourneyImporter:
                     token=token,
                     payload=payload,
                 )
-                self.package_updated += 1
+                self.count("package_updated")
                 self.log(f"  ~ Updated package {payload.get('package_code', package_id)}")
             else:
-                self.package_skipped += 1
+                self.count("package_skipped")
                 self.log(f"  - Package exists {payload.get('package_code', package_id)} (skipped update)")
             return package_id
 
-        created = self.client.request("POST", "packages", token=token, payload=payload)
+        created = self.create(
+            token,
+            "packages",
+            payload,
+            lambda: self.find_package(token, trip_id, desired_code, desired_name),
+        )
         package_id = str(created["id"])
-        self.package_created += 1
+        self.count("package_created")
         self.log(f"  + Created package {payload.get('package_code', package_id)}")
         return package_id
 
@@ -671,19 +827,20 @@ class JourneyImporter:
             self.v("  - No flight data provided; skipping flights")
             return
 
-        existing = self.list_flights_for_package(token, package_id)
-        existing_keys = {
-            (str(row.get("leg", "")), str(row.get("flight_no", "")), str(row.get("dep_dt", "")))
-            for row in existing
-        }
+        def flight_keys() -> set[tuple[str, str, str]]:
+            return {
+                (str(row.get("leg", "")), str(row.get("flight_no", "")), str(row.get("dep_dt", "")))
+                for row in self.list_flights_for_package(token, package_id)
+            }
 
+        existing_keys = flight_keys()
         for payload in desired:
             key = (payload["leg"], payload["flight_no"], payload["dep_dt"])
             if key in existing_keys:
                 self.v(f"  - Flight exists {payload['flight_no']} ({payload['leg']})")
                 continue
-            self.client.request("POST", "flights", token=token, payload=payload)
-            self.flight_created += 1
+            self.create(token, "flights", payload, lambda key=key: key if key in flight_keys() else None)
+            self.count("flight_created")
             self.log(f"  + Created flight {payload['flight_no']} ({payload['leg']})")
 
     def ensure_hotels(self, token: str, plan: JourneyPlan, package_id: str) -> None:
@@ -692,19 +849,20 @@ class JourneyImporter:
             self.v("  - No hotel data provided; skipping hotels")
             return
 
-        existing = self.list_hotels_for_package(token, package_id)
-        existing_keys = {
-            (str(row.get("name", "")), str(row.get("check_in", "")), str(row.get("check_out", "")))
-            for row in existing
-        }
+        def hotel_keys() -> set[tuple[str, str, str]]:
+            return {
+                (str(row.get("name", "")), str(row.get("check_in", "")), str(row.get("check_out", "")))
+                for row in self.list_hotels_for_package(token, package_id)
+            }
 
+        existing_keys = hotel_keys()
         for payload in desired:
             key = (payload["name"], payload["check_in"], payload["check_out"])
             if key in existing_keys:
                 self.v(f"  - Hotel exists {payload['name']} ({payload['check_in']}->{payload['check_out']})")
                 continue
-            self.client.request("POST", "hotels", token=token, payload=payload)
-            self.hotel_created += 1
+            self.create(token, "hotels", payload, lambda key=key: key if key in hotel_keys() else None)
+            self.count("hotel_created")
             self.log(f"  + Created hotel {payload['name']} ({payload['check_in']}->{payload['check_out']})")
 
     def dry_run(self, plans: list[JourneyPlan]) -> None:
@@ -740,15 +898,55 @@ class JourneyImporter:
             )
         self.log("\nRun again with --apply to execute this import.")
 
-    def apply_all(self, token: str, plans: list[JourneyPlan]) -> None:
-        for plan in plans:
-            self.log(f"[{plan.row.sn}] {plan.trip_payload['code']} :: {plan.trip_payload['name']}")
-            trip_id = self.ensure_trip(token, plan)
-            package_id = self.ensure_package(token, plan, trip_id)
+    def _buffered(self, func, *args) -> tuple[list[str], Exception | None]:
+        """Run ``func`` collecting its log lines; return them with any error it raised."""
+        self._local.lines = []
+        error = None
+        try:
+            func(*args)
+        except Exception as exc:  # noqa: BLE001
+            error = exc
+        lines = self._local.lines
+        del self._local.lines
+        return lines, error
+
+    def import_plan(self, token: str, plan: JourneyPlan, ops_pool: ThreadPoolExecutor) -> None:
+        self.log(f"[{plan.row.sn}] {plan.trip_payload['code']} :: {plan.trip_payload['name']}")
+        trip_id = self.ensure_trip(token, plan)
+        package_id = self.ensure_package(token, plan, trip_id)
+
+        if self.include_operations:
+            # Flights and hotels only depend on the package, so they run side by side.
+            futures = [
+                ops_pool.submit(self._buffered, self.ensure_flights, token, plan, package_id),
+                ops_pool.submit(self._buffered, self.ensure_hotels, token, plan, package_id),
+            ]
+            errors = []
+            for future in futures:
+                lines, exc = future.result()
+                self._local.lines.extend(lines)
+                if exc is not None:
+                    errors.append(exc)
+            if errors:
+                raise errors[0]
 
-            if self.include_operations:
-                self.ensure_flights(token, plan, package_id)
-                self.ensure_hotels(token, plan, package_id)
+    def apply_all(self, token: str, plans: list[JourneyPlan]) -> None:
+        # Separate pools: journey threads wait on their operations, which must
+        # never queue behind the journeys themselves.
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="journey") as plan_pool, \
+                ThreadPoolExecutor(self.workers * 2, thread_name_prefix="journey-ops") as ops_pool:
+            futures = [
+                plan_pool.submit(self._buffered, self.import_plan, token, plan, ops_pool)
+                for plan in plans
+            ]
+            # Report in source order, as each journey's block completes.
+            for plan, future in zip(plans, futures):
+                lines, exc = future.result()
+                for line in lines:
+                    print(line)
+                if exc is not None:
+                    print(f"  ! Failed: {exc}")
+                    self.failures.append(f"{plan.trip_payload['code']}: {exc}")
 
     def summary(self) -> str:
         return (
@@ -756,7 +954,8 @@ class JourneyImporter:
             f"  trips: created={self.trip_created}, updated={self.trip_updated}, skipped={self.trip_skipped}\n"
             f"  packages: created={self.package_created}, updated={self.package_updated}, skipped={self.package_skipped}\n"
             f"  flights created={self.flight_created}\n"
-            f"  hotels created={self.hotel_created}"
+            f"  hotels created={self.hotel_created}\n"
+            f"  failed journeys={len(self.failures)}"
         )
 
 
@@ -805,6 +1004,24 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Process only the first N rows from the markdown table.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("ALHILAL_IMPORT_WORKERS", "8")),
+        help="Journeys imported concurrently (default 8).",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Retries per request for connection errors, 429 and 5xx responses.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=30,
+        help="Per-request timeout in seconds.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -841,13 +1058,21 @@ def main() -> int:
         print("No importable journey rows found.", file=sys.stderr)
         return 2
 
-    client = SimpleApiClient(args.api_base)
+    workers = max(args.workers, 1)
+    client = SimpleApiClient(
+        args.api_base,
+        timeout_seconds=args.timeout,
+        # One connection per journey thread plus two per journey for its operations.
+        pool_size=workers * 3,
+        max_retries=max(args.max_retries, 0),
+    )
     importer = JourneyImporter(
         client=client,
         apply=args.apply,
         update_existing=args.update_existing,
         include_operations=not args.skip_operations,
         verbose=args.verbose,
+        workers=workers,
     )
 
     if not args.apply:
@@ -861,15 +1086,24 @@ def main() -> int:
         )
         return 2
 
+    started = time_module.monotonic()
     try:
         token = importer.login(args.phone, args.password)
         importer.apply_all(token, plans)
     except Exception as exc:  # noqa: BLE001
         print(f"Import failed: {exc}", file=sys.stderr)
         return 1
+    finally:
+        client.close()
 
     print()
     print(importer.summary())
+    print(f"  elapsed={time_module.monotonic() - started:.1f}s")
+    if importer.failures:
+        print("\nFailed journeys (safe to re-run; existing entities are matched by code):", file=sys.stderr)
+        for failure in importer.failures:
+            print(f"  {failure}", file=sys.stderr)
+        return 1
     return 0
 
 